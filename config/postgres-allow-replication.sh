@@ -0,0 +1,4 @@
+#!/bin/sh
+# Lets the streaming replicas of docker-compose.yml copy the primary and follow its changes
+set -e
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -4,6 +4,7 @@ import logging
 import uvicorn.server
 
 from linkurator_core.infrastructure.config.settings import ApiSettings, ApplicationSettings
+from linkurator_core.infrastructure.metrics import clear_metrics_directory
 from linkurator_core.infrastructure.postgres.repositories import run_postgres_migrations
 
 
@@ -60,4 +61,6 @@ if __name__ == "__main__":
         app_settings.postgres.ip_address, app_settings.postgres.port, app_settings.postgres.database,
         app_settings.postgres.user, app_settings.postgres.password)
 
+    clear_metrics_directory(app_settings.metrics.directory)
+
     asyncio.run(main(app_settings.api))
@@ -36,7 +36,6 @@ class ValidateTokenHandler:
                           expires_at=now + timedelta(seconds=SESSION_DURATION_IN_SECONDS))
         await self.session_repository.add(session)
 
-        user.last_login_at = now
-        await self.user_repository.update(user)
+        await self.user_repository.touch_last_login(user.uuid, now)
 
         return session
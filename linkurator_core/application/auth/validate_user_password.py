@@ -24,7 +24,6 @@ class ValidateUserPassword:
         session = Session.new(user_id=user.uuid, seconds_to_expire=SESSION_DURATION_IN_SECONDS)
         await self.session_repository.add(session)
 
-        user.last_login_at = datetime.now(timezone.utc)
-        await self.user_repository.update(user)
+        await self.user_repository.touch_last_login(user.uuid, datetime.now(timezone.utc))
 
         return session
@@ -6,6 +6,7 @@ from linkurator_core.application.auth.send_validate_new_user_email import (
 from linkurator_core.application.auth.send_welcome_email import SendWelcomeEmail
 from linkurator_core.application.chats.process_user_query_handler import ProcessUserQueryHandler
 from linkurator_core.application.items.refresh_items_handler import RefreshItemsHandler
+from linkurator_core.application.items.sync_user_timeline_handler import SyncUserTimelineHandler
 from linkurator_core.application.subscriptions.summarize_subscription_handler import SummarizeSubscriptionHandler
 from linkurator_core.application.subscriptions.update_subscription_handler import UpdateSubscriptionHandler
 from linkurator_core.application.subscriptions.update_subscription_items_handler import (
@@ -23,6 +24,7 @@ from linkurator_core.domain.common.event import (
     SubscriptionNeedsSummarizationEvent,
     UserRegisteredEvent,
     UserRegisterRequestSentEvent,
+    UserTimelineBecameOutdatedEvent,
 )
 
 
@@ -36,6 +38,7 @@ class EventHandler:
     send_welcome_email: SendWelcomeEmail
     process_user_query_handler: ProcessUserQueryHandler
     summarize_subscription_handler: SummarizeSubscriptionHandler
+    sync_user_timeline_handler: SyncUserTimelineHandler | None = None
 
     async def handle(self, event: Event) -> None:
         if isinstance(event, SubscriptionItemsBecameOutdatedEvent):
@@ -52,5 +55,8 @@ class EventHandler:
             await self.process_user_query_handler.handle(event.chat_id, event.query)
         elif isinstance(event, SubscriptionNeedsSummarizationEvent):
             await self.summarize_subscription_handler.handle(event.subscription_id)
+        elif isinstance(event, UserTimelineBecameOutdatedEvent):
+            if self.sync_user_timeline_handler is not None:
+                await self.sync_user_timeline_handler.handle(event.user_id)
         else:
             pass
@@ -5,7 +5,7 @@ from datetime import datetime, timezone
 from uuid import UUID
 
 from linkurator_core.domain.common.exceptions import SubscriptionNotFoundError
-from linkurator_core.domain.items.item_repository import ItemFilterCriteria, ItemRepository
+from linkurator_core.domain.items.item_repository import ItemRepository
 from linkurator_core.domain.subscriptions.subscription_repository import SubscriptionRepository
 from linkurator_core.domain.users.user_repository import UserRepository
 
@@ -17,7 +17,8 @@ class DeleteSubscriptionItemsHandler:
         self.subscription_repository = subscription_repository
         self.item_repository = item_repository
 
-    async def handle(self, user_id: UUID, subscription_id: UUID) -> None:
+    async def handle(self, user_id: UUID, subscription_id: UUID, before: datetime | None = None) -> int:
+        """Delete the items of the subscription, only the ones created before `before` if it is given."""
         user = await self.user_repository.get(user_id)
         if user is None or user.is_admin is False:
             msg = "Only admins can delete subscription items"
@@ -27,22 +28,10 @@ class DeleteSubscriptionItemsHandler:
         if subscription is None:
             raise SubscriptionNotFoundError(subscription_id)
 
-        items_uuids: list[UUID] = []
-        page_number = 0
-
-        while True:
-            items = await self.item_repository.find_items(
-                criteria=ItemFilterCriteria(subscription_ids=[subscription_id]),
-                page_number=page_number,
-                limit=100)
-            if len(items) == 0:
-                break
-            items_uuids.extend([item.uuid for item in items])
-
-        for item_uuid in items_uuids:
-            await self.item_repository.delete_item(item_uuid)
+        deleted_items = await self.item_repository.delete_items_by_subscription(subscription_id, before=before)
 
         subscription.scanned_at = datetime.fromtimestamp(0, tz=timezone.utc)
         await self.subscription_repository.update(subscription)
 
-        logging.info("Deleted items of subscription %s - %s", subscription_id, subscription.name)
+        logging.info("Deleted %s items of subscription %s - %s", deleted_items, subscription_id, subscription.name)
+        return deleted_items
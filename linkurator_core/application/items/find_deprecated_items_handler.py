@@ -1,7 +1,9 @@
+import asyncio
 import logging
 
-from linkurator_core.domain.common.event import ItemsBecameOutdatedEvent
+from linkurator_core.application.items.outdated_items_drain import DrainProgress, OutdatedItemsDrain
 from linkurator_core.domain.common.event_bus_service import EventBusService
+from linkurator_core.domain.items.drain_cursor_repository import DrainCursorRepository
 from linkurator_core.domain.items.item_repository import ItemFilterCriteria, ItemRepository
 from linkurator_core.domain.subscriptions.subscription_service import SubscriptionService
 
@@ -12,22 +14,33 @@ class FindDeprecatedItemsHandler:
         item_repository: ItemRepository,
         event_bus: EventBusService,
         subscription_services: list[SubscriptionService],
+        max_run_seconds: float = 60 * 4,
+        drain_cursor_repository: DrainCursorRepository | None = None,
     ) -> None:
         self.item_repository = item_repository
         self.event_bus = event_bus
         self.subscription_services = subscription_services
+        self.drains = {
+            service.provider_name(): OutdatedItemsDrain(
+                name=f"Deprecated {service.provider_name()} items",
+                item_repository=item_repository,
+                event_bus=event_bus,
+                batch_size=service.refresh_batch_size(),
+                max_items_per_minute=service.max_refreshed_items_per_minute(),
+                max_run_seconds=max_run_seconds,
+                cursor_repository=drain_cursor_repository,
+            )
+            for service in subscription_services
+        }
 
     async def handle(self) -> None:
         logging.info("Finding deprecated items")
 
-        for service in self.subscription_services:
-            items = await self.item_repository.find_items(
-                criteria=ItemFilterCriteria(
-                    provider=service.provider_name(),
-                    last_version=service.provider_version()),
-                page_number=0,
-                limit=50)
+        await asyncio.gather(*[
+            self.drains[service.provider_name()].drain(
+                ItemFilterCriteria(provider=service.provider_name(), last_version=service.provider_version()))
+            for service in self.subscription_services
+        ])
 
-            if len(items) > 0:
-                item_uuids = {item.uuid for item in items}
-                await self.event_bus.publish(ItemsBecameOutdatedEvent.new(item_ids=item_uuids))
+    def progress(self) -> list[DrainProgress]:
+        return [drain.progress() for drain in self.drains.values()]
@@ -1,28 +1,40 @@
 import logging
 from datetime import datetime, timedelta, timezone
 
-from linkurator_core.domain.common.event import ItemsBecameOutdatedEvent
+from linkurator_core.application.items.outdated_items_drain import DrainProgress, OutdatedItemsDrain
 from linkurator_core.domain.common.event_bus_service import EventBusService
+from linkurator_core.domain.items.drain_cursor_repository import DrainCursorRepository
 from linkurator_core.domain.items.item_repository import ItemFilterCriteria, ItemRepository
 
 
 class FindZeroDurationItems:
-    def __init__(self, item_repository: ItemRepository, event_bus: EventBusService) -> None:
+    def __init__(
+            self,
+            item_repository: ItemRepository,
+            event_bus: EventBusService,
+            max_items_per_minute: int | None = None,
+            max_run_seconds: float = 60 * 4,
+            drain_cursor_repository: DrainCursorRepository | None = None,
+    ) -> None:
         self.item_repository = item_repository
         self.event_bus = event_bus
+        self.drain = OutdatedItemsDrain(
+            name="Zero duration items",
+            item_repository=item_repository,
+            event_bus=event_bus,
+            max_items_per_minute=max_items_per_minute,
+            max_run_seconds=max_run_seconds,
+            cursor_repository=drain_cursor_repository,
+        )
 
     async def handle(self) -> None:
         logging.info("Finding zero duration items")
 
-        items = await self.item_repository.find_items(
-            criteria=ItemFilterCriteria(
-                min_duration=0,
-                max_duration=0,
-                updated_before=datetime.now(timezone.utc) - timedelta(days=1),
-            ),
-            page_number=0,
-            limit=50)
+        await self.drain.drain(ItemFilterCriteria(
+            min_duration=0,
+            max_duration=0,
+            updated_before=datetime.now(timezone.utc) - timedelta(days=1),
+        ))
 
-        if len(items) > 0:
-            item_uuids = {item.uuid for item in items}
-            await self.event_bus.publish(ItemsBecameOutdatedEvent.new(item_ids=item_uuids))
+    def progress(self) -> DrainProgress:
+        return self.drain.progress()
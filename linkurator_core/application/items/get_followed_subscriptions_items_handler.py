@@ -5,10 +5,14 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from uuid import UUID
 
+from linkurator_core.application.items.user_timeline import UserTimeline
 from linkurator_core.domain.items.interaction import Interaction
+from linkurator_core.domain.items.item import Item
 from linkurator_core.domain.items.item_repository import AnyItemInteraction, ItemFilterCriteria, ItemRepository
 from linkurator_core.domain.items.item_with_interactions import ItemWithInteractions
+from linkurator_core.domain.items.timeline_repository import TimelineCursor
 from linkurator_core.domain.subscriptions.subscription_repository import SubscriptionRepository
+from linkurator_core.domain.users.user import User
 from linkurator_core.domain.users.user_repository import UserRepository
 
 
@@ -23,10 +27,12 @@ class GetFollowedSubscriptionsItemsHandler:
         item_repository: ItemRepository,
         subscription_repository: SubscriptionRepository,
         user_repository: UserRepository,
+        user_timeline: UserTimeline | None = None,
     ) -> None:
         self.item_repository = item_repository
         self.subscription_repository = subscription_repository
         self.user_repository = user_repository
+        self.user_timeline = user_timeline
 
     async def handle(
         self,
@@ -42,6 +48,7 @@ class GetFollowedSubscriptionsItemsHandler:
         include_discouraged_items: bool = True,
         include_viewed_items: bool = True,
         include_hidden_items: bool = True,
+        after: TimelineCursor | None = None,
     ) -> GetFollowedSubscriptionsItemsResponse:
         user = await self.user_repository.get(user_id)
         if user is None:
@@ -51,27 +58,24 @@ class GetFollowedSubscriptionsItemsHandler:
         if not subscription_ids:
             return GetFollowedSubscriptionsItemsResponse(items=[])
 
-        results = await asyncio.gather(
-            self.item_repository.find_items(
-                criteria=ItemFilterCriteria(
-                    subscription_ids=subscription_ids,
-                    published_after=datetime.fromtimestamp(0, tz=timezone.utc),
-                    created_before=created_before,
-                    text=text_filter,
-                    interactions_from_user=user_id,
-                    min_duration=min_duration,
-                    max_duration=max_duration,
-                    interactions=AnyItemInteraction(
-                        without_interactions=include_items_without_interactions,
-                        recommended=include_recommended_items,
-                        discouraged=include_discouraged_items,
-                        viewed=include_viewed_items,
-                        hidden=include_hidden_items,
-                    ),
-                ),
-                page_number=page_number,
-                limit=page_size,
+        criteria = ItemFilterCriteria(
+            subscription_ids=subscription_ids,
+            published_after=datetime.fromtimestamp(0, tz=timezone.utc),
+            created_before=created_before,
+            text=text_filter,
+            interactions_from_user=user_id,
+            min_duration=min_duration,
+            max_duration=max_duration,
+            interactions=AnyItemInteraction(
+                without_interactions=include_items_without_interactions,
+                recommended=include_recommended_items,
+                discouraged=include_discouraged_items,
+                viewed=include_viewed_items,
+                hidden=include_hidden_items,
             ),
+        )
+        results = await asyncio.gather(
+            self._find_items(user, criteria, page_number, page_size, after),
             self.subscription_repository.get_list(subscription_ids),
         )
         items = results[0]
@@ -97,3 +101,12 @@ class GetFollowedSubscriptionsItemsHandler:
                 if item.subscription_uuid in subscriptions_by_id
             ],
         )
+
+    async def _find_items(
+            self, user: User, criteria: ItemFilterCriteria, page_number: int, limit: int, after: TimelineCursor | None,
+    ) -> list[Item]:
+        if self.user_timeline is not None:
+            items = await self.user_timeline.find_items(user, criteria, page_number, limit, after)
+            if items is not None:
+                return items
+        return await self.item_repository.find_items(criteria=criteria, page_number=page_number, limit=limit)
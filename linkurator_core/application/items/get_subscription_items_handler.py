@@ -6,7 +6,12 @@ from datetime import datetime, timezone
 from uuid import UUID
 
 from linkurator_core.domain.items.interaction import Interaction
-from linkurator_core.domain.items.item_repository import AnyItemInteraction, ItemFilterCriteria, ItemRepository
+from linkurator_core.domain.items.item_repository import (
+    AnyItemInteraction,
+    ItemFilterCriteria,
+    ItemOrdering,
+    ItemRepository,
+)
 from linkurator_core.domain.items.item_with_interactions import CuratorInteractions, ItemWithInteractions
 from linkurator_core.domain.subscriptions.subscription import Subscription
 from linkurator_core.domain.subscriptions.subscription_repository import SubscriptionRepository
@@ -46,6 +51,7 @@ class GetSubscriptionItemsHandler:
         include_discouraged_items: bool = True,
         include_viewed_items: bool = True,
         include_hidden_items: bool = True,
+        order_by: ItemOrdering = ItemOrdering.PUBLISHED_AT,
     ) -> GetSubscriptionItemsResponse:
         results = await asyncio.gather(
             self.subscription_repository.get(subscription_id),
@@ -65,6 +71,7 @@ class GetSubscriptionItemsHandler:
                         viewed=include_viewed_items,
                         hidden=include_hidden_items,
                     ),
+                    order_by=order_by,
                 ),
                 page_number=page_number,
                 limit=page_size,
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from uuid import UUID
+
+from linkurator_core.domain.common.event import ItemsBecameOutdatedEvent
+from linkurator_core.domain.common.event_bus_service import EventBusService
+from linkurator_core.domain.items.drain_cursor_repository import DrainCursorRepository
+from linkurator_core.domain.items.item_repository import ItemFilterCriteria, ItemRepository
+
+
+@dataclass
+class DrainProgress:
+    name: str
+    remaining_items: int
+    published_items: int
+    items_per_minute: float
+    eta_seconds: float | None
+
+
+class OutdatedItemsDrain:
+    """
+    Publishes the items matching a criteria in batches until none is left, so they get refreshed.
+
+    Candidates are paged with a cursor on the item id, which is kept between runs: every run continues
+    where the previous one stopped, and a new pass starts once all the candidates have been published.
+    With a `cursor_repository` the cursor is saved after every batch and read at the start of every run,
+    so the pass survives a restart of the processor or a change of the leader replica.
+    A run stops when it exceeds `max_run_seconds` or when the event bus has `max_pending_events`
+    events waiting, and batches are spaced so no more than `max_items_per_minute` items are published.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            item_repository: ItemRepository,
+            event_bus: EventBusService,
+            batch_size: int = 50,
+            max_items_per_minute: int | None = None,
+            max_pending_events: int = 100,
+            max_run_seconds: float = 60 * 4,
+            cursor_repository: DrainCursorRepository | None = None,
+    ) -> None:
+        self.name = name
+        self.item_repository = item_repository
+        self.event_bus = event_bus
+        self.batch_size = batch_size
+        self.max_items_per_minute = max_items_per_minute
+        self.max_pending_events = max_pending_events
+        self.max_run_seconds = max_run_seconds
+        self.cursor_repository = cursor_repository
+        self._cursor: UUID | None = None
+        self._remaining_items = 0
+        self._published_items = 0
+        self._pass_started_at: float | None = None
+
+    async def drain(self, criteria: ItemFilterCriteria) -> None:
+        started_at = time.monotonic()
+        if self.cursor_repository is not None:
+            self._cursor = await self.cursor_repository.get(self.name)
+        if self._pass_started_at is None:
+            self._remaining_items = await self.item_repository.count_matching_items(criteria)
+            self._published_items = 0
+            self._pass_started_at = started_at
+
+        while time.monotonic() - started_at < self.max_run_seconds:
+            pending_events = await self.event_bus.pending_events()
+            if pending_events is not None and pending_events >= self.max_pending_events:
+                logging.info("Pausing %s because %s events are pending", self.name, pending_events)
+                break
+
+            item_ids = await self.item_repository.find_item_ids(
+                criteria=criteria, after_id=self._cursor, limit=self.batch_size)
+            if len(item_ids) == 0:
+                self._log_progress()
+                await self._save_cursor(None)
+                self._pass_started_at = None
+                return
+
+            await self.event_bus.publish(ItemsBecameOutdatedEvent.new(item_ids=set(item_ids)))
+            await self._save_cursor(item_ids[-1])
+            self._published_items += len(item_ids)
+            self._remaining_items = max(self._remaining_items - len(item_ids), 0)
+
+            if self.max_items_per_minute is not None:
+                await asyncio.sleep(len(item_ids) * 60 / self.max_items_per_minute)
+
+        self._log_progress()
+
+    def progress(self) -> DrainProgress:
+        items_per_minute = 0.0
+        if self._pass_started_at is not None:
+            elapsed_seconds = time.monotonic() - self._pass_started_at
+            if elapsed_seconds > 0:
+                items_per_minute = self._published_items * 60 / elapsed_seconds
+
+        eta_seconds: float | None = None
+        if self._remaining_items == 0:
+            eta_seconds = 0
+        elif items_per_minute > 0:
+            eta_seconds = self._remaining_items * 60 / items_per_minute
+
+        return DrainProgress(
+            name=self.name,
+            remaining_items=self._remaining_items,
+            published_items=self._published_items,
+            items_per_minute=items_per_minute,
+            eta_seconds=eta_seconds,
+        )
+
+    async def _save_cursor(self, cursor: UUID | None) -> None:
+        self._cursor = cursor
+        if self.cursor_repository is not None:
+            await self.cursor_repository.save(self.name, cursor)
+
+    def _log_progress(self) -> None:
+        progress = self.progress()
+        logging.info("%s: %s items published, %s remaining, %.1f items/minute, ETA %s seconds",
+                     progress.name, progress.published_items, progress.remaining_items,
+                     progress.items_per_minute, "unknown" if progress.eta_seconds is None else int(progress.eta_seconds))
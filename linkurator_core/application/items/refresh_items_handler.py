@@ -18,15 +18,12 @@ class RefreshItemsHandler:
         items = await self.item_repository.find_items(criteria=ItemFilterCriteria(item_ids=item_uuids),
                                                 page_number=0, limit=len(item_uuids))
 
-        updated_items = await self.subscription_service.get_items({item.uuid for item in items})
+        updated_items = await self.subscription_service.refresh_items(items)
 
         await self.item_repository.upsert_items(list(updated_items))
 
         updated_item_uuids = {item.uuid for item in updated_items}
-        for item in items:
-            if item.uuid not in updated_item_uuids:
-                await self.item_repository.delete_item(item.uuid)
+        deleted_item_uuids = [item.uuid for item in items if item.uuid not in updated_item_uuids]
+        await self.item_repository.delete_items(deleted_item_uuids)
 
-        updated_items_count = len(updated_item_uuids)
-        deleted_items_count = len(item_uuids) - len(updated_item_uuids)
-        logging.info("%s items updated and %s items deleted", updated_items_count, deleted_items_count)
+        logging.info("%s items updated and %s items deleted", len(updated_item_uuids), len(deleted_item_uuids))
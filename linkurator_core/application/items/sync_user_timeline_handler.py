@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from linkurator_core.application.items.user_timeline import UserTimeline
+from linkurator_core.domain.users.user_repository import UserRepository
+
+
+class SyncUserTimelineHandler:
+    def __init__(self, user_repository: UserRepository, user_timeline: UserTimeline) -> None:
+        self.user_repository = user_repository
+        self.user_timeline = user_timeline
+
+    async def handle(self, user_id: UUID) -> None:
+        user = await self.user_repository.get(user_id)
+        if user is None:
+            return
+        await self.user_timeline.sync(user)
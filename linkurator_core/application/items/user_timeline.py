@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from linkurator_core.domain.common.event import UserTimelineBecameOutdatedEvent
+from linkurator_core.domain.common.event_bus_service import EventBusService
+from linkurator_core.domain.items.item import Item
+from linkurator_core.domain.items.item_repository import ItemFilterCriteria
+from linkurator_core.domain.items.timeline_repository import Timeline, TimelineCursor, TimelineRepository
+from linkurator_core.domain.users.user import User
+
+
+class UserTimeline:
+    """
+    Keeps a materialized timeline with the items of the subscriptions followed by each user.
+
+    New items are pushed to the timelines of the followers when they are ingested, and the items of a
+    subscription are added or removed when it is followed or unfollowed, so reading the followed items
+    is a range scan over the timeline instead of merging the items of every subscription.
+
+    Timelines only hold the items published in the last `max_age`, and users following more than
+    `max_subscriptions` subscriptions have no timeline. When a timeline cannot answer a query, `find_items`
+    returns None and the caller pulls the items from the item repository as before.
+
+    Timelines are synced by the event handlers, out of the requests: reading a missing or outdated timeline,
+    or following and unfollowing subscriptions, publishes an event for the user instead. Reads publish it
+    once for each set of followed subscriptions, and again after `sync_request_ttl` in case it was lost.
+    """
+
+    def __init__(
+            self,
+            timeline_repository: TimelineRepository,
+            max_subscriptions: int = 500,
+            max_age: timedelta = timedelta(days=180),
+            event_bus: EventBusService | None = None,
+            sync_request_ttl: timedelta = timedelta(minutes=1),
+    ) -> None:
+        self.timeline_repository = timeline_repository
+        self.max_subscriptions = max_subscriptions
+        self.max_age = max_age
+        self.event_bus = event_bus
+        self.sync_request_ttl = sync_request_ttl
+        # Time and hash of the followed subscriptions of the last sync requested for each user, oldest first
+        self._sync_requests: dict[UUID, tuple[float, int]] = {}
+
+    async def sync(self, user: User) -> Timeline | None:
+        subscription_ids = user.get_subscriptions()
+        if len(subscription_ids) > self.max_subscriptions:
+            await self.timeline_repository.delete(user.uuid)
+            return None
+
+        timeline = await self.timeline_repository.get(user.uuid)
+        if timeline is None:
+            logging.info("Materializing the timeline of user %s", user.uuid)
+            timeline = Timeline(
+                user_id=user.uuid,
+                subscription_ids=set(),
+                complete_since=datetime.now(tz=timezone.utc) - self.max_age)
+            await self.timeline_repository.save(timeline)
+
+        # The pending subscriptions of a sync that did not finish are synced again
+        followed_ids = (subscription_ids - timeline.subscription_ids) | (timeline.pending_subscription_ids & subscription_ids)
+        unfollowed_ids = (timeline.subscription_ids - subscription_ids) | (timeline.pending_subscription_ids - subscription_ids)
+        if len(followed_ids) == 0 and len(unfollowed_ids) == 0:
+            return timeline
+
+        # Saved before changing the items, so the ones ingested meanwhile are pushed to the timeline only
+        # if their subscription is followed. The timeline stays incomplete until all the items are changed.
+        timeline.subscription_ids = set(subscription_ids)
+        timeline.pending_subscription_ids = followed_ids | unfollowed_ids
+        await self.timeline_repository.save(timeline)
+        await self.timeline_repository.remove_subscription_items(user.uuid, unfollowed_ids)
+        await self.timeline_repository.add_subscription_items(user.uuid, followed_ids, timeline.complete_since)
+        timeline.pending_subscription_ids = set()
+        await self.timeline_repository.save(timeline)
+        return timeline
+
+    async def request_sync(self, user: User) -> None:
+        """Sync the timeline of the user in the background, if the timeline has an event bus."""
+        if self.event_bus is None:
+            return
+        self._sync_requests.pop(user.uuid, None)
+        self._sync_requests[user.uuid] = (time.monotonic(), hash(frozenset(user.get_subscriptions())))
+        await self.event_bus.publish(UserTimelineBecameOutdatedEvent.new(user.uuid))
+
+    def _is_sync_requested(self, user: User) -> bool:
+        now = time.monotonic()
+        expiry = self.sync_request_ttl.total_seconds()
+        while len(self._sync_requests) > 0:
+            user_id, (requested_at, _) = next(iter(self._sync_requests.items()))
+            if now - requested_at < expiry:
+                break
+            del self._sync_requests[user_id]
+
+        request = self._sync_requests.get(user.uuid)
+        return request is not None and request[1] == hash(frozenset(user.get_subscriptions()))
+
+    async def find_items(
+            self, user: User, criteria: ItemFilterCriteria, page_number: int, limit: int,
+            after: TimelineCursor | None = None,
+    ) -> list[Item] | None:
+        """
+        The followed items of the user matching the criteria, or None if they have to be pulled.
+
+        Timelines are paged after the last item of the previous page, so the pages after the first one
+        are only answered with a cursor. The timeline is missing older items, so it only answers when the
+        whole page is found in it.
+        """
+        if criteria.text or (page_number > 0 and after is None):
+            return None
+
+        timeline = await self.timeline_repository.get(user.uuid)
+        subscription_ids = user.get_subscriptions()
+        if timeline is None or timeline.subscription_ids != subscription_ids or timeline.pending_subscription_ids:
+            if len(subscription_ids) <= self.max_subscriptions and not self._is_sync_requested(user):
+                await self.request_sync(user)
+            return None
+
+        items = await self.timeline_repository.find_items(
+            user_id=user.uuid,
+            criteria=replace(criteria, subscription_ids=None),
+            limit=limit,
+            after=after)
+        if len(items) < limit:
+            return None
+        return items
+
+    async def add_items(self, items: list[Item]) -> None:
+        await self.timeline_repository.add_items(items)
+
+    async def delete(self, user: User) -> None:
+        await self.timeline_repository.delete(user.uuid)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from linkurator_core.application.topics.find_topics_by_name_handler import CuratorTopic
+from linkurator_core.domain.subscriptions.subscription import Subscription
+from linkurator_core.domain.subscriptions.subscription_repository import SubscriptionRepository
+from linkurator_core.domain.topics.topic import Topic
+from linkurator_core.domain.topics.topic_repository import TopicRepository
+from linkurator_core.domain.users.user import User
+from linkurator_core.domain.users.user_repository import UserRepository
+
+
+@dataclass
+class SearchResults:
+    curators: list[User] = field(default_factory=list)
+    topics: list[CuratorTopic] = field(default_factory=list)
+    subscriptions: list[Subscription] = field(default_factory=list)
+
+
+class SearchByNameHandler:
+    """Search as you type the curators, topics and subscriptions whose name contains a text."""
+
+    def __init__(self,
+                 user_repository: UserRepository,
+                 topic_repository: TopicRepository,
+                 subscription_repository: SubscriptionRepository,
+                 ) -> None:
+        self.user_repository = user_repository
+        self.topic_repository = topic_repository
+        self.subscription_repository = subscription_repository
+
+    async def handle(self, text: str, limit: int) -> SearchResults:
+        text = text.strip()
+        if text == "":
+            return SearchResults()
+
+        curators, topics, subscriptions = await asyncio.gather(
+            self.user_repository.search_by_username(text, limit),
+            self.topic_repository.search_topics_by_name(text, limit),
+            self.subscription_repository.search_by_name(text, limit),
+        )
+        topic_curators = await self._get_curators(topics)
+
+        return SearchResults(
+            curators=curators,
+            topics=[CuratorTopic(topic=topic, curator=topic_curators[topic.user_id])
+                    for topic in topics
+                    if topic.user_id in topic_curators],
+            subscriptions=subscriptions,
+        )
+
+    async def _get_curators(self, topics: list[Topic]) -> dict[UUID, User]:
+        user_ids = {topic.user_id for topic in topics}
+
+        users = await asyncio.gather(*[self.user_repository.get(user_id) for user_id in user_ids])
+
+        return {user.uuid: user for user in users if user is not None}
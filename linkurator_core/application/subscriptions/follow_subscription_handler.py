@@ -1,14 +1,23 @@
+from __future__ import annotations
+
 from uuid import UUID
 
+from linkurator_core.application.items.user_timeline import UserTimeline
 from linkurator_core.domain.common.exceptions import SubscriptionNotFoundError, UserNotFoundError
 from linkurator_core.domain.subscriptions.subscription_repository import SubscriptionRepository
-from linkurator_core.domain.users.user_repository import UserRepository
+from linkurator_core.domain.users.user_repository import FollowKind, UserRepository
 
 
 class FollowSubscriptionHandler:
-    def __init__(self, subscription_repository: SubscriptionRepository, user_repository: UserRepository) -> None:
+    def __init__(
+            self,
+            subscription_repository: SubscriptionRepository,
+            user_repository: UserRepository,
+            user_timeline: UserTimeline | None = None,
+    ) -> None:
         self.subscription_repository = subscription_repository
         self.user_repository = user_repository
+        self.user_timeline = user_timeline
 
     async def handle(self, user_id: UUID, subscription_id: UUID) -> None:
         user = await self.user_repository.get(user_id)
@@ -20,5 +29,7 @@ class FollowSubscriptionHandler:
             raise SubscriptionNotFoundError(subscription_id)
 
         user.follow_subscription(subscription_id)
+        await self.user_repository.follow(user_id, FollowKind.SUBSCRIPTION, subscription_id)
 
-        await self.user_repository.update(user)
+        if self.user_timeline is not None:
+            await self.user_timeline.request_sync(user)
@@ -1,9 +1,12 @@
+from __future__ import annotations
+
 from uuid import UUID
 
+from linkurator_core.application.items.user_timeline import UserTimeline
 from linkurator_core.domain.common.exceptions import UserNotFoundError
 from linkurator_core.domain.subscriptions.subscription_repository import SubscriptionRepository
 from linkurator_core.domain.topics.topic_repository import TopicRepository
-from linkurator_core.domain.users.user_repository import UserRepository
+from linkurator_core.domain.users.user_repository import FollowKind, UserRepository
 
 
 class UnfollowSubscriptionHandler:
@@ -12,10 +15,12 @@ class UnfollowSubscriptionHandler:
             subscription_repository: SubscriptionRepository,
             user_repository: UserRepository,
             topic_repository: TopicRepository,
+            user_timeline: UserTimeline | None = None,
     ) -> None:
         self.subscription_repository = subscription_repository
         self.user_repository = user_repository
         self.topic_repository = topic_repository
+        self.user_timeline = user_timeline
 
     async def handle(self, user_id: UUID, subscription_id: UUID) -> None:
         user = await self.user_repository.get(user_id)
@@ -23,5 +28,7 @@ class UnfollowSubscriptionHandler:
             raise UserNotFoundError(user_id)
 
         user.unfollow_subscription(subscription_id)
+        await self.user_repository.unfollow(user_id, FollowKind.SUBSCRIPTION, subscription_id)
 
-        await self.user_repository.update(user)
+        if self.user_timeline is not None:
+            await self.user_timeline.request_sync(user)
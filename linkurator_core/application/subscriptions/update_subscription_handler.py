@@ -1,7 +1,9 @@
+import logging
 from uuid import UUID
 
 from linkurator_core.domain.common.event import SubscriptionNeedsSummarizationEvent
 from linkurator_core.domain.common.event_bus_service import EventBusService
+from linkurator_core.domain.common.lock_service import LockService
 from linkurator_core.domain.common.types import DateGenerator
 from linkurator_core.domain.common.utils import datetime_now
 from linkurator_core.domain.subscriptions.general_subscription_service import GeneralSubscriptionService
@@ -13,14 +15,26 @@ class UpdateSubscriptionHandler:
                  subscription_repository: SubscriptionRepository,
                  subscription_service: GeneralSubscriptionService,
                  event_bus: EventBusService,
+                 lock_service: LockService,
                  date_generator: DateGenerator = datetime_now,
                  ) -> None:
         self.subscription_repository = subscription_repository
         self.subscription_service = subscription_service
         self.event_bus = event_bus
+        self.lock_service = lock_service
         self.date_generator = date_generator
 
     async def handle(self, subscription_id: UUID) -> None:
+        lock_key = f"update_subscription:{subscription_id}"
+        if not await self.lock_service.try_acquire(lock_key):
+            logging.info("Skipping update of subscription %s because it is already being updated", subscription_id)
+            return
+        try:
+            await self._update_subscription(subscription_id, lock_key)
+        finally:
+            await self.lock_service.release(lock_key)
+
+    async def _update_subscription(self, subscription_id: UUID, lock_key: str) -> None:
         current_sub = await self.subscription_repository.get(subscription_id)
         if current_sub is None:
             return
@@ -29,6 +43,10 @@ class UpdateSubscriptionHandler:
         if updated_sub is None:
             return
 
+        if not await self.lock_service.is_held(lock_key):
+            logging.warning("Discarding update of subscription %s because its lock was lost", subscription_id)
+            return
+
         updated_sub.updated_at = self.date_generator()
         await self.subscription_repository.update(updated_sub)
 
@@ -4,6 +4,8 @@ import logging
 import uuid
 from datetime import datetime, timezone
 
+from linkurator_core.application.items.user_timeline import UserTimeline
+from linkurator_core.domain.common.lock_service import LockService
 from linkurator_core.domain.items.item import Item
 from linkurator_core.domain.items.item_repository import ItemFilterCriteria, ItemRepository
 from linkurator_core.domain.subscriptions.general_subscription_service import GeneralSubscriptionService
@@ -11,25 +13,31 @@ from linkurator_core.domain.subscriptions.subscription_repository import Subscri
 
 
 class UpdateSubscriptionItemsHandler:
-    subscriptions_being_updated: dict[uuid.UUID, datetime] = {}
-
     def __init__(self,
                  subscription_service: GeneralSubscriptionService,
                  subscription_repository: SubscriptionRepository,
                  item_repository: ItemRepository,
+                 lock_service: LockService,
+                 user_timeline: UserTimeline | None = None,
     ) -> None:
         self.subscription_service = subscription_service
         self.subscription_repository = subscription_repository
         self.item_repository = item_repository
+        self.lock_service = lock_service
+        self.user_timeline = user_timeline
 
     async def handle(self, subscription_id: uuid.UUID) -> None:
-        now = datetime.now(tz=timezone.utc)
-        if subscription_id in self.subscriptions_being_updated:
-            logging.info("Skipping update of subscription %s because it was scheduled on %s",
-                         subscription_id, self.subscriptions_being_updated[subscription_id])
+        lock_key = f"update_subscription_items:{subscription_id}"
+        if not await self.lock_service.try_acquire(lock_key):
+            logging.info("Skipping update of subscription %s because it is already being updated", subscription_id)
             return
-        self.subscriptions_being_updated[subscription_id] = now
+        try:
+            await self._update_items(subscription_id, lock_key)
+        finally:
+            await self.lock_service.release(lock_key)
 
+    async def _update_items(self, subscription_id: uuid.UUID, lock_key: str) -> None:
+        now = datetime.now(tz=timezone.utc)
         subscription = await self.subscription_repository.get(subscription_id)
         if subscription is None:
             logging.error("Cannot update items of subscription %s because it does not exist", subscription_id)
@@ -57,7 +65,13 @@ class UpdateSubscriptionItemsHandler:
                 if len(existing_items) == 0:
                     new_filtered_items.append(new_item)
 
+            if not await self.lock_service.is_held(lock_key):
+                logging.warning("Discarding update of subscription %s because its lock was lost", subscription_id)
+                return
+
             await self.item_repository.upsert_items(new_filtered_items)
+            if self.user_timeline is not None:
+                await self.user_timeline.add_items(new_filtered_items)
 
             subscription.scanned_at = now
             if len(new_items) > 0:
@@ -68,5 +82,3 @@ class UpdateSubscriptionItemsHandler:
                          len(new_filtered_items), subscription.uuid, subscription.name)
         except Exception as err:  # pylint: disable=broad-except
             logging.error("Cannot update items of subscription %s because %s", subscription_id, err, exc_info=True)
-        finally:
-            self.subscriptions_being_updated.pop(subscription_id, None)
@@ -2,7 +2,7 @@ from uuid import UUID
 
 from linkurator_core.domain.common.exceptions import TopicNotFoundError
 from linkurator_core.domain.topics.topic_repository import TopicRepository
-from linkurator_core.domain.users.user_repository import UserRepository
+from linkurator_core.domain.users.user_repository import FollowKind, UserRepository
 
 
 class FavoriteTopicHandler:
@@ -21,8 +21,6 @@ class FavoriteTopicHandler:
             return
 
         if topic.user_id != user_id:
-            user.follow_topic(topic_id)
+            await self.user_repository.follow(user_id, FollowKind.TOPIC, topic_id)
 
-        user.favorite_topic(topic_id)
-
-        await self.user_repository.update(user)
+        await self.user_repository.follow(user_id, FollowKind.FAVORITE_TOPIC, topic_id)
@@ -2,7 +2,7 @@ from uuid import UUID
 
 from linkurator_core.domain.common.exceptions import CannotFollowOwnedTopicError, TopicNotFoundError
 from linkurator_core.domain.topics.topic_repository import TopicRepository
-from linkurator_core.domain.users.user_repository import UserRepository
+from linkurator_core.domain.users.user_repository import FollowKind, UserRepository
 
 
 class FollowTopicHandler:
@@ -23,6 +23,4 @@ class FollowTopicHandler:
         if user is None:
             return
 
-        user.follow_topic(topic_id)
-
-        await self.user_repository.update(user)
+        await self.user_repository.follow(user_id, FollowKind.TOPIC, topic_id)
@@ -1,7 +1,7 @@
 from uuid import UUID
 
 from linkurator_core.domain.topics.topic_repository import TopicRepository
-from linkurator_core.domain.users.user_repository import UserRepository
+from linkurator_core.domain.users.user_repository import FollowKind, UserRepository
 
 
 class UnfavoriteTopicHandler:
@@ -15,6 +15,4 @@ class UnfavoriteTopicHandler:
         if user is None:
             return
 
-        user.unfavorite_topic(topic_id)
-
-        await self.user_repository.update(user)
+        await self.user_repository.unfollow(user_id, FollowKind.FAVORITE_TOPIC, topic_id)
@@ -1,7 +1,7 @@
 from uuid import UUID
 
 from linkurator_core.domain.topics.topic_repository import TopicRepository
-from linkurator_core.domain.users.user_repository import UserRepository
+from linkurator_core.domain.users.user_repository import FollowKind, UserRepository
 
 
 class UnfollowTopicHandler:
@@ -15,10 +15,8 @@ class UnfollowTopicHandler:
         if user is None:
             return
 
-        user.unfollow_topic(topic_id)
+        await self.user_repository.unfollow(user_id, FollowKind.TOPIC, topic_id)
 
         topic = await self.topic_repository.get(topic_id)
         if topic is not None and topic.user_id != user_id:
-            user.unfavorite_topic(topic_id)
-
-        await self.user_repository.update(user)
+            await self.user_repository.unfollow(user_id, FollowKind.FAVORITE_TOPIC, topic_id)
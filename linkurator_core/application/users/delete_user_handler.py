@@ -1,5 +1,8 @@
+from __future__ import annotations
+
 import logging
 
+from linkurator_core.application.items.user_timeline import UserTimeline
 from linkurator_core.domain.common.exceptions import FailToRevokeCredentialsError
 from linkurator_core.domain.users.account_service import AccountService
 from linkurator_core.domain.users.session import Session
@@ -9,10 +12,11 @@ from linkurator_core.domain.users.user_repository import UserRepository
 
 class DeleteUserHandler:
     def __init__(self, user_repository: UserRepository, session_repository: SessionRepository,
-                 account_service: AccountService) -> None:
+                 account_service: AccountService, user_timeline: UserTimeline | None = None) -> None:
         self.user_repository = user_repository
         self.session_repository = session_repository
         self.account_service = account_service
+        self.user_timeline = user_timeline
 
     async def handle(self, user_session: Session) -> None:
         user_id = user_session.user_id
@@ -27,4 +31,7 @@ class DeleteUserHandler:
 
         await self.session_repository.delete(user_session.token)
 
+        if self.user_timeline is not None:
+            await self.user_timeline.delete(user)
+
         await self.user_repository.delete(user_id)
@@ -1,7 +1,7 @@
 from uuid import UUID
 
 from linkurator_core.domain.common.exceptions import UserNotFoundError
-from linkurator_core.domain.users.user_repository import UserRepository
+from linkurator_core.domain.users.user_repository import FollowKind, UserRepository
 
 
 class FollowCuratorHandler:
@@ -17,6 +17,4 @@ class FollowCuratorHandler:
         if curator is None:
             raise UserNotFoundError(curator_id)
 
-        user.follow_curator(curator_id)
-
-        await self.user_repository.update(user)
+        await self.user_repository.follow(user_id, FollowKind.CURATOR, curator_id)
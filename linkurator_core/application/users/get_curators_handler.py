@@ -7,6 +7,9 @@ from linkurator_core.domain.common.exceptions import UserNotFoundError
 from linkurator_core.domain.users.user import User
 from linkurator_core.domain.users.user_repository import UserRepository
 
+# Most curators found by a part of their username
+MAX_FOUND_CURATORS = 100
+
 
 class GetCuratorsHandler:
     def __init__(self, user_repository: UserRepository) -> None:
@@ -31,6 +34,6 @@ class GetCuratorsHandler:
             return followed_curators
 
         if username:
-            return await self.user_repository.search_by_username(username)
+            return await self.user_repository.search_by_username(username, MAX_FOUND_CURATORS, substring=True)
 
         return []
@@ -19,6 +19,6 @@ class GetUserProfileHandler:
         now = now_function()
         if user is not None and now - user.last_login_at > timedelta(hours=1):
             user.last_login_at = now
-            await self.user_repository.update(user)
+            await self.user_repository.touch_last_login(user.uuid, now)
 
         return user
@@ -1,7 +1,7 @@
 from uuid import UUID
 
 from linkurator_core.domain.common.exceptions import UserNotFoundError
-from linkurator_core.domain.users.user_repository import UserRepository
+from linkurator_core.domain.users.user_repository import FollowKind, UserRepository
 
 
 class UnfollowCuratorHandler:
@@ -13,6 +13,4 @@ class UnfollowCuratorHandler:
         if user is None:
             raise UserNotFoundError(user_id)
 
-        user.unfollow_curator(curator_id)
-
-        await self.user_repository.update(user)
+        await self.user_repository.unfollow(user_id, FollowKind.CURATOR, curator_id)
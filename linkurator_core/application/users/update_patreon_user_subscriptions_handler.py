@@ -6,7 +6,7 @@ from linkurator_core.domain.common.event_bus_service import EventBusService
 from linkurator_core.domain.subscriptions.subscription import Subscription
 from linkurator_core.domain.subscriptions.subscription_repository import SubscriptionRepository
 from linkurator_core.domain.subscriptions.subscription_service import SubscriptionService
-from linkurator_core.domain.users.user_repository import UserRepository
+from linkurator_core.domain.users.user_repository import FollowKind, UserRepository
 
 
 class UpdatePatreonUserSubscriptionsHandler:
@@ -34,9 +34,7 @@ class UpdatePatreonUserSubscriptionsHandler:
             )
             for subscription in subscriptions:
                 registered = await self._get_or_create_subscription(subscription)
-                user.follow_subscription(registered.uuid)
-
-            await self.user_repository.update(user)
+                await self.user_repository.follow(user.uuid, FollowKind.SUBSCRIPTION, registered.uuid)
 
         except Exception as e:
             logging.exception("Failed to update Patreon subscriptions for user %s: %s", user_id, e)
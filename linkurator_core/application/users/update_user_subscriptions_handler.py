@@ -31,12 +31,12 @@ class UpdateYoutubeUserSubscriptionsHandler:
                 user_id=user_id, access_token=access_token)
             updated_subscriptions = [await self._get_or_create_subscription(subscription)
                                      for subscription in subscriptions]
-            user.set_youtube_subscriptions({subscription.uuid for subscription in updated_subscriptions})
+            await self.user_repository.set_youtube_subscriptions(
+                user.uuid, {subscription.uuid for subscription in updated_subscriptions})
         except InvalidCredentialError:
             pass
 
-        user.scanned_at = datetime.now(timezone.utc)
-        await self.user_repository.update(user)
+        await self.user_repository.set_scanned_at(user.uuid, datetime.now(timezone.utc))
 
     async def _get_or_create_subscription(self, subscription: Subscription) -> Subscription:
         registered_subscription = await self.subscription_repository.find_by_url(subscription.url)
@@ -0,0 +1,197 @@
+"""
+The app of the API benchmark: the real handlers over the in-memory repositories, seeded with a synthetic
+dataset, so the benchmark measures the framework, the handlers and the serialization without a database.
+"""
+import itertools
+import json
+import logging
+import subprocess  # noqa: S404
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock
+from uuid import UUID
+
+from linkurator_core.application.auth.validate_session_token import ValidateTokenHandler
+from linkurator_core.application.items.get_curator_items_handler import GetCuratorItemsHandler
+from linkurator_core.application.items.get_favorite_topics_items_handler import GetFavoriteTopicsItemsHandler
+from linkurator_core.application.items.get_followed_curators_items_handler import GetFollowedCuratorsItemsHandler
+from linkurator_core.application.items.get_followed_subscriptions_items_handler import (
+    GetFollowedSubscriptionsItemsHandler,
+)
+from linkurator_core.application.items.get_item_handler import GetItemHandler
+from linkurator_core.application.items.get_subscription_items_handler import GetSubscriptionItemsHandler
+from linkurator_core.application.items.get_topic_items_handler import GetTopicItemsHandler
+from linkurator_core.application.search.search_by_name_handler import SearchByNameHandler
+from linkurator_core.application.subscriptions.get_subscription_handler import GetSubscriptionHandler
+from linkurator_core.application.subscriptions.get_user_subscriptions_handler import GetUserSubscriptionsHandler
+from linkurator_core.application.topics.get_curator_topics_as_user_handler import GetCuratorTopicsHandler
+from linkurator_core.application.topics.get_topic_handler import GetTopicHandler
+from linkurator_core.application.topics.get_user_topics_handler import GetUserTopicsHandler
+from linkurator_core.application.users.get_curators_handler import GetCuratorsHandler
+from linkurator_core.application.users.get_user_profile_handler import GetUserProfileHandler
+from linkurator_core.benchmarks.load_test import LoadTestReport
+from linkurator_core.domain.common.synthetic_dataset import SyntheticDataset
+from linkurator_core.domain.users.session import Session
+from linkurator_core.infrastructure.fastapi.create_app import Handlers
+from linkurator_core.infrastructure.google.account_service import GoogleAccountService
+from linkurator_core.infrastructure.in_memory.item_repository import InMemoryItemRepository
+from linkurator_core.infrastructure.in_memory.session_repository import InMemorySessionRepository
+from linkurator_core.infrastructure.in_memory.subscription_repository import InMemorySubscriptionRepository
+from linkurator_core.infrastructure.in_memory.topic_repository import InMemoryTopicRepository
+from linkurator_core.infrastructure.in_memory.user_repository import InMemoryUserRepository
+
+SESSION_SECONDS = 24 * 60 * 60
+
+
+@dataclass
+class InMemoryRepositories:
+    users: InMemoryUserRepository = field(default_factory=InMemoryUserRepository)
+    sessions: InMemorySessionRepository = field(default_factory=InMemorySessionRepository)
+    subscriptions: InMemorySubscriptionRepository = field(default_factory=InMemorySubscriptionRepository)
+    topics: InMemoryTopicRepository = field(default_factory=InMemoryTopicRepository)
+    items: InMemoryItemRepository = field(default_factory=InMemoryItemRepository)
+
+
+async def load_dataset_in_memory(
+        dataset: SyntheticDataset, repositories: InMemoryRepositories, sessions: int,
+) -> dict[UUID, str]:
+    """Add the entities of the dataset to the repositories, and return the tokens of the first `sessions` users."""
+    start = time.perf_counter()
+    for subscription in dataset.subscriptions():
+        await repositories.subscriptions.add(subscription)
+    for user in dataset.users():
+        # The repository checks the email and username of every user on add, which is quadratic
+        repositories.users.users[user.uuid] = user
+    for topic in dataset.topics():
+        await repositories.topics.add(topic)
+    for batch in itertools.batched(dataset.items(), 10_000):
+        await repositories.items.upsert_items(list(batch))
+    for interaction in dataset.interactions():
+        await repositories.items.add_interaction(interaction)
+
+    tokens: dict[UUID, str] = {}
+    for user_id in dataset.user_ids[:sessions]:
+        session = Session.new(user_id=user_id, seconds_to_expire=SESSION_SECONDS)
+        await repositories.sessions.add(session)
+        tokens[user_id] = session.token
+    logging.info("Loaded the dataset in memory in %.1fs", time.perf_counter() - start)
+    return tokens
+
+
+def in_memory_handlers(repositories: InMemoryRepositories) -> Handlers:
+    """
+    The handlers of the read endpoints over the repositories. The handlers calling the providers, Google or
+    the email service, and the ones writing, are mocks: the benchmark does not call them.
+    """
+    users = repositories.users
+    subscriptions = repositories.subscriptions
+    topics = repositories.topics
+    items = repositories.items
+    account_service = GoogleAccountService(client_id="benchmark", client_secret="benchmark")
+    return Handlers(
+        validate_token=ValidateTokenHandler(users, repositories.sessions, account_service),
+        validate_user_password=AsyncMock(),
+        register_user_with_email=AsyncMock(),
+        register_user_with_google=AsyncMock(),
+        validate_new_user_request=AsyncMock(),
+        request_password_change=AsyncMock(),
+        change_password_from_request=AsyncMock(),
+        google_client=account_service,
+        google_youtube_client=account_service,
+        get_subscription=GetSubscriptionHandler(subscriptions),
+        get_user_subscriptions=GetUserSubscriptionsHandler(subscriptions, users),
+        find_subscriptions_by_name_handler=AsyncMock(),
+        follow_subscription_handler=AsyncMock(),
+        unfollow_subscription_handler=AsyncMock(),
+        get_subscription_items_handler=GetSubscriptionItemsHandler(
+            user_repository=users, item_repository=items, subscription_repository=subscriptions),
+        delete_subscription_items_handler=AsyncMock(),
+        refresh_subscription_handler=AsyncMock(),
+        get_user_profile_handler=GetUserProfileHandler(users),
+        edit_user_profile_handler=AsyncMock(),
+        find_user_handler=AsyncMock(),
+        delete_user_handler=AsyncMock(),
+        get_curators_handler=GetCuratorsHandler(users),
+        follow_curator_handler=AsyncMock(),
+        unfollow_curator_handler=AsyncMock(),
+        create_topic_handler=AsyncMock(),
+        get_user_topics_handler=GetUserTopicsHandler(topic_repo=topics, user_repo=users),
+        get_curator_topics_handler=GetCuratorTopicsHandler(user_repository=users, topic_repository=topics),
+        get_curator_items_handler=GetCuratorItemsHandler(
+            item_repository=items, subscription_repository=subscriptions, user_repository=users),
+        get_followed_curators_items_handler=GetFollowedCuratorsItemsHandler(
+            item_repository=items, subscription_repository=subscriptions, user_repository=users),
+        get_topic_handler=GetTopicHandler(topic_repository=topics, user_repository=users),
+        find_topics_by_name_handler=AsyncMock(),
+        assign_subscription_to_topic_handler=AsyncMock(),
+        unassign_subscription_from_topic_handler=AsyncMock(),
+        get_topic_items_handler=GetTopicItemsHandler(
+            topic_repository=topics, subscription_repository=subscriptions, item_repository=items,
+            user_repository=users),
+        get_favorite_topics_items_handler=GetFavoriteTopicsItemsHandler(
+            topic_repository=topics, subscription_repository=subscriptions, item_repository=items,
+            user_repository=users),
+        delete_topic_handler=AsyncMock(),
+        update_topic_handler=AsyncMock(),
+        follow_topic_handler=AsyncMock(),
+        unfollow_topic_handler=AsyncMock(),
+        favorite_topic_handler=AsyncMock(),
+        unfavorite_topic_handler=AsyncMock(),
+        get_item_handler=GetItemHandler(item_repository=items, subscription_repository=subscriptions),
+        create_item_interaction_handler=AsyncMock(),
+        delete_item_interaction_handler=AsyncMock(),
+        get_followed_subscriptions_items_handler=GetFollowedSubscriptionsItemsHandler(
+            item_repository=items, subscription_repository=subscriptions, user_repository=users),
+        get_platform_statistics=AsyncMock(),
+        get_providers_handler=AsyncMock(),
+        update_youtube_user_subscriptions_handler=AsyncMock(),
+        patreon_client=None,
+        update_patreon_user_subscriptions_handler=None,
+        query_agent_handler=AsyncMock(),
+        get_user_chats_handler=AsyncMock(),
+        get_chat_handler=AsyncMock(),
+        delete_chat_handler=AsyncMock(),
+        get_user_filter_handler=AsyncMock(),
+        upsert_user_filter_handler=AsyncMock(),
+        delete_user_filter_handler=AsyncMock(),
+        search_by_name_handler=SearchByNameHandler(
+            user_repository=users, topic_repository=topics, subscription_repository=subscriptions),
+    )
+
+
+def benchmark_results(report: LoadTestReport, parameters: dict[str, Any]) -> dict[str, Any]:
+    """The results of a run, with the commit and the parameters, to compare them with the runs of other commits."""
+    commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"],  # noqa: S603, S607
+                            capture_output=True, text=True, check=False).stdout.strip()
+    return {
+        "commit": commit or None,
+        "created_at": datetime.now(tz=timezone.utc).isoformat(),
+        "parameters": parameters,
+        **report.as_dict(),
+    }
+
+
+def compare_results(results: dict[str, Any], baseline: dict[str, Any]) -> str:
+    """The change of the throughput and the p99 latency of each endpoint against a baseline run."""
+    lines = [f"Compared to {baseline['commit']} of {baseline['created_at']}:"]
+    for endpoint, current in sorted(results["endpoints"].items()):
+        previous = baseline["endpoints"].get(endpoint)
+        if previous is None:
+            lines.append(f"{endpoint:<40} new")
+            continue
+        lines.append(
+            f"{endpoint:<40} {current['requests_per_second']:>8.1f} req/s "
+            f"({_change(current['requests_per_second'], previous['requests_per_second'])}), "
+            f"p99 {current['p99_ms']:>7.1f}ms ({_change(current['p99_ms'], previous['p99_ms'])})")
+    return "\n".join(lines)
+
+
+def _change(current: float, previous: float) -> str:
+    return f"{(current - previous) / previous:+.0%}" if previous else "n/a"
+
+
+def write_results(results: dict[str, Any], path: Path) -> None:
+    path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
@@ -0,0 +1,107 @@
+"""
+Searchable items made of a synthetic vocabulary and the searches run over them, shared by the item search
+performance tests and the item search benchmark script.
+"""
+from __future__ import annotations
+
+import itertools
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from linkurator_core.domain.common.mock_factory import mock_item
+from linkurator_core.domain.items.item import Item
+from linkurator_core.domain.items.item_repository import ItemFilterCriteria, ItemOrdering
+
+SEARCH_SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "pa", "do", "gu", "be", "fi", "ho", "ju"]
+
+
+@dataclass
+class FindItemsQueryCase:
+    name: str
+    criteria: ItemFilterCriteria
+    check_items_result: bool
+    max_baseline_multiplier: float
+
+
+def generate_search_vocabulary(size: int, seed: int = 0) -> list[str]:
+    """Distinct made up words. Earlier words are used more often by generate_searchable_items."""
+    rng = random.Random(seed)
+    words: dict[str, None] = {}
+    while len(words) < size:
+        words["".join(rng.choices(SEARCH_SYLLABLES, k=rng.randint(2, 4)))] = None
+    return list(words)
+
+
+def generate_searchable_items(
+        count: int,
+        subscription_ids: list[UUID],
+        vocabulary: list[str],
+        first_item: int = 0,
+) -> list[Item]:
+    """
+    Generate items whose names and descriptions are made of words of the vocabulary.
+
+    Word frequencies follow Zipf's law, like in natural language: the n-th word of the vocabulary
+    is used about n times less than the first one. Large catalogues can be generated in chunks,
+    starting each one at `first_item`.
+    """
+    rng = random.Random(first_item)
+    cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+    base_date = datetime(2020, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+
+    items = []
+    for i in range(first_item, first_item + count):
+        words = rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(20, 40))
+        items.append(mock_item(
+            sub_uuid=subscription_ids[i % len(subscription_ids)],
+            name=" ".join(words[:rng.randint(3, 8)]).capitalize(),
+            description=" ".join(words[8:]),
+            published_at=base_date + timedelta(minutes=i),
+            created_at=base_date,
+            updated_at=base_date,
+            duration=(i * 7) % 7200,
+        ))
+    return items
+
+
+def search_queries(vocabulary: list[str]) -> list[FindItemsQueryCase]:
+    """Searches of words with different frequencies over items generated by generate_searchable_items."""
+    common_word = vocabulary[0]
+    frequent_word = vocabulary[10]
+    searched_word = vocabulary[200]
+    rare_word = vocabulary[-1]
+    partial_word = max(vocabulary[100:200], key=len)[:5]
+    return [
+        FindItemsQueryCase(
+            name=f"common word ({common_word})",
+            criteria=ItemFilterCriteria(text=common_word),
+            check_items_result=True,
+            max_baseline_multiplier=3.0,
+        ),
+        FindItemsQueryCase(
+            name=f"rare word ({rare_word})",
+            criteria=ItemFilterCriteria(text=rare_word),
+            check_items_result=False,
+            max_baseline_multiplier=3.0,
+        ),
+        FindItemsQueryCase(
+            name=f"two words ({frequent_word} {rare_word})",
+            criteria=ItemFilterCriteria(text=f"{frequent_word} {rare_word}"),
+            check_items_result=False,
+            max_baseline_multiplier=3.0,
+        ),
+        FindItemsQueryCase(
+            name=f"part of a word ({partial_word})",
+            criteria=ItemFilterCriteria(text=partial_word),
+            check_items_result=True,
+            max_baseline_multiplier=3.0,
+        ),
+        FindItemsQueryCase(
+            name=f"word by relevance ({searched_word})",
+            criteria=ItemFilterCriteria(text=searched_word, order_by=ItemOrdering.RELEVANCE),
+            check_items_result=True,
+            max_baseline_multiplier=3.0,
+        ),
+    ]
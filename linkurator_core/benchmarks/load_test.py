@@ -0,0 +1,174 @@
+"""
+Scenario runner replaying a weighted mix of API calls against the FastAPI app, shared by the load tests
+and the load test script.
+"""
+import asyncio
+import itertools
+import random
+import statistics
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+import httpx
+from fastapi import FastAPI
+
+from linkurator_core.domain.common.synthetic_dataset import SyntheticDataset
+
+
+@dataclass
+class LoadTestUser:
+    """A user of the dataset with a session, and what it follows, to build the paths of its calls."""
+
+    token: str
+    user_id: UUID
+    subscription_ids: list[UUID]
+    topic_ids: list[UUID]
+    curator_ids: list[UUID]
+
+
+@dataclass
+class ApiCallMix:
+    """An endpoint of the scenario, called in proportion to its weight with the path built for a user."""
+
+    endpoint: str
+    weight: float
+    path: Callable[[random.Random, LoadTestUser], str]
+
+
+@dataclass
+class EndpointReport:
+    endpoint: str
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def percentile(self, percent: float) -> float:
+        latencies = sorted(self.latencies_ms)
+        return latencies[min(int(len(latencies) * percent / 100), len(latencies) - 1)]
+
+
+@dataclass
+class LoadTestReport:
+    seconds: float
+    endpoints: dict[str, EndpointReport]
+
+    @property
+    def requests(self) -> int:
+        return sum(len(report.latencies_ms) for report in self.endpoints.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "seconds": self.seconds,
+            "requests": self.requests,
+            "requests_per_second": self.requests / self.seconds,
+            "endpoints": {
+                endpoint: {
+                    "requests": len(report.latencies_ms),
+                    "errors": report.errors,
+                    "requests_per_second": len(report.latencies_ms) / self.seconds,
+                    "p50_ms": report.percentile(50),
+                    "p95_ms": report.percentile(95),
+                    "p99_ms": report.percentile(99),
+                }
+                for endpoint, report in sorted(self.endpoints.items())
+            },
+        }
+
+    def as_text(self) -> str:
+        lines = [f"{self.requests} requests in {self.seconds:.1f}s, {self.requests / self.seconds:.1f} requests/s",
+                 f"{'endpoint':<40} {'requests':>8} {'errors':>6} {'req/s':>7} {'p50':>8} {'p95':>8} {'p99':>8}"]
+        for endpoint, report in sorted(self.endpoints.items()):
+            lines.append(
+                f"{endpoint:<40} {len(report.latencies_ms):>8} {report.errors:>6} "
+                f"{len(report.latencies_ms) / self.seconds:>7.1f} {statistics.median(report.latencies_ms):>6.1f}ms "
+                f"{report.percentile(95):>6.1f}ms {report.percentile(99):>6.1f}ms")
+        return "\n".join(lines)
+
+
+def default_api_call_mix(search_words: list[str]) -> list[ApiCallMix]:
+    """The calls of users browsing their feeds and searching the given words."""
+    return [
+        ApiCallMix("GET /subscriptions/items", 30, lambda _, user: "/subscriptions/items?page_size=50"),
+        ApiCallMix("GET /subscriptions/{sub_id}/items", 15, lambda rng, user: (
+            f"/subscriptions/{rng.choice(user.subscription_ids)}/items?page_size=50")),
+        ApiCallMix("GET /topics/{topic_id}/items", 10, lambda rng, user: (
+            f"/topics/{rng.choice(user.topic_ids)}/items?page_size=50")),
+        ApiCallMix("GET /topics/favorites/items", 5, lambda _, user: "/topics/favorites/items?page_size=50"),
+        ApiCallMix("GET /curators/items", 5, lambda _, user: "/curators/items?page_size=50"),
+        ApiCallMix("GET /curators/{curator_id}/items", 5, lambda rng, user: (
+            f"/curators/{rng.choice(user.curator_ids)}/items?page_size=50")),
+        ApiCallMix("GET /profile/", 10, lambda _, user: "/profile/"),
+        ApiCallMix("GET /subscriptions/", 5, lambda _, user: "/subscriptions/"),
+        ApiCallMix("GET /topics/", 5, lambda _, user: "/topics/"),
+        ApiCallMix("GET /search/", 5, lambda rng, _: f"/search/?text={rng.choice(search_words)}"),
+        ApiCallMix("GET /subscriptions/items?search", 5, lambda rng, _: (
+            f"/subscriptions/items?page_size=50&search={rng.choice(search_words)}")),
+    ]
+
+
+def load_test_users(dataset: SyntheticDataset, tokens: dict[UUID, str]) -> list[LoadTestUser]:
+    """The users of the dataset with a token, with their followed subscriptions, topics and curators."""
+    topics: dict[UUID, list[UUID]] = {}
+    for topic in dataset.topics():
+        topics.setdefault(topic.user_id, []).append(topic.uuid)
+    return [
+        LoadTestUser(
+            token=tokens[user.uuid],
+            user_id=user.uuid,
+            subscription_ids=sorted(user.get_subscriptions()),
+            topic_ids=topics.get(user.uuid, []) + sorted(user.get_followed_topics()),
+            curator_ids=sorted(user.curators),
+        )
+        for user in dataset.users() if user.uuid in tokens
+    ]
+
+
+def api_calls(
+        users: list[LoadTestUser], mix: list[ApiCallMix], seed: int = 0,
+) -> Iterator[tuple[str, str, str]]:
+    """Endless endpoint, path and token of calls of random users, picked with the weights of the mix."""
+    rng = random.Random(seed)
+    cum_weights = list(itertools.accumulate(call.weight for call in mix))
+    while True:
+        user = rng.choice(users)
+        call = rng.choices(mix, cum_weights=cum_weights)[0]
+        try:
+            path = call.path(rng, user)
+        except IndexError:
+            # The user follows none of the topics or curators the call needs
+            continue
+        yield call.endpoint, path, user.token
+
+
+async def run_load_test(
+        app: FastAPI,
+        users: list[LoadTestUser],
+        mix: list[ApiCallMix],
+        requests: int,
+        concurrency: int = 10,
+        seed: int = 0,
+) -> LoadTestReport:
+    """
+    Replay `requests` calls of the mix against the app, `concurrency` at a time, and report the latency
+    percentiles and throughput of each endpoint. The calls go through the ASGI interface, without a network.
+    """
+    calls = itertools.islice(api_calls(users, mix, seed), requests)
+    endpoints: dict[str, EndpointReport] = {}
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        for endpoint, path, token in calls:
+            start = time.perf_counter()
+            response = await client.get(path, headers={"Authorization": f"Bearer {token}"})
+            report = endpoints.setdefault(endpoint, EndpointReport(endpoint))
+            report.latencies_ms.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                report.errors += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load-test") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        seconds = time.perf_counter() - start
+    return LoadTestReport(seconds=seconds, endpoints=endpoints)
@@ -0,0 +1,351 @@
+"""
+The processor benchmark: the handlers of the processor over Postgres and an in-process event bus, refreshing
+subscriptions whose provider is a local HTTP server serving synthetic YouTube and RSS feeds.
+"""
+import asyncio
+import logging
+import resource
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Any
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+from aiohttp import web
+
+from linkurator_core.application.common.event_handler import EventHandler
+from linkurator_core.application.items.refresh_items_handler import RefreshItemsHandler
+from linkurator_core.application.subscriptions.update_subscription_items_handler import UpdateSubscriptionItemsHandler
+from linkurator_core.domain.common.event import SubscriptionItemsBecameOutdatedEvent
+from linkurator_core.domain.common.utils import parse_url
+from linkurator_core.domain.items.item_repository import ItemFilterCriteria
+from linkurator_core.domain.subscriptions.general_subscription_service import GeneralSubscriptionService
+from linkurator_core.domain.subscriptions.subscription import Subscription
+from linkurator_core.infrastructure.asyncio_impl.http_client import AsyncHttpClient
+from linkurator_core.infrastructure.google.youtube_api_client import MAX_VIDEOS_PER_QUERY, YoutubeApiClient
+from linkurator_core.infrastructure.google.youtube_rss_client import YoutubeRssClient
+from linkurator_core.infrastructure.google.youtube_service import YoutubeService
+from linkurator_core.infrastructure.in_memory.event_bus import InMemoryEventBus
+from linkurator_core.infrastructure.metrics import instrument_event_handling
+from linkurator_core.infrastructure.postgres.item_repository import PostgresItemRepository
+from linkurator_core.infrastructure.postgres.lock_service import PostgresLockService
+from linkurator_core.infrastructure.postgres.query_statistics import query_statistics
+from linkurator_core.infrastructure.postgres.rss_data_repository import PostgresRssDataRepository
+from linkurator_core.infrastructure.postgres.subscription_repository import PostgresSubscriptionRepository
+from linkurator_core.infrastructure.postgres.user_repository import PostgresUserRepository
+from linkurator_core.infrastructure.rss.rss_feed_client import RssFeedClient
+from linkurator_core.infrastructure.rss.rss_service import RssSubscriptionService
+
+YOUTUBE_DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+@dataclass
+class FakeProviderShape:
+    items_per_feed: int = 30
+    new_items_per_round: int = 3
+    latency_ms: float = 50
+    # Items are published every `publish_interval`, the newest one a minute before the server starts
+    publish_interval: timedelta = timedelta(hours=6)
+
+
+class FakeProviderServer:
+    """
+    Local HTTP server standing in for YouTube and the RSS feeds. Every feed has `items_per_feed` items, and
+    `publish_new_items` adds `new_items_per_round` newer items to all of them. Every response is delayed by
+    `latency_ms`, like the response of a remote provider.
+    """
+
+    def __init__(self, shape: FakeProviderShape) -> None:
+        self.shape = shape
+        self.requests: Counter[str] = Counter()
+        self.base_url = ""
+        self._published = shape.items_per_feed
+        self._first_published_at = (datetime.now(tz=timezone.utc).replace(microsecond=0) - timedelta(minutes=1)
+                                    - shape.publish_interval * (shape.items_per_feed - 1))
+        self._app = web.Application()
+        self._app.add_routes([
+            web.get("/feeds/videos.xml", self._youtube_feed),
+            web.get("/youtube/v3/playlistItems", self._youtube_playlist_items),
+            web.get("/youtube/v3/videos", self._youtube_videos),
+            web.get("/rss/{feed}.xml", self._rss_feed),
+        ])
+
+    @asynccontextmanager
+    async def running(self) -> AsyncIterator["FakeProviderServer"]:
+        runner = web.AppRunner(self._app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        try:
+            yield self
+        finally:
+            await runner.cleanup()
+
+    def publish_new_items(self) -> None:
+        self._published += self.shape.new_items_per_round
+
+    def published_at(self, position: int) -> datetime:
+        return self._first_published_at + self.shape.publish_interval * position
+
+    def feed_positions(self) -> range:
+        """Positions of the items of every feed, the newest first."""
+        return range(self._published - 1, self._published - 1 - self.shape.items_per_feed, -1)
+
+    def youtube_subscription(self, index: int) -> Subscription:
+        playlist_id = f"UU{index:08d}"
+        return Subscription.new(
+            uuid=uuid4(),
+            name=f"Benchmark channel {index}",
+            provider="youtube",
+            url=parse_url(f"https://www.youtube.com/channel/UC{index:08d}"),
+            thumbnail=parse_url(f"https://yt3.ggpht.com/UC{index:08d}"),
+            description="",
+            external_data={"channel_id": f"UC{index:08d}", "playlist_id": playlist_id},
+        )
+
+    def rss_subscription(self, index: int) -> Subscription:
+        feed_url = f"{self.base_url}/rss/feed{index}.xml"
+        return Subscription.new(
+            uuid=uuid4(),
+            name=f"Benchmark feed {index}",
+            provider="rss",
+            url=parse_url(feed_url),
+            thumbnail=parse_url(f"{self.base_url}/rss/feed{index}.png"),
+            description="",
+            external_data={"feed_url": feed_url},
+        )
+
+    async def _respond(self, route: str) -> None:
+        self.requests[route] += 1
+        await asyncio.sleep(self.shape.latency_ms / 1000)
+
+    async def _youtube_feed(self, request: web.Request) -> web.Response:
+        await self._respond("youtube_rss")
+        playlist_id = request.query["playlist_id"]
+        entries = "".join(
+            f"<entry><title>Video {position}</title>"
+            f'<link rel="alternate" href="https://www.youtube.com/watch?v={playlist_id}.{position}"/>'
+            f"<published>{self.published_at(position).strftime('%Y-%m-%dT%H:%M:%S+00:00')}</published></entry>"
+            for position in self.feed_positions())
+        return web.Response(text=f'<feed xmlns="http://www.w3.org/2005/Atom">{entries}</feed>',
+                            content_type="application/atom+xml")
+
+    async def _youtube_playlist_items(self, request: web.Request) -> web.Response:
+        await self._respond("youtube_playlist_items")
+        playlist_id = request.query["playlistId"]
+        offset = int(request.query.get("pageToken", "0"))
+        positions = self.feed_positions()[offset:offset + MAX_VIDEOS_PER_QUERY]
+        response: dict[str, Any] = {"items": [
+            {"snippet": {"publishedAt": self.published_at(position).strftime(YOUTUBE_DATE_FORMAT),
+                         "resourceId": {"videoId": f"{playlist_id}.{position}"}}}
+            for position in positions]}
+        if offset + MAX_VIDEOS_PER_QUERY < self.shape.items_per_feed:
+            response["nextPageToken"] = str(offset + MAX_VIDEOS_PER_QUERY)
+        return web.json_response(response)
+
+    async def _youtube_videos(self, request: web.Request) -> web.Response:
+        await self._respond("youtube_videos")
+        videos = []
+        for video_id in request.query["id"].split(","):
+            playlist_id, position = video_id.rsplit(".", maxsplit=1)
+            videos.append({
+                "id": video_id,
+                "snippet": {
+                    "publishedAt": self.published_at(int(position)).strftime(YOUTUBE_DATE_FORMAT),
+                    "title": f"Video {position}",
+                    "description": f"Video {position} of the playlist {playlist_id}",
+                    "thumbnails": {"medium": {"url": f"https://i.ytimg.com/vi/{video_id}/mqdefault.jpg"}},
+                    "channelId": f"UC{playlist_id[2:]}",
+                    "liveBroadcastContent": "none",
+                },
+                "contentDetails": {"duration": "PT12M30S"},
+            })
+        return web.json_response({"items": videos})
+
+    async def _rss_feed(self, request: web.Request) -> web.Response:
+        await self._respond("rss")
+        feed = request.match_info["feed"]
+        items = "".join(
+            f"<item><title>Post {position}</title><link>{self.base_url}/rss/{feed}/{position}</link>"
+            f"<description>Post {position} of {feed}</description>"
+            f"<pubDate>{format_datetime(self.published_at(position))}</pubDate>"
+            f'<media:thumbnail url="{self.base_url}/rss/{feed}/{position}.png"/></item>'
+            for position in self.feed_positions())
+        return web.Response(
+            text=f'<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel><title>{feed}</title>'
+                 f"<link>{self.base_url}/rss/{feed}</link><description>{feed}</description>{items}</channel></rss>",
+            content_type="application/rss+xml")
+
+
+@dataclass
+class ProcessorRepositories:
+    subscriptions: PostgresSubscriptionRepository
+    items: PostgresItemRepository
+    lock_service: PostgresLockService
+
+
+def processor_event_handler(
+        connection: dict[str, Any], server: FakeProviderServer,
+) -> tuple[EventHandler, ProcessorRepositories]:
+    """
+    The event handler of the processor, with its repositories over Postgres and its YouTube and RSS providers
+    calling the fake server. The handlers of the other events are mocks: the benchmark does not publish them.
+    """
+    subscription_repository = PostgresSubscriptionRepository(**connection)
+    item_repository = PostgresItemRepository(**connection)
+    lock_service = PostgresLockService(**connection)
+
+    youtube_client = YoutubeApiClient()
+    youtube_client.base_url = f"{server.base_url}/youtube/v3"
+    youtube_rss_client = YoutubeRssClient()
+    youtube_rss_client.base_url = server.base_url
+    youtube_service = YoutubeService(
+        user_repository=PostgresUserRepository(**connection),
+        subscription_repository=subscription_repository,
+        item_repository=item_repository,
+        api_keys=["benchmark"],
+        youtube_client=youtube_client,
+        youtube_rss_client=youtube_rss_client,
+    )
+    rss_service = RssSubscriptionService(
+        subscription_repository=subscription_repository,
+        item_repository=item_repository,
+        rss_feed_client=RssFeedClient(http_client=AsyncHttpClient()),
+        rss_data_repository=PostgresRssDataRepository(**connection),
+    )
+    general_subscription_service = GeneralSubscriptionService(services=[youtube_service, rss_service])
+
+    event_handler = EventHandler(
+        update_youtube_user_subscriptions_handler=AsyncMock(),
+        update_subscription_items_handler=UpdateSubscriptionItemsHandler(
+            subscription_repository=subscription_repository,
+            item_repository=item_repository,
+            subscription_service=general_subscription_service,
+            lock_service=lock_service),
+        update_subscription_handler=AsyncMock(),
+        refresh_items_handler=RefreshItemsHandler(
+            item_repository=item_repository,
+            subscription_service=general_subscription_service),
+        send_validate_new_user_email=AsyncMock(),
+        send_welcome_email=AsyncMock(),
+        process_user_query_handler=AsyncMock(),
+        summarize_subscription_handler=AsyncMock(),
+    )
+    return event_handler, ProcessorRepositories(subscription_repository, item_repository, lock_service)
+
+
+@dataclass
+class RoundReport:
+    refreshes: int
+    seconds: float
+    items: int
+    queries: int
+    provider_requests: int
+
+    @property
+    def refreshes_per_minute(self) -> float:
+        return self.refreshes / self.seconds * 60 if self.seconds else 0
+
+    @property
+    def queries_per_refresh(self) -> float:
+        return self.queries / self.refreshes if self.refreshes else 0
+
+
+@dataclass
+class ProcessorBenchmarkReport:
+    rounds: list[RoundReport]
+    # The most frequent statements, with their calls per refresh
+    statements: list[tuple[str, float]]
+    peak_traced_bytes: int | None
+    peak_resident_bytes: int
+
+    def as_text(self) -> str:
+        lines = [f"{'round':<6} {'refreshes':>9} {'seconds':>8} {'refreshes/min':>13} {'new items':>9} "
+                 f"{'queries/refresh':>15} {'provider calls':>14}"]
+        lines.extend(
+            f"{number:<6} {report.refreshes:>9} {report.seconds:>8.1f} {report.refreshes_per_minute:>13.0f} "
+            f"{report.items:>9} {report.queries_per_refresh:>15.1f} {report.provider_requests:>14}"
+            for number, report in enumerate(self.rounds))
+        lines.append("Queries per refresh by statement:")
+        lines.extend(f"{calls:>8.1f}  {template[:100]}" for template, calls in self.statements)
+        if self.peak_traced_bytes is not None:
+            lines.append(f"Peak of the memory allocated by Python: {self.peak_traced_bytes / 2 ** 20:.1f}MiB")
+        lines.append(f"Peak resident memory of the process: {self.peak_resident_bytes / 2 ** 20:.1f}MiB")
+        return "\n".join(lines)
+
+
+async def run_processor_benchmark(
+        connection: dict[str, Any],
+        server: FakeProviderServer,
+        subscriptions: list[Subscription],
+        rounds: int,
+        concurrency: int = 10,
+        trace_memory: bool = False,
+) -> ProcessorBenchmarkReport:
+    """
+    Refresh the items of every subscription `rounds` times, through the event bus, as the processor does when
+    the subscriptions become outdated. The first round imports the items of the feeds, the next ones the items
+    published since the previous round.
+    """
+    event_handler, repositories = processor_event_handler(connection, server)
+    for subscription in subscriptions:
+        await repositories.subscriptions.add(subscription)
+
+    event_bus = InMemoryEventBus(max_concurrent_handlers=concurrency)
+    event_bus.subscribe(SubscriptionItemsBecameOutdatedEvent, instrument_event_handling(event_handler.handle))
+    bus_task = asyncio.create_task(event_bus.start())
+    if trace_memory:
+        tracemalloc.start()
+    round_reports: list[RoundReport] = []
+    calls: Counter[str] = Counter()
+    try:
+        for number in range(rounds):
+            if number > 0:
+                server.publish_new_items()
+            items_before = await _count_items(repositories.items, subscriptions)
+            provider_requests_before = server.requests.total()
+            query_statistics.reset()
+            start = time.perf_counter()
+            for subscription in subscriptions:
+                await event_bus.publish(SubscriptionItemsBecameOutdatedEvent.new(subscription_id=subscription.uuid))
+            await event_bus.wait_until_idle()
+            seconds = time.perf_counter() - start
+
+            statements = query_statistics.statements()
+            calls.update({statement.template: statement.calls for statement in statements})
+            round_reports.append(RoundReport(
+                refreshes=len(subscriptions),
+                seconds=seconds,
+                items=await _count_items(repositories.items, subscriptions) - items_before,
+                queries=sum(statement.calls for statement in statements),
+                provider_requests=server.requests.total() - provider_requests_before,
+            ))
+            logging.info("Round %s: %s refreshes in %.1fs", number, len(subscriptions), seconds)
+        peak_traced_bytes = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        await event_bus.stop()
+        await bus_task
+        await repositories.lock_service.close()
+
+    refreshes = len(subscriptions) * rounds
+    return ProcessorBenchmarkReport(
+        rounds=round_reports,
+        statements=[(template, count / refreshes) for template, count in calls.most_common(8)],
+        peak_traced_bytes=peak_traced_bytes,
+        peak_resident_bytes=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+    )
+
+
+async def _count_items(item_repository: PostgresItemRepository, subscriptions: list[Subscription]) -> int:
+    return await item_repository.count_matching_items(
+        ItemFilterCriteria(subscription_ids=[subscription.uuid for subscription in subscriptions]))
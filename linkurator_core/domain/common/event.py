@@ -111,6 +111,18 @@ class UserRegisteredEvent(Event):
         )
 
 
+class UserTimelineBecameOutdatedEvent(Event):
+    user_id: UUID
+
+    @classmethod
+    def new(cls, user_id: UUID) -> UserTimelineBecameOutdatedEvent:
+        return cls(
+            id=uuid4(),
+            created_at=datetime.now(timezone.utc),
+            user_id=user_id,
+        )
+
+
 class NewChatQueryEvent(Event):
     chat_id: UUID
     query: str
@@ -24,3 +24,7 @@ class EventBusService(abc.ABC):
     @abc.abstractmethod
     def is_running(self) -> bool:
         raise NotImplementedError()
+
+    async def pending_events(self) -> int | None:
+        """Number of published events that have not been handled yet, or None if it is unknown."""
+        return None
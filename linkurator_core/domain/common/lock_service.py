@@ -0,0 +1,26 @@
+import abc
+
+
+class LockService(abc.ABC):
+    """
+    Named locks shared by every process connected to the same backend, so a piece of work
+    runs in a single place at a time. Acquiring a lock never waits.
+
+    A lock can be lost while held, when the backend drops it, so holders check `is_held` before
+    writing the results of their work.
+    """
+
+    @abc.abstractmethod
+    async def try_acquire(self, key: str) -> bool:
+        """Return True if the lock was acquired, False if it is already held, even by this process."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def release(self, key: str) -> None:
+        """Release the lock. Never raises if the backend has already dropped it."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def is_held(self, key: str) -> bool:
+        """Return True if this process still holds the lock, False if it was released or lost."""
+        raise NotImplementedError()
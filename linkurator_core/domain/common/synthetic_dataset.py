@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import itertools
+import math
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from linkurator_core.domain.common.mock_factory import mock_interaction, mock_item, mock_sub, mock_topic, mock_user
+from linkurator_core.domain.items.interaction import Interaction, InteractionType
+from linkurator_core.domain.items.item import Item, ItemProvider
+from linkurator_core.domain.subscriptions.subscription import Subscription
+from linkurator_core.domain.topics.topic import Topic
+from linkurator_core.domain.users.user import User, Username
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "pa", "do", "gu", "be", "fi", "ho", "ju"]
+PROVIDERS: list[ItemProvider] = ["youtube", "youtube", "youtube", "youtube", "spotify", "rss"]
+INTERACTION_TYPES = [InteractionType.VIEWED, InteractionType.RECOMMENDED,
+                     InteractionType.HIDDEN, InteractionType.DISCOURAGED]
+INTERACTION_WEIGHTS = [0.7, 0.1, 0.15, 0.05]
+# Bits of the item UUIDs holding the position of the item in its subscription, below the subscription index
+ITEM_POSITION_BITS = 24
+
+
+@dataclass
+class SyntheticDatasetShape:
+    """
+    Size of a synthetic dataset. Every count is an average: the items of the subscriptions follow a power law
+    with the given exponent, and the subscriptions and interactions of the users are spread around their average.
+    """
+
+    users: int = 1000
+    subscriptions: int = 20_000
+    items: int = 1_000_000
+    subscriptions_per_user: int = 300
+    topics_per_user: int = 5
+    curators: int = 50
+    curators_per_user: int = 10
+    interactions_per_user: int = 500
+    channel_size_exponent: float = 0.9
+    history_days: int = 5 * 365
+    vocabulary: int = 5000
+    seed: int = 0
+
+
+@dataclass
+class _UserProfile:
+    index: int
+    uuid: UUID
+    subscriptions: list[int]
+    curators: list[int]
+
+
+class SyntheticDataset:
+    """
+    A deterministic dataset of users, subscriptions, topics, items and interactions with the distributions of a
+    real deployment: a few subscriptions with most of the items, users following hundreds of subscriptions, the
+    popular subscriptions followed by most users, a few curators followed by the others, and interactions with
+    the recent items of the followed subscriptions.
+
+    Every entity is generated on demand from the seed, so tens of millions of items can be streamed to a database
+    without keeping them in memory. The same seed always generates the same UUIDs.
+    """
+
+    def __init__(self, shape: SyntheticDatasetShape, now: datetime | None = None) -> None:
+        self.shape = shape
+        self.now = now or datetime.now(tz=timezone.utc)
+        rng = random.Random(shape.seed)
+        self.subscription_ids = [_random_uuid(rng) for _ in range(shape.subscriptions)]
+        self.user_ids = [_random_uuid(rng) for _ in range(shape.users)]
+        self._topic_namespace = _random_uuid(rng).int >> 64 << 64
+        self._item_namespace = _random_uuid(rng).int >> 48 << 48
+        self.vocabulary = _vocabulary(rng, shape.vocabulary)
+        self._word_cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(self.vocabulary) + 1)))
+
+        # The subscriptions are ranked by size, the first one is the largest and the most followed
+        weights = [1 / rank ** shape.channel_size_exponent for rank in range(1, shape.subscriptions + 1)]
+        self.items_per_subscription = _split(shape.items, weights)
+        self._popularity_cum_weights = list(itertools.accumulate(weights))
+
+    def subscriptions(self) -> Iterator[Subscription]:
+        for index, uuid in enumerate(self.subscription_ids):
+            rng = self._rng("subscription", index)
+            subscription = mock_sub(
+                uuid=uuid,
+                name=self._words(rng, rng.randint(1, 4)).title(),
+                description=self._words(rng, rng.randint(10, 60)),
+                provider=PROVIDERS[index % len(PROVIDERS)],
+                created_at=self.now - timedelta(days=self.shape.history_days),
+                scanned_at=self.now,
+            )
+            subscription.updated_at = subscription.created_at
+            subscription.last_published_at = self._published_at(index, 0)
+            yield subscription
+
+    def users(self) -> Iterator[User]:
+        for profile in self._profiles():
+            topics_of_curators = {self.topic_id(curator, 0) for curator in profile.curators
+                                  if self.shape.topics_per_user > 0}
+            own_topics = {self.topic_id(profile.index, 0)} if self.shape.topics_per_user > 0 else set()
+            yield mock_user(
+                uuid=profile.uuid,
+                subscribed_to=[self.subscription_ids[index] for index in profile.subscriptions],
+                curators={self.user_ids[curator] for curator in profile.curators},
+                topics=topics_of_curators,
+                favorite_topics=own_topics,
+                username=Username(f"user{profile.index}"),
+                email=f"user{profile.index}@example.com",
+            )
+
+    def topics(self) -> Iterator[Topic]:
+        for profile in self._profiles():
+            rng = self._rng("topics", profile.index)
+            for position in range(self.shape.topics_per_user):
+                subscriptions = rng.sample(profile.subscriptions, min(len(profile.subscriptions), rng.randint(5, 30)))
+                yield mock_topic(
+                    uuid=self.topic_id(profile.index, position),
+                    name=self._words(rng, rng.randint(1, 3)).title(),
+                    user_uuid=profile.uuid,
+                    subscription_uuids=[self.subscription_ids[index] for index in subscriptions],
+                )
+
+    def items(self) -> Iterator[Item]:
+        for index, count in enumerate(self.items_per_subscription):
+            rng = self._rng("items", index)
+            provider = PROVIDERS[index % len(PROVIDERS)]
+            for position in range(count):
+                published_at = self._published_at(index, position)
+                # Most items last a few minutes to an hour, and some have no duration yet
+                duration = None if rng.random() < 0.05 else int(rng.lognormvariate(math.log(600), 1))
+                yield mock_item(
+                    item_uuid=self.item_id(index, position),
+                    sub_uuid=self.subscription_ids[index],
+                    name=self._words(rng, rng.randint(3, 10)).capitalize(),
+                    description=self._words(rng, rng.randint(10, 80)),
+                    published_at=published_at,
+                    created_at=published_at,
+                    updated_at=published_at,
+                    duration=duration,
+                    provider=provider,
+                )
+
+    def interactions(self) -> Iterator[Interaction]:
+        for profile in self._profiles():
+            if len(profile.subscriptions) == 0:
+                continue
+            rng = self._rng("interactions", profile.index)
+            sizes = [self.items_per_subscription[index] for index in profile.subscriptions]
+            cum_sizes = list(itertools.accumulate(sizes))
+            count = round(rng.lognormvariate(math.log(max(self.shape.interactions_per_user, 1)), 0.8))
+            seen: set[tuple[int, int, InteractionType]] = set()
+            for subscription in rng.choices(profile.subscriptions, cum_weights=cum_sizes, k=count):
+                # The recent items of a subscription get most of the interactions
+                position = int(self.items_per_subscription[subscription] * rng.random() ** 3)
+                interaction_type = rng.choices(INTERACTION_TYPES, weights=INTERACTION_WEIGHTS)[0]
+                if (subscription, position, interaction_type) in seen:
+                    continue
+                seen.add((subscription, position, interaction_type))
+                yield mock_interaction(
+                    uuid=_random_uuid(rng),
+                    user_id=profile.uuid,
+                    item_id=self.item_id(subscription, position),
+                    created_at=self._published_at(subscription, position) + timedelta(hours=rng.randint(1, 72)),
+                    interaction_type=interaction_type,
+                )
+
+    def item_id(self, subscription_index: int, position: int) -> UUID:
+        """UUID of the item at `position`, from the newest, of a subscription. It leaves the item out of memory."""
+        return UUID(int=self._item_namespace | subscription_index << ITEM_POSITION_BITS | position, version=4)
+
+    def topic_id(self, user_index: int, position: int) -> UUID:
+        return UUID(int=self._topic_namespace | user_index << 16 | position, version=4)
+
+    def _profiles(self) -> Iterator[_UserProfile]:
+        shape = self.shape
+        for index, uuid in enumerate(self.user_ids):
+            rng = self._rng("user", index)
+            count = round(rng.lognormvariate(math.log(max(shape.subscriptions_per_user, 1)), 0.6))
+            count = min(max(count, 1), shape.subscriptions)
+            subscriptions: dict[int, None] = {}
+            while len(subscriptions) < count:
+                picked = rng.choices(range(shape.subscriptions), cum_weights=self._popularity_cum_weights,
+                                     k=count - len(subscriptions))
+                subscriptions.update(dict.fromkeys(picked))
+            candidates = [curator for curator in range(min(shape.curators, shape.users)) if curator != index]
+            curators = rng.sample(candidates, min(len(candidates), shape.curators_per_user))
+            yield _UserProfile(index=index, uuid=uuid, subscriptions=list(subscriptions), curators=curators)
+
+    def _published_at(self, subscription_index: int, position: int) -> datetime:
+        # The items of a subscription are evenly spread over the history, the first one is the newest
+        interval = timedelta(days=self.shape.history_days) / max(self.items_per_subscription[subscription_index], 1)
+        return self.now - interval * position
+
+    def _words(self, rng: random.Random, count: int) -> str:
+        return " ".join(rng.choices(self.vocabulary, cum_weights=self._word_cum_weights, k=count))
+
+    def _rng(self, entity: str, index: int) -> random.Random:
+        return random.Random(f"{self.shape.seed}-{entity}-{index}")
+
+
+def _random_uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def _vocabulary(rng: random.Random, size: int) -> list[str]:
+    """Distinct made up words. Earlier words are used more often, like in natural language."""
+    words: dict[str, None] = {}
+    while len(words) < size:
+        words["".join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))] = None
+    return list(words)
+
+
+def _split(total: int, weights: list[float]) -> list[int]:
+    """Split the total proportionally to the weights, with at least one for each."""
+    weights_sum = sum(weights)
+    parts = [max(1, int(total * weight / weights_sum)) for weight in weights]
+    for position in range(max(total - sum(parts), 0)):
+        parts[position % len(parts)] += 1
+    return parts
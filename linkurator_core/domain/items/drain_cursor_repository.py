@@ -0,0 +1,18 @@
+import abc
+from uuid import UUID
+
+
+class DrainCursorRepository(abc.ABC):
+    """
+    Position of each drain of outdated items, by drain name, so a drain continues where it stopped
+    after the processor restarts or another replica becomes the leader.
+    """
+
+    @abc.abstractmethod
+    async def get(self, name: str) -> UUID | None:
+        """Return the id of the last item published by the drain, or None if it has to start a new pass."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def save(self, name: str, cursor: UUID | None) -> None:
+        raise NotImplementedError()
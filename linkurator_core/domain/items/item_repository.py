@@ -3,6 +3,7 @@ from __future__ import annotations
 import abc
 from dataclasses import dataclass, field
 from datetime import datetime
+from enum import StrEnum
 from uuid import UUID
 
 from pydantic import AnyUrl
@@ -20,6 +21,12 @@ class AnyItemInteraction:
     hidden: bool | None = None
 
 
+class ItemOrdering(StrEnum):
+    PUBLISHED_AT = "published_at"
+    # Items matching the text better first. Without text, the same as PUBLISHED_AT
+    RELEVANCE = "relevance"
+
+
 @dataclass
 class ItemFilterCriteria:
     item_ids: set[UUID] | None = None
@@ -35,6 +42,7 @@ class ItemFilterCriteria:
     min_duration: int | None = None
     max_duration: int | None = None
     interactions: AnyItemInteraction = field(default_factory=AnyItemInteraction)
+    order_by: ItemOrdering = ItemOrdering.PUBLISHED_AT
 
 
 @dataclass
@@ -64,10 +72,33 @@ class ItemRepository(abc.ABC):
     async def delete_item(self, item_id: UUID) -> None:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def delete_items(self, item_ids: list[UUID]) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete_items_by_subscription(self, subscription_id: UUID, before: datetime | None = None) -> int:
+        """Delete the items of a subscription, only those created before `before` if given. Return how many."""
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def find_items(self, criteria: ItemFilterCriteria, page_number: int, limit: int) -> list[Item]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def find_item_ids(self, criteria: ItemFilterCriteria, after_id: UUID | None, limit: int) -> list[UUID]:
+        """
+        Return the ids of the matching items in ascending order, starting after `after_id`.
+
+        Unlike the pages of `find_items`, the ids returned by successive calls never overlap or skip
+        items when matching items are modified or deleted between calls.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def count_matching_items(self, criteria: ItemFilterCriteria) -> int:
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def delete_all_items(self) -> None:
         raise NotImplementedError
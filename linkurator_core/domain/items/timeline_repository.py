@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import abc
+from dataclasses import dataclass, field
+from datetime import datetime
+from uuid import UUID
+
+from linkurator_core.domain.items.item import Item
+from linkurator_core.domain.items.item_repository import ItemFilterCriteria
+
+
+@dataclass
+class Timeline:
+    """
+    The items of the subscriptions followed by a user, stored ahead of time.
+
+    A timeline holds every item of `subscription_ids` published after `complete_since`, and no older one,
+    except for the `pending_subscription_ids`, followed or unfollowed, whose items are still being added or removed.
+    """
+
+    user_id: UUID
+    subscription_ids: set[UUID]
+    complete_since: datetime
+    pending_subscription_ids: set[UUID] = field(default_factory=set)
+
+
+@dataclass(frozen=True)
+class TimelineCursor:
+    """Position of the last item of a page of a timeline, the next page starts after it."""
+
+    published_at: datetime
+    item_id: UUID
+
+    @classmethod
+    def of(cls, item: Item) -> TimelineCursor:
+        return cls(published_at=item.published_at, item_id=item.uuid)
+
+    @classmethod
+    def parse(cls, value: str) -> TimelineCursor:
+        published_at, item_id = value.rsplit("_", 1)
+        return cls(published_at=datetime.fromisoformat(published_at), item_id=UUID(item_id))
+
+    def __str__(self) -> str:
+        return f"{self.published_at.isoformat()}_{self.item_id}"
+
+
+class TimelineRepository(abc.ABC):
+    @abc.abstractmethod
+    async def get(self, user_id: UUID) -> Timeline | None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def save(self, timeline: Timeline) -> None:
+        """Create or update a timeline, without changing its items."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, user_id: UUID) -> None:
+        """Delete a timeline and its items."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def add_subscription_items(self, user_id: UUID, subscription_ids: set[UUID], published_after: datetime) -> None:
+        """Add to a timeline the items of some subscriptions published after a date."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def remove_subscription_items(self, user_id: UUID, subscription_ids: set[UUID]) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def add_items(self, items: list[Item]) -> None:
+        """Add new items to the timelines that follow their subscription and are complete since before them."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def find_items(
+            self, user_id: UUID, criteria: ItemFilterCriteria, limit: int, after: TimelineCursor | None = None,
+    ) -> list[Item]:
+        """The items of a timeline matching the criteria, newest first, starting after the cursor."""
+        raise NotImplementedError
@@ -45,6 +45,20 @@ class GeneralSubscriptionService:
         )
         return reduce(lambda a, b: a | b, results, set())
 
+    async def refresh_items(
+            self,
+            items: list[Item],
+    ) -> set[Item]:
+        items_by_provider: dict[str, list[Item]] = {}
+        for item in items:
+            items_by_provider.setdefault(item.provider, []).append(item)
+
+        results = await asyncio.gather(
+            *[service.refresh_items(items_by_provider[service.provider_name()])
+              for service in self.services if service.provider_name() in items_by_provider],
+        )
+        return reduce(lambda a, b: a | b, results, set())
+
     async def get_subscription_items(
             self,
             sub_id: uuid.UUID,
@@ -54,6 +54,9 @@ class SubscriptionRepository(ABC):
     @abstractmethod
     async def find_by_name(self, name: str, provider: ItemProvider | None = None) -> list[Subscription]: ...
 
+    @abstractmethod
+    async def search_by_name(self, name_part: str, limit: int) -> list[Subscription]: ...
+
     @abstractmethod
     async def find(self, criteria: SubscriptionFilterCriteria) -> list[Subscription]: ...
 
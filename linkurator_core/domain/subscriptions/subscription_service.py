@@ -26,6 +26,14 @@ class SubscriptionService(abc.ABC):
     @abc.abstractmethod
     def refresh_period_minutes(self) -> int: ...
 
+    def refresh_batch_size(self) -> int:
+        """Maximum number of items to refresh with a single request to the provider."""
+        return 50
+
+    def max_refreshed_items_per_minute(self) -> int | None:
+        """Rate at which items can be refreshed without exhausting the provider quota. None means no limit."""
+        return None
+
     @abc.abstractmethod
     async def get_subscriptions(
             self,
@@ -45,6 +53,16 @@ class SubscriptionService(abc.ABC):
             item_ids: set[uuid.UUID],
     ) -> set[Item]: ...
 
+    async def refresh_items(
+            self,
+            items: list[Item],
+    ) -> set[Item]:
+        """
+        Get the latest version of already loaded items. Items of other providers are ignored,
+        and items that no longer exist in the provider are missing from the result.
+        """
+        return await self.get_items({item.uuid for item in items})
+
     @abc.abstractmethod
     async def get_subscription_items(
             self,
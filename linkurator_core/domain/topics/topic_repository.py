@@ -26,6 +26,10 @@ class TopicRepository(abc.ABC):
     async def find_topics_by_name(self, name: str) -> list[Topic]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def search_topics_by_name(self, name_part: str, limit: int) -> list[Topic]:
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def update(self, topic: Topic) -> None:
         raise NotImplementedError
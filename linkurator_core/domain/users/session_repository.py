@@ -4,6 +4,10 @@ from typing import Optional
 from linkurator_core.domain.users.session import Session
 
 
+class TokenAlreadyExists(Exception):
+    pass
+
+
 class SessionRepository(abc.ABC):
     @abc.abstractmethod
     async def get(self, token: str) -> Optional[Session]:
@@ -1,5 +1,6 @@
 import abc
 import datetime
+from enum import StrEnum
 from typing import List, Optional
 from uuid import UUID
 
@@ -10,6 +11,15 @@ class EmailAlreadyInUse(Exception):
     pass
 
 
+class FollowKind(StrEnum):
+    """What a user follows. Each kind is changed on its own, leaving the other follows of the user alone."""
+
+    SUBSCRIPTION = "subscription"
+    TOPIC = "topic"
+    FAVORITE_TOPIC = "favorite_topic"
+    CURATOR = "curator"
+
+
 class UserRepository(abc.ABC):
     @abc.abstractmethod
     async def add(self, user: User) -> None: ...
@@ -35,6 +45,23 @@ class UserRepository(abc.ABC):
     @abc.abstractmethod
     async def update(self, user: User) -> None: ...
 
+    @abc.abstractmethod
+    async def touch_last_login(self, user_id: UUID, last_login_at: datetime.datetime) -> None: ...
+
+    @abc.abstractmethod
+    async def set_scanned_at(self, user_id: UUID, scanned_at: datetime.datetime) -> None: ...
+
+    @abc.abstractmethod
+    async def set_youtube_subscriptions(self, user_id: UUID, subscription_ids: set[UUID]) -> None: ...
+
+    @abc.abstractmethod
+    async def follow(self, user_id: UUID, kind: FollowKind, element_id: UUID) -> None:
+        """Follow, or favorite, the element, with the same rules as the follow methods of User."""
+
+    @abc.abstractmethod
+    async def unfollow(self, user_id: UUID, kind: FollowKind, element_id: UUID) -> None:
+        """Unfollow, or unfavorite, the element, with the same rules as the unfollow methods of User."""
+
     @abc.abstractmethod
     async def find_latest_scan_before(self, timestamp: datetime.datetime) -> List[User]: ...
 
@@ -48,4 +75,9 @@ class UserRepository(abc.ABC):
     async def count_active_users(self) -> int: ...
 
     @abc.abstractmethod
-    async def search_by_username(self, username_part: str) -> List[User]: ...
+    async def search_by_username(self, username_part: str, limit: int, substring: bool = False) -> List[User]:
+        """
+        The users whose username contains the text, the most similar first.
+
+        Texts shorter than a trigram only match the beginning of the usernames, unless `substring` is set.
+        """
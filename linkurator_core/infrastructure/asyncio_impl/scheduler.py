@@ -1,27 +1,87 @@
 import asyncio
-import sys
+import contextlib
+import logging
+import random
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import Awaitable, Callable, List
 
+from linkurator_core.domain.common.lock_service import LockService
+from linkurator_core.infrastructure.metrics import (
+    SCHEDULED_TASK_DURATION,
+    SCHEDULED_TASK_LAG,
+    SCHEDULED_TASK_SKIPPED_RUNS,
+)
+
 TaskCallback = Callable[[], Awaitable[None]]
 
+LEADER_LOCK_KEY = "task_scheduler_leader"
+
+
+@dataclass
+class TaskMetrics:
+    runs: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    skipped_overlapping_runs: int = 0
+    skipped_not_leader_runs: int = 0
+    last_duration_seconds: float = 0
+    max_duration_seconds: float = 0
+    total_duration_seconds: float = 0
+    last_lag_seconds: float = 0
+    max_lag_seconds: float = 0
+
 
 @dataclass
 class Task:
     id: uuid.UUID
-    interval_seconds: int
+    interval_seconds: float
     callback: TaskCallback
     latest_executed: datetime = datetime.fromtimestamp(0, tz=timezone.utc)
+    name: str = ""
+    jitter_seconds: float = 0
+    timeout_seconds: float | None = None
+    metrics: TaskMetrics = field(default_factory=TaskMetrics)
 
 
 class TaskScheduler:
-    def __init__(self) -> None:
+    """
+    Runs recurring tasks, each one in its own coroutine so a slow task never delays the others.
+
+    Runs are due at fixed multiples of the interval from the first run, so the schedule does not
+    drift with the duration of the runs. A task never overlaps with itself: if a run is still in
+    progress when the next one is due, that tick is skipped.
+
+    When a `lock_service` is given, several schedulers can run the same tasks in different processes:
+    only the one holding the leader lock runs them, and another one takes over if the leader is gone.
+
+    The duration, lag and skipped runs of every task are recorded in the metrics registry, labelled
+    with the task name.
+    """
+
+    def __init__(self, lock_service: LockService | None = None) -> None:
         self.tasks: List[Task] = []
         self.is_running = False
+        self.lock_service = lock_service
+        self._stop_requested = asyncio.Event()
+        self._leader_lock = asyncio.Lock()
+        self._is_leading = False
 
-    def schedule_recurring_task(self, task: TaskCallback, interval_seconds: int, skip_first: bool = False) -> None:
+    def schedule_recurring_task(
+            self,
+            task: TaskCallback,
+            interval_seconds: float,
+            skip_first: bool = False,
+            jitter_seconds: float = 0,
+            timeout_seconds: float | None = None,
+    ) -> None:
+        """
+        Schedule `task` every `interval_seconds`.
+
+        Each run starts after a random delay of up to `jitter_seconds`, and is cancelled if it
+        takes longer than `timeout_seconds`.
+        """
         latest_executed = datetime.fromtimestamp(0, tz=timezone.utc)
         if skip_first:
             latest_executed = datetime.now(timezone.utc)
@@ -29,22 +89,111 @@ class TaskScheduler:
         new_task = Task(id=uuid.uuid4(),
                         interval_seconds=interval_seconds,
                         callback=task,
-                        latest_executed=latest_executed)
+                        latest_executed=latest_executed,
+                        name=getattr(task, "__qualname__", repr(task)),
+                        jitter_seconds=jitter_seconds,
+                        timeout_seconds=timeout_seconds)
         self.tasks.append(new_task)
 
+    def metrics(self) -> dict[str, TaskMetrics]:
+        """Counters of the tasks of this scheduler alone, while the registry adds up every scheduler."""
+        return {task.name: task.metrics for task in self.tasks}
+
     async def start(self) -> None:
         self.is_running = True
-        while self.is_running:
-            waiting_seconds = sys.maxsize
-            start_time = datetime.now(timezone.utc)
-            for task in self.tasks:
-                remaining_time = task.latest_executed + timedelta(seconds=task.interval_seconds) - start_time
-                if task.latest_executed + timedelta(seconds=task.interval_seconds) <= start_time:
-                    task.latest_executed = datetime.now(timezone.utc)
-                    await task.callback()
-                waiting_seconds = min(waiting_seconds, int(remaining_time.total_seconds()))
-
-            await asyncio.sleep(waiting_seconds)
+        self._stop_requested.clear()
+        loops = [asyncio.create_task(self._run_recurring_task(task)) for task in self.tasks]
+        try:
+            await self._stop_requested.wait()
+        finally:
+            self.is_running = False
+            for loop in loops:
+                loop.cancel()
+            await asyncio.gather(*loops, return_exceptions=True)
+            if self.lock_service is not None and self._is_leading:
+                self._is_leading = False
+                await self.lock_service.release(LEADER_LOCK_KEY)
 
     async def stop(self) -> None:
         self.is_running = False
+        self._stop_requested.set()
+
+    async def _run_recurring_task(self, task: Task) -> None:
+        loop = asyncio.get_running_loop()
+        remaining = task.latest_executed + timedelta(seconds=task.interval_seconds) - datetime.now(timezone.utc)
+        next_run_at = loop.time() + max(remaining.total_seconds(), 0)
+        current_run: asyncio.Task[None] | None = None
+
+        try:
+            while True:
+                # The lag is measured from the start planned with the jitter, which is a delay on purpose
+                planned_at = next_run_at
+                if task.jitter_seconds > 0:
+                    planned_at += random.uniform(0, task.jitter_seconds)
+                delay = planned_at - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                if not await self._is_leader():
+                    task.metrics.skipped_not_leader_runs += 1
+                    SCHEDULED_TASK_SKIPPED_RUNS.inc((task.name, "not_leader"))
+                elif current_run is not None and not current_run.done():
+                    task.metrics.skipped_overlapping_runs += 1
+                    SCHEDULED_TASK_SKIPPED_RUNS.inc((task.name, "overlapping"))
+                    logging.warning("Skipping run of %s because the previous one is still in progress", task.name)
+                else:
+                    lag = max(loop.time() - planned_at, 0)
+                    current_run = asyncio.create_task(self._execute(task, lag))
+
+                # Skip the ticks that were missed instead of running them back to back
+                now = loop.time()
+                next_run_at += task.interval_seconds
+                if next_run_at <= now:
+                    missed_ticks = int((now - next_run_at) // task.interval_seconds) + 1
+                    next_run_at += missed_ticks * task.interval_seconds
+        finally:
+            if current_run is not None and not current_run.done():
+                current_run.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await current_run
+
+    async def _is_leader(self) -> bool:
+        if self.lock_service is None:
+            return True
+        async with self._leader_lock:
+            try:
+                if not (self._is_leading and await self.lock_service.is_held(LEADER_LOCK_KEY)):
+                    self._is_leading = await self.lock_service.try_acquire(LEADER_LOCK_KEY)
+            except Exception:  # pylint: disable=broad-except
+                logging.exception("Cannot check the scheduler leadership")
+                self._is_leading = False
+            return self._is_leading
+
+    async def _execute(self, task: Task, lag_seconds: float) -> None:
+        loop = asyncio.get_running_loop()
+        metrics = task.metrics
+        metrics.runs += 1
+        metrics.last_lag_seconds = lag_seconds
+        metrics.max_lag_seconds = max(metrics.max_lag_seconds, lag_seconds)
+        SCHEDULED_TASK_LAG.observe((task.name,), lag_seconds)
+        task.latest_executed = datetime.now(timezone.utc)
+
+        started_at = loop.time()
+        outcome = "error"
+        try:
+            await asyncio.wait_for(task.callback(), timeout=task.timeout_seconds)
+            outcome = "ok"
+        except TimeoutError:
+            outcome = "timeout"
+            metrics.timeouts += 1
+            metrics.failures += 1
+            logging.exception("Task %s timed out after %s seconds", task.name, task.timeout_seconds)
+        except Exception:  # pylint: disable=broad-except
+            metrics.failures += 1
+            logging.exception("Task %s failed", task.name)
+        finally:
+            duration = loop.time() - started_at
+            SCHEDULED_TASK_DURATION.observe((task.name, outcome), duration)
+            metrics.last_duration_seconds = duration
+            metrics.max_duration_seconds = max(metrics.max_duration_seconds, duration)
+            metrics.total_duration_seconds += duration
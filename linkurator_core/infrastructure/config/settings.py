@@ -16,6 +16,10 @@ class ApiSettings(BaseModel):
     debug: bool
     reload: bool
     with_gunicorn: bool
+    # Send the time spent in queries, providers and handlers of each request in a Server-Timing header
+    server_timing: bool = False
+    # Requests slower than this are logged with their time breakdown
+    slow_request_ms: int = 1000
 
 
 class AIAgentSettings(BaseModel):
@@ -83,12 +87,24 @@ class PatreonSettings(BaseModel):
     client_secret: str
 
 
+class PostgresReplicaSettings(BaseModel):
+    ip_address: IPv4Address
+    port: int
+
+
 class PostgresSettings(BaseModel):
     ip_address: IPv4Address
     port: int
     user: str
     password: str
     database: str
+    # Streaming replicas serving the feed reads, with the same database and credentials as the primary
+    replicas: list[PostgresReplicaSettings] = []
+    # Seconds the reads of a client go to the primary after it writes, to see its own writes
+    read_your_writes_seconds: int = 5
+    # Queries slower than this are logged, and the plan of a sample of them is captured
+    slow_query_ms: int = 500
+    slow_query_explain_rate: float = 0.1
 
 
 class RabbitMQSettings(BaseModel):
@@ -98,6 +114,36 @@ class RabbitMQSettings(BaseModel):
     password: str
 
 
+class EventBusBackend(StrEnum):
+    RABBITMQ = "rabbitmq"
+    IN_MEMORY = "in_memory"
+
+
+class EventBusSettings(BaseModel):
+    backend: EventBusBackend = EventBusBackend.RABBITMQ
+    max_queue_size: int = 10_000
+    max_concurrent_handlers: int = 10
+    spill_path: str | None = None
+
+
+class TimelineSettings(BaseModel):
+    enabled: bool = False
+    max_subscriptions: int = 500
+    max_age_days: int = 180
+
+
+class MetricsSettings(BaseModel):
+    # Directory where the API workers and the processor write their metrics, to serve them all from /metrics.
+    # Without it, each worker only serves its own metrics
+    directory: str | None = None
+
+
+class EventLoopMonitorSettings(BaseModel):
+    enabled: bool = True
+    # The stack of the event loop is logged when it runs no callback for this long
+    blocked_ms: int = 250
+
+
 class LogfireEnvironment(StrEnum):
     PROD = "prod"
     DEV = "dev"
@@ -150,6 +196,10 @@ class ApplicationSettings(BaseModel):
     patreon: PatreonSettings | None
     postgres: PostgresSettings
     rabbitmq: RabbitMQSettings
+    event_bus: EventBusSettings
+    timeline: TimelineSettings = TimelineSettings()
+    metrics: MetricsSettings = MetricsSettings()
+    event_loop_monitor: EventLoopMonitorSettings = EventLoopMonitorSettings()
     logging: LogSettings
     website: WebsiteSettings
     vpn: VpnSettings
@@ -179,6 +229,10 @@ class ApplicationSettings(BaseModel):
             patreon=patreon_settings,
             postgres=PostgresSettings(**config["postgres"]),
             rabbitmq=RabbitMQSettings(**config["rabbitmq"]),
+            event_bus=EventBusSettings(**config.get("event_bus", {})),
+            timeline=TimelineSettings(**config.get("timeline", {})),
+            metrics=MetricsSettings(**config.get("metrics", {})),
+            event_loop_monitor=EventLoopMonitorSettings(**config.get("event_loop_monitor", {})),
             logging=LogSettings(**config["logging"]),
             website=WebsiteSettings(**config["website"]),
             vpn=VpnSettings(**config["vpn"]),
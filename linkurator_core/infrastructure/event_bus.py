@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from linkurator_core.domain.common.event_bus_service import EventBusService
+from linkurator_core.infrastructure.config.settings import ApplicationSettings, EventBusBackend
+from linkurator_core.infrastructure.in_memory.event_bus import InMemoryEventBus
+from linkurator_core.infrastructure.rabbitmq_event_bus import RabbitMQEventBus
+
+
+def create_event_bus(settings: ApplicationSettings) -> EventBusService:
+    event_bus_settings = settings.event_bus
+    if event_bus_settings.backend == EventBusBackend.IN_MEMORY:
+        return InMemoryEventBus(
+            max_queue_size=event_bus_settings.max_queue_size,
+            max_concurrent_handlers=event_bus_settings.max_concurrent_handlers,
+            spill_path=Path(event_bus_settings.spill_path) if event_bus_settings.spill_path else None,
+        )
+
+    rabbitmq_settings = settings.rabbitmq
+    return RabbitMQEventBus(host=str(rabbitmq_settings.ip_address), port=rabbitmq_settings.port,
+                            username=rabbitmq_settings.user, password=rabbitmq_settings.password)
@@ -1,4 +1,8 @@
 """Main file of the application."""
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from datetime import timedelta
 
 from fastapi.applications import FastAPI
 
@@ -25,6 +29,8 @@ from linkurator_core.application.items.get_followed_subscriptions_items_handler
 from linkurator_core.application.items.get_item_handler import GetItemHandler
 from linkurator_core.application.items.get_subscription_items_handler import GetSubscriptionItemsHandler
 from linkurator_core.application.items.get_topic_items_handler import GetTopicItemsHandler
+from linkurator_core.application.items.user_timeline import UserTimeline
+from linkurator_core.application.search.search_by_name_handler import SearchByNameHandler
 from linkurator_core.application.statistics.get_platform_statistics import GetPlatformStatisticsHandler
 from linkurator_core.application.subscriptions.find_subscription_by_name_or_url_handler import (
     FindSubscriptionsByNameOrUrlHandler,
@@ -66,12 +72,14 @@ from linkurator_core.application.users.update_patreon_user_subscriptions_handler
 )
 from linkurator_core.application.users.update_user_subscriptions_handler import UpdateYoutubeUserSubscriptionsHandler
 from linkurator_core.application.users.upsert_user_filter_handler import UpsertUserFilterHandler
+from linkurator_core.domain.common.event_bus_service import EventBusService
 from linkurator_core.domain.subscriptions.general_subscription_service import GeneralSubscriptionService
 from linkurator_core.domain.subscriptions.subscription_service import SubscriptionService
 from linkurator_core.domain.users.password_change_request import PasswordChangeRequest
 from linkurator_core.domain.users.registration_request import RegistrationRequest
 from linkurator_core.infrastructure.asyncio_impl.http_client import AsyncHttpClient
-from linkurator_core.infrastructure.config.settings import ApplicationSettings
+from linkurator_core.infrastructure.config.settings import ApplicationSettings, EventBusBackend
+from linkurator_core.infrastructure.event_bus import create_event_bus
 from linkurator_core.infrastructure.fastapi.create_app import Handlers, create_app_from_handlers
 from linkurator_core.infrastructure.google.account_service import GoogleAccountService, GoogleDomainAccountService
 from linkurator_core.infrastructure.google.gmail_email_sender import GmailEmailSender
@@ -79,31 +87,37 @@ from linkurator_core.infrastructure.google.youtube_api_client import YoutubeApiC
 from linkurator_core.infrastructure.google.youtube_rss_client import YoutubeRssClient
 from linkurator_core.infrastructure.google.youtube_service import YoutubeService
 from linkurator_core.infrastructure.logger import configure_logging
+from linkurator_core.infrastructure.loop_monitor import monitoring_event_loop
+from linkurator_core.infrastructure.memory_profiler import recording_memory
+from linkurator_core.infrastructure.metrics import instrument_handlers, metrics
 from linkurator_core.infrastructure.patreon.patreon_api_client import PatreonApiClient
 from linkurator_core.infrastructure.patreon.patreon_service import PatreonSubscriptionService
 from linkurator_core.infrastructure.postgres.chat_repository import PostgresChatRepository
+from linkurator_core.infrastructure.postgres.common import PostgresReplica
 from linkurator_core.infrastructure.postgres.item_repository import PostgresItemRepository
 from linkurator_core.infrastructure.postgres.password_change_request_repository import (
     PostgresPasswordChangeRequestRepository,
 )
+from linkurator_core.infrastructure.postgres.query_statistics import query_statistics
 from linkurator_core.infrastructure.postgres.registration_request_repository import (
     PostgresRegistrationRequestRepository,
 )
 from linkurator_core.infrastructure.postgres.rss_data_repository import PostgresRssDataRepository
 from linkurator_core.infrastructure.postgres.session_repository import PostgresSessionRepository
 from linkurator_core.infrastructure.postgres.subscription_repository import PostgresSubscriptionRepository
+from linkurator_core.infrastructure.postgres.timeline_repository import PostgresTimelineRepository
 from linkurator_core.infrastructure.postgres.topic_repository import PostgresTopicRepository
 from linkurator_core.infrastructure.postgres.user_filter_repository import PostgresUserFilterRepository
 from linkurator_core.infrastructure.postgres.user_repository import PostgresUserRepository
-from linkurator_core.infrastructure.rabbitmq_event_bus import RabbitMQEventBus
 from linkurator_core.infrastructure.rss.rss_feed_client import RssFeedClient
 from linkurator_core.infrastructure.rss.rss_service import RssSubscriptionService
 from linkurator_core.infrastructure.spotify.spotify_api_client import SpotifyApiClient, SpotifyCredentials
 from linkurator_core.infrastructure.spotify.spotify_service import SpotifySubscriptionService
+from linkurator_core.processor import run_processor
 
 
-def app_handlers() -> Handlers:
-    settings = ApplicationSettings.from_file()
+def app_handlers(event_bus: EventBusService, settings: ApplicationSettings | None = None) -> Handlers:
+    settings = settings or ApplicationSettings.from_file()
 
     account_service = GoogleAccountService(
         client_id=settings.google.oauth.web.client_id,
@@ -114,6 +128,7 @@ def app_handlers() -> Handlers:
     )
 
     db_settings = settings.postgres
+    replicas = [PostgresReplica(replica.ip_address, replica.port) for replica in db_settings.replicas]
     user_repository = PostgresUserRepository(
         ip=db_settings.ip_address, port=db_settings.port, db_name=db_settings.database,
         username=db_settings.user, password=db_settings.password)
@@ -122,10 +137,10 @@ def app_handlers() -> Handlers:
         username=db_settings.user, password=db_settings.password)
     subscription_repository = PostgresSubscriptionRepository(
         ip=db_settings.ip_address, port=db_settings.port, db_name=db_settings.database,
-        username=db_settings.user, password=db_settings.password)
+        username=db_settings.user, password=db_settings.password, replicas=replicas)
     item_repository = PostgresItemRepository(
         ip=db_settings.ip_address, port=db_settings.port, db_name=db_settings.database,
-        username=db_settings.user, password=db_settings.password)
+        username=db_settings.user, password=db_settings.password, replicas=replicas)
     topic_repository = PostgresTopicRepository(
         ip=db_settings.ip_address, port=db_settings.port, db_name=db_settings.database,
         username=db_settings.user, password=db_settings.password)
@@ -144,6 +159,15 @@ def app_handlers() -> Handlers:
     rss_data_repository = PostgresRssDataRepository(
         ip=db_settings.ip_address, port=db_settings.port, db_name=db_settings.database,
         username=db_settings.user, password=db_settings.password)
+    user_timeline: UserTimeline | None = None
+    if settings.timeline.enabled:
+        user_timeline = UserTimeline(
+            timeline_repository=PostgresTimelineRepository(
+                ip=db_settings.ip_address, port=db_settings.port, db_name=db_settings.database,
+                username=db_settings.user, password=db_settings.password, replicas=replicas),
+            max_subscriptions=settings.timeline.max_subscriptions,
+            max_age=timedelta(days=settings.timeline.max_age_days),
+            event_bus=event_bus)
 
     http_client = AsyncHttpClient(contact_email=settings.google.service_account_email)
     proxy_http_client = http_client
@@ -208,10 +232,6 @@ def app_handlers() -> Handlers:
 
     general_subscription_service = GeneralSubscriptionService(services=subscription_services)
 
-    rabbitmq_settings = settings.rabbitmq
-    event_bus = RabbitMQEventBus(host=str(rabbitmq_settings.ip_address), port=rabbitmq_settings.port,
-                                 username=rabbitmq_settings.user, password=rabbitmq_settings.password)
-
     google_domain_service = GoogleDomainAccountService(
         service_credentials=settings.google.email_service_credentials,
         email=settings.google.service_account_email,
@@ -243,9 +263,9 @@ def app_handlers() -> Handlers:
         google_client=account_service,
         google_youtube_client=youtube_account_service,
         get_user_subscriptions=GetUserSubscriptionsHandler(subscription_repository, user_repository),
-        follow_subscription_handler=FollowSubscriptionHandler(subscription_repository, user_repository),
+        follow_subscription_handler=FollowSubscriptionHandler(subscription_repository, user_repository, user_timeline),
         unfollow_subscription_handler=UnfollowSubscriptionHandler(
-            subscription_repository, user_repository, topic_repository),
+            subscription_repository, user_repository, topic_repository, user_timeline),
         get_subscription=GetSubscriptionHandler(subscription_repository),
         get_subscription_items_handler=GetSubscriptionItemsHandler(
             user_repository=user_repository,
@@ -264,7 +284,7 @@ def app_handlers() -> Handlers:
         get_user_profile_handler=GetUserProfileHandler(user_repository),
         edit_user_profile_handler=EditUserProfile(user_repository),
         find_user_handler=FindCuratorHandler(user_repository),
-        delete_user_handler=DeleteUserHandler(user_repository, session_repository, account_service),
+        delete_user_handler=DeleteUserHandler(user_repository, session_repository, account_service, user_timeline),
         get_curators_handler=GetCuratorsHandler(user_repository),
         find_subscriptions_by_name_handler=FindSubscriptionsByNameOrUrlHandler(
             subscription_repository=subscription_repository,
@@ -342,7 +362,8 @@ def app_handlers() -> Handlers:
         get_followed_subscriptions_items_handler=GetFollowedSubscriptionsItemsHandler(
             item_repository=item_repository,
             subscription_repository=subscription_repository,
-            user_repository=user_repository),
+            user_repository=user_repository,
+            user_timeline=user_timeline),
         get_platform_statistics=GetPlatformStatisticsHandler(
             user_repository=user_repository,
             subscription_repository=subscription_repository,
@@ -376,10 +397,61 @@ def app_handlers() -> Handlers:
         get_user_filter_handler=GetUserFilterHandler(user_filter_repository=user_filter_repository),
         upsert_user_filter_handler=UpsertUserFilterHandler(user_filter_repository=user_filter_repository),
         delete_user_filter_handler=DeleteUserFilterHandler(user_filter_repository=user_filter_repository),
+        search_by_name_handler=SearchByNameHandler(
+            user_repository=user_repository,
+            topic_repository=topic_repository,
+            subscription_repository=subscription_repository,
+        ),
     )
 
 
 def create_app() -> FastAPI:
-    configure_logging(ApplicationSettings.from_file().logging)
+    settings = ApplicationSettings.from_file()
+    configure_logging(settings.logging)
+    if settings.event_bus.backend == EventBusBackend.IN_MEMORY and settings.api.workers > 1:
+        # Every worker would run its own processor and handle only the events it published itself
+        msg = f"The in-memory event bus needs a single API worker, but {settings.api.workers} are configured"
+        raise ValueError(msg)
+    query_statistics.configure(
+        settings.postgres.slow_query_ms,
+        settings.postgres.slow_query_explain_rate,
+        trace_queries=settings.logging.logfire.enabled,
+    )
+    metrics.configure(settings.metrics.directory)
 
-    return create_app_from_handlers(app_handlers())
+    event_bus = create_event_bus(settings)
+    handlers = app_handlers(event_bus)
+    instrument_handlers(handlers)
+    read_your_writes_seconds = settings.postgres.read_your_writes_seconds
+    loop_monitor_settings = settings.event_loop_monitor
+
+    # Events published by the API are only seen by handlers in the same process, so the
+    # processor runs alongside the API, in the single worker allowed in this mode.
+    @contextlib.asynccontextmanager
+    async def run_processor_in_process() -> AsyncIterator[None]:
+        processor_task = asyncio.create_task(run_processor(event_bus=event_bus))
+        try:
+            yield
+        finally:
+            await event_bus.stop()
+            processor_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await processor_task
+
+    @contextlib.asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        async with contextlib.AsyncExitStack() as stack:
+            await stack.enter_async_context(recording_memory("api"))
+            if loop_monitor_settings.enabled:
+                await stack.enter_async_context(monitoring_event_loop("api", loop_monitor_settings.blocked_ms))
+            if settings.event_bus.backend == EventBusBackend.IN_MEMORY:
+                await stack.enter_async_context(run_processor_in_process())
+            yield
+
+    return create_app_from_handlers(
+        handlers,
+        lifespan=lifespan,
+        read_your_writes_seconds=read_your_writes_seconds,
+        server_timing=settings.api.server_timing,
+        slow_request_ms=settings.api.slow_request_ms,
+    )
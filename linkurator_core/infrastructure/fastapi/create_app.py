@@ -2,10 +2,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import AsyncContextManager, Callable
 
-from fastapi import Depends, Request
+from fastapi import Depends, Query, Request, status
 from fastapi.applications import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from linkurator_core.application.auth.change_password_from_request import ChangePasswordFromRequest
 from linkurator_core.application.auth.register_new_user_with_email import RegisterNewUserWithEmail
@@ -30,6 +32,7 @@ from linkurator_core.application.items.get_followed_subscriptions_items_handler
 from linkurator_core.application.items.get_item_handler import GetItemHandler
 from linkurator_core.application.items.get_subscription_items_handler import GetSubscriptionItemsHandler
 from linkurator_core.application.items.get_topic_items_handler import GetTopicItemsHandler
+from linkurator_core.application.search.search_by_name_handler import SearchByNameHandler
 from linkurator_core.application.statistics.get_platform_statistics import (
     GetPlatformStatisticsHandler,
     PlatformStatistics,
@@ -75,6 +78,12 @@ from linkurator_core.application.users.update_patreon_user_subscriptions_handler
 from linkurator_core.application.users.update_user_subscriptions_handler import UpdateYoutubeUserSubscriptionsHandler
 from linkurator_core.application.users.upsert_user_filter_handler import UpsertUserFilterHandler
 from linkurator_core.domain.users.session import Session
+from linkurator_core.infrastructure.fastapi.metrics_middleware import MetricsMiddleware
+from linkurator_core.infrastructure.fastapi.models import default_responses
+from linkurator_core.infrastructure.fastapi.models.default_responses import EmptyResponse
+from linkurator_core.infrastructure.fastapi.models.memory import MemoryReportSchema
+from linkurator_core.infrastructure.fastapi.models.query_statistics import StatementStatisticsSchema
+from linkurator_core.infrastructure.fastapi.read_your_writes import ReadYourWritesMiddleware
 from linkurator_core.infrastructure.fastapi.routers import (
     authentication,
     chats,
@@ -82,13 +91,19 @@ from linkurator_core.infrastructure.fastapi.routers import (
     items,
     profile,
     providers,
+    search,
     subscriptions,
     topics,
     user_filter,
 )
 from linkurator_core.infrastructure.fastapi.routers.authentication import check_basic_auth
+from linkurator_core.infrastructure.fastapi.server_timing import ServerTimingMiddleware
 from linkurator_core.infrastructure.google.account_service import GoogleAccountService
+from linkurator_core.infrastructure.memory_profiler import MemoryTracingNotStartedError, memory_tracer
+from linkurator_core.infrastructure.metrics import metrics
 from linkurator_core.infrastructure.patreon.patreon_api_client import PatreonApiClient
+from linkurator_core.infrastructure.postgres.query_statistics import query_statistics
+from linkurator_core.infrastructure.profiler import MAX_PROFILE_SECONDS, ProfilerAlreadyRunningError, profile_event_loop
 
 
 @dataclass
@@ -150,10 +165,20 @@ class Handlers:  # pylint: disable=too-many-instance-attributes
     get_user_filter_handler: GetUserFilterHandler
     upsert_user_filter_handler: UpsertUserFilterHandler
     delete_user_filter_handler: DeleteUserFilterHandler
+    search_by_name_handler: SearchByNameHandler
 
 
-def create_app_from_handlers(handlers: Handlers) -> FastAPI:
-    app = FastAPI(title="Linkurator API", version="0.1.0")
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def create_app_from_handlers(
+        handlers: Handlers,
+        lifespan: Callable[[FastAPI], AsyncContextManager[None]] | None = None,
+        read_your_writes_seconds: int = 5,
+        server_timing: bool = False,
+        slow_request_ms: int = 1000,
+) -> FastAPI:
+    app = FastAPI(title="Linkurator API", version="0.1.0", lifespan=lifespan)
 
     async def get_current_session(request: Request) -> Session | None:
         token = request.cookies.get("token")
@@ -177,6 +202,72 @@ def create_app_from_handlers(handlers: Handlers) -> FastAPI:
         """Returns platform statistics."""
         return await handlers.get_platform_statistics.handle()
 
+    @app.get("/metrics", tags=["API Status"], response_class=PlainTextResponse)
+    async def metrics_endpoint(
+            _: None = Depends(check_basic_auth),
+    ) -> PlainTextResponse:
+        """Returns the latency histograms of the routes, handlers, provider calls and events in the Prometheus format."""
+        return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    @app.get("/profiler", tags=["API Status"], response_class=PlainTextResponse)
+    async def profile_worker(
+            seconds: float = Query(default=10, gt=0, le=MAX_PROFILE_SECONDS),
+            interval_ms: float = Query(default=5, ge=1, le=1000),
+            _: None = Depends(check_basic_auth),
+    ) -> PlainTextResponse:
+        """
+        Samples the stacks of the worker serving the request for the given seconds, including every other request
+        it serves meanwhile. Returns them in the collapsed format of flamegraph.pl and speedscope.
+        """
+        try:
+            stacks = await profile_event_loop(seconds, interval_ms / 1000)
+        except ProfilerAlreadyRunningError as error:
+            raise default_responses.conflict(str(error)) from error
+        return PlainTextResponse(stacks)
+
+    @app.post("/memory/tracing", tags=["API Status"], status_code=status.HTTP_204_NO_CONTENT)
+    async def start_memory_tracing(
+            _: None = Depends(check_basic_auth),
+    ) -> EmptyResponse:
+        """Starts tracing the memory allocations of the worker serving the request. It slows down the worker."""
+        memory_tracer.start()
+        return EmptyResponse()
+
+    @app.delete("/memory/tracing", tags=["API Status"], status_code=status.HTTP_204_NO_CONTENT)
+    async def stop_memory_tracing(
+            _: None = Depends(check_basic_auth),
+    ) -> EmptyResponse:
+        """Stops tracing the memory allocations of the worker serving the request."""
+        memory_tracer.stop()
+        return EmptyResponse()
+
+    @app.post("/memory/snapshots", tags=["API Status"])
+    async def snapshot_memory(
+            limit: int = Query(default=30, ge=1, le=1000),
+            _: None = Depends(check_basic_auth),
+    ) -> MemoryReportSchema:
+        """
+        Returns the memory of the worker serving the request, and the modules that allocated the most memory
+        since the previous snapshot. The memory tracing must have been started in the worker.
+        """
+        try:
+            report = memory_tracer.snapshot(limit)
+        except MemoryTracingNotStartedError as error:
+            raise default_responses.conflict(str(error)) from error
+        return MemoryReportSchema.from_memory_report(report)
+
+    @app.get("/statistics/queries", tags=["API Status"])
+    async def query_statistics_endpoint(
+            limit: int = Query(default=50, ge=1, le=1000),
+            _: None = Depends(check_basic_auth),
+    ) -> list[StatementStatisticsSchema]:
+        """
+        Returns the statistics of the database queries run by the worker serving the request,
+        the statements taking the most time in total first.
+        """
+        return [StatementStatisticsSchema.from_statement_statistics(statement)
+                for statement in query_statistics.statements()[:limit]]
+
     app.include_router(
         tags=["Authentication"],
         router=authentication.get_router(
@@ -293,7 +384,17 @@ def create_app_from_handlers(handlers: Handlers) -> FastAPI:
         ),
         prefix="/filters",
     )
+    app.include_router(
+        tags=["Search"],
+        router=search.get_router(
+            get_session=get_current_session,
+            get_user_profile_handler=handlers.get_user_profile_handler,
+            search_by_name_handler=handlers.search_by_name_handler,
+        ),
+        prefix="/search",
+    )
 
+    app.add_middleware(ReadYourWritesMiddleware, window_seconds=read_your_writes_seconds)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["http://localhost:3000", "https://localhost",
@@ -302,5 +403,7 @@ def create_app_from_handlers(handlers: Handlers) -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(ServerTimingMiddleware, send_header=server_timing, slow_request_ms=slow_request_ms)
+    app.add_middleware(MetricsMiddleware)
 
     return app
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from linkurator_core.infrastructure.metrics import HTTP_REQUEST_DURATION, metrics
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Records the duration of the requests by method, route template and status code. The requests not matching
+    any route share a label, so scanners trying random paths do not create a series for each path.
+    While the application runs, the metrics of the worker are written to the shared directory every few seconds.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._run_with_flushing(scope, receive, send)
+            return
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            route_path = route.path if route is not None else UNMATCHED_ROUTE
+            HTTP_REQUEST_DURATION.observe((scope["method"], route_path, str(status)), time.perf_counter() - start)
+
+    async def _run_with_flushing(self, scope: Scope, receive: Receive, send: Send) -> None:
+        flushing = asyncio.create_task(metrics.flush_periodically())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            flushing.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await flushing
+            metrics.flush()
@@ -15,6 +15,7 @@ from linkurator_core.domain.users.user import User
 from linkurator_core.infrastructure.fastapi.models.curator import CuratorSchema
 from linkurator_core.infrastructure.fastapi.models.schema import Iso8601Datetime
 from linkurator_core.infrastructure.fastapi.models.subscription import SubscriptionSchema
+from linkurator_core.infrastructure.request_timing import timed_section
 
 
 class RecommendedBySchema(BaseModel):
@@ -60,40 +61,41 @@ class ItemSchema(BaseModel):
         user_interactions: list[Interaction] | None = None,
         curator_interactions: list[CuratorInteractions] | None = None,
     ) -> ItemSchema:
-        user_interactions = [
-            interaction for interaction in user_interactions or [] if interaction.item_uuid == item.uuid
-        ]
-        recommended = any(reaction.type == InteractionType.RECOMMENDED for reaction in user_interactions)
-        discouraged = any(reaction.type == InteractionType.DISCOURAGED for reaction in user_interactions)
-        viewed = any(reaction.type == InteractionType.VIEWED for reaction in user_interactions)
-        hidden = any(reaction.type == InteractionType.HIDDEN for reaction in user_interactions)
-
-        recommended_by: list[RecommendedBySchema] = []
-        curator_interactions = curator_interactions or []
-        for curator_interaction in curator_interactions:
-            for interaction in curator_interaction.interactions:
-                if interaction.type == InteractionType.RECOMMENDED and interaction.item_uuid == item.uuid:
-                    recommended_by.append(
-                        RecommendedBySchema.from_domain(curator_interaction.curator, interaction.created_at),
-                    )
-
-        return cls(
-            uuid=item.uuid,
-            subscription_uuid=item.subscription_uuid,
-            subscription=SubscriptionSchema.from_domain_subscription(subscription, None),
-            name=item.name,
-            description=item.description,
-            url=item.url,
-            thumbnail=item.thumbnail,
-            created_at=item.created_at,
-            published_at=item.published_at,
-            recommended=recommended,
-            discouraged=discouraged,
-            viewed=viewed,
-            hidden=hidden,
-            duration=item.duration,
-            recommended_by=recommended_by,
-        )
+        with timed_section("schema"):
+            user_interactions = [
+                interaction for interaction in user_interactions or [] if interaction.item_uuid == item.uuid
+            ]
+            recommended = any(reaction.type == InteractionType.RECOMMENDED for reaction in user_interactions)
+            discouraged = any(reaction.type == InteractionType.DISCOURAGED for reaction in user_interactions)
+            viewed = any(reaction.type == InteractionType.VIEWED for reaction in user_interactions)
+            hidden = any(reaction.type == InteractionType.HIDDEN for reaction in user_interactions)
+
+            recommended_by: list[RecommendedBySchema] = []
+            curator_interactions = curator_interactions or []
+            for curator_interaction in curator_interactions:
+                for interaction in curator_interaction.interactions:
+                    if interaction.type == InteractionType.RECOMMENDED and interaction.item_uuid == item.uuid:
+                        recommended_by.append(
+                            RecommendedBySchema.from_domain(curator_interaction.curator, interaction.created_at),
+                        )
+
+            return cls(
+                uuid=item.uuid,
+                subscription_uuid=item.subscription_uuid,
+                subscription=SubscriptionSchema.from_domain_subscription(subscription, None),
+                name=item.name,
+                description=item.description,
+                url=item.url,
+                thumbnail=item.thumbnail,
+                created_at=item.created_at,
+                published_at=item.published_at,
+                recommended=recommended,
+                discouraged=discouraged,
+                viewed=viewed,
+                hidden=hidden,
+                duration=item.duration,
+                recommended_by=recommended_by,
+            )
 
 
 class InteractionFilterSchema(Enum):
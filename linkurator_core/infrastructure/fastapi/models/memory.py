@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from linkurator_core.infrastructure.memory_profiler import AllocationSite, MemoryReport
+
+
+class AllocationSiteSchema(BaseModel):
+    """Memory allocated by the code of a module and still alive, and its change since the previous snapshot."""
+
+    module: str
+    size_bytes: int
+    size_diff_bytes: int
+    count: int
+    count_diff: int
+
+    @classmethod
+    def from_allocation_site(cls, site: AllocationSite) -> AllocationSiteSchema:
+        return cls(
+            module=site.module,
+            size_bytes=site.size_bytes,
+            size_diff_bytes=site.size_diff_bytes,
+            count=site.count,
+            count_diff=site.count_diff,
+        )
+
+
+class MemoryReportSchema(BaseModel):
+    """Memory of the worker serving the request, with the modules allocating the most since the previous snapshot."""
+
+    resident_bytes: int
+    traced_bytes: int
+    traced_peak_bytes: int
+    compared_to: datetime | None
+    sites: list[AllocationSiteSchema]
+
+    @classmethod
+    def from_memory_report(cls, report: MemoryReport) -> MemoryReportSchema:
+        return cls(
+            resident_bytes=report.resident_bytes,
+            traced_bytes=report.traced_bytes,
+            traced_peak_bytes=report.traced_peak_bytes,
+            compared_to=report.compared_to,
+            sites=[AllocationSiteSchema.from_allocation_site(site) for site in report.sites],
+        )
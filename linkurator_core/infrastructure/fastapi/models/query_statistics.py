@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from linkurator_core.infrastructure.postgres.query_statistics import StatementStatistics
+
+
+class StatementStatisticsSchema(BaseModel):
+    """Latency, rows and pool wait of a query statement run by the worker serving the request."""
+
+    template: str
+    calls: int
+    total_ms: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    mean_rows: float
+    mean_pool_wait_ms: float
+    slow_calls: int
+    plan: str | None
+    plan_captured_at: datetime | None
+
+    @classmethod
+    def from_statement_statistics(cls, statement: StatementStatistics) -> StatementStatisticsSchema:
+        calls = max(statement.calls, 1)
+        return cls(
+            template=statement.template,
+            calls=statement.calls,
+            total_ms=statement.total_ms,
+            mean_ms=statement.total_ms / calls,
+            p50_ms=statement.percentile_ms(0.5),
+            p95_ms=statement.percentile_ms(0.95),
+            p99_ms=statement.percentile_ms(0.99),
+            max_ms=statement.max_ms,
+            mean_rows=statement.rows / calls,
+            mean_pool_wait_ms=statement.pool_wait_ms / calls,
+            slow_calls=statement.slow_calls,
+            plan=statement.plan,
+            plan_captured_at=statement.plan_captured_at,
+        )
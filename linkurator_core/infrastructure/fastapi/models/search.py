@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from linkurator_core.application.search.search_by_name_handler import SearchResults
+from linkurator_core.domain.users.user import User
+from linkurator_core.infrastructure.fastapi.models.curator import CuratorSchema
+from linkurator_core.infrastructure.fastapi.models.subscription import SubscriptionSchema
+from linkurator_core.infrastructure.fastapi.models.topic import TopicSchema
+
+
+class SearchResultsSchema(BaseModel):
+    """Curators, topics and subscriptions whose name contains the searched text."""
+
+    curators: list[CuratorSchema]
+    topics: list[TopicSchema]
+    subscriptions: list[SubscriptionSchema]
+
+    @classmethod
+    def from_domain_results(cls, results: SearchResults, user: User | None) -> SearchResultsSchema:
+        followed_curators = set() if user is None else user.curators
+        return cls(
+            curators=[CuratorSchema.from_domain_user(curator, curator.uuid in followed_curators)
+                      for curator in results.curators],
+            topics=[TopicSchema.from_domain_topic(element.topic, element.curator, user)
+                    for element in results.topics],
+            subscriptions=[SubscriptionSchema.from_domain_subscription(subscription, user)
+                           for subscription in results.subscriptions],
+        )
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from linkurator_core.infrastructure.postgres.common import reads_from_primary
+
+PRIMARY_READS_COOKIE_NAME = "primary_reads_until"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReadYourWritesMiddleware:
+    """
+    Sends the reads of a client to the primary database while it writes and for a few seconds afterwards,
+    so it sees its own writes even if the replicas have not replayed them yet. The deadline is kept in
+    a cookie, so it applies whichever worker serves the next requests.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: int) -> None:
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        now = time.time()
+        writes = scope["method"] not in SAFE_METHODS
+        if not writes and _primary_reads_deadline(scope) <= now:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_deadline(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{PRIMARY_READS_COOKIE_NAME}={now + self.window_seconds:.3f}; "
+                    f"Max-Age={self.window_seconds}; Path=/",
+                )
+            await send(message)
+
+        with reads_from_primary():
+            await self.app(scope, receive, send_with_deadline if writes else send)
+
+
+def _primary_reads_deadline(scope: Scope) -> float:
+    try:
+        return float(HTTPConnection(scope).cookies.get(PRIMARY_READS_COOKIE_NAME, 0))
+    except ValueError:
+        return 0
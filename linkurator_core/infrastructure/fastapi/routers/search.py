@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Annotated, Any, Callable, Coroutine
+
+from fastapi import APIRouter, Depends, Query, Request, status
+
+from linkurator_core.application.search.search_by_name_handler import SearchByNameHandler
+from linkurator_core.application.users.get_user_profile_handler import GetUserProfileHandler
+from linkurator_core.domain.users.session import Session
+from linkurator_core.domain.users.user import User
+from linkurator_core.infrastructure.fastapi.models.search import SearchResultsSchema
+
+MAX_SEARCH_LIMIT = 50
+
+
+def get_router(
+        get_session: Callable[[Request], Coroutine[Any, Any, Session | None]],
+        get_user_profile_handler: GetUserProfileHandler,
+        search_by_name_handler: SearchByNameHandler,
+) -> APIRouter:
+    router = APIRouter()
+
+    @router.get("/",
+                status_code=status.HTTP_200_OK,
+                )
+    async def search_by_name(
+            text: str,
+            limit: Annotated[int, Query(ge=1, le=MAX_SEARCH_LIMIT)] = 10,
+            session: Session | None = Depends(get_session),
+    ) -> SearchResultsSchema:
+        """
+        Search as you type the curators, topics and subscriptions by name
+        :param text: Text contained in the names. With less than three characters, the beginning of the names
+        :param limit: Maximum number of curators, topics and subscriptions returned. The most similar names first
+        :return: The curators, topics and subscriptions found
+        """
+
+        async def get_user_profile(session: Session | None) -> User | None:
+            if session is None:
+                return None
+            return await get_user_profile_handler.handle(session.user_id)
+
+        user, results = await asyncio.gather(
+            get_user_profile(session),
+            search_by_name_handler.handle(text=text, limit=limit),
+        )
+        return SearchResultsSchema.from_domain_results(results, user)
+
+    return router
@@ -33,6 +33,8 @@ from linkurator_core.domain.common.exceptions import (
     SubscriptionAlreadyUpdatedError,
     SubscriptionNotFoundError,
 )
+from linkurator_core.domain.items.item_repository import ItemOrdering
+from linkurator_core.domain.items.timeline_repository import TimelineCursor
 from linkurator_core.domain.users.session import Session
 from linkurator_core.domain.users.user import User
 from linkurator_core.infrastructure.fastapi.models import default_responses
@@ -87,6 +89,7 @@ def get_router(  # pylint: disable=too-many-statements
             max_duration: int | None = None,
             include_interactions: Annotated[str | None, Query(
                 description=f"Comma separated values. Valid values: {VALID_INTERACTIONS}")] = None,
+            cursor: str | None = None,
             session: Session | None = Depends(get_session),
     ) -> Page[ItemSchema]:
         """
@@ -99,6 +102,7 @@ def get_router(  # pylint: disable=too-many-statements
         :param min_duration: Filter elements with a duration greater than this value (query parameter)
         :param max_duration: Filter elements with a duration lower than this value (query parameter)
         :param include_interactions: Filter elements by interactions (query parameter)
+        :param cursor: Position of the last element of the previous page, given in the next page url
         :param session: The session of the logged user
         :return: A page with the items. UNAUTHORIZED status code if the session is invalid.
         """
@@ -108,6 +112,12 @@ def get_router(  # pylint: disable=too-many-statements
         if created_before_ts is None:
             created_before_ts = datetime.now(tz=timezone.utc).timestamp()
 
+        try:
+            after = TimelineCursor.parse(cursor) if cursor is not None else None
+        except ValueError as error:
+            msg = "Invalid cursor"
+            raise default_responses.bad_request(msg) from error
+
         try:
             interactions = None
             if include_interactions is not None:
@@ -132,15 +142,16 @@ def get_router(  # pylint: disable=too-many-statements
             include_discouraged_items=_include_interaction(InteractionFilterSchema.DISCOURAGED),
             include_viewed_items=_include_interaction(InteractionFilterSchema.VIEWED),
             include_hidden_items=_include_interaction(InteractionFilterSchema.HIDDEN),
+            after=after,
         )
 
-        current_url = request.url.include_query_params(
+        current_url = request.url.remove_query_params("cursor").include_query_params(
             page_number=page_number,
             page_size=page_size,
             created_before_ts=created_before_ts,
         )
 
-        return Page[ItemSchema].create(
+        page = Page[ItemSchema].create(
             elements=[
                 ItemSchema.from_domain_item(
                     item=item_with_sub.item,
@@ -152,6 +163,13 @@ def get_router(  # pylint: disable=too-many-statements
             page_number=page_number,
             page_size=page_size,
             current_url=current_url)
+        if page.next_page is not None:
+            # The next page of a timeline starts after the last item of this one
+            page.next_page = Page.next_page_url(
+                current_url=current_url.include_query_params(cursor=str(TimelineCursor.of(response.items[-1].item))),
+                current_page_number=page_number,
+                page_size=page_size)
+        return page
 
     @router.get("/",
                 responses={
@@ -290,6 +308,7 @@ def get_router(  # pylint: disable=too-many-statements
             max_duration: int | None = None,
             include_interactions: Annotated[str | None, Query(
                 description=f"Comma separated values. Valid values: {VALID_INTERACTIONS}")] = None,
+            order_by: ItemOrdering = ItemOrdering.PUBLISHED_AT,
             session: Session | None = Depends(get_session),
     ) -> Page[ItemSchema]:
         """
@@ -303,6 +322,7 @@ def get_router(  # pylint: disable=too-many-statements
         :param min_duration: Filter elements with a duration greater than this value (query parameter)
         :param max_duration: Filter elements with a duration lower than this value (query parameter)
         :param include_interactions: Filter elements by interactions (query parameter)
+        :param order_by: Sort the elements matching the search by relevance instead of by date (query parameter)
         :param session: The session of the logged user
         :return: A page with the items. UNAUTHORIZED status code if the session is invalid.
         """
@@ -334,6 +354,7 @@ def get_router(  # pylint: disable=too-many-statements
             include_discouraged_items=_include_interaction(InteractionFilterSchema.DISCOURAGED),
             include_viewed_items=_include_interaction(InteractionFilterSchema.VIEWED),
             include_hidden_items=_include_interaction(InteractionFilterSchema.HIDDEN),
+            order_by=order_by,
         )
 
         current_url = request.url.include_query_params(
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from linkurator_core.infrastructure.request_timing import collect_request_timing
+
+
+class ServerTimingMiddleware:
+    """
+    Collects where the time of each request goes: queries, repository methods, provider calls, handlers and
+    schemas. The breakdown is sent in a Server-Timing header when enabled, and logged for the slow requests.
+    """
+
+    def __init__(self, app: ASGIApp, send_header: bool, slow_request_ms: int) -> None:
+        self.app = app
+        self.send_header = send_header
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        with collect_request_timing() as timing:
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("server-timing", timing.server_timing((time.perf_counter() - start) * 1000))
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing if self.send_header else send)
+
+        total_ms = (time.perf_counter() - start) * 1000
+        if total_ms >= self.slow_request_ms:
+            logging.warning("Slow request %s %s took %.0f ms: %s",
+                            scope["method"], scope["path"], total_ms, timing.server_timing(total_ms))
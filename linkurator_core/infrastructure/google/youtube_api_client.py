@@ -11,6 +11,8 @@ import aiohttp
 import backoff
 from unidecode import unidecode
 
+from linkurator_core.infrastructure.metrics import provider_call
+
 MAX_VIDEOS_PER_QUERY = 50
 
 
@@ -88,6 +90,7 @@ class YoutubeApiClient:
     def __init__(self) -> None:
         self.base_url = "https://youtube.googleapis.com/youtube/v3"
 
+    @provider_call("youtube")
     async def get_youtube_user_channel(self, access_token: str) -> YoutubeChannel | None:
         response_json, status_code = await self._request_youtube_user_channel(access_token)
         if status_code != 200:
@@ -99,6 +102,7 @@ class YoutubeApiClient:
 
         return YoutubeChannel.from_dict(items[0])
 
+    @provider_call("youtube")
     async def get_youtube_subscriptions(self, access_token: str, api_key: str) -> list[YoutubeChannel]:
         next_page_token = None
         subscriptions: list[YoutubeChannel] = []
@@ -132,6 +136,7 @@ class YoutubeApiClient:
 
         return subscriptions
 
+    @provider_call("youtube")
     async def get_youtube_channel_from_name(self, api_key: str, channel_name: str) -> YoutubeChannel | None:
         channel_response_json, channel_status_code = await self._request_youtube_channels_from_name(
             api_key, channel_name)
@@ -143,6 +148,7 @@ class YoutubeApiClient:
         items = channel_response_json.get("items", [])
         return YoutubeChannel.from_dict(items[0]) if len(items) > 0 else None
 
+    @provider_call("youtube")
     async def get_youtube_channel(self, api_key: str, channel_id: str) -> YoutubeChannel | None:
         channel_response_json, channel_status_code = await self._request_youtube_channels(
             api_key, [channel_id])
@@ -154,6 +160,7 @@ class YoutubeApiClient:
         items = channel_response_json.get("items", [])
         return YoutubeChannel.from_dict(items[0]) if len(items) > 0 else None
 
+    @provider_call("youtube")
     async def get_youtube_videos(self, api_key: str, video_ids: list[str]) -> list[YoutubeVideo]:
         youtube_videos: list[YoutubeVideo] = []
 
@@ -169,6 +176,7 @@ class YoutubeApiClient:
 
         return youtube_videos
 
+    @provider_call("youtube")
     async def get_youtube_videos_from_playlist(
             self, api_key: str, playlist_id: str, from_date: datetime,
     ) -> list[YoutubeVideo]:
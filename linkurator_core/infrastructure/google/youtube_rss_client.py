@@ -7,6 +7,7 @@ from datetime import datetime, timezone
 
 from linkurator_core.domain.common.exceptions import InvalidYoutubeRssFeedError
 from linkurator_core.infrastructure.asyncio_impl.http_client import AsyncHttpClient
+from linkurator_core.infrastructure.metrics import provider_call
 
 
 @dataclass
@@ -19,10 +20,12 @@ class YoutubeRssItem:
 class YoutubeRssClient:
     def __init__(self, http_client: AsyncHttpClient = AsyncHttpClient()) -> None:
         self.http_client = http_client
+        self.base_url = "https://www.youtube.com"
 
+    @provider_call("youtube_rss")
     async def get_youtube_items(self, playlist_id: str) -> list[YoutubeRssItem]:
         items = []
-        url = youtube_rss_url(playlist_id)
+        url = youtube_rss_url(playlist_id, self.base_url)
 
         response = await self.http_client.get(url)
         if response.status == 404:
@@ -63,5 +66,5 @@ class YoutubeRssClient:
         return items
 
 
-def youtube_rss_url(playlist_id: str) -> str:
-    return f"https://www.youtube.com/feeds/videos.xml?playlist_id={playlist_id}"
+def youtube_rss_url(playlist_id: str, base_url: str = "https://www.youtube.com") -> str:
+    return f"{base_url}/feeds/videos.xml?playlist_id={playlist_id}"
@@ -30,6 +30,10 @@ YOUTUBE_PROVIDER_NAME = "youtube"
 YOUTUBE_PROVIDER_ALIAS = "YouTube"
 YOUTUBE_PROVIDER_VERSION = 1
 YOUTUBE_REFRESH_PERIOD_MINUTES = 5
+# Each API key has 10,000 quota units per day and videos.list costs 1 unit for up to 50 videos.
+# Half of the quota is kept for the rest of the requests.
+YOUTUBE_DAILY_QUOTA_UNITS_PER_KEY = 10_000
+YOUTUBE_VIDEOS_PER_REQUEST = 50
 
 
 class YoutubeService(SubscriptionService):
@@ -66,6 +70,13 @@ class YoutubeService(SubscriptionService):
     def refresh_period_minutes(self) -> int:
         return YOUTUBE_REFRESH_PERIOD_MINUTES
 
+    def refresh_batch_size(self) -> int:
+        return YOUTUBE_VIDEOS_PER_REQUEST
+
+    def max_refreshed_items_per_minute(self) -> int:
+        refresh_units_per_day = len(self.api_keys) * YOUTUBE_DAILY_QUOTA_UNITS_PER_KEY // 2
+        return refresh_units_per_day * YOUTUBE_VIDEOS_PER_REQUEST // (24 * 60)
+
     async def get_subscriptions(
             self,
             user_id: uuid.UUID,
@@ -130,14 +141,20 @@ class YoutubeService(SubscriptionService):
             self,
             item_ids: set[uuid.UUID],
     ) -> set[Item]:
-        def link_to_video_id(link: str) -> str:
-            return link.rsplit("/watch?v=", maxsplit=1)[-1]
-
         items = await self.item_repository.find_items(
             criteria=ItemFilterCriteria(item_ids=item_ids),
             page_number=0,
             limit=len(item_ids))
 
+        return await self.refresh_items(items)
+
+    async def refresh_items(
+            self,
+            items: list[Item],
+    ) -> set[Item]:
+        def link_to_video_id(link: str) -> str:
+            return link.rsplit("/watch?v=", maxsplit=1)[-1]
+
         items = [item for item in items if item.provider == self.provider_name()]
 
         video_id_to_item: dict[str, Item] = {link_to_video_id(str(item.url)): item for item in items}
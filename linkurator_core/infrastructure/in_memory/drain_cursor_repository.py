@@ -0,0 +1,15 @@
+from uuid import UUID
+
+from linkurator_core.domain.items.drain_cursor_repository import DrainCursorRepository
+
+
+class InMemoryDrainCursorRepository(DrainCursorRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self._cursors: dict[str, UUID | None] = {}
+
+    async def get(self, name: str) -> UUID | None:
+        return self._cursors.get(name)
+
+    async def save(self, name: str, cursor: UUID | None) -> None:
+        self._cursors[name] = cursor
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Coroutine
+
+from linkurator_core.domain.common.event import Event
+from linkurator_core.domain.common.event_bus_service import EventBusService
+
+EventCallback = Callable[[Event], Coroutine[Any, Any, None]]
+
+_inside_handler: contextvars.ContextVar[bool] = contextvars.ContextVar("inside_event_handler", default=False)
+
+
+class InMemoryEventBus(EventBusService):
+    """
+    Event bus that dispatches events to handlers running in the same event loop.
+
+    Events wait in a bounded queue and are consumed by a fixed number of workers, so at most
+    `max_concurrent_handlers` events are processed at the same time. When the queue is full,
+    external publishers wait for room (backpressure), while handlers publishing follow-up events
+    never block, as they would otherwise wait on the very workers they occupy.
+
+    If `spill_path` is set, events that do not fit in the queue are appended to that file, and
+    events still pending when the bus stops are saved there and processed on the next start.
+    """
+
+    def __init__(
+            self,
+            max_queue_size: int = 10_000,
+            max_concurrent_handlers: int = 10,
+            spill_path: Path | None = None,
+    ) -> None:
+        if max_queue_size < 1:
+            msg = "Queue size must be at least 1"
+            raise ValueError(msg)
+        if max_concurrent_handlers < 1:
+            msg = "At least one concurrent handler is required"
+            raise ValueError(msg)
+
+        self.event_handlers: dict[type[Event], list[EventCallback]] = {}
+        self.max_concurrent_handlers = max_concurrent_handlers
+        self.spill_path = spill_path
+        self._queue: asyncio.Queue[Event] = asyncio.Queue(maxsize=max_queue_size)
+        self._overflow: deque[Event] = deque()
+        self._in_flight = 0
+        self._spill_lock = asyncio.Lock()
+        self._spilled_events = 0
+        self._stop_requested = asyncio.Event()
+        self._is_running = False
+
+    async def publish(self, event: Event) -> None:
+        if not self._queue.full():
+            self._queue.put_nowait(event)
+            return
+
+        if self.spill_path is not None:
+            await self._spill([event])
+            return
+
+        if _inside_handler.get():
+            self._overflow.append(event)
+            return
+
+        await self._queue.put(event)
+
+    def subscribe(self, event_type: type[Event], callback: EventCallback) -> None:
+        if event_type not in self.event_handlers:
+            self.event_handlers[event_type] = []
+
+        self.event_handlers[event_type].append(callback)
+
+    async def start(self) -> None:
+        self._stop_requested.clear()
+        await self._restore_spilled_events()
+
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrent_handlers)]
+        self._is_running = True
+        try:
+            await self._stop_requested.wait()
+        finally:
+            self._is_running = False
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await self._save_pending_events()
+
+    async def stop(self) -> None:
+        self._stop_requested.set()
+
+    def is_running(self) -> bool:
+        return self._is_running
+
+    async def pending_events(self) -> int:
+        return self._queue.qsize() + len(self._overflow) + self._spilled_events + self._in_flight
+
+    async def wait_until_idle(self, check_interval_seconds: float = 0.01) -> None:
+        """Wait until every published event has been handled. The bus must be running."""
+        while await self.pending_events() > 0:
+            await asyncio.sleep(check_interval_seconds)
+
+    async def _worker(self) -> None:
+        _inside_handler.set(True)
+        while True:
+            event = await self._queue.get()
+            self._in_flight += 1
+            try:
+                await self._dispatch(event)
+            except asyncio.CancelledError:
+                # Stopped halfway: keep the event so it is saved and handled again on the next start
+                self._overflow.appendleft(event)
+                raise
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+
+            while len(self._overflow) > 0 and not self._queue.full():
+                self._queue.put_nowait(self._overflow.popleft())
+            if self._spilled_events > 0 and self._queue.empty():
+                await self._restore_spilled_events()
+
+    async def _dispatch(self, event: Event) -> None:
+        for handler in self.event_handlers.get(event.__class__, []):
+            try:
+                await handler(event)
+            except Exception:  # pylint: disable=broad-except
+                logging.exception("Error handling event %s", event)
+
+    async def _spill(self, events: list[Event]) -> None:
+        if self.spill_path is None or len(events) == 0:
+            return
+        spill_path = self.spill_path
+        lines = "".join(event.serialize() + "\n" for event in events)
+
+        def append() -> None:
+            with spill_path.open("a", encoding="utf-8") as spill_file:
+                spill_file.write(lines)
+
+        async with self._spill_lock:
+            await asyncio.to_thread(append)
+            self._spilled_events += len(events)
+
+    async def _restore_spilled_events(self) -> None:
+        """Move as many spilled events as fit in the queue back from disk, oldest first."""
+        if self.spill_path is None:
+            return
+        spill_path = self.spill_path
+
+        def read_lines() -> list[str]:
+            if not spill_path.exists():
+                return []
+            return [line for line in spill_path.read_text(encoding="utf-8").splitlines() if line]
+
+        def write_lines(lines: list[str]) -> None:
+            if len(lines) == 0:
+                spill_path.unlink(missing_ok=True)
+            else:
+                spill_path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+
+        async with self._spill_lock:
+            lines = await asyncio.to_thread(read_lines)
+            free_slots = self._queue.maxsize - self._queue.qsize()
+            restored, remaining = lines[:free_slots], lines[free_slots:]
+            for line in restored:
+                self._queue.put_nowait(Event.deserialize(line))
+            await asyncio.to_thread(write_lines, remaining)
+            self._spilled_events = len(remaining)
+
+    async def _save_pending_events(self) -> None:
+        pending: list[Event] = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+            self._queue.task_done()
+        pending.extend(self._overflow)
+        self._overflow.clear()
+
+        if len(pending) == 0:
+            return
+        if self.spill_path is None:
+            logging.warning("Event bus stopped with %s unprocessed events", len(pending))
+            return
+        await self._spill(pending)
@@ -1,120 +1,318 @@
 from __future__ import annotations
 
+import heapq
+import itertools
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import NamedTuple, TypeVar
 from uuid import UUID
 
 from unidecode import unidecode
 
 from linkurator_core.domain.items.interaction import Interaction, InteractionType
 from linkurator_core.domain.items.item import Item, ItemProvider
-from linkurator_core.domain.items.item_repository import InteractionFilterCriteria, ItemFilterCriteria, ItemRepository
+from linkurator_core.domain.items.item_repository import (
+    InteractionFilterCriteria,
+    ItemFilterCriteria,
+    ItemOrdering,
+    ItemRepository,
+)
 
+# Like in Postgres, a text with shorter words only matches whole words
+PARTIAL_WORD_MIN_LENGTH = 3
+NAME_WEIGHT = 1.0
+DESCRIPTION_WEIGHT = 0.4
 
-def _item_contains_text(text: str, item: Item) -> bool:
-    text_inputs = unidecode(text.lower().strip('"').strip("'")).split()
-    item_text = unidecode(item.name.lower())
-    return all(text_input in item_text for text_input in text_inputs)
+
+# Newest last when sorted: the publication date, then the opposite of the order in which the item was added
+_FeedEntry = tuple[datetime, int, UUID]
+
+_K = TypeVar("_K")
+
+
+def _words(text: str) -> list[str]:
+    return re.findall(r"\w+", unidecode(text).lower())
+
+
+def _discard(index: dict[_K, set[UUID]], key: _K, item_id: UUID) -> None:
+    item_ids = index.get(key)
+    if item_ids is None:
+        return
+    item_ids.discard(item_id)
+    if not item_ids:
+        del index[key]
+
+
+@dataclass(frozen=True)
+class _SearchableText:
+    """The words of an item, computed once instead of on every search"""
+
+    name: str
+    description: str
+    normalized_name: str
+    name_words: frozenset[str]
+    description_words: frozenset[str]
+
+    @classmethod
+    def from_item(cls, item: Item) -> _SearchableText:
+        return cls(
+            name=item.name,
+            description=item.description,
+            normalized_name=unidecode(item.name).lower(),
+            name_words=frozenset(_words(item.name)),
+            description_words=frozenset(_words(item.description)))
+
+    def matches(self, words: list[str]) -> bool:
+        if all(word in self.name_words or word in self.description_words for word in words):
+            return True
+        return (all(len(word) >= PARTIAL_WORD_MIN_LENGTH for word in words)
+                and all(word in self.normalized_name for word in words))
+
+    def rank(self, words: list[str]) -> float:
+        return sum(NAME_WEIGHT if word in self.name_words else DESCRIPTION_WEIGHT if word in self.description_words
+                   else 0 for word in words)
+
+
+def _matches_item_fields(item: Item, criteria: ItemFilterCriteria) -> bool:
+    if item.duration is None:
+        matches_duration = criteria.min_duration is None or criteria.max_duration is None
+    else:
+        matches_duration = ((criteria.min_duration is None or item.duration >= criteria.min_duration)
+                            and (criteria.max_duration is None or item.duration <= criteria.max_duration))
+    return not (
+        item.deleted_at is not None
+        or (criteria.item_ids is not None and item.uuid not in criteria.item_ids)
+        or (criteria.subscription_ids is not None and item.subscription_uuid not in criteria.subscription_ids)
+        or (criteria.published_after and criteria.published_after >= item.published_at)
+        or (criteria.updated_before and criteria.updated_before <= item.updated_at)
+        or (criteria.created_before and criteria.created_before <= item.created_at)
+        or (criteria.url and criteria.url != item.url)
+        or (criteria.last_version and item.version >= criteria.last_version)
+        or (criteria.provider and item.provider != criteria.provider)
+        or not matches_duration)
+
+
+class _IndexedItem(NamedTuple):
+    """The values an item is indexed by, to find its entries again when it changes"""
+
+    feed_entry: _FeedEntry
+    subscription_uuid: UUID
+    url: str
+    provider: ItemProvider
+    version: int
 
 
 class InMemoryItemRepository(ItemRepository):
+    """
+    The items are indexed by subscription, in lists sorted by publication date, by url and by provider and
+    version, and the interactions by user and item, so the queries of a page only visit the items they need.
+    Like in Postgres, the items published at the same time have no defined order, here the first added first.
+    """
+
     def __init__(self) -> None:
         super().__init__()
         self.items: dict[UUID, Item] = {}
         self.interactions: dict[UUID, Interaction] = {}
+        self._searchable_texts: dict[UUID, _SearchableText] = {}
+        self._indexed_items: dict[UUID, _IndexedItem] = {}
+        self._sequence = itertools.count()
+        # Oldest first, the feeds changed since they were last read are sorted on the next read
+        self._subscription_feeds: dict[UUID, list[_FeedEntry]] = {}
+        self._unsorted_feeds: set[UUID] = set()
+        self._items_by_url: dict[str, set[UUID]] = {}
+        self._items_by_provider: dict[ItemProvider, dict[int, set[UUID]]] = {}
+        self._user_interactions: dict[UUID, dict[UUID, list[Interaction]]] = {}
 
     async def upsert_items(self, items: list[Item]) -> None:
-        for item in items:
+        latest_items = {item.uuid: item for item in items}
+        sequences = {item_id: -self._indexed_items[item_id].feed_entry[1] for item_id in latest_items
+                     if item_id in self._indexed_items}
+        self._unindex(set(sequences))
+        for item in latest_items.values():
             self.items[item.uuid] = item
+            self._index(item, sequences.get(item.uuid))
 
     async def get_item(self, item_id: UUID) -> Item | None:
         return self.items.get(item_id)
 
     async def delete_item(self, item_id: UUID) -> None:
-        if item_id in self.items:
-            del self.items[item_id]
+        await self.delete_items([item_id])
 
-    async def find_items(  # pylint: disable=too-many-branches
+    async def delete_items(self, item_ids: list[UUID]) -> None:
+        self._unindex(set(item_ids))
+        for item_id in item_ids:
+            self.items.pop(item_id, None)
+            self._searchable_texts.pop(item_id, None)
+
+    async def delete_items_by_subscription(self, subscription_id: UUID, before: datetime | None = None) -> int:
+        item_ids = [item.uuid for item in (self.items[item_id]
+                                           for _, _, item_id in self._subscription_feeds.get(subscription_id, []))
+                    if item.deleted_at is None and (before is None or item.created_at < before)]
+        await self.delete_items(item_ids)
+        return len(item_ids)
+
+    async def find_items(
             self,
             criteria: ItemFilterCriteria,
             page_number: int,
             limit: int,
     ) -> list[Item]:
-        found_items = []
-        for item in self.items.values():
-            if item.deleted_at is not None:
-                continue
-            if criteria.item_ids is not None and item.uuid not in criteria.item_ids:
-                continue
-            if criteria.subscription_ids is not None and item.subscription_uuid not in criteria.subscription_ids:
+        words = _words(criteria.text) if criteria.text is not None else None
+        by_relevance = criteria.order_by == ItemOrdering.RELEVANCE and bool(criteria.text)
+        found_items: list[Item] = []
+        for published_at, _, item_id in self._newest_candidates(criteria):
+            if criteria.published_after and criteria.published_after >= published_at:
+                # The next candidates are older
+                break
+            item = self.items[item_id]
+            if not self._matches(item, criteria, words):
                 continue
-            if criteria.published_after and criteria.published_after >= item.published_at:
-                continue
-            if criteria.updated_before and criteria.updated_before <= item.updated_at:
-                continue
-            if criteria.created_before and criteria.created_before <= item.created_at:
-                continue
-            if criteria.url and criteria.url != item.url:
-                continue
-            if criteria.last_version and item.version >= criteria.last_version:
-                continue
-            if criteria.provider and item.provider != criteria.provider:
-                continue
-            if criteria.text is not None and not _item_contains_text(criteria.text, item):
-                continue
-            if item.duration is None and (criteria.min_duration is not None and criteria.max_duration is not None):
-                continue
-            if item.duration is not None:
-                if criteria.min_duration is not None and item.duration < criteria.min_duration:
-                    continue
-                if criteria.max_duration is not None and item.duration > criteria.max_duration:
-                    continue
+            found_items.append(item)
+            if not by_relevance and len(found_items) >= (page_number + 1) * limit:
+                break
 
-            if criteria.interactions_from_user is not None:
-                is_filtered = True
-                interactions = await self.get_user_interactions_by_item_id(criteria.interactions_from_user, [item.uuid])
-                interactions_types = [interaction.type for interaction in interactions[item.uuid]]
-                if criteria.interactions.without_interactions and len(interactions[item.uuid]) == 0:
-                    is_filtered = False
-                if criteria.interactions.hidden and InteractionType.HIDDEN in interactions_types:
-                    is_filtered = False
-                if criteria.interactions.viewed and InteractionType.VIEWED in interactions_types:
-                    is_filtered = False
-                if criteria.interactions.recommended and InteractionType.RECOMMENDED in interactions_types:
-                    is_filtered = False
-                if criteria.interactions.discouraged and InteractionType.DISCOURAGED in interactions_types:
-                    is_filtered = False
-
-                if is_filtered:
-                    continue
+        if by_relevance and words is not None:
+            found_items.sort(key=lambda found_item: self._searchable_text(found_item).rank(words), reverse=True)
+        return found_items[page_number * limit: (page_number + 1) * limit]
 
-            found_items.append(item)
+    def _newest_candidates(self, criteria: ItemFilterCriteria) -> Iterable[_FeedEntry]:
+        """The entries of the items that may match the criteria, the newest first, from the most selective index."""
+        if criteria.item_ids is not None:
+            item_ids: Iterable[UUID] = criteria.item_ids
+        elif criteria.url:
+            item_ids = self._items_by_url.get(str(criteria.url), set())
+        elif criteria.subscription_ids is not None:
+            return self._merged_feeds(set(criteria.subscription_ids))
+        elif criteria.provider:
+            versions = self._items_by_provider.get(criteria.provider, {})
+            item_ids = itertools.chain.from_iterable(
+                ids for version, ids in versions.items()
+                if not criteria.last_version or version < criteria.last_version)
+        else:
+            return self._merged_feeds(self._subscription_feeds.keys())
+        return sorted((self._indexed_items[item_id].feed_entry for item_id in item_ids
+                       if item_id in self._indexed_items), reverse=True)
+
+    def _merged_feeds(self, subscription_ids: Iterable[UUID]) -> Iterator[_FeedEntry]:
+        feeds = [reversed(self._feed(subscription_id)) for subscription_id in subscription_ids
+                 if subscription_id in self._subscription_feeds]
+        return heapq.merge(*feeds, reverse=True)
+
+    def _feed(self, subscription_id: UUID) -> list[_FeedEntry]:
+        feed = self._subscription_feeds[subscription_id]
+        if subscription_id in self._unsorted_feeds:
+            feed.sort()
+            self._unsorted_feeds.discard(subscription_id)
+        return feed
+
+    def _matches(self, item: Item, criteria: ItemFilterCriteria, words: list[str] | None) -> bool:
+        return (_matches_item_fields(item, criteria)
+                and (words is None or self._searchable_text(item).matches(words))
+                and self._matches_interactions(item, criteria))
+
+    def _matches_interactions(self, item: Item, criteria: ItemFilterCriteria) -> bool:
+        if criteria.interactions_from_user is None:
+            return True
+        interactions_types = {interaction.type for interaction in self._user_interactions.get(
+            criteria.interactions_from_user, {}).get(item.uuid, [])}
+        interactions = criteria.interactions
+        return bool((interactions.without_interactions and len(interactions_types) == 0)
+                    or (interactions.hidden and InteractionType.HIDDEN in interactions_types)
+                    or (interactions.viewed and InteractionType.VIEWED in interactions_types)
+                    or (interactions.recommended and InteractionType.RECOMMENDED in interactions_types)
+                    or (interactions.discouraged and InteractionType.DISCOURAGED in interactions_types))
+
+    def _index(self, item: Item, sequence: int | None) -> None:
+        sequence = next(self._sequence) if sequence is None else sequence
+        indexed_item = _IndexedItem(
+            feed_entry=(item.published_at, -sequence, item.uuid),
+            subscription_uuid=item.subscription_uuid,
+            url=str(item.url),
+            provider=item.provider,
+            version=item.version)
+        self._indexed_items[item.uuid] = indexed_item
+        self._subscription_feeds.setdefault(item.subscription_uuid, []).append(indexed_item.feed_entry)
+        self._unsorted_feeds.add(item.subscription_uuid)
+        self._items_by_url.setdefault(indexed_item.url, set()).add(item.uuid)
+        self._items_by_provider.setdefault(item.provider, {}).setdefault(item.version, set()).add(item.uuid)
 
-        sorted_items = sorted(found_items, key=lambda found_item: found_item.published_at, reverse=True)
-        return sorted_items[page_number * limit: (page_number + 1) * limit]
+    def _unindex(self, item_ids: set[UUID]) -> None:
+        indexed_items = [self._indexed_items.pop(item_id) for item_id in item_ids if item_id in self._indexed_items]
+        for subscription_id in {indexed_item.subscription_uuid for indexed_item in indexed_items}:
+            feed = [entry for entry in self._subscription_feeds[subscription_id] if entry[2] not in item_ids]
+            if feed:
+                self._subscription_feeds[subscription_id] = feed
+            else:
+                del self._subscription_feeds[subscription_id]
+                self._unsorted_feeds.discard(subscription_id)
+        for indexed_item in indexed_items:
+            item_id = indexed_item.feed_entry[2]
+            _discard(self._items_by_url, indexed_item.url, item_id)
+            versions = self._items_by_provider[indexed_item.provider]
+            _discard(versions, indexed_item.version, item_id)
+            if not versions:
+                del self._items_by_provider[indexed_item.provider]
+
+    def _searchable_text(self, item: Item) -> _SearchableText:
+        searchable_text = self._searchable_texts.get(item.uuid)
+        if (searchable_text is None
+                or searchable_text.name != item.name or searchable_text.description != item.description):
+            searchable_text = _SearchableText.from_item(item)
+            self._searchable_texts[item.uuid] = searchable_text
+        return searchable_text
+
+    async def find_item_ids(self, criteria: ItemFilterCriteria, after_id: UUID | None, limit: int) -> list[UUID]:
+        matching_items = await self.find_items(criteria=criteria, page_number=0, limit=len(self.items))
+        item_ids = sorted(item.uuid for item in matching_items if after_id is None or item.uuid > after_id)
+        return item_ids[:limit]
+
+    async def count_matching_items(self, criteria: ItemFilterCriteria) -> int:
+        return len(await self.find_items(criteria=criteria, page_number=0, limit=len(self.items)))
 
     async def delete_all_items(self) -> None:
         self.items.clear()
+        self._searchable_texts.clear()
+        self._indexed_items.clear()
+        self._subscription_feeds.clear()
+        self._unsorted_feeds.clear()
+        self._items_by_url.clear()
+        self._items_by_provider.clear()
 
     async def add_interaction(self, interaction: Interaction) -> None:
+        self._unindex_interaction(interaction.uuid)
         self.interactions[interaction.uuid] = interaction
+        self._user_interactions.setdefault(interaction.user_uuid, {}).setdefault(
+            interaction.item_uuid, []).append(interaction)
 
     async def get_interaction(self, interaction_id: UUID) -> Interaction | None:
         return self.interactions.get(interaction_id)
 
     async def delete_interaction(self, interaction_id: UUID) -> None:
-        if interaction_id in self.interactions:
-            del self.interactions[interaction_id]
+        self._unindex_interaction(interaction_id)
+        self.interactions.pop(interaction_id, None)
 
     async def delete_all_interactions(self) -> None:
         self.interactions.clear()
+        self._user_interactions.clear()
+
+    def _unindex_interaction(self, interaction_id: UUID) -> None:
+        interaction = self.interactions.get(interaction_id)
+        if interaction is None:
+            return
+        item_interactions = self._user_interactions[interaction.user_uuid]
+        item_interactions[interaction.item_uuid].remove(interaction)
+        if not item_interactions[interaction.item_uuid]:
+            del item_interactions[interaction.item_uuid]
+        if not item_interactions:
+            del self._user_interactions[interaction.user_uuid]
 
     async def get_user_interactions_by_item_id(
             self, user_id: UUID, item_ids: list[UUID],
     ) -> dict[UUID, list[Interaction]]:
-        interactions: dict[UUID, list[Interaction]] = {item_id: [] for item_id in item_ids}
-        for interaction in self.interactions.values():
-            if interaction.user_uuid == user_id and interaction.item_uuid in item_ids:
-                interactions[interaction.item_uuid].append(interaction)
-        return interactions
+        item_interactions = self._user_interactions.get(user_id, {})
+        return {item_id: list(item_interactions.get(item_id, [])) for item_id in item_ids}
 
     async def find_interactions(
             self, criteria: InteractionFilterCriteria, page_number: int, limit: int,
@@ -132,7 +330,7 @@ class InMemoryItemRepository(ItemRepository):
 
             item = self.items.get(interaction.item_uuid)
             if item is not None:
-                if criteria.text is not None and criteria.text.lower() not in item.name.lower():
+                if criteria.text and not self._searchable_text(item).matches(_words(criteria.text)):
                     continue
                 if item.duration is not None:
                     if criteria.min_duration is not None and item.duration < criteria.min_duration:
@@ -0,0 +1,19 @@
+from linkurator_core.domain.common.lock_service import LockService
+
+
+class InMemoryLockService(LockService):
+    def __init__(self) -> None:
+        super().__init__()
+        self._held: set[str] = set()
+
+    async def try_acquire(self, key: str) -> bool:
+        if key in self._held:
+            return False
+        self._held.add(key)
+        return True
+
+    async def release(self, key: str) -> None:
+        self._held.discard(key)
+
+    async def is_held(self, key: str) -> bool:
+        return key in self._held
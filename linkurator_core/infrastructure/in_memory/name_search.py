@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import re
+from typing import Callable, Iterable, TypeVar
+
+from unidecode import unidecode
+
+T = TypeVar("T")
+
+# Texts shorter than a trigram only match the beginning of the name, like in the Postgres repositories
+TRIGRAM_LENGTH = 3
+
+
+def search_by_name(
+        elements: Iterable[T], name: Callable[[T], str], name_part: str, limit: int, substring: bool = False,
+) -> list[T]:
+    """Keep the `limit` elements whose name contains the given text, the names with the most similar words first."""
+    normalized_part = _normalize(name_part)
+
+    def matches(element_name: str) -> bool:
+        if substring or len(normalized_part) >= TRIGRAM_LENGTH:
+            return normalized_part in element_name
+        return element_name.startswith(normalized_part)
+
+    found = [element for element in elements if matches(_normalize(name(element)))]
+    found.sort(key=lambda element: (-word_similarity(normalized_part, _normalize(name(element))), name(element)))
+    return found[:limit]
+
+
+def word_similarity(text: str, other_text: str) -> float:
+    """
+    Greatest similarity between the trigrams of a text and any continuous extent of the trigrams
+    of the other text, as the word_similarity of pg_trgm.
+    """
+    trigrams = set(_trigrams(text))
+    other_trigrams = _trigrams(other_text)
+    best = 0.0
+    for start in range(len(other_trigrams)):
+        for end in range(start + 1, len(other_trigrams) + 1):
+            extent = set(other_trigrams[start:end])
+            best = max(best, len(trigrams & extent) / len(trigrams | extent))
+    return best
+
+
+def _trigrams(text: str) -> list[str]:
+    trigrams: list[str] = []
+    for word in re.findall(r"[^\W_]+", text.lower()):
+        padded = f"  {word} "
+        trigrams.extend(padded[i:i + TRIGRAM_LENGTH] for i in range(len(padded) - TRIGRAM_LENGTH + 1))
+    return trigrams
+
+
+def _normalize(text: str) -> str:
+    return unidecode(text).lower()
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from linkurator_core.domain.users.session import Session
+from linkurator_core.domain.users.session_repository import SessionRepository, TokenAlreadyExists
+
+
+class InMemorySessionRepository(SessionRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.sessions: dict[str, Session] = {}
+
+    async def get(self, token: str) -> Session | None:
+        return self.sessions.get(token)
+
+    async def add(self, session: Session) -> None:
+        if session.token in self.sessions:
+            msg = f"Token '{session.token}' already exists"
+            raise TokenAlreadyExists(msg)
+        self.sessions[session.token] = session
+
+    async def delete(self, token: str) -> None:
+        self.sessions.pop(token, None)
@@ -11,6 +11,7 @@ from linkurator_core.domain.subscriptions.subscription_repository import (
     SubscriptionFilterCriteria,
     SubscriptionRepository,
 )
+from linkurator_core.infrastructure.in_memory.name_search import search_by_name
 
 
 class InMemorySubscriptionRepository(SubscriptionRepository):
@@ -74,6 +75,9 @@ class InMemorySubscriptionRepository(SubscriptionRepository):
         ]
         return sorted(subs, key=lambda x: x.created_at, reverse=True)
 
+    async def search_by_name(self, name_part: str, limit: int) -> list[Subscription]:
+        return search_by_name(self.subscriptions.values(), lambda subscription: subscription.name, name_part, limit)
+
     async def find(self, criteria: SubscriptionFilterCriteria) -> list[Subscription]:
         subs = []
         for subscription in self.subscriptions.values():
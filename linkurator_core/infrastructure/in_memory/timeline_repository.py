@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from dataclasses import replace
+from datetime import datetime
+from uuid import UUID
+
+from linkurator_core.domain.items.item import Item
+from linkurator_core.domain.items.item_repository import ItemFilterCriteria, ItemRepository
+from linkurator_core.domain.items.timeline_repository import Timeline, TimelineCursor, TimelineRepository
+
+BACKFILL_PAGE_SIZE = 1000
+
+
+class InMemoryTimelineRepository(TimelineRepository):
+    def __init__(self, item_repository: ItemRepository) -> None:
+        self.item_repository = item_repository
+        self.timelines: dict[UUID, Timeline] = {}
+        # Subscription and publication date of the items of each timeline
+        self.timeline_items: dict[UUID, dict[UUID, tuple[UUID, datetime]]] = {}
+
+    async def get(self, user_id: UUID) -> Timeline | None:
+        return deepcopy(self.timelines.get(user_id))
+
+    async def save(self, timeline: Timeline) -> None:
+        self.timelines[timeline.user_id] = deepcopy(timeline)
+        self.timeline_items.setdefault(timeline.user_id, {})
+
+    async def delete(self, user_id: UUID) -> None:
+        self.timelines.pop(user_id, None)
+        self.timeline_items.pop(user_id, None)
+
+    async def add_subscription_items(self, user_id: UUID, subscription_ids: set[UUID], published_after: datetime) -> None:
+        if user_id not in self.timelines or len(subscription_ids) == 0:
+            return
+        page_number = 0
+        while True:
+            items = await self.item_repository.find_items(
+                criteria=ItemFilterCriteria(subscription_ids=list(subscription_ids), published_after=published_after),
+                page_number=page_number,
+                limit=BACKFILL_PAGE_SIZE)
+            for item in items:
+                self.timeline_items[user_id][item.uuid] = (item.subscription_uuid, item.published_at)
+            if len(items) < BACKFILL_PAGE_SIZE:
+                return
+            page_number += 1
+
+    async def remove_subscription_items(self, user_id: UUID, subscription_ids: set[UUID]) -> None:
+        items = self.timeline_items.get(user_id, {})
+        for item_id in [item_id for item_id, (sub_id, _) in items.items() if sub_id in subscription_ids]:
+            del items[item_id]
+
+    async def add_items(self, items: list[Item]) -> None:
+        for timeline in self.timelines.values():
+            for item in items:
+                if item.subscription_uuid in timeline.subscription_ids and item.published_at > timeline.complete_since:
+                    self.timeline_items[timeline.user_id][item.uuid] = (item.subscription_uuid, item.published_at)
+
+    async def find_items(
+            self, user_id: UUID, criteria: ItemFilterCriteria, limit: int, after: TimelineCursor | None = None,
+    ) -> list[Item]:
+        entries = self.timeline_items.get(user_id, {})
+        item_ids = {item_id for item_id, (_, published_at) in entries.items()
+                    if after is None or (published_at, item_id) < (after.published_at, after.item_id)}
+        if criteria.item_ids is not None:
+            item_ids &= criteria.item_ids
+        if len(item_ids) == 0:
+            return []
+        items = await self.item_repository.find_items(
+            criteria=replace(criteria, item_ids=item_ids), page_number=0, limit=len(item_ids))
+        return sorted(items, key=lambda item: (entries[item.uuid][1], item.uuid), reverse=True)[:limit]
@@ -7,6 +7,7 @@ from unidecode import unidecode
 from linkurator_core.domain.common.exceptions import DuplicatedKeyError
 from linkurator_core.domain.topics.topic import Topic
 from linkurator_core.domain.topics.topic_repository import TopicRepository
+from linkurator_core.infrastructure.in_memory.name_search import search_by_name
 
 
 class InMemoryTopicRepository(TopicRepository):
@@ -35,6 +36,9 @@ class InMemoryTopicRepository(TopicRepository):
         return [topic for topic in self.topics.values()
                 if search_terms_in_name(search_terms, unidecode(topic.name.lower()))]
 
+    async def search_topics_by_name(self, name_part: str, limit: int) -> list[Topic]:
+        return search_by_name(self.topics.values(), lambda topic: topic.name, name_part, limit)
+
     async def update(self, topic: Topic) -> None:
         self.topics[topic.uuid] = topic
 
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
-from copy import copy
+from copy import copy, deepcopy
 from datetime import datetime
+from typing import Callable
 from uuid import UUID
 
 from linkurator_core.domain.common.exceptions import UsernameAlreadyInUseError
 from linkurator_core.domain.users.user import User, Username
-from linkurator_core.domain.users.user_repository import EmailAlreadyInUse, UserRepository
+from linkurator_core.domain.users.user_repository import EmailAlreadyInUse, FollowKind, UserRepository
+from linkurator_core.infrastructure.in_memory.name_search import search_by_name
+
+# The methods of User following and unfollowing each kind of element
+FOLLOW_CHANGES: dict[FollowKind, tuple[Callable[[User, UUID], None], Callable[[User, UUID], None]]] = {
+    FollowKind.SUBSCRIPTION: (User.follow_subscription, User.unfollow_subscription),
+    FollowKind.TOPIC: (User.follow_topic, User.unfollow_topic),
+    FollowKind.FAVORITE_TOPIC: (User.favorite_topic, User.unfavorite_topic),
+    FollowKind.CURATOR: (User.follow_curator, User.unfollow_curator),
+}
 
 
 class InMemoryUserRepository(UserRepository):
@@ -57,6 +67,34 @@ class InMemoryUserRepository(UserRepository):
                 raise UsernameAlreadyInUseError()
         self.users[user.uuid] = user
 
+    async def touch_last_login(self, user_id: UUID, last_login_at: datetime) -> None:
+        def touch(user: User) -> None:
+            user.last_login_at = last_login_at
+        self._modify(user_id, touch)
+
+    async def set_scanned_at(self, user_id: UUID, scanned_at: datetime) -> None:
+        def set_scanned_at(user: User) -> None:
+            user.scanned_at = scanned_at
+        self._modify(user_id, set_scanned_at)
+
+    async def set_youtube_subscriptions(self, user_id: UUID, subscription_ids: set[UUID]) -> None:
+        self._modify(user_id, lambda user: user.set_youtube_subscriptions(set(subscription_ids)))
+
+    async def follow(self, user_id: UUID, kind: FollowKind, element_id: UUID) -> None:
+        follow, _ = FOLLOW_CHANGES[kind]
+        self._modify(user_id, lambda user: follow(user, element_id))
+
+    async def unfollow(self, user_id: UUID, kind: FollowKind, element_id: UUID) -> None:
+        _, unfollow = FOLLOW_CHANGES[kind]
+        self._modify(user_id, lambda user: unfollow(user, element_id))
+
+    def _modify(self, user_id: UUID, change: Callable[[User], None]) -> None:
+        # The stored user is replaced, like a row, so the users read or added before do not change
+        if user_id in self.users:
+            user = deepcopy(self.users[user_id])
+            change(user)
+            self.users[user_id] = user
+
     async def find_latest_scan_before(self, timestamp: datetime) -> list[User]:
         found_users = []
         for user in self.users.values():
@@ -80,9 +118,7 @@ class InMemoryUserRepository(UserRepository):
         logged_after = User.time_since_last_active()
         return len([user for user in self.users.values() if user.last_login_at > logged_after])
 
-    async def search_by_username(self, username_part: str) -> list[User]:
-        found_users = []
-        for user in self.users.values():
-            if username_part.lower() in str(user.username).lower():
-                found_users.append(copy(user))
-        return found_users
+    async def search_by_username(self, username_part: str, limit: int, substring: bool = False) -> list[User]:
+        found_users = search_by_name(
+            self.users.values(), lambda user: str(user.username), username_part, limit, substring)
+        return [copy(user) for user in found_users]
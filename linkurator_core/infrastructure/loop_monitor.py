@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from linkurator_core.infrastructure.metrics import metrics
+
+# Scheduling delays are mostly well under the request durations, so the buckets start lower
+LAG_BUCKETS_SECONDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+TICK_INTERVAL_SECONDS = 0.1
+
+EVENT_LOOP_LAG = metrics.histogram(
+    "event_loop_lag_seconds", "Delay of the event loop running a callback scheduled on time.", ("process",),
+    buckets=LAG_BUCKETS_SECONDS)
+
+
+class EventLoopMonitor:
+    """
+    Measures how late the event loop runs a callback scheduled every 100 ms, and records the delay as a metric.
+
+    A watchdog thread checks that the callback keeps running. When the loop goes longer than `blocked_ms` without
+    running it, something is blocking the loop, and the stack of the loop thread is logged once for that stall.
+    Unlike the asyncio debug mode, nothing wraps the callbacks, so it is cheap enough to leave enabled.
+    """
+
+    def __init__(self, process: str, blocked_ms: int) -> None:
+        self.process = process
+        self.blocked_seconds = blocked_ms / 1000
+        self._loop_thread_id = 0
+        self._handle: asyncio.TimerHandle | None = None
+        self._heartbeat = 0.0
+        self._reported_heartbeat = 0.0
+        self._stop = threading.Event()
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._schedule_tick(asyncio.get_running_loop(), self._heartbeat)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+        self._stop.set()
+        self._watchdog.join()
+
+    def _schedule_tick(self, loop: asyncio.AbstractEventLoop, now: float) -> None:
+        self._handle = loop.call_later(TICK_INTERVAL_SECONDS, self._tick, loop, now + TICK_INTERVAL_SECONDS)
+
+    def _tick(self, loop: asyncio.AbstractEventLoop, expected: float) -> None:
+        now = time.monotonic()
+        EVENT_LOOP_LAG.observe((self.process,), max(now - expected, 0))
+        self._heartbeat = now
+        self._schedule_tick(loop, now)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.blocked_seconds / 2):
+            heartbeat = self._heartbeat
+            blocked_seconds = time.monotonic() - heartbeat - TICK_INTERVAL_SECONDS
+            if blocked_seconds < self.blocked_seconds or heartbeat == self._reported_heartbeat:
+                continue
+            self._reported_heartbeat = heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "unknown\n"
+            logging.warning("The event loop of the %s has been blocked for %.0f ms, currently in:\n%s",
+                            self.process, blocked_seconds * 1000, stack)
+
+
+_monitored_loops: set[int] = set()
+
+
+@asynccontextmanager
+async def monitoring_event_loop(process: str, blocked_ms: int) -> AsyncIterator[None]:
+    """
+    Monitor the running event loop while in the block. When the processor runs inside the API process,
+    the loop is already monitored and the block does nothing.
+    """
+    loop_id = id(asyncio.get_running_loop())
+    if loop_id in _monitored_loops:
+        yield
+        return
+    monitor = EventLoopMonitor(process, blocked_ms)
+    monitor.start()
+    _monitored_loops.add(loop_id)
+    try:
+        yield
+    finally:
+        _monitored_loops.discard(loop_id)
+        monitor.stop()
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import resource
+import signal
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator
+
+from linkurator_core.infrastructure.metrics import metrics
+
+MEMORY_SAMPLE_INTERVAL_SECONDS = 15
+
+RESIDENT_MEMORY = metrics.gauge(
+    "process_resident_memory_bytes", "Resident memory of the process.", ("process", "pid"))
+ALLOCATED_BLOCKS = metrics.gauge(
+    "python_allocated_blocks", "Memory blocks currently allocated by the Python interpreter.", ("process", "pid"))
+TRACED_MEMORY = metrics.gauge(
+    "python_traced_memory_bytes", "Memory allocated by Python code, only while tracemalloc traces.", ("process", "pid"))
+
+
+class MemoryTracingNotStartedError(Exception):
+    pass
+
+
+@dataclass
+class AllocationSite:
+    module: str
+    size_bytes: int
+    size_diff_bytes: int
+    count: int
+    count_diff: int
+
+
+@dataclass
+class MemoryReport:
+    resident_bytes: int
+    traced_bytes: int
+    traced_peak_bytes: int
+    compared_to: datetime | None
+    sites: list[AllocationSite]
+
+    def as_text(self) -> str:
+        lines = [
+            f"Resident memory: {self.resident_bytes / 2 ** 20:.1f} MiB",
+            f"Traced memory: {self.traced_bytes / 2 ** 20:.1f} MiB, "
+            f"peak since the previous snapshot: {self.traced_peak_bytes / 2 ** 20:.1f} MiB",
+            f"Compared to the snapshot of {self.compared_to.isoformat() if self.compared_to else 'nothing'}",
+        ]
+        lines.extend(f"{site.module}: {site.size_bytes / 1024:.1f} KiB ({site.size_diff_bytes / 1024:+.1f} KiB), "
+                     f"{site.count} blocks ({site.count_diff:+d})" for site in self.sites)
+        return "\n".join(lines) + "\n"
+
+
+def resident_memory_bytes() -> int:
+    try:
+        resident_pages = int(Path("/proc/self/statm").read_text(encoding="utf-8").split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Without procfs only the peak is available
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class MemoryTracer:
+    """
+    Snapshots of the memory allocated by Python code, added up by module and compared to the previous snapshot.
+    Tracing slows down every allocation, so it only runs between `start` and `stop`.
+    """
+
+    def __init__(self) -> None:
+        self._previous: tracemalloc.Snapshot | None = None
+        self._previous_taken_at: datetime | None = None
+
+    @staticmethod
+    def is_tracing() -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            self._previous = None
+            self._previous_taken_at = None
+            tracemalloc.start()
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        self._previous = None
+        self._previous_taken_at = None
+
+    def snapshot(self, limit: int) -> MemoryReport:
+        """The modules allocating the most memory since the previous snapshot, or in total for the first one."""
+        if not tracemalloc.is_tracing():
+            msg = "Memory tracing has not been started"
+            raise MemoryTracingNotStartedError(msg)
+
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__),
+            tracemalloc.Filter(inclusive=False, filename_pattern="<unknown>"),
+        ])
+        traced_bytes, traced_peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+        current = _by_module(snapshot)
+        previous = _by_module(self._previous) if self._previous is not None else {}
+        sites = [
+            AllocationSite(
+                module=module,
+                size_bytes=size,
+                size_diff_bytes=size - previous.get(module, (0, 0))[0],
+                count=count,
+                count_diff=count - previous.get(module, (0, 0))[1],
+            )
+            for module, (size, count) in current.items()
+        ]
+        sites.sort(key=lambda site: (site.size_diff_bytes, site.size_bytes), reverse=True)
+
+        report = MemoryReport(
+            resident_bytes=resident_memory_bytes(),
+            traced_bytes=traced_bytes,
+            traced_peak_bytes=traced_peak_bytes,
+            compared_to=self._previous_taken_at,
+            sites=sites[:limit],
+        )
+        self._previous = snapshot
+        self._previous_taken_at = datetime.now(timezone.utc)
+        return report
+
+
+def _by_module(snapshot: tracemalloc.Snapshot) -> dict[str, tuple[int, int]]:
+    modules: dict[str, tuple[int, int]] = {}
+    for statistic in snapshot.statistics("filename"):
+        module = _module_name(statistic.traceback[0].filename)
+        size, count = modules.get(module, (0, 0))
+        modules[module] = (size + statistic.size, count + statistic.count)
+    return modules
+
+
+def _module_name(filename: str) -> str:
+    for path in sorted(filter(None, sys.path), key=len, reverse=True):
+        prefix = path.rstrip(os.sep) + os.sep
+        if filename.startswith(prefix):
+            module = filename.removeprefix(prefix).removesuffix(".py").replace(os.sep, ".")
+            return module.removesuffix(".__init__")
+    return filename
+
+
+memory_tracer = MemoryTracer()
+
+
+def record_memory(process: str) -> None:
+    labels = (process, str(os.getpid()))
+    RESIDENT_MEMORY.set(labels, resident_memory_bytes())
+    ALLOCATED_BLOCKS.set(labels, sys.getallocatedblocks())
+    TRACED_MEMORY.set(labels, tracemalloc.get_traced_memory()[0])
+
+
+_recording = False
+
+
+@asynccontextmanager
+async def recording_memory(process: str) -> AsyncIterator[None]:
+    """
+    Record the memory gauges every few seconds while in the block. When the processor runs inside the API process,
+    the memory is already recorded and the block does nothing.
+    """
+    global _recording  # noqa: PLW0603
+    if _recording:
+        yield
+        return
+
+    async def record_periodically() -> None:
+        while True:
+            record_memory(process)
+            await asyncio.sleep(MEMORY_SAMPLE_INTERVAL_SECONDS)
+
+    _recording = True
+    task = asyncio.create_task(record_periodically())
+    try:
+        yield
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        _recording = False
+
+
+def snapshot_memory_on_signal(limit: int = 30) -> None:
+    """
+    Start tracing the memory allocations the first time the process receives SIGUSR2, and write a snapshot compared
+    to the previous one to a file in the temporary directory on every other SIGUSR2. Meant for the processor, which
+    serves no requests. Tracing goes on until the process restarts.
+    """
+    def on_signal() -> None:
+        if not memory_tracer.is_tracing():
+            memory_tracer.start()
+            logging.info("Memory tracing started, send SIGUSR2 again to write a snapshot")
+            return
+        report = memory_tracer.snapshot(limit).as_text()
+        path = Path(tempfile.gettempdir()) / f"linkurator-memory-{os.getpid()}-{int(time.time())}.txt"
+        path.write_text(report, encoding="utf-8")
+        logging.info("Memory snapshot written to %s:\n%s", path, report)
+
+    asyncio.get_running_loop().add_signal_handler(signal.SIGUSR2, on_signal)
@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import contextlib
+import functools
+import inspect
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Coroutine, Iterable, ParamSpec, TypeVar
+
+from linkurator_core.application.items.outdated_items_drain import DrainProgress
+from linkurator_core.domain.common.event import Event
+from linkurator_core.infrastructure.request_timing import add_timing
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# Upper bounds of the buckets, in seconds. The last bucket counts everything slower
+DURATION_BUCKETS_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+FLUSH_INTERVAL_SECONDS = 5
+# Gauges of the processes that stopped writing their file for this long are no longer served
+STALE_GAUGE_SECONDS = 60
+
+
+class Histogram:
+    """
+    Distribution of durations by label values. The series keep the count of each bucket followed by the sum,
+    and are only turned into the cumulative buckets of the Prometheus format when rendered.
+    """
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...],
+                 buckets: tuple[float, ...] = DURATION_BUCKETS_SECONDS) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        self.series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [0] * (len(self.buckets) + 2)
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def merge(self, labels: tuple[str, ...], other: list[float]) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            self.series[labels] = list(other)
+            return
+        for position, value in enumerate(other):
+            series[position] += value
+
+    def copy(self) -> Histogram:
+        histogram = Histogram(self.name, self.documentation, self.label_names, self.buckets)
+        histogram.series = {labels: list(series) for labels, series in self.series.items()}
+        return histogram
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        upper_bounds = [*(str(bucket) for bucket in self.buckets), "+Inf"]
+        for labels, series in sorted(self.series.items()):
+            label_pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels, strict=True)]
+            cumulative = 0.0
+            for upper_bound, count in zip(upper_bounds, series, strict=False):
+                cumulative += count
+                bucket_labels = ",".join([*label_pairs, f'le="{upper_bound}"'])
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {cumulative:g}")
+            series_labels = ",".join(label_pairs)
+            lines.append(f"{self.name}_sum{{{series_labels}}} {series[-1]}")
+            lines.append(f"{self.name}_count{{{series_labels}}} {cumulative:g}")
+        return lines
+
+
+class Gauge:
+    """Current value by label values. The values of other processes replace the local ones with the same labels."""
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.series: dict[tuple[str, ...], list[float]] = {}
+
+    def set(self, labels: tuple[str, ...], value: float) -> None:
+        self.series[labels] = [value]
+
+    def merge(self, labels: tuple[str, ...], other: list[float]) -> None:
+        self.series[labels] = list(other)
+
+    def copy(self) -> Gauge:
+        gauge = Gauge(self.name, self.documentation, self.label_names)
+        gauge.series = {labels: list(series) for labels, series in self.series.items()}
+        return gauge
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        for labels, series in sorted(self.series.items()):
+            label_pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels, strict=True)]
+            lines.append(f"{self.name}{{{','.join(label_pairs)}}} {series[0]:g}")
+        return lines
+
+
+class Counter:
+    """Running total by label values. The totals of other processes are added to the local ones."""
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.series: dict[tuple[str, ...], list[float]] = {}
+
+    def inc(self, labels: tuple[str, ...], value: float = 1) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [0]
+        series[0] += value
+
+    def merge(self, labels: tuple[str, ...], other: list[float]) -> None:
+        self.inc(labels, other[0])
+
+    def copy(self) -> Counter:
+        counter = Counter(self.name, self.documentation, self.label_names)
+        counter.series = {labels: list(series) for labels, series in self.series.items()}
+        return counter
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, series in sorted(self.series.items()):
+            label_pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels, strict=True)]
+            lines.append(f"{self.name}{{{','.join(label_pairs)}}} {series[0]:g}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Metrics of this process, in the Prometheus text format.
+
+    Under gunicorn every worker has its own registry, so each one writes its series to a file named after its pid
+    in a directory shared by the workers, and the worker serving a scrape adds up the files of the others.
+    The processor writes to the same directory when it runs on the same host.
+    """
+
+    def __init__(self) -> None:
+        self.directory: Path | None = None
+        self._metrics: dict[str, Histogram | Gauge | Counter] = {}
+        self._flushing = False
+
+    def configure(self, directory: str | None) -> None:
+        self.directory = Path(directory) if directory is not None else None
+
+    def histogram(self, name: str, documentation: str, label_names: tuple[str, ...],
+                  buckets: tuple[float, ...] = DURATION_BUCKETS_SECONDS) -> Histogram:
+        histogram = self._metrics.get(name)
+        if not isinstance(histogram, Histogram):
+            histogram = self._metrics[name] = Histogram(name, documentation, label_names, buckets)
+        return histogram
+
+    def gauge(self, name: str, documentation: str, label_names: tuple[str, ...]) -> Gauge:
+        gauge = self._metrics.get(name)
+        if not isinstance(gauge, Gauge):
+            gauge = self._metrics[name] = Gauge(name, documentation, label_names)
+        return gauge
+
+    def counter(self, name: str, documentation: str, label_names: tuple[str, ...]) -> Counter:
+        counter = self._metrics.get(name)
+        if not isinstance(counter, Counter):
+            counter = self._metrics[name] = Counter(name, documentation, label_names)
+        return counter
+
+    def snapshot(self) -> dict[str, list[tuple[tuple[str, ...], list[float]]]]:
+        return {name: list(metric.series.items()) for name, metric in self._metrics.items()}
+
+    def flush(self) -> None:
+        """Write the series of this process to the shared directory, if there is one."""
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{os.getpid()}.json"
+        temporary_path = path.with_suffix(".tmp")
+        temporary_path.write_text(json.dumps(self.snapshot()), encoding="utf-8")
+        temporary_path.replace(path)
+
+    async def flush_periodically(self) -> None:
+        if self.directory is None or self._flushing:
+            return
+        self._flushing = True
+        try:
+            while True:
+                await asyncio.sleep(FLUSH_INTERVAL_SECONDS)
+                try:
+                    self.flush()
+                except OSError:
+                    logging.exception("Failed to write the metrics to %s", self.directory)
+        finally:
+            self._flushing = False
+
+    def render(self) -> str:
+        all_metrics = {name: metric.copy() for name, metric in self._metrics.items()}
+        for name, series, stale in self._other_processes_series():
+            metric = all_metrics.get(name)
+            if metric is None or (stale and isinstance(metric, Gauge)):
+                continue
+            for labels, values in series:
+                metric.merge(tuple(labels), values)
+        lines = [line for metric in all_metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+    def _other_processes_series(self) -> list[tuple[str, list[tuple[list[str], list[float]]], bool]]:
+        if self.directory is None or not self.directory.exists():
+            return []
+        own_file = f"{os.getpid()}.json"
+        stale_before = time.time() - STALE_GAUGE_SECONDS
+        series: list[tuple[str, list[tuple[list[str], list[float]]], bool]] = []
+        for path in self.directory.glob("*.json"):
+            if path.name == own_file:
+                continue
+            try:
+                stale = path.stat().st_mtime < stale_before
+                series.extend((name, values, stale)
+                              for name, values in json.loads(path.read_text(encoding="utf-8")).items())
+            except (OSError, ValueError):
+                logging.warning("Skipping unreadable metrics file %s", path)
+        return series
+
+    def reset(self) -> None:
+        for metric in self._metrics.values():
+            metric.series = {}
+
+
+def clear_metrics_directory(directory: str | None) -> None:
+    """Remove the files of the workers of a previous run, before starting the new ones."""
+    if directory is None:
+        return
+    for path in Path(directory).glob("*.json"):
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = metrics.histogram(
+    "http_request_duration_seconds", "Duration of the API requests by route.", ("method", "route", "status"))
+HANDLER_DURATION = metrics.histogram(
+    "handler_duration_seconds", "Duration of the application handlers.", ("handler", "outcome"))
+PROVIDER_CALL_DURATION = metrics.histogram(
+    "provider_call_duration_seconds", "Duration of the calls to the provider APIs.", ("provider", "call", "outcome"))
+EVENT_HANDLING_DURATION = metrics.histogram(
+    "event_handling_duration_seconds", "Duration of the processing of the events.", ("event", "outcome"))
+SCHEDULED_TASK_DURATION = metrics.histogram(
+    "scheduled_task_duration_seconds", "Duration of the runs of the scheduled tasks.", ("task", "outcome"))
+SCHEDULED_TASK_LAG = metrics.histogram(
+    "scheduled_task_lag_seconds", "Delay between the planned and the actual start of the scheduled tasks.", ("task",))
+SCHEDULED_TASK_SKIPPED_RUNS = metrics.counter(
+    "scheduled_task_skipped_runs_total", "Runs of the scheduled tasks that were skipped, by reason.", ("task", "reason"))
+DRAIN_REMAINING_ITEMS = metrics.gauge(
+    "drain_remaining_items", "Items left to publish in the current pass of the drains of outdated items.", ("drain",))
+DRAIN_PUBLISHED_ITEMS = metrics.gauge(
+    "drain_published_items", "Items published in the current pass of the drains of outdated items.", ("drain",))
+DRAIN_ITEMS_PER_MINUTE = metrics.gauge(
+    "drain_items_per_minute", "Items published per minute in the current pass of the drains.", ("drain",))
+DRAIN_ETA_SECONDS = metrics.gauge(
+    "drain_eta_seconds", "Estimated time left in the current pass of the drains, -1 when unknown.", ("drain",))
+
+
+def timed(histogram: Histogram, *labels: str, timing_name: str | None = None) -> Callable[
+        [Callable[P, Awaitable[T]]], Callable[P, Coroutine[Any, Any, T]]]:
+    """
+    Record the duration of the calls to a coroutine function, with an outcome label telling if it raised.
+    With a `timing_name`, the duration is also added to the timing of the request being served.
+    """
+    def decorator(function: Callable[P, Awaitable[T]]) -> Callable[P, Coroutine[Any, Any, T]]:
+        @functools.wraps(function)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                result = await function(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                duration = time.perf_counter() - start
+                histogram.observe((*labels, outcome), duration)
+                if timing_name is not None:
+                    add_timing(timing_name, duration * 1000)
+
+        return wrapper
+
+    return decorator
+
+
+def provider_call(provider: str) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Coroutine[Any, Any, T]]]:
+    """Record the duration of a method calling a provider API, labelled with the provider and the method name."""
+    def decorator(function: Callable[P, Awaitable[T]]) -> Callable[P, Coroutine[Any, Any, T]]:
+        call = function.__name__
+        return timed(PROVIDER_CALL_DURATION, provider, call, timing_name=f"{provider}.{call}")(function)
+
+    return decorator
+
+
+def instrument_handlers(handlers: object) -> None:
+    """Record the duration of the `handle` method of every handler in the attributes of `handlers`."""
+    instrumented: set[int] = set()
+    for handler in vars(handlers).values():
+        handle = getattr(handler, "handle", None)
+        if id(handler) in instrumented or not inspect.iscoroutinefunction(handle):
+            continue
+        name = type(handler).__name__
+        handler.handle = timed(HANDLER_DURATION, name, timing_name=name)(handle)
+        instrumented.add(id(handler))
+
+
+def instrument_event_handling(
+        handle: Callable[[Event], Awaitable[None]],
+) -> Callable[[Event], Coroutine[Any, Any, None]]:
+    """Record the duration of the processing of each event, by event type."""
+    @functools.wraps(handle)
+    async def wrapper(event: Event) -> None:
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            await handle(event)
+            outcome = "ok"
+        finally:
+            EVENT_HANDLING_DURATION.observe((type(event).__name__, outcome), time.perf_counter() - start)
+
+    return wrapper
+
+
+def record_drain_progress(progress: Iterable[DrainProgress]) -> None:
+    """Set the gauges of the drains of outdated items from their progress."""
+    for drain in progress:
+        labels = (drain.name,)
+        DRAIN_REMAINING_ITEMS.set(labels, drain.remaining_items)
+        DRAIN_PUBLISHED_ITEMS.set(labels, drain.published_items)
+        DRAIN_ITEMS_PER_MINUTE.set(labels, drain.items_per_minute)
+        DRAIN_ETA_SECONDS.set(labels, -1 if drain.eta_seconds is None else drain.eta_seconds)
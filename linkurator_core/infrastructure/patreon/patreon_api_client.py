@@ -10,6 +10,7 @@ from pydantic import AnyUrl, BaseModel
 
 from linkurator_core.domain.common.utils import parse_url
 from linkurator_core.infrastructure.asyncio_impl.http_client import AsyncHttpClient
+from linkurator_core.infrastructure.metrics import provider_call
 
 
 class PatreonImage(BaseModel):
@@ -76,6 +77,7 @@ class PatreonApiClient:
         }
         return f"{BASE_URL}/oauth2/authorize?{urlencode(params)}"
 
+    @provider_call("patreon")
     async def exchange_code_for_tokens(self, code: str, redirect_uri: str) -> str | None:
         """Exchange authorization code for an access token. Returns the access token or None on failure."""
         token_url = f"{BASE_URL}/api/oauth2/token"
@@ -93,6 +95,7 @@ class PatreonApiClient:
         logging.error("Failed to exchange Patreon code: %s -> %s", response.status, response.json)
         return None
 
+    @provider_call("patreon")
     async def get_current_user_memberships(self, access_token: str) -> list[PatreonMembership]:
         """Get the memberships the current user is a member/patron of."""
         url = f"{BASE_URL}/api/oauth2/v2/identity"
@@ -119,6 +122,7 @@ class PatreonApiClient:
         logging.error("Failed to get Patreon memberships: %s -> %s", response.status, response.json)
         return []
 
+    @provider_call("patreon")
     async def get_campaign(self, campaign_id: str) -> PatreonCampaign | None:
         """Get a campaign by ID."""
         url = f"{BASE_URL}/api/campaigns/{campaign_id}"
@@ -134,6 +138,7 @@ class PatreonApiClient:
         logging.error("Failed to get Patreon campaign: %s -> %s", response.status, response.json)
         return None
 
+    @provider_call("patreon")
     async def get_campaign_id_from_vanity(self, vanity: str) -> str | None:
         """Get campaign ID from vanity name."""
         url = f"{BASE_URL}/api/campaigns"
@@ -151,6 +156,7 @@ class PatreonApiClient:
         logging.error("Failed to get Patreon campaign ID from vanity: %s -> %s", response.status, response.json)
         return None
 
+    @provider_call("patreon")
     async def get_campaign_posts(self, campaign_id: str, from_date: datetime) -> list[PatreonPost]:
         url = f"{BASE_URL}/api/campaigns/{campaign_id}/posts"
         page_size = 100
@@ -196,6 +202,7 @@ class PatreonApiClient:
 
         return all_posts
 
+    @provider_call("patreon")
     async def get_post(self, post_id: str) -> PatreonPost | None:
         """Get a single post by ID."""
         url = f"{BASE_URL}/api/posts/{post_id}"
@@ -129,9 +129,18 @@ class PatreonSubscriptionService(SubscriptionService):
             limit=len(item_ids),
         )
 
+        return await self.refresh_items(items)
+
+    async def refresh_items(
+        self,
+        items: list[Item],
+    ) -> set[Item]:
         updated_items: set[Item] = set()
 
         for item in items:
+            if item.provider != self.provider_name():
+                continue
+
             # Extract post ID from URL (e.g., patreon.com/posts/12345)
             post_id = extract_post_id_from_url(item.url)
             if not post_id:
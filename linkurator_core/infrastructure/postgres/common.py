@@ -1,16 +1,50 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import AsyncIterator, Sequence
-from contextlib import AbstractAsyncContextManager, asynccontextmanager
+import itertools
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator, Sequence
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from ipaddress import IPv4Address
-from typing import Any
+from typing import Any, TypeVar
 
-from psycopg import AsyncConnection, AsyncTransaction
+import logfire
+import psycopg
+from psycopg import AsyncConnection, AsyncCursor, AsyncTransaction
 from psycopg.rows import dict_row
-from psycopg_pool import AsyncConnectionPool
+from psycopg_pool import AsyncConnectionPool, PoolTimeout
+
+from linkurator_core.infrastructure.postgres.query_statistics import query_statistics, statement_template
+from linkurator_core.infrastructure.request_timing import add_timing
 
 PostgresRow = dict[str, Any]
+T = TypeVar("T")
+
+PRIMARY_APPLICATION_NAME = "linkurator"
+REPLICA_APPLICATION_NAME = "linkurator-replica"
+# A replica that is down is noticed quickly, instead of making the requests wait for a connection
+REPLICA_CONNECTION_TIMEOUT_SECONDS = 2
+REPLICA_HEALTH_CHECK_INTERVAL_SECONDS = 5
+MAX_REPLICA_LAG_SECONDS = 10
+
+_reads_from_primary: ContextVar[bool] = ContextVar("reads_from_primary", default=False)
+
+
+@contextmanager
+def reads_from_primary() -> Iterator[None]:
+    """Send the reads made inside the block to the primary, so they see the writes made just before them."""
+    token = _reads_from_primary.set(True)
+    try:
+        yield
+    finally:
+        _reads_from_primary.reset(token)
+
+
+def reading_from_primary() -> bool:
+    return _reads_from_primary.get()
 
 
 def drop_nul_bytes(value: str) -> str:
@@ -22,29 +56,68 @@ def drop_nul_bytes(value: str) -> str:
     return value.replace("\x00", "") if "\x00" in value else value
 
 
+def escape_like(value: str) -> str:
+    """Escape the wildcards of a text to match it literally in a LIKE pattern."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 class PostgresConnection:
-    """Thin wrapper around a borrowed psycopg AsyncConnection with asyncpg-style query helpers."""
+    """
+    Thin wrapper around a borrowed psycopg AsyncConnection with asyncpg-style query helpers.
+    The queries are recorded in the query statistics, with the time waited for the connection on the first one.
+    """
 
-    def __init__(self, conn: AsyncConnection[PostgresRow]) -> None:
+    def __init__(
+            self,
+            conn: AsyncConnection[PostgresRow],
+            pool_wait_ms: float = 0,
+            explain: Callable[[str, Sequence[Any]], None] | None = None,
+    ) -> None:
         self._conn = conn
+        self._pool_wait_ms = pool_wait_ms
+        self._explain = explain
 
     def transaction(self) -> AbstractAsyncContextManager[AsyncTransaction]:
         return self._conn.transaction()
 
-    async def execute(self, query: str, *args: Any) -> str:
+    def _record(self, query: str, args: Sequence[Any], start: float, rows: int) -> None:
+        duration_ms = (time.perf_counter() - start) * 1000
+        explain = query_statistics.record(query, duration_ms, rows, self._pool_wait_ms)
+        add_timing("db", duration_ms)
+        if self._pool_wait_ms:
+            add_timing("db-pool", self._pool_wait_ms)
+        self._pool_wait_ms = 0
+        if explain and self._explain is not None:
+            self._explain(query, args)
+
+    async def _execute(self, query: str, args: Sequence[Any]) -> AsyncCursor[PostgresRow]:
+        if query_statistics.trace_queries:
+            with logfire.span("postgres {template}", template=statement_template(query)):
+                return await self._timed_execute(query, args)
+        return await self._timed_execute(query, args)
+
+    async def _timed_execute(self, query: str, args: Sequence[Any]) -> AsyncCursor[PostgresRow]:
+        start = time.perf_counter()
         cursor = await self._conn.execute(query, args)
+        self._record(query, args, start, cursor.rowcount)
+        return cursor
+
+    async def execute(self, query: str, *args: Any) -> str:
+        cursor = await self._execute(query, args)
         return cursor.statusmessage or ""
 
     async def executemany(self, query: str, args_list: Sequence[Sequence[Any]]) -> None:
+        start = time.perf_counter()
         async with self._conn.cursor() as cursor:
             await cursor.executemany(query, args_list)
+        self._record(query, (), start, len(args_list))
 
     async def fetch(self, query: str, *args: Any) -> list[dict[str, Any]]:
-        cursor = await self._conn.execute(query, args)
+        cursor = await self._execute(query, args)
         return await cursor.fetchall()
 
     async def fetchrow(self, query: str, *args: Any) -> dict[str, Any] | None:
-        cursor = await self._conn.execute(query, args)
+        cursor = await self._execute(query, args)
         return await cursor.fetchone()
 
     async def fetchval(self, query: str, *args: Any) -> Any:
@@ -57,12 +130,15 @@ class PostgresConnection:
             self, table: str, records: Sequence[Sequence[Any]], columns: Sequence[str],
     ) -> None:
         columns_sql = ", ".join(columns)
+        query = f"COPY {table} ({columns_sql}) FROM STDIN"
+        start = time.perf_counter()
         async with (
             self._conn.cursor() as cursor,
-            cursor.copy(f"COPY {table} ({columns_sql}) FROM STDIN") as copy,
+            cursor.copy(query) as copy,
         ):
             for record in records:
                 await copy.write_row(record)
+        self._record(query, (), start, len(records))
 
 
 class PostgresPool:
@@ -70,11 +146,30 @@ class PostgresPool:
 
     def __init__(self, pool: AsyncConnectionPool[AsyncConnection[PostgresRow]]) -> None:
         self._pool = pool
+        self._explain_tasks: set[asyncio.Task[None]] = set()
 
     @asynccontextmanager
     async def acquire(self) -> AsyncIterator[PostgresConnection]:
+        start = time.perf_counter()
         async with self._pool.connection() as raw_conn:
-            yield PostgresConnection(raw_conn)
+            pool_wait_ms = (time.perf_counter() - start) * 1000
+            yield PostgresConnection(raw_conn, pool_wait_ms, self._explain_in_background)
+
+    def _explain_in_background(self, query: str, args: Sequence[Any]) -> None:
+        task = asyncio.create_task(self._explain(query, args))
+        self._explain_tasks.add(task)
+        task.add_done_callback(self._explain_tasks.discard)
+
+    async def _explain(self, query: str, args: Sequence[Any]) -> None:
+        try:
+            async with self._pool.connection() as raw_conn, raw_conn.transaction(force_rollback=True):
+                # Anything that is not a plain read fails instead of writing or locking
+                await raw_conn.execute("SET TRANSACTION READ ONLY")
+                cursor = await raw_conn.execute("EXPLAIN (ANALYZE, BUFFERS) " + query, args)
+                plan = "\n".join(str(next(iter(row.values()))) for row in await cursor.fetchall())
+            query_statistics.record_plan(query, plan)
+        except (psycopg.Error, PoolTimeout):
+            logging.exception("Failed to explain a slow query")
 
     async def execute(self, query: str, *args: Any) -> str:
         async with self.acquire() as conn:
@@ -97,20 +192,131 @@ class PostgresPool:
             return await conn.fetchval(query, *args)
 
 
+class _FailoverPool(PostgresPool):
+    """Pool of a replica that runs the queries on the primary when the replica fails."""
+
+    def __init__(
+            self,
+            pool: AsyncConnectionPool[AsyncConnection[PostgresRow]],
+            primary: Callable[[], Awaitable[PostgresPool]],
+            on_failure: Callable[[], None],
+    ) -> None:
+        super().__init__(pool)
+        self._replica = PostgresPool(pool)
+        self._primary = primary
+        self._on_failure = on_failure
+
+    async def _run(self, query: Callable[[PostgresPool], Awaitable[T]]) -> T:
+        try:
+            return await query(self._replica)
+        except (psycopg.OperationalError, PoolTimeout):
+            logging.exception("Query failed on a replica, running it on the primary")
+            self._on_failure()
+            return await query(await self._primary())
+
+    async def execute(self, query: str, *args: Any) -> str:
+        return await self._run(lambda pool: pool.execute(query, *args))
+
+    async def fetch(self, query: str, *args: Any) -> list[dict[str, Any]]:
+        return await self._run(lambda pool: pool.fetch(query, *args))
+
+    async def fetchrow(self, query: str, *args: Any) -> dict[str, Any] | None:
+        return await self._run(lambda pool: pool.fetchrow(query, *args))
+
+    async def fetchval(self, query: str, *args: Any) -> Any:
+        return await self._run(lambda pool: pool.fetchval(query, *args))
+
+
+@dataclass(frozen=True)
+class PostgresReplica:
+    """Streaming replica of the primary, with the same database and credentials."""
+
+    ip: IPv4Address
+    port: int
+
+
+class _ReplicaState:
+    def __init__(
+            self,
+            pool: AsyncConnectionPool[AsyncConnection[PostgresRow]],
+            primary: Callable[[], Awaitable[PostgresPool]],
+    ) -> None:
+        self.pool = _FailoverPool(pool, primary, self.mark_unhealthy)
+        self._replica = PostgresPool(pool)
+        self._healthy = False
+        self._next_check = 0.0
+        self._lock = asyncio.Lock()
+
+    def mark_unhealthy(self) -> None:
+        self._healthy = False
+        self._next_check = time.monotonic() + REPLICA_HEALTH_CHECK_INTERVAL_SECONDS
+
+    async def is_healthy(self) -> bool:
+        if time.monotonic() < self._next_check:
+            return self._healthy
+        async with self._lock:
+            if time.monotonic() < self._next_check:
+                return self._healthy
+            try:
+                # A replica that has replayed everything it received is up to date, even if the primary
+                # has not written anything for a while
+                lag = await asyncio.wait_for(
+                    self._replica.fetchval("""
+                        SELECT COALESCE(CASE
+                            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+                        END, 0)
+                    """),
+                    REPLICA_CONNECTION_TIMEOUT_SECONDS,
+                )
+                self._healthy = lag <= MAX_REPLICA_LAG_SECONDS
+                if not self._healthy:
+                    logging.warning("Replica is %s seconds behind the primary, reading from the primary", lag)
+            except (psycopg.Error, PoolTimeout, TimeoutError):
+                logging.exception("Replica health check failed, reading from the primary")
+                self._healthy = False
+            self._next_check = time.monotonic() + REPLICA_HEALTH_CHECK_INTERVAL_SECONDS
+            return self._healthy
+
+
 class PostgresConnector:
     """
-    Lazily creates and caches a connection pool for a single (host, db) pair.
+    Lazily creates and caches a connection pool for a single (host, db) pair, and for each of its replicas.
     """
 
-    def __init__(self, ip: IPv4Address, port: int, db_name: str, username: str, password: str) -> None:
+    def __init__(
+            self, ip: IPv4Address, port: int, db_name: str, username: str, password: str,
+            replicas: Sequence[PostgresReplica] = (),
+    ) -> None:
         self._ip = ip
         self._port = port
         self._db_name = db_name
         self._username = username
         self._password = password
+        self._replicas = list(replicas)
         self._pool: PostgresPool | None = None
+        self._replica_states: list[_ReplicaState] | None = None
+        self._replica_turns = itertools.cycle(range(len(self._replicas)))
         self._pool_lock = asyncio.Lock()
 
+    def _raw_pool(
+            self, ip: IPv4Address, port: int, application_name: str, timeout: float | None = None,
+    ) -> AsyncConnectionPool[AsyncConnection[PostgresRow]]:
+        kwargs: dict[str, Any] = {
+            "host": str(ip),
+            "port": port,
+            "dbname": self._db_name,
+            "user": self._username,
+            "password": self._password,
+            "application_name": application_name,
+            "autocommit": True,
+            "row_factory": dict_row,
+        }
+        if timeout is None:
+            return AsyncConnectionPool(conninfo="", min_size=1, max_size=5, open=False, kwargs=kwargs)
+        kwargs["connect_timeout"] = timeout
+        return AsyncConnectionPool(conninfo="", min_size=1, max_size=5, open=False, kwargs=kwargs, timeout=timeout)
+
     async def pool(self) -> PostgresPool:
         if self._pool is not None:
             return self._pool
@@ -118,22 +324,39 @@ class PostgresConnector:
         async with self._pool_lock:
             if self._pool is not None:
                 return self._pool
-            raw_pool: AsyncConnectionPool[AsyncConnection[PostgresRow]] = AsyncConnectionPool(
-                conninfo="",
-                min_size=1,
-                max_size=5,
-                open=False,
-                kwargs={
-                    "host": str(self._ip),
-                    "port": self._port,
-                    "dbname": self._db_name,
-                    "user": self._username,
-                    "password": self._password,
-                    "autocommit": True,
-                    "row_factory": dict_row,
-                },
-            )
+            raw_pool = self._raw_pool(self._ip, self._port, PRIMARY_APPLICATION_NAME)
             await raw_pool.open()
             pool = PostgresPool(raw_pool)
             self._pool = pool
             return pool
+
+    async def read_pool(self) -> PostgresPool:
+        """
+        Pool for the reads that tolerate a slight staleness. They go to the healthy replicas in turns,
+        or to the primary when there are none or the reads must see the writes made just before them.
+        """
+        if not self._replicas or reading_from_primary():
+            return await self.pool()
+        states = await self._replica_pools()
+        for _ in states:
+            state = states[next(self._replica_turns)]
+            if await state.is_healthy():
+                return state.pool
+        return await self.pool()
+
+    async def _replica_pools(self) -> list[_ReplicaState]:
+        if self._replica_states is not None:
+            return self._replica_states
+
+        async with self._pool_lock:
+            if self._replica_states is not None:
+                return self._replica_states
+            states = []
+            for replica in self._replicas:
+                raw_pool = self._raw_pool(
+                    replica.ip, replica.port, REPLICA_APPLICATION_NAME, timeout=REPLICA_CONNECTION_TIMEOUT_SECONDS)
+                # Opening does not wait for the connections, so a replica that is down does not fail here
+                await raw_pool.open()
+                states.append(_ReplicaState(raw_pool, self.pool))
+            self._replica_states = states
+            return states
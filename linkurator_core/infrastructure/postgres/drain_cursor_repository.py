@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from ipaddress import IPv4Address
+from uuid import UUID
+
+from linkurator_core.domain.items.drain_cursor_repository import DrainCursorRepository
+from linkurator_core.infrastructure.postgres.common import PostgresConnector
+
+
+class PostgresDrainCursorRepository(DrainCursorRepository):
+    def __init__(self, ip: IPv4Address, port: int, db_name: str, username: str, password: str) -> None:
+        super().__init__()
+        self._connector = PostgresConnector(ip, port, db_name, username, password)
+
+    async def get(self, name: str) -> UUID | None:
+        pool = await self._connector.pool()
+        cursor: UUID | None = await pool.fetchval("SELECT item_uuid FROM drain_cursors WHERE name = %s", name)
+        return cursor
+
+    async def save(self, name: str, cursor: UUID | None) -> None:
+        pool = await self._connector.pool()
+        await pool.execute(
+            """
+            INSERT INTO drain_cursors (name, item_uuid, updated_at)
+            VALUES (%s, %s, NOW())
+            ON CONFLICT (name) DO UPDATE SET item_uuid = EXCLUDED.item_uuid, updated_at = EXCLUDED.updated_at
+            """,
+            name, cursor,
+        )
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from ipaddress import IPv4Address
+
+from linkurator_core.infrastructure.postgres.common import PostgresConnector
+
+ARCHIVED_TABLES = ["items", "interactions", "rss_data"]
+
+ARCHIVE_BATCH_QUERY = """
+    WITH batch AS (
+        SELECT uuid, url FROM items
+        WHERE deleted_at < %s
+        ORDER BY deleted_at
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    ), moved_items AS (
+        DELETE FROM items USING batch WHERE items.uuid = batch.uuid
+        RETURNING items.*
+    ), archived_items AS (
+        INSERT INTO archived_items (
+            uuid, subscription_uuid, name, description, url, thumbnail, created_at, updated_at,
+            published_at, provider, deleted_at, duration, version, archived_at
+        )
+        SELECT uuid, subscription_uuid, name, description, url, thumbnail, created_at, updated_at,
+               published_at, provider, deleted_at, duration, version, now()
+        FROM moved_items
+        RETURNING 1
+    ), moved_interactions AS (
+        DELETE FROM interactions USING batch WHERE interactions.item_uuid = batch.uuid
+        RETURNING interactions.*
+    ), archived_interactions AS (
+        INSERT INTO archived_interactions (uuid, item_uuid, user_uuid, type, created_at, archived_at)
+        SELECT uuid, item_uuid, user_uuid, type, created_at, now() FROM moved_interactions
+        RETURNING 1
+    ), moved_rss_data AS (
+        DELETE FROM rss_data USING batch
+        WHERE rss_data.item_url = batch.url
+          AND NOT EXISTS (SELECT 1 FROM items WHERE items.url = rss_data.item_url AND items.deleted_at IS NULL)
+        RETURNING rss_data.*
+    ), archived_rss_data AS (
+        INSERT INTO archived_rss_data (id, rss_url, item_url, raw_data, archived_at)
+        SELECT id, rss_url, item_url, raw_data, now() FROM moved_rss_data
+        RETURNING 1
+    ), deleted_timeline_items AS (
+        DELETE FROM timeline_items USING batch WHERE timeline_items.timeline_item_uuid = batch.uuid
+    )
+    SELECT
+        (SELECT COUNT(*) FROM archived_items) AS items,
+        (SELECT COUNT(*) FROM archived_interactions) AS interactions,
+        (SELECT COUNT(*) FROM archived_rss_data) AS rss_data
+"""
+
+
+@dataclass
+class TableBloat:
+    table: str
+    live_rows: int
+    dead_rows: int
+    table_bytes: int
+    index_bytes: int
+
+    @property
+    def dead_rows_ratio(self) -> float:
+        total_rows = self.live_rows + self.dead_rows
+        return 0 if total_rows == 0 else self.dead_rows / total_rows
+
+
+@dataclass
+class ArchiveResult:
+    items: int = 0
+    interactions: int = 0
+    rss_data: int = 0
+    batches: int = 0
+
+
+class PostgresItemArchiver:
+    """
+    Moves items soft-deleted for longer than the retention period to the archive tables, together
+    with their interactions and raw RSS data.
+
+    Every batch is a short transaction of its own, with a pause between batches, so the live tables
+    are never locked for long and autovacuum can keep up. Once done, the tables are vacuumed to make
+    the space of the removed rows reusable.
+    """
+
+    def __init__(
+            self,
+            ip: IPv4Address, port: int, db_name: str, username: str, password: str,
+            retention: timedelta = timedelta(days=30),
+            batch_size: int = 1000,
+            max_batches: int | None = None,
+            pause_seconds: float = 0.5,
+    ) -> None:
+        self._connector = PostgresConnector(ip, port, db_name, username, password)
+        self.retention = retention
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.pause_seconds = pause_seconds
+
+    async def handle(self) -> None:
+        await self.archive_deleted_items()
+
+    async def archive_deleted_items(self, vacuum: bool = True) -> ArchiveResult:
+        deleted_before = datetime.now(timezone.utc) - self.retention
+        logging.info("Archiving items deleted before %s", deleted_before)
+        self._log_bloat("before archiving", await self.table_bloat())
+
+        pool = await self._connector.pool()
+        result = ArchiveResult()
+        while self.max_batches is None or result.batches < self.max_batches:
+            row = await pool.fetchrow(ARCHIVE_BATCH_QUERY, deleted_before, self.batch_size)
+            if row is None or row["items"] == 0:
+                break
+            result.batches += 1
+            result.items += row["items"]
+            result.interactions += row["interactions"]
+            result.rss_data += row["rss_data"]
+            if row["items"] < self.batch_size:
+                break
+            await asyncio.sleep(self.pause_seconds)
+
+        logging.info("Archived %s items, %s interactions and %s raw RSS records in %s batches",
+                     result.items, result.interactions, result.rss_data, result.batches)
+
+        if vacuum and result.items > 0:
+            await pool.execute("VACUUM (ANALYZE) " + ", ".join(ARCHIVED_TABLES))
+            self._log_bloat("after archiving", await self.table_bloat())
+
+        return result
+
+    async def table_bloat(self) -> list[TableBloat]:
+        """Dead rows and size of the tables the archived rows come from, as estimated by the statistics."""
+        pool = await self._connector.pool()
+        rows = await pool.fetch(
+            """
+            SELECT relname, n_live_tup, n_dead_tup, pg_table_size(relid) AS table_bytes,
+                   pg_indexes_size(relid) AS index_bytes
+            FROM pg_stat_user_tables WHERE relname = ANY(%s) ORDER BY relname
+            """,
+            ARCHIVED_TABLES,
+        )
+        return [
+            TableBloat(
+                table=row["relname"],
+                live_rows=row["n_live_tup"],
+                dead_rows=row["n_dead_tup"],
+                table_bytes=row["table_bytes"],
+                index_bytes=row["index_bytes"],
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def _log_bloat(moment: str, bloat: list[TableBloat]) -> None:
+        for table in bloat:
+            logging.info("Table %s %s: %s live rows, %s dead rows (%.1f%%), %s table bytes, %s index bytes",
+                         table.table, moment, table.live_rows, table.dead_rows, table.dead_rows_ratio * 100,
+                         table.table_bytes, table.index_bytes)
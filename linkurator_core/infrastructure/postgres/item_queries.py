@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from linkurator_core.domain.common import utils
+from linkurator_core.domain.items.interaction import Interaction, InteractionType
+from linkurator_core.domain.items.item import Item
+from linkurator_core.domain.items.item_repository import ItemFilterCriteria
+from linkurator_core.infrastructure.postgres.common import drop_nul_bytes, escape_like
+
+# Words shorter than a trigram cannot be looked up in the trigram index of the names, so a text
+# with any of them only matches whole words
+PARTIAL_WORD_MIN_LENGTH = 3
+
+# The columns read into an Item, leaving out the search vector
+ITEM_COLUMNS = (
+    "uuid", "subscription_uuid", "name", "description", "url", "thumbnail", "duration", "version",
+    "provider", "created_at", "updated_at", "published_at", "deleted_at",
+)
+
+
+# The columns written from an Item, in the order of item_params
+ITEM_INSERT_COLUMNS = (
+    "uuid", "subscription_uuid", "name", "description", "url", "thumbnail",
+    "created_at", "updated_at", "published_at", "provider", "deleted_at", "duration", "version",
+)
+
+
+def item_params(item: Item) -> tuple[Any, ...]:
+    return (
+        item.uuid, item.subscription_uuid, drop_nul_bytes(item.name), drop_nul_bytes(item.description),
+        str(item.url), str(item.thumbnail), item.created_at, item.updated_at,
+        item.published_at, item.provider, item.deleted_at, item.duration, item.version,
+    )
+
+
+def item_columns(table: str = "items") -> str:
+    return ", ".join(f"{table}.{column}" for column in ITEM_COLUMNS)
+
+
+def row_to_item(row: Any) -> Item:
+    return Item(
+        uuid=row["uuid"],
+        subscription_uuid=row["subscription_uuid"],
+        name=row["name"],
+        description=row["description"],
+        url=utils.parse_url(row["url"]),
+        thumbnail=utils.parse_url(row["thumbnail"]),
+        duration=row["duration"],
+        version=row["version"],
+        provider=row["provider"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+        published_at=row["published_at"],
+        deleted_at=row["deleted_at"],
+    )
+
+
+def row_to_interaction(row: Any) -> Interaction:
+    return Interaction(
+        uuid=row["uuid"],
+        item_uuid=row["item_uuid"],
+        user_uuid=row["user_uuid"],
+        type=InteractionType(row["type"]),
+        created_at=row["created_at"],
+    )
+
+
+@dataclass(frozen=True)
+class SqlFragment:
+    """A piece of SQL text with placeholders (%s) paired with the parameter values"""
+
+    placeholders: str
+    params: tuple[Any, ...] = ()
+
+
+def comparison(column: str, operator: str, value: Any) -> SqlFragment:
+    return SqlFragment(f"{column} {operator} %s", (value,))
+
+
+def uuid_array_condition(column: str, values: Sequence[UUID]) -> SqlFragment:
+    return SqlFragment(f"{column} = ANY(%s::uuid[])", (list(values),))
+
+
+def text_search_condition(table: str, text: str) -> SqlFragment:
+    """
+    Items with every word of the text in their name or description, or as part of a word of their name.
+    """
+    condition = SqlFragment(
+        f"{table}.search_vector @@ plainto_tsquery('simple', immutable_unaccent(%s))", (text,))
+    words = re.findall(r"\w+", text)
+    if len(words) == 0 or any(len(word) < PARTIAL_WORD_MIN_LENGTH for word in words):
+        return condition
+
+    partial_words = join(
+        [SqlFragment(f"immutable_unaccent({table}.name) ILIKE immutable_unaccent(%s)", (f"%{escape_like(word)}%",))
+         for word in words],
+        " AND ")
+    return SqlFragment(
+        f"({condition.placeholders} OR ({partial_words.placeholders}))",
+        (*condition.params, *partial_words.params),
+    )
+
+
+def text_rank(table: str, text: str) -> SqlFragment:
+    return SqlFragment(
+        f"ts_rank({table}.search_vector, plainto_tsquery('simple', immutable_unaccent(%s)))", (text,))
+
+
+def join(fragments: Sequence[SqlFragment], separator: str) -> SqlFragment:
+    return SqlFragment(
+        separator.join(fragment.placeholders for fragment in fragments),
+        tuple(value for fragment in fragments for value in fragment.params),
+    )
+
+
+def build_item_conditions(criteria: ItemFilterCriteria) -> list[SqlFragment]:
+    fragments = [SqlFragment("deleted_at IS NULL")]
+    if criteria.item_ids is not None:
+        fragments.append(uuid_array_condition("uuid", list(criteria.item_ids)))
+    if criteria.subscription_ids is not None and len(set(criteria.subscription_ids)) == 1:
+        # Unlike = ANY, an equality reads the items of the subscription in the order of the index
+        fragments.append(comparison("subscription_uuid", "=", criteria.subscription_ids[0]))
+    elif criteria.subscription_ids is not None:
+        fragments.append(uuid_array_condition("subscription_uuid", list(criteria.subscription_ids)))
+    if criteria.published_after is not None:
+        fragments.append(comparison("published_at", ">", criteria.published_after))
+    if criteria.created_before is not None:
+        fragments.append(comparison("created_at", "<", criteria.created_before))
+    if criteria.updated_before is not None:
+        fragments.append(comparison("updated_at", "<", criteria.updated_before))
+    if criteria.url is not None:
+        fragments.append(comparison("url", "=", str(criteria.url)))
+    if criteria.last_version is not None:
+        fragments.append(comparison("version", "<", criteria.last_version))
+    if criteria.provider is not None:
+        fragments.append(comparison("provider", "=", criteria.provider))
+    if criteria.text is not None and len(criteria.text) > 0:
+        fragments.append(text_search_condition("items", criteria.text))
+    duration_fragment = build_duration_condition("duration", criteria.min_duration, criteria.max_duration)
+    if duration_fragment is not None:
+        fragments.append(duration_fragment)
+    return fragments
+
+
+def build_duration_condition(
+        column: str, min_duration: int | None, max_duration: int | None,
+) -> SqlFragment | None:
+    if min_duration is not None and max_duration is not None:
+        return SqlFragment(f"{column} BETWEEN %s AND %s", (min_duration, max_duration))
+    if max_duration is not None:
+        return SqlFragment(f"({column} IS NULL OR {column} <= %s)", (max_duration,))
+    if min_duration is not None:
+        return SqlFragment(f"({column} IS NULL OR {column} >= %s)", (min_duration,))
+    return None
+
+
+def build_interaction_condition(criteria: ItemFilterCriteria) -> SqlFragment | None:
+    if criteria.interactions_from_user is None:
+        return None
+    user_id = criteria.interactions_from_user
+    or_fragments: list[SqlFragment] = []
+    if criteria.interactions.without_interactions:
+        or_fragments.append(SqlFragment(
+            "NOT EXISTS (SELECT 1 FROM interactions ix WHERE ix.item_uuid = items.uuid "
+            "AND ix.user_uuid = %s)",
+            (user_id,),
+        ))
+    for flag, interaction_type in (
+        (criteria.interactions.recommended, InteractionType.RECOMMENDED),
+        (criteria.interactions.discouraged, InteractionType.DISCOURAGED),
+        (criteria.interactions.viewed, InteractionType.VIEWED),
+        (criteria.interactions.hidden, InteractionType.HIDDEN),
+    ):
+        if flag:
+            or_fragments.append(SqlFragment(
+                "EXISTS (SELECT 1 FROM interactions ix WHERE ix.item_uuid = items.uuid "
+                "AND ix.user_uuid = %s AND ix.type = %s)",
+                (user_id, interaction_type.value),
+            ))
+    if not or_fragments:
+        return SqlFragment("FALSE")
+    joined = join(or_fragments, " OR ")
+    return SqlFragment(f"({joined.placeholders})", joined.params)
@@ -1,149 +1,114 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
-from dataclasses import dataclass
+from dataclasses import replace
 from datetime import datetime, timezone
 from ipaddress import IPv4Address
 from typing import Any
 from uuid import UUID
 
-from linkurator_core.domain.common import utils
-from linkurator_core.domain.items.interaction import Interaction, InteractionType
+from linkurator_core.domain.items.interaction import Interaction
 from linkurator_core.domain.items.item import Item, ItemProvider
-from linkurator_core.domain.items.item_repository import InteractionFilterCriteria, ItemFilterCriteria, ItemRepository
-from linkurator_core.infrastructure.postgres.common import PostgresConnector, drop_nul_bytes
-
-
-def _row_to_item(row: Any) -> Item:
-    return Item(
-        uuid=row["uuid"],
-        subscription_uuid=row["subscription_uuid"],
-        name=row["name"],
-        description=row["description"],
-        url=utils.parse_url(row["url"]),
-        thumbnail=utils.parse_url(row["thumbnail"]),
-        duration=row["duration"],
-        version=row["version"],
-        provider=row["provider"],
-        created_at=row["created_at"],
-        updated_at=row["updated_at"],
-        published_at=row["published_at"],
-        deleted_at=row["deleted_at"],
-    )
-
-
-def _row_to_interaction(row: Any) -> Interaction:
-    return Interaction(
-        uuid=row["uuid"],
-        item_uuid=row["item_uuid"],
-        user_uuid=row["user_uuid"],
-        type=InteractionType(row["type"]),
-        created_at=row["created_at"],
-    )
-
-
-@dataclass(frozen=True)
-class SqlFragment:
-    """A piece of SQL text with placeholders (%s) paired with the parameter values"""
-
-    placeholders: str
-    params: tuple[Any, ...] = ()
-
-
-def _comparison(column: str, operator: str, value: Any) -> SqlFragment:
-    return SqlFragment(f"{column} {operator} %s", (value,))
-
-
-def _uuid_array_condition(column: str, values: Sequence[UUID]) -> SqlFragment:
-    return SqlFragment(f"{column} = ANY(%s::uuid[])", (list(values),))
-
-
-def _text_search_condition(column: str, text: str) -> SqlFragment:
+from linkurator_core.domain.items.item_repository import (
+    InteractionFilterCriteria,
+    ItemFilterCriteria,
+    ItemOrdering,
+    ItemRepository,
+)
+from linkurator_core.infrastructure.postgres.common import PostgresConnector, PostgresReplica
+from linkurator_core.infrastructure.postgres.item_queries import (
+    ITEM_INSERT_COLUMNS,
+    SqlFragment,
+    build_duration_condition,
+    build_interaction_condition,
+    build_item_conditions,
+    comparison,
+    item_columns,
+    item_params,
+    join,
+    row_to_interaction,
+    row_to_item,
+    text_rank,
+    text_search_condition,
+    uuid_array_condition,
+)
+from linkurator_core.infrastructure.request_timing import request_timed
+
+# Rows updated per statement when deleting many items, so no statement holds its row locks for long
+DELETE_BATCH_SIZE = 1000
+
+# Between these numbers of subscriptions, the newest items of each subscription are read separately and
+# merged instead of filtering the items of all the subscriptions together. With more subscriptions, reading
+# each one costs more than walking the live items by publication date until the page is complete.
+MERGED_FEED_MIN_SUBSCRIPTIONS = 10
+MERGED_FEED_MAX_SUBSCRIPTIONS = 100
+
+
+def _build_find_items_query(criteria: ItemFilterCriteria, page_number: int, limit: int) -> SqlFragment:
+    if _use_merged_feed_query(criteria):
+        return _build_merged_feed_query(criteria, page_number, limit)
+
+    fragments = build_item_conditions(criteria)
+    interaction_fragment = build_interaction_condition(criteria)
+    if interaction_fragment is not None:
+        fragments = [*fragments, interaction_fragment]
+
+    where_clause = join(fragments, " AND ")
+    order = SqlFragment("published_at DESC")
+    if criteria.order_by == ItemOrdering.RELEVANCE and criteria.text:
+        rank = text_rank("items", criteria.text)
+        order = SqlFragment(f"{rank.placeholders} DESC, published_at DESC", rank.params)
     return SqlFragment(
-        f"to_tsvector('simple', immutable_unaccent({column})) "
-        "@@ plainto_tsquery('simple', immutable_unaccent(%s))",
-        (text,),
+        f"SELECT {item_columns()} FROM items WHERE " + where_clause.placeholders  # noqa: S608
+        + f" ORDER BY {order.placeholders} LIMIT %s OFFSET %s",
+        (*where_clause.params, *order.params, limit, page_number * limit),
     )
 
 
-def _join(fragments: Sequence[SqlFragment], separator: str) -> SqlFragment:
+def _use_merged_feed_query(criteria: ItemFilterCriteria) -> bool:
+    # Lookups by id and text searches match few items, which are found faster with their own indexes
+    return (criteria.subscription_ids is not None
+            and MERGED_FEED_MIN_SUBSCRIPTIONS <= len(set(criteria.subscription_ids)) <= MERGED_FEED_MAX_SUBSCRIPTIONS
+            and criteria.item_ids is None
+            and not criteria.text)
+
+
+def _build_merged_feed_query(criteria: ItemFilterCriteria, page_number: int, limit: int) -> SqlFragment:
+    """
+    Feed of many subscriptions, newest first.
+
+    Filtering all the subscriptions at once can make Postgres sort every matching item to return a page.
+    Instead, the ids of the newest items of each subscription are read in order from the index of live
+    items, stopping after the ones that can be in the page, and merged. Only the items of the page
+    are read from the table.
+    """
+    fragments = build_item_conditions(replace(criteria, subscription_ids=None))
+    fragments.append(SqlFragment("items.subscription_uuid = subscriptions.uuid"))
+    interaction_fragment = build_interaction_condition(criteria)
+    if interaction_fragment is not None:
+        fragments.append(interaction_fragment)
+
+    where_clause = join(fragments, " AND ")
+    items_per_subscription = (page_number + 1) * limit
+    newest_items = "SELECT uuid, published_at FROM items WHERE " + where_clause.placeholders  # noqa: S608
     return SqlFragment(
-        separator.join(fragment.placeholders for fragment in fragments),
-        tuple(value for fragment in fragments for value in fragment.params),
+        "WITH page AS ("  # noqa: S608
+        "SELECT feed.uuid, feed.published_at FROM unnest(%s::uuid[]) AS subscriptions(uuid) "
+        f"CROSS JOIN LATERAL ({newest_items} ORDER BY published_at DESC LIMIT %s) AS feed "
+        "ORDER BY feed.published_at DESC LIMIT %s OFFSET %s"
+        f") SELECT {item_columns()} FROM page JOIN items ON items.uuid = page.uuid ORDER BY page.published_at DESC",
+        (list(set(criteria.subscription_ids or [])), *where_clause.params,
+         items_per_subscription, limit, page_number * limit),
     )
 
 
-def _build_item_conditions(criteria: ItemFilterCriteria) -> list[SqlFragment]:
-    fragments = [SqlFragment("deleted_at IS NULL")]
-    if criteria.item_ids is not None:
-        fragments.append(_uuid_array_condition("uuid", list(criteria.item_ids)))
-    if criteria.subscription_ids is not None:
-        fragments.append(_uuid_array_condition("subscription_uuid", list(criteria.subscription_ids)))
-    if criteria.published_after is not None:
-        fragments.append(_comparison("published_at", ">", criteria.published_after))
-    if criteria.created_before is not None:
-        fragments.append(_comparison("created_at", "<", criteria.created_before))
-    if criteria.updated_before is not None:
-        fragments.append(_comparison("updated_at", "<", criteria.updated_before))
-    if criteria.url is not None:
-        fragments.append(_comparison("url", "=", str(criteria.url)))
-    if criteria.last_version is not None:
-        fragments.append(_comparison("version", "<", criteria.last_version))
-    if criteria.provider is not None:
-        fragments.append(_comparison("provider", "=", criteria.provider))
-    if criteria.text is not None and len(criteria.text) > 0:
-        fragments.append(_text_search_condition("name", criteria.text))
-    duration_fragment = _build_duration_condition("duration", criteria.min_duration, criteria.max_duration)
-    if duration_fragment is not None:
-        fragments.append(duration_fragment)
-    return fragments
-
-
-def _build_duration_condition(
-        column: str, min_duration: int | None, max_duration: int | None,
-) -> SqlFragment | None:
-    if min_duration is not None and max_duration is not None:
-        return SqlFragment(f"{column} BETWEEN %s AND %s", (min_duration, max_duration))
-    if max_duration is not None:
-        return SqlFragment(f"({column} IS NULL OR {column} <= %s)", (max_duration,))
-    if min_duration is not None:
-        return SqlFragment(f"({column} IS NULL OR {column} >= %s)", (min_duration,))
-    return None
-
-
-def _build_interaction_condition(criteria: ItemFilterCriteria) -> SqlFragment | None:
-    if criteria.interactions_from_user is None:
-        return None
-    user_id = criteria.interactions_from_user
-    or_fragments: list[SqlFragment] = []
-    if criteria.interactions.without_interactions:
-        or_fragments.append(SqlFragment(
-            "NOT EXISTS (SELECT 1 FROM interactions ix WHERE ix.item_uuid = items.uuid "
-            "AND ix.user_uuid = %s)",
-            (user_id,),
-        ))
-    for flag, interaction_type in (
-        (criteria.interactions.recommended, InteractionType.RECOMMENDED),
-        (criteria.interactions.discouraged, InteractionType.DISCOURAGED),
-        (criteria.interactions.viewed, InteractionType.VIEWED),
-        (criteria.interactions.hidden, InteractionType.HIDDEN),
-    ):
-        if flag:
-            or_fragments.append(SqlFragment(
-                "EXISTS (SELECT 1 FROM interactions ix WHERE ix.item_uuid = items.uuid "
-                "AND ix.user_uuid = %s AND ix.type = %s)",
-                (user_id, interaction_type.value),
-            ))
-    if not or_fragments:
-        return SqlFragment("FALSE")
-    joined = _join(or_fragments, " OR ")
-    return SqlFragment(f"({joined.placeholders})", joined.params)
-
-
 class PostgresItemRepository(ItemRepository):
-    def __init__(self, ip: IPv4Address, port: int, db_name: str, username: str, password: str) -> None:
+    def __init__(
+            self, ip: IPv4Address, port: int, db_name: str, username: str, password: str,
+            replicas: Sequence[PostgresReplica] = (),
+    ) -> None:
         super().__init__()
-        self._connector = PostgresConnector(ip, port, db_name, username, password)
+        self._connector = PostgresConnector(ip, port, db_name, username, password, replicas)
 
     async def analyze(self) -> None:
         """
@@ -162,11 +127,9 @@ class PostgresItemRepository(ItemRepository):
             return
         pool = await self._connector.pool()
         await pool.executemany(
-            """
-            INSERT INTO items (
-                uuid, subscription_uuid, name, description, url, thumbnail,
-                created_at, updated_at, published_at, provider, deleted_at, duration, version
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            f"""
+            INSERT INTO items ({", ".join(ITEM_INSERT_COLUMNS)})
+            VALUES ({", ".join(["%s"] * len(ITEM_INSERT_COLUMNS))})
             ON CONFLICT (uuid) DO UPDATE SET
                 subscription_uuid = EXCLUDED.subscription_uuid,
                 name = EXCLUDED.name,
@@ -180,23 +143,16 @@ class PostgresItemRepository(ItemRepository):
                 deleted_at = EXCLUDED.deleted_at,
                 duration = EXCLUDED.duration,
                 version = EXCLUDED.version
-            """,
-            [
-                (
-                    item.uuid, item.subscription_uuid, drop_nul_bytes(item.name), drop_nul_bytes(item.description),
-                    str(item.url), str(item.thumbnail), item.created_at, item.updated_at,
-                    item.published_at, item.provider, item.deleted_at, item.duration, item.version,
-                )
-                for item in items
-            ],
+            """,  # noqa: S608
+            [item_params(item) for item in items],
         )
 
     async def get_item(self, item_id: UUID) -> Item | None:
         pool = await self._connector.pool()
-        row = await pool.fetchrow("SELECT * FROM items WHERE uuid = %s", item_id)
+        row = await pool.fetchrow(f"SELECT {item_columns()} FROM items WHERE uuid = %s", item_id)  # noqa: S608
         if row is None or row["deleted_at"] is not None:
             return None
-        return _row_to_item(row)
+        return row_to_item(row)
 
     async def delete_item(self, item_id: UUID) -> None:
         pool = await self._connector.pool()
@@ -204,21 +160,74 @@ class PostgresItemRepository(ItemRepository):
             "UPDATE items SET deleted_at = %s WHERE uuid = %s", datetime.now(timezone.utc), item_id,
         )
 
+    async def delete_items(self, item_ids: list[UUID]) -> None:
+        if len(item_ids) == 0:
+            return
+        pool = await self._connector.pool()
+        await pool.execute(
+            "UPDATE items SET deleted_at = %s WHERE uuid = ANY(%s::uuid[])", datetime.now(timezone.utc), item_ids,
+        )
+
+    async def delete_items_by_subscription(self, subscription_id: UUID, before: datetime | None = None) -> int:
+        pool = await self._connector.pool()
+        fragments = [SqlFragment("deleted_at IS NULL"), comparison("subscription_uuid", "=", subscription_id)]
+        if before is not None:
+            fragments.append(comparison("created_at", "<", before))
+        where_clause = join(fragments, " AND ")
+        query = (
+            "WITH deleted AS ("  # noqa: S608
+            " UPDATE items SET deleted_at = %s WHERE uuid IN ("
+            " SELECT uuid FROM items WHERE " + where_clause.placeholders + " LIMIT %s)"
+            " RETURNING 1"
+            ") SELECT COUNT(*) FROM deleted"
+        )
+
+        deleted_items = 0
+        while True:
+            deleted_in_batch = await pool.fetchval(
+                query, datetime.now(timezone.utc), *where_clause.params, DELETE_BATCH_SIZE)
+            deleted_items += deleted_in_batch
+            if deleted_in_batch < DELETE_BATCH_SIZE:
+                return deleted_items
+
+    @request_timed("items.find_items")
     async def find_items(self, criteria: ItemFilterCriteria, page_number: int, limit: int) -> list[Item]:
+        pool = await self._connector.read_pool()
+        query = _build_find_items_query(criteria, page_number, limit)
+        rows = await pool.fetch(query.placeholders, *query.params)
+        return [row_to_item(row) for row in rows]
+
+    async def explain_find_items(self, criteria: ItemFilterCriteria, page_number: int, limit: int) -> dict[str, Any]:
+        """Plan chosen by Postgres for the find_items query, as returned by EXPLAIN (FORMAT JSON)."""
+        pool = await self._connector.pool()
+        query = _build_find_items_query(criteria, page_number, limit)
+        plan = await pool.fetchval("EXPLAIN (FORMAT JSON) " + query.placeholders, *query.params)
+        return plan[0]["Plan"]
+
+    async def find_item_ids(self, criteria: ItemFilterCriteria, after_id: UUID | None, limit: int) -> list[UUID]:
         pool = await self._connector.pool()
-        fragments = _build_item_conditions(criteria)
-        interaction_fragment = _build_interaction_condition(criteria)
+        fragments = build_item_conditions(criteria)
+        interaction_fragment = build_interaction_condition(criteria)
         if interaction_fragment is not None:
             fragments = [*fragments, interaction_fragment]
+        if after_id is not None:
+            fragments = [*fragments, comparison("uuid", ">", after_id)]
 
-        where_clause = _join(fragments, " AND ")
-        query = (
-            "SELECT * FROM items WHERE " + where_clause.placeholders  # noqa: S608
-            + " ORDER BY published_at DESC LIMIT %s OFFSET %s"
-        )
-        params = (*where_clause.params, limit, page_number * limit)
-        rows = await pool.fetch(query, *params)
-        return [_row_to_item(row) for row in rows]
+        where_clause = join(fragments, " AND ")
+        query = "SELECT uuid FROM items WHERE " + where_clause.placeholders + " ORDER BY uuid LIMIT %s"  # noqa: S608
+        rows = await pool.fetch(query, *where_clause.params, limit)
+        return [row["uuid"] for row in rows]
+
+    async def count_matching_items(self, criteria: ItemFilterCriteria) -> int:
+        pool = await self._connector.pool()
+        fragments = build_item_conditions(criteria)
+        interaction_fragment = build_interaction_condition(criteria)
+        if interaction_fragment is not None:
+            fragments = [*fragments, interaction_fragment]
+
+        where_clause = join(fragments, " AND ")
+        query = "SELECT COUNT(*) FROM items WHERE " + where_clause.placeholders  # noqa: S608
+        return await pool.fetchval(query, *where_clause.params)
 
     async def delete_all_items(self) -> None:
         pool = await self._connector.pool()
@@ -235,7 +244,7 @@ class PostgresItemRepository(ItemRepository):
     async def get_interaction(self, interaction_id: UUID) -> Interaction | None:
         pool = await self._connector.pool()
         row = await pool.fetchrow("SELECT * FROM interactions WHERE uuid = %s", interaction_id)
-        return None if row is None else _row_to_interaction(row)
+        return None if row is None else row_to_interaction(row)
 
     async def delete_interaction(self, interaction_id: UUID) -> None:
         pool = await self._connector.pool()
@@ -245,6 +254,7 @@ class PostgresItemRepository(ItemRepository):
         pool = await self._connector.pool()
         await pool.execute("DELETE FROM interactions")
 
+    @request_timed("items.get_user_interactions")
     async def get_user_interactions_by_item_id(
             self, user_id: UUID, item_ids: list[UUID],
     ) -> dict[UUID, list[Interaction]]:
@@ -255,35 +265,35 @@ class PostgresItemRepository(ItemRepository):
         )
         result: dict[UUID, list[Interaction]] = {item_id: [] for item_id in item_ids}
         for row in rows:
-            result[row["item_uuid"]].append(_row_to_interaction(row))
+            result[row["item_uuid"]].append(row_to_interaction(row))
         return result
 
     async def find_interactions(
             self, criteria: InteractionFilterCriteria, page_number: int, limit: int,
     ) -> list[Interaction]:
-        pool = await self._connector.pool()
+        pool = await self._connector.read_pool()
         fragments: list[SqlFragment] = []
         if criteria.item_ids is not None:
-            fragments.append(_uuid_array_condition("i.item_uuid", list(criteria.item_ids)))
+            fragments.append(uuid_array_condition("i.item_uuid", list(criteria.item_ids)))
         if criteria.user_ids is not None:
-            fragments.append(_uuid_array_condition("i.user_uuid", list(criteria.user_ids)))
+            fragments.append(uuid_array_condition("i.user_uuid", list(criteria.user_ids)))
         if criteria.interaction_types is not None:
             types = [interaction_type.value for interaction_type in criteria.interaction_types]
             fragments.append(SqlFragment("i.type = ANY(%s::text[])", (types,)))
         if criteria.created_before is not None:
-            fragments.append(_comparison("i.created_at", "<", criteria.created_before))
+            fragments.append(comparison("i.created_at", "<", criteria.created_before))
 
         join_clause = ""
         if any(value is not None for value in (criteria.text, criteria.min_duration, criteria.max_duration)):
             join_clause = "JOIN items it ON it.uuid = i.item_uuid"
             fragments.append(SqlFragment("it.deleted_at IS NULL"))
             if criteria.text is not None and len(criteria.text) > 0:
-                fragments.append(_text_search_condition("it.name", criteria.text))
-            duration_fragment = _build_duration_condition("it.duration", criteria.min_duration, criteria.max_duration)
+                fragments.append(text_search_condition("it", criteria.text))
+            duration_fragment = build_duration_condition("it.duration", criteria.min_duration, criteria.max_duration)
             if duration_fragment is not None:
                 fragments.append(duration_fragment)
 
-        where = _join(fragments, " AND ")
+        where = join(fragments, " AND ")
         where_clause = f" WHERE {where.placeholders}" if fragments else ""
         query = (
             f"SELECT i.* FROM interactions i {join_clause}{where_clause} "  # noqa: S608
@@ -291,7 +301,7 @@ class PostgresItemRepository(ItemRepository):
         )
         params = (*where.params, limit, page_number * limit)
         rows = await pool.fetch(query, *params)
-        return [_row_to_interaction(row) for row in rows]
+        return [row_to_interaction(row) for row in rows]
 
     async def count_items(self, provider: ItemProvider | None = None) -> int:
         pool = await self._connector.pool()
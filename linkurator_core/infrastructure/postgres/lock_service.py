@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from ipaddress import IPv4Address
+
+import psycopg
+from psycopg import AsyncConnection
+
+from linkurator_core.domain.common.lock_service import LockService
+
+
+class PostgresLockService(LockService):
+    """
+    Locks backed by Postgres session-level advisory locks.
+
+    Advisory locks belong to the connection that takes them, so every lock of this process is taken
+    on one dedicated connection instead of a pooled one. If that connection is lost, Postgres releases
+    its locks and they are forgotten here as well, letting another process take over the work.
+    Keys are hashed into 64 bits, so two different keys practically never share a lock.
+    """
+
+    def __init__(self, ip: IPv4Address, port: int, db_name: str, username: str, password: str) -> None:
+        super().__init__()
+        self._ip = ip
+        self._port = port
+        self._db_name = db_name
+        self._username = username
+        self._password = password
+        self._conn: AsyncConnection[tuple[object, ...]] | None = None
+        self._conn_lock = asyncio.Lock()
+        self._held: set[str] = set()
+
+    async def try_acquire(self, key: str) -> bool:
+        async with self._conn_lock:
+            if key in self._held:
+                return False
+            row = await self._fetchone("SELECT pg_try_advisory_lock(hashtextextended(%s, 0))", key)
+            acquired = row is not None and row[0] is True
+            if acquired:
+                self._held.add(key)
+            return acquired
+
+    async def release(self, key: str) -> None:
+        async with self._conn_lock:
+            if key not in self._held:
+                return
+            self._held.discard(key)
+            # A lost connection has already released the lock on the server
+            with contextlib.suppress(psycopg.OperationalError):
+                await self._fetchone("SELECT pg_advisory_unlock(hashtextextended(%s, 0))", key)
+
+    async def is_held(self, key: str) -> bool:
+        async with self._conn_lock:
+            if key not in self._held:
+                return False
+            with contextlib.suppress(psycopg.OperationalError):
+                await self._fetchone("SELECT 1")
+            return key in self._held
+
+    async def close(self) -> None:
+        async with self._conn_lock:
+            self._held.clear()
+            if self._conn is None:
+                return
+            # Closing the connection releases the locks too, but only once the server notices it
+            if not self._conn.closed:
+                with contextlib.suppress(psycopg.OperationalError):
+                    await self._conn.execute("SELECT pg_advisory_unlock_all()")
+            await self._conn.close()
+            self._conn = None
+
+    async def _fetchone(self, query: str, *args: str) -> tuple[object, ...] | None:
+        if self._conn is None or self._conn.closed:
+            self._forget_locks()
+            self._conn = await psycopg.AsyncConnection.connect(
+                host=str(self._ip), port=self._port, dbname=self._db_name,
+                user=self._username, password=self._password, autocommit=True,
+            )
+        try:
+            cursor = await self._conn.execute(query, args)
+            return await cursor.fetchone()
+        except psycopg.OperationalError:
+            await self._conn.close()
+            self._conn = None
+            self._forget_locks()
+            raise
+
+    def _forget_locks(self) -> None:
+        if len(self._held) > 0:
+            logging.warning("Lost the database connection holding the locks %s", sorted(self._held))
+            self._held.clear()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from psycopg import AsyncConnection
+from psycopg.rows import TupleRow
+
+from linkurator_core.infrastructure.postgres.migrations.base import BaseMigration
+
+
+class Migration(BaseMigration):
+    async def upgrade(self, conn: AsyncConnection[TupleRow]) -> None:
+        # Soft-deleted items are moved here, with their interactions and raw RSS data, once they have been
+        # deleted for longer than the retention period. The same item can be archived more than once if it is
+        # fetched again after being archived, so the ids are not unique.
+        await conn.execute("""
+            CREATE TABLE archived_items (
+                uuid UUID NOT NULL,
+                subscription_uuid UUID NOT NULL,
+                name TEXT NOT NULL,
+                description TEXT NOT NULL,
+                url TEXT NOT NULL,
+                thumbnail TEXT NOT NULL,
+                created_at TIMESTAMPTZ NOT NULL,
+                updated_at TIMESTAMPTZ NOT NULL,
+                published_at TIMESTAMPTZ NOT NULL,
+                provider TEXT NOT NULL,
+                deleted_at TIMESTAMPTZ,
+                duration INTEGER,
+                version INTEGER NOT NULL,
+                archived_at TIMESTAMPTZ NOT NULL
+            )
+        """)
+        await conn.execute("CREATE INDEX archived_items_uuid_idx ON archived_items (uuid)")
+
+        await conn.execute("""
+            CREATE TABLE archived_interactions (
+                uuid UUID NOT NULL,
+                item_uuid UUID NOT NULL,
+                user_uuid UUID NOT NULL,
+                type TEXT NOT NULL,
+                created_at TIMESTAMPTZ NOT NULL,
+                archived_at TIMESTAMPTZ NOT NULL
+            )
+        """)
+        await conn.execute("CREATE INDEX archived_interactions_item_uuid_idx ON archived_interactions (item_uuid)")
+
+        await conn.execute("""
+            CREATE TABLE archived_rss_data (
+                id BIGINT NOT NULL,
+                rss_url TEXT NOT NULL,
+                item_url TEXT NOT NULL,
+                raw_data TEXT NOT NULL,
+                archived_at TIMESTAMPTZ NOT NULL
+            )
+        """)
+
+        # Raw RSS data is archived by item url
+        await conn.execute("CREATE INDEX rss_data_item_url_idx ON rss_data (item_url)")
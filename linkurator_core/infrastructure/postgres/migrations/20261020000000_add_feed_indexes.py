@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from psycopg import AsyncConnection
+from psycopg.rows import TupleRow
+
+from linkurator_core.infrastructure.postgres.migrations.base import BaseMigration
+
+
+class Migration(BaseMigration):
+    async def upgrade(self, conn: AsyncConnection[TupleRow]) -> None:
+        # The feed lists the live items of some subscriptions, newest first. Indexing only the live items,
+        # in the order they are listed, lets the query stop after the first page instead of sorting every
+        # item of the subscriptions. The duration and creation date are included to filter on them, and the
+        # id so the feed of many subscriptions picks the newest items of each one from the index alone.
+        await conn.execute(
+            "CREATE INDEX items_live_subscription_published_idx "
+            "ON items (subscription_uuid, published_at DESC) INCLUDE (uuid, duration, created_at) "
+            "WHERE deleted_at IS NULL",
+        )
+        await conn.execute(
+            "CREATE INDEX items_live_published_idx "
+            "ON items (published_at DESC) INCLUDE (subscription_uuid, duration) "
+            "WHERE deleted_at IS NULL",
+        )
+        # Superseded by items_live_subscription_published_idx, which all the queries by subscription use
+        await conn.execute("DROP INDEX items_subscription_deleted_published_duration_idx")
+
+        # Items are appended roughly in creation and publication order, so a BRIN index is enough for
+        # range scans over the history at a fraction of the size of a btree.
+        await conn.execute("CREATE INDEX items_created_at_brin_idx ON items USING BRIN (created_at)")
+        await conn.execute("CREATE INDEX items_published_at_brin_idx ON items USING BRIN (published_at)")
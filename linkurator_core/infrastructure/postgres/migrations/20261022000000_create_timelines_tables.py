@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from psycopg import AsyncConnection
+from psycopg.rows import TupleRow
+
+from linkurator_core.infrastructure.postgres.migrations.base import BaseMigration
+
+
+class Migration(BaseMigration):
+    async def upgrade(self, conn: AsyncConnection[TupleRow]) -> None:
+        await conn.execute("""
+            CREATE TABLE timelines (
+                user_uuid UUID PRIMARY KEY,
+                subscription_uuids UUID[] NOT NULL,
+                pending_subscription_uuids UUID[] NOT NULL DEFAULT '{}',
+                complete_since TIMESTAMPTZ NOT NULL
+            )
+        """)
+        # New items are added to the timelines of the users following their subscription
+        await conn.execute(
+            "CREATE INDEX timelines_subscription_uuids_idx ON timelines USING GIN (subscription_uuids)",
+        )
+
+        # The columns are prefixed so they can be filtered together with the ones of the items table
+        await conn.execute("""
+            CREATE TABLE timeline_items (
+                timeline_user_uuid UUID NOT NULL,
+                timeline_item_uuid UUID NOT NULL,
+                timeline_subscription_uuid UUID NOT NULL,
+                timeline_published_at TIMESTAMPTZ NOT NULL,
+                PRIMARY KEY (timeline_user_uuid, timeline_item_uuid)
+            )
+        """)
+        # Pages of a timeline are read in the order of the index, starting after the last item of the previous page
+        await conn.execute(
+            "CREATE INDEX timeline_items_user_published_idx "
+            "ON timeline_items (timeline_user_uuid, timeline_published_at DESC, timeline_item_uuid DESC)",
+        )
+        await conn.execute("CREATE INDEX timeline_items_item_idx ON timeline_items (timeline_item_uuid)")
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from psycopg import AsyncConnection
+from psycopg.rows import TupleRow
+
+from linkurator_core.infrastructure.postgres.migrations.base import BaseMigration
+
+
+class Migration(BaseMigration):
+    async def upgrade(self, conn: AsyncConnection[TupleRow]) -> None:
+        # The text searched is stored when an item is written instead of computed for every row checked
+        # by a search. The name weighs more than the description when ranking the matches.
+        await conn.execute("""
+            ALTER TABLE items ADD COLUMN search_vector TSVECTOR GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', immutable_unaccent(name)), 'A')
+                || setweight(to_tsvector('simple', immutable_unaccent(description)), 'B')
+            ) STORED
+        """)
+        await conn.execute("CREATE INDEX items_search_vector_idx ON items USING GIN (search_vector)")
+        await conn.execute("DROP INDEX items_name_search_idx")
+
+        # Trigrams of the name find the items whose name contains a part of a word
+        await conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        await conn.execute(
+            "CREATE INDEX items_name_trigram_idx ON items USING GIN (immutable_unaccent(name) gin_trgm_ops)",
+        )
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from psycopg import AsyncConnection
+from psycopg.rows import TupleRow
+
+from linkurator_core.infrastructure.postgres.migrations.base import BaseMigration
+
+
+class Migration(BaseMigration):
+    async def upgrade(self, conn: AsyncConnection[TupleRow]) -> None:
+        # The arrays of the users table are mirrored into one row per user and followed element, so the users
+        # following an element are found and counted through an index instead of checking every user.
+        # The kind tells which array of the user the row comes from.
+        await conn.execute("""
+            CREATE TABLE user_subscriptions (
+                user_uuid UUID NOT NULL REFERENCES users (uuid) ON DELETE CASCADE,
+                subscription_uuid UUID NOT NULL,
+                kind TEXT NOT NULL CHECK (kind IN ('followed', 'youtube', 'youtube_unfollowed')),
+                PRIMARY KEY (user_uuid, subscription_uuid, kind)
+            )
+        """)
+        await conn.execute(
+            "CREATE INDEX user_subscriptions_subscription_idx ON user_subscriptions (subscription_uuid, kind, user_uuid)",
+        )
+
+        await conn.execute("""
+            CREATE TABLE user_topic_follows (
+                user_uuid UUID NOT NULL REFERENCES users (uuid) ON DELETE CASCADE,
+                topic_uuid UUID NOT NULL,
+                kind TEXT NOT NULL CHECK (kind IN ('followed', 'favorite')),
+                PRIMARY KEY (user_uuid, topic_uuid, kind)
+            )
+        """)
+        await conn.execute(
+            "CREATE INDEX user_topic_follows_topic_idx ON user_topic_follows (topic_uuid, kind, user_uuid)",
+        )
+
+        await conn.execute("""
+            CREATE TABLE user_curator_follows (
+                user_uuid UUID NOT NULL REFERENCES users (uuid) ON DELETE CASCADE,
+                curator_uuid UUID NOT NULL,
+                PRIMARY KEY (user_uuid, curator_uuid)
+            )
+        """)
+        await conn.execute(
+            "CREATE INDEX user_curator_follows_curator_idx ON user_curator_follows (curator_uuid, user_uuid)",
+        )
+
+        # The rows written by instances still running without the follow tables during the rollout
+        # are copied afterwards by scripts/backfill_user_follows.py
+        await conn.execute("""
+            INSERT INTO user_subscriptions (user_uuid, subscription_uuid, kind)
+            SELECT uuid, unnest(subscription_uuids), 'followed' FROM users
+            UNION SELECT uuid, unnest(youtube_subscription_uuids), 'youtube' FROM users
+            UNION SELECT uuid, unnest(youtube_unfollowed_subscription_uuids), 'youtube_unfollowed' FROM users
+        """)
+        await conn.execute("""
+            INSERT INTO user_topic_follows (user_uuid, topic_uuid, kind)
+            SELECT uuid, unnest(followed_topics), 'followed' FROM users
+            UNION SELECT uuid, unnest(favorite_topics), 'favorite' FROM users
+        """)
+        await conn.execute("""
+            INSERT INTO user_curator_follows (user_uuid, curator_uuid)
+            SELECT DISTINCT uuid, unnest(curators) FROM users
+        """)
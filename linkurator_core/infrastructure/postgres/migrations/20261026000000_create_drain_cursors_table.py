@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from psycopg import AsyncConnection
+from psycopg.rows import TupleRow
+
+from linkurator_core.infrastructure.postgres.migrations.base import BaseMigration
+
+
+class Migration(BaseMigration):
+    async def upgrade(self, conn: AsyncConnection[TupleRow]) -> None:
+        # Last item published by each drain of outdated items. A NULL item starts a new pass
+        await conn.execute("""
+            CREATE TABLE drain_cursors (
+                name TEXT PRIMARY KEY,
+                item_uuid UUID,
+                updated_at TIMESTAMPTZ NOT NULL
+            )
+        """)
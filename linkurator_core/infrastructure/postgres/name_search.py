@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import Any
+
+from linkurator_core.infrastructure.postgres.common import escape_like
+
+# Texts shorter than a trigram can only be found through the index at the beginning of the name
+TRIGRAM_LENGTH = 3
+
+
+def name_search_query(
+        table: str, column: str, name_part: str, limit: int, substring: bool = False,
+) -> tuple[str, tuple[Any, ...]]:
+    """
+    Query the rows whose name contains the given text, the names with the most similar words first.
+
+    The rows are read from a GiST trigram index of the unaccented name in order of word similarity,
+    so only the first `limit` matches are read, without sorting them. Texts shorter than a trigram only
+    match the beginning of the names, unless `substring` is set, which makes them scan every name.
+    """
+    pattern = f"{escape_like(name_part)}%"
+    if substring or len(name_part) >= TRIGRAM_LENGTH:
+        pattern = f"%{pattern}"
+    query = f"""
+        SELECT * FROM {table}
+        WHERE immutable_unaccent({column}) ILIKE immutable_unaccent(%s)
+        ORDER BY immutable_unaccent(%s) <<-> immutable_unaccent({column})
+        LIMIT %s
+    """  # noqa: S608
+    return query, (pattern, name_part, limit)
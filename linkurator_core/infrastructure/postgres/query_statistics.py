@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import bisect
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+
+import logfire
+
+# Upper bounds of the latency histogram buckets, the last bucket counts everything slower
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+# Queries built with literal values would otherwise create a statement for every value
+MAX_STATEMENTS = 1000
+OTHER_STATEMENTS = "other statements"
+EXPLAIN_INTERVAL_SECONDS = 60
+# Reads that lock rows or create a table are not plain reads
+NOT_READ_ONLY_SELECT = re.compile(r"\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b|\bINTO\b", re.IGNORECASE)
+
+
+@lru_cache(maxsize=MAX_STATEMENTS)
+def statement_template(query: str) -> str:
+    """The query with its whitespace collapsed. The values are parameters, so queries differing on them are equal."""
+    return " ".join(query.split())
+
+
+def is_read_only(template: str) -> bool:
+    """True for the SELECT statements that neither lock rows nor write, which can safely run again."""
+    return template.upper().startswith("SELECT") and NOT_READ_ONLY_SELECT.search(template) is None
+
+
+@dataclass
+class StatementStatistics:
+    template: str
+    calls: int = 0
+    total_ms: float = 0
+    max_ms: float = 0
+    rows: int = 0
+    pool_wait_ms: float = 0
+    slow_calls: int = 0
+    latency_buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    plan: str | None = None
+    plan_captured_at: datetime | None = None
+    last_explain: float = 0
+
+    def percentile_ms(self, fraction: float) -> float:
+        """Upper bound of the latency of the given fraction of the calls, or the maximum for the slowest bucket."""
+        remaining = fraction * self.calls
+        for bucket, count in enumerate(self.latency_buckets):
+            remaining -= count
+            if remaining <= 0 and count > 0:
+                return LATENCY_BUCKETS_MS[bucket] if bucket < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+
+class QueryStatistics:
+    """
+    Latency, rows and pool wait of the queries run by this process, by statement. The queries slower than
+    a threshold are logged, and the plan of some of them is captured with EXPLAIN ANALYZE.
+    """
+
+    def __init__(self) -> None:
+        self.slow_query_ms = 500.0
+        self.explain_rate = 0.1
+        self.trace_queries = False
+        self._statements: dict[str, StatementStatistics] = {}
+
+    def configure(self, slow_query_ms: float, explain_rate: float, trace_queries: bool) -> None:
+        self.slow_query_ms = slow_query_ms
+        self.explain_rate = explain_rate
+        self.trace_queries = trace_queries
+
+    def record(self, query: str, duration_ms: float, rows: int, pool_wait_ms: float) -> bool:
+        """Record a query run, and return whether its plan should be captured."""
+        template = statement_template(query)
+        statement = self._statements.get(template)
+        if statement is None:
+            if len(self._statements) >= MAX_STATEMENTS:
+                template = OTHER_STATEMENTS
+            statement = self._statements.setdefault(template, StatementStatistics(template))
+        statement.calls += 1
+        statement.total_ms += duration_ms
+        statement.max_ms = max(statement.max_ms, duration_ms)
+        statement.rows += max(rows, 0)
+        statement.pool_wait_ms += pool_wait_ms
+        statement.latency_buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+
+        if duration_ms < self.slow_query_ms:
+            return False
+        statement.slow_calls += 1
+        logfire.warning("Slow query {template}", template=template, duration_ms=duration_ms, rows=rows,
+                        pool_wait_ms=pool_wait_ms)
+
+        # Explaining runs the query again, so only plain reads are explained, and not too often. A locking
+        # read would wait on the locks still held by the transaction that ran it
+        now = time.monotonic()
+        if (not is_read_only(template)
+                or now - statement.last_explain < EXPLAIN_INTERVAL_SECONDS
+                or random.random() >= self.explain_rate):
+            return False
+        statement.last_explain = now
+        return True
+
+    def record_plan(self, query: str, plan: str) -> None:
+        template = statement_template(query)
+        statement = self._statements.get(template)
+        if statement is not None:
+            statement.plan = plan
+            statement.plan_captured_at = datetime.now(timezone.utc)
+        logfire.info("Plan of slow query {template}", template=template, plan=plan)
+
+    def statements(self) -> list[StatementStatistics]:
+        """Statistics of the statements, the ones taking the most time in total first."""
+        return sorted(self._statements.values(), key=lambda statement: statement.total_ms, reverse=True)
+
+    def reset(self) -> None:
+        self._statements = {}
+
+
+query_statistics = QueryStatistics()
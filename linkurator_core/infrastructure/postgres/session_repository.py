@@ -5,12 +5,9 @@ from ipaddress import IPv4Address
 import psycopg
 
 from linkurator_core.domain.users.session import Session
-from linkurator_core.domain.users.session_repository import SessionRepository
+from linkurator_core.domain.users.session_repository import SessionRepository, TokenAlreadyExists
 from linkurator_core.infrastructure.postgres.common import PostgresConnector
-
-
-class TokenAlreadyExists(Exception):
-    pass
+from linkurator_core.infrastructure.request_timing import request_timed
 
 
 class PostgresSessionRepository(SessionRepository):
@@ -18,6 +15,7 @@ class PostgresSessionRepository(SessionRepository):
         super().__init__()
         self._connector = PostgresConnector(ip, port, db_name, username, password)
 
+    @request_timed("sessions.get")
     async def get(self, token: str) -> Session | None:
         pool = await self._connector.pool()
         row = await pool.fetchrow("SELECT * FROM sessions WHERE token = %s", token)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Sequence
 from datetime import datetime
 from ipaddress import IPv4Address
 from typing import Any
@@ -14,7 +15,9 @@ from linkurator_core.domain.subscriptions.subscription_repository import (
     SubscriptionFilterCriteria,
     SubscriptionRepository,
 )
-from linkurator_core.infrastructure.postgres.common import PostgresConnector
+from linkurator_core.infrastructure.postgres.common import PostgresConnector, PostgresReplica
+from linkurator_core.infrastructure.postgres.name_search import name_search_query
+from linkurator_core.infrastructure.request_timing import request_timed
 
 
 def _row_to_domain(row: Any) -> Subscription:
@@ -35,9 +38,12 @@ def _row_to_domain(row: Any) -> Subscription:
 
 
 class PostgresSubscriptionRepository(SubscriptionRepository):
-    def __init__(self, ip: IPv4Address, port: int, db_name: str, username: str, password: str) -> None:
+    def __init__(
+            self, ip: IPv4Address, port: int, db_name: str, username: str, password: str,
+            replicas: Sequence[PostgresReplica] = (),
+    ) -> None:
         super().__init__()
-        self._connector = PostgresConnector(ip, port, db_name, username, password)
+        self._connector = PostgresConnector(ip, port, db_name, username, password, replicas)
 
     async def add(self, subscription: Subscription) -> None:
         pool = await self._connector.pool()
@@ -59,8 +65,9 @@ class PostgresSubscriptionRepository(SubscriptionRepository):
         row = await pool.fetchrow("SELECT * FROM subscriptions WHERE uuid = %s", subscription_id)
         return None if row is None else _row_to_domain(row)
 
+    @request_timed("subscriptions.get_list")
     async def get_list(self, subscription_ids: list[UUID]) -> list[Subscription]:
-        pool = await self._connector.pool()
+        pool = await self._connector.read_pool()
         rows = await pool.fetch(
             "SELECT * FROM subscriptions WHERE uuid = ANY(%s::uuid[]) ORDER BY created_at DESC",
             subscription_ids,
@@ -138,6 +145,12 @@ class PostgresSubscriptionRepository(SubscriptionRepository):
             )
         return [_row_to_domain(row) for row in rows]
 
+    async def search_by_name(self, name_part: str, limit: int) -> list[Subscription]:
+        pool = await self._connector.pool()
+        query, params = name_search_query("subscriptions", "name", name_part, limit)
+        rows = await pool.fetch(query, *params)
+        return [_row_to_domain(row) for row in rows]
+
     async def find(self, criteria: SubscriptionFilterCriteria) -> list[Subscription]:
         pool = await self._connector.pool()
         conditions: list[str] = []
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime
+from ipaddress import IPv4Address
+from uuid import UUID
+
+from linkurator_core.domain.items.item import Item
+from linkurator_core.domain.items.item_repository import ItemFilterCriteria
+from linkurator_core.domain.items.timeline_repository import Timeline, TimelineCursor, TimelineRepository
+from linkurator_core.infrastructure.postgres.common import PostgresConnector, PostgresReplica
+from linkurator_core.infrastructure.postgres.item_queries import (
+    SqlFragment,
+    build_interaction_condition,
+    build_item_conditions,
+    item_columns,
+    join,
+    row_to_item,
+)
+from linkurator_core.infrastructure.request_timing import request_timed
+
+
+class PostgresTimelineRepository(TimelineRepository):
+    def __init__(
+            self, ip: IPv4Address, port: int, db_name: str, username: str, password: str,
+            replicas: Sequence[PostgresReplica] = (),
+    ) -> None:
+        self._connector = PostgresConnector(ip, port, db_name, username, password, replicas)
+
+    async def get(self, user_id: UUID) -> Timeline | None:
+        pool = await self._connector.pool()
+        row = await pool.fetchrow("SELECT * FROM timelines WHERE user_uuid = %s", user_id)
+        if row is None:
+            return None
+        return Timeline(
+            user_id=row["user_uuid"],
+            subscription_ids=set(row["subscription_uuids"]),
+            complete_since=row["complete_since"],
+            pending_subscription_ids=set(row["pending_subscription_uuids"]),
+        )
+
+    async def save(self, timeline: Timeline) -> None:
+        pool = await self._connector.pool()
+        await pool.execute(
+            """
+            INSERT INTO timelines (user_uuid, subscription_uuids, pending_subscription_uuids, complete_since)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (user_uuid) DO UPDATE SET
+                subscription_uuids = EXCLUDED.subscription_uuids,
+                pending_subscription_uuids = EXCLUDED.pending_subscription_uuids,
+                complete_since = EXCLUDED.complete_since
+            """,
+            timeline.user_id, list(timeline.subscription_ids), list(timeline.pending_subscription_ids),
+            timeline.complete_since,
+        )
+
+    async def delete(self, user_id: UUID) -> None:
+        pool = await self._connector.pool()
+        await pool.execute("DELETE FROM timeline_items WHERE timeline_user_uuid = %s", user_id)
+        await pool.execute("DELETE FROM timelines WHERE user_uuid = %s", user_id)
+
+    async def add_subscription_items(self, user_id: UUID, subscription_ids: set[UUID], published_after: datetime) -> None:
+        if len(subscription_ids) == 0:
+            return
+        pool = await self._connector.pool()
+        await pool.execute(
+            """
+            INSERT INTO timeline_items
+                (timeline_user_uuid, timeline_item_uuid, timeline_subscription_uuid, timeline_published_at)
+            SELECT %s, uuid, subscription_uuid, published_at FROM items
+            WHERE subscription_uuid = ANY(%s::uuid[]) AND deleted_at IS NULL AND published_at > %s
+            ON CONFLICT DO NOTHING
+            """,
+            user_id, list(subscription_ids), published_after,
+        )
+
+    async def remove_subscription_items(self, user_id: UUID, subscription_ids: set[UUID]) -> None:
+        if len(subscription_ids) == 0:
+            return
+        pool = await self._connector.pool()
+        await pool.execute(
+            "DELETE FROM timeline_items "
+            "WHERE timeline_user_uuid = %s AND timeline_subscription_uuid = ANY(%s::uuid[])",
+            user_id, list(subscription_ids),
+        )
+
+    async def add_items(self, items: list[Item]) -> None:
+        if len(items) == 0:
+            return
+        pool = await self._connector.pool()
+        await pool.execute(
+            """
+            INSERT INTO timeline_items
+                (timeline_user_uuid, timeline_item_uuid, timeline_subscription_uuid, timeline_published_at)
+            SELECT timelines.user_uuid, new_items.uuid, new_items.subscription_uuid, new_items.published_at
+            FROM unnest(%s::uuid[], %s::uuid[], %s::timestamptz[]) AS new_items(uuid, subscription_uuid, published_at)
+            JOIN timelines ON timelines.subscription_uuids @> ARRAY[new_items.subscription_uuid]
+                AND new_items.published_at > timelines.complete_since
+            ON CONFLICT DO NOTHING
+            """,
+            [item.uuid for item in items],
+            [item.subscription_uuid for item in items],
+            [item.published_at for item in items],
+        )
+
+    @request_timed("timeline.find_items")
+    async def find_items(
+            self, user_id: UUID, criteria: ItemFilterCriteria, limit: int, after: TimelineCursor | None = None,
+    ) -> list[Item]:
+        pool = await self._connector.read_pool()
+        fragments = [SqlFragment("timeline_items.timeline_user_uuid = %s", (user_id,))]
+        if after is not None:
+            fragments.append(SqlFragment(
+                "(timeline_items.timeline_published_at, timeline_items.timeline_item_uuid) < (%s, %s)",
+                (after.published_at, after.item_id)))
+        fragments.extend(build_item_conditions(criteria))
+        interaction_fragment = build_interaction_condition(criteria)
+        if interaction_fragment is not None:
+            fragments.append(interaction_fragment)
+
+        where_clause = join(fragments, " AND ")
+        query = (
+            f"SELECT {item_columns()} FROM timeline_items "  # noqa: S608
+            "JOIN items ON items.uuid = timeline_items.timeline_item_uuid "
+            "WHERE " + where_clause.placeholders
+            + " ORDER BY timeline_items.timeline_published_at DESC, timeline_items.timeline_item_uuid DESC LIMIT %s"
+        )
+        rows = await pool.fetch(query, *where_clause.params, limit)
+        return [row_to_item(row) for row in rows]
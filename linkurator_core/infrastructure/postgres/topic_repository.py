@@ -10,6 +10,8 @@ from linkurator_core.domain.common.exceptions import DuplicatedKeyError
 from linkurator_core.domain.topics.topic import Topic
 from linkurator_core.domain.topics.topic_repository import TopicRepository
 from linkurator_core.infrastructure.postgres.common import PostgresConnector
+from linkurator_core.infrastructure.postgres.name_search import name_search_query
+from linkurator_core.infrastructure.request_timing import request_timed
 
 
 def _row_to_domain(row: Any) -> Topic:
@@ -43,6 +45,7 @@ class PostgresTopicRepository(TopicRepository):
             msg = f"Topic with id '{topic.uuid}' already exists"
             raise DuplicatedKeyError(msg) from error
 
+    @request_timed("topics.get")
     async def get(self, topic_id: UUID) -> Topic | None:
         pool = await self._connector.pool()
         row = await pool.fetchrow("SELECT * FROM topics WHERE uuid = %s", topic_id)
@@ -66,6 +69,12 @@ class PostgresTopicRepository(TopicRepository):
         )
         return [_row_to_domain(row) for row in rows]
 
+    async def search_topics_by_name(self, name_part: str, limit: int) -> list[Topic]:
+        pool = await self._connector.pool()
+        query, params = name_search_query("topics", "name", name_part, limit)
+        rows = await pool.fetch(query, *params)
+        return [_row_to_domain(row) for row in rows]
+
     async def update(self, topic: Topic) -> None:
         pool = await self._connector.pool()
         await pool.execute(
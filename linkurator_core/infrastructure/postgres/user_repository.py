@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime
+from dataclasses import dataclass
 from ipaddress import IPv4Address
 from typing import Any
 from uuid import UUID
@@ -10,8 +11,10 @@ import psycopg
 from linkurator_core.domain.common import utils
 from linkurator_core.domain.common.exceptions import UsernameAlreadyInUseError
 from linkurator_core.domain.users.user import HashedPassword, User, Username
-from linkurator_core.domain.users.user_repository import EmailAlreadyInUse, UserRepository
-from linkurator_core.infrastructure.postgres.common import PostgresConnector
+from linkurator_core.domain.users.user_repository import EmailAlreadyInUse, FollowKind, UserRepository
+from linkurator_core.infrastructure.postgres.common import PostgresConnection, PostgresConnector
+from linkurator_core.infrastructure.postgres.name_search import name_search_query
+from linkurator_core.infrastructure.request_timing import request_timed
 
 INSERT_COLUMNS = """
     uuid, first_name, last_name, username, email, avatar_url, locale,
@@ -23,6 +26,133 @@ INSERT_COLUMNS = """
 INSERT_PLACEHOLDERS = ", ".join(["%s"] * 21)
 
 
+def _append_to_array_query(column: str) -> str:
+    """Add a UUID to an array column of a user, unless it is already there, leaving the other columns alone."""
+    return f"""
+        UPDATE users SET {column} = array_append({column}, element.id)
+        FROM (SELECT %s::uuid AS id) AS element
+        WHERE users.uuid = %s AND NOT element.id = ANY({column})
+    """  # noqa: S608
+
+
+def _remove_from_array_query(column: str) -> str:
+    """Remove a UUID from an array column of a user, if it is there, leaving the other columns alone."""
+    return f"""
+        UPDATE users SET {column} = array_remove({column}, element.id)
+        FROM (SELECT %s::uuid AS id) AS element
+        WHERE users.uuid = %s AND element.id = ANY({column})
+    """  # noqa: S608
+
+
+@dataclass(frozen=True)
+class _Follows:
+    """Rows of a follow table that mirror an array column of the users table."""
+
+    array: str
+    table: str
+    column: str
+    kind: str | None = None
+
+    @property
+    def _kind_column(self) -> str:
+        return "" if self.kind is None else ", kind"
+
+    @property
+    def _kind_value(self) -> str:
+        return "" if self.kind is None else f", '{self.kind}'"
+
+    @property
+    def _kind_condition(self) -> str:
+        return "" if self.kind is None else f" AND kind = '{self.kind}'"
+
+    async def sync(self, conn: PostgresConnection, user_ids: list[UUID]) -> None:
+        """Replace the rows of the users with the elements of their array."""
+        await conn.execute(
+            f"DELETE FROM {self.table} WHERE user_uuid = ANY(%s){self._kind_condition}",  # noqa: S608
+            user_ids,
+        )
+        await conn.execute(
+            f"""
+            INSERT INTO {self.table} (user_uuid, {self.column}{self._kind_column})
+            SELECT DISTINCT uuid, unnest({self.array}){self._kind_value} FROM users WHERE uuid = ANY(%s)
+            """,  # noqa: S608
+            user_ids,
+        )
+
+    async def mirror(self, conn: PostgresConnection, user_id: UUID, element_id: UUID) -> None:
+        """Add or remove the row of an element, depending on whether it is in the array of the user."""
+        await conn.execute(
+            f"DELETE FROM {self.table} WHERE user_uuid = %s AND {self.column} = %s{self._kind_condition}",  # noqa: S608
+            user_id, element_id,
+        )
+        await conn.execute(
+            f"""
+            INSERT INTO {self.table} (user_uuid, {self.column}{self._kind_column})
+            SELECT uuid, element.id{self._kind_value} FROM users, (SELECT %s::uuid AS id) AS element
+            WHERE users.uuid = %s AND element.id = ANY({self.array})
+            """,  # noqa: S608
+            element_id, user_id,
+        )
+
+
+FOLLOWED_SUBSCRIPTIONS = _Follows("subscription_uuids", "user_subscriptions", "subscription_uuid", "followed")
+YOUTUBE_SUBSCRIPTIONS = _Follows("youtube_subscription_uuids", "user_subscriptions", "subscription_uuid", "youtube")
+YOUTUBE_UNFOLLOWED_SUBSCRIPTIONS = _Follows(
+    "youtube_unfollowed_subscription_uuids", "user_subscriptions", "subscription_uuid", "youtube_unfollowed")
+FOLLOWED_TOPICS = _Follows("followed_topics", "user_topic_follows", "topic_uuid", "followed")
+FAVORITE_TOPICS = _Follows("favorite_topics", "user_topic_follows", "topic_uuid", "favorite")
+FOLLOWED_CURATORS = _Follows("curators", "user_curator_follows", "curator_uuid")
+ALL_FOLLOWS = (FOLLOWED_SUBSCRIPTIONS, YOUTUBE_SUBSCRIPTIONS, YOUTUBE_UNFOLLOWED_SUBSCRIPTIONS,
+               FOLLOWED_TOPICS, FAVORITE_TOPICS, FOLLOWED_CURATORS)
+
+FOLLOW_SUBSCRIPTION_QUERY = """
+    UPDATE users SET
+        subscription_uuids = array_append(array_remove(subscription_uuids, element.id), element.id),
+        youtube_unfollowed_subscription_uuids = array_remove(youtube_unfollowed_subscription_uuids, element.id)
+    FROM (SELECT %s::uuid AS id) AS element
+    WHERE users.uuid = %s
+        AND (NOT element.id = ANY(subscription_uuids) OR element.id = ANY(youtube_unfollowed_subscription_uuids))
+"""
+# Unfollowed YouTube subscriptions are remembered, so they are not followed again when syncing with YouTube
+UNFOLLOW_SUBSCRIPTION_QUERY = """
+    UPDATE users SET
+        subscription_uuids = array_remove(subscription_uuids, element.id),
+        youtube_unfollowed_subscription_uuids = CASE
+            WHEN element.id = ANY(youtube_subscription_uuids)
+                AND NOT element.id = ANY(youtube_unfollowed_subscription_uuids)
+            THEN array_append(youtube_unfollowed_subscription_uuids, element.id)
+            ELSE youtube_unfollowed_subscription_uuids
+        END
+    FROM (SELECT %s::uuid AS id) AS element
+    WHERE users.uuid = %s
+        AND (element.id = ANY(subscription_uuids) OR (element.id = ANY(youtube_subscription_uuids)
+             AND NOT element.id = ANY(youtube_unfollowed_subscription_uuids)))
+"""
+# The arrays changed by following and unfollowing each kind of element, and the queries changing them
+FOLLOW_CHANGES: dict[FollowKind, tuple[tuple[_Follows, ...], str, str]] = {
+    FollowKind.SUBSCRIPTION: (
+        (FOLLOWED_SUBSCRIPTIONS, YOUTUBE_UNFOLLOWED_SUBSCRIPTIONS), FOLLOW_SUBSCRIPTION_QUERY,
+        UNFOLLOW_SUBSCRIPTION_QUERY),
+    FollowKind.TOPIC: (
+        (FOLLOWED_TOPICS,), _append_to_array_query(FOLLOWED_TOPICS.array),
+        _remove_from_array_query(FOLLOWED_TOPICS.array)),
+    FollowKind.FAVORITE_TOPIC: (
+        (FAVORITE_TOPICS,), _append_to_array_query(FAVORITE_TOPICS.array),
+        _remove_from_array_query(FAVORITE_TOPICS.array)),
+    FollowKind.CURATOR: (
+        (FOLLOWED_CURATORS,), _append_to_array_query(FOLLOWED_CURATORS.array),
+        _remove_from_array_query(FOLLOWED_CURATORS.array)),
+}
+
+# Same rule as User.get_subscriptions: the YouTube subscriptions are followed unless the user unfollowed them
+SUBSCRIPTION_FOLLOWERS_QUERY = """
+    SELECT user_uuid FROM user_subscriptions
+    WHERE subscription_uuid = %s
+    GROUP BY user_uuid
+    HAVING bool_or(kind IN ('followed', 'youtube')) AND NOT bool_or(kind = 'youtube_unfollowed')
+"""
+
+
 def _row_to_domain(row: Any) -> User:
     password_hash = None
     if row["password_hash"] is not None:
@@ -72,6 +202,17 @@ def user_params(user: User) -> tuple[Any, ...]:
     )
 
 
+def _follow_arrays(user: User) -> dict[str, set[UUID]]:
+    return {
+        FOLLOWED_SUBSCRIPTIONS.array: set(user.get_subscriptions(include_youtube=False)),
+        YOUTUBE_SUBSCRIPTIONS.array: set(user.get_youtube_subscriptions()),
+        YOUTUBE_UNFOLLOWED_SUBSCRIPTIONS.array: set(user.get_youtube_unfollowed_subscriptions()),
+        FOLLOWED_TOPICS.array: set(user.get_followed_topics()),
+        FAVORITE_TOPICS.array: set(user.get_favorite_topics()),
+        FOLLOWED_CURATORS.array: set(user.curators),
+    }
+
+
 class PostgresUserRepository(UserRepository):
     def __init__(self, ip: IPv4Address, port: int, db_name: str, username: str, password: str) -> None:
         super().__init__()
@@ -80,10 +221,13 @@ class PostgresUserRepository(UserRepository):
     async def add(self, user: User) -> None:
         pool = await self._connector.pool()
         try:
-            await pool.execute(
-                f"INSERT INTO users ({INSERT_COLUMNS}) VALUES ({INSERT_PLACEHOLDERS})",  # noqa: S608
-                *user_params(user),
-            )
+            async with pool.acquire() as conn, conn.transaction():
+                await conn.execute(
+                    f"INSERT INTO users ({INSERT_COLUMNS}) VALUES ({INSERT_PLACEHOLDERS})",  # noqa: S608
+                    *user_params(user),
+                )
+                for follows in ALL_FOLLOWS:
+                    await follows.sync(conn, [user.uuid])
         except psycopg.errors.UniqueViolation as error:
             if error.diag.constraint_name == "users_email_key":
                 msg = f"Email '{user.email}' is already in use"
@@ -93,6 +237,7 @@ class PostgresUserRepository(UserRepository):
                 raise UsernameAlreadyInUseError(msg) from error
             raise
 
+    @request_timed("users.get")
     async def get(self, user_id: UUID) -> User | None:
         pool = await self._connector.pool()
         row = await pool.fetchrow("SELECT * FROM users WHERE uuid = %s", user_id)
@@ -140,19 +285,30 @@ class PostgresUserRepository(UserRepository):
         pool = await self._connector.pool()
         uuid_param, *rest = user_params(user)
         try:
-            await pool.execute(
-                """
-                UPDATE users SET
-                    first_name = %s, last_name = %s, username = %s, email = %s, avatar_url = %s, locale = %s,
-                    created_at = %s, updated_at = %s, scanned_at = %s, last_login_at = %s,
-                    google_refresh_token = %s, password_hash = %s, password_salt = %s,
-                    subscription_uuids = %s, youtube_subscription_uuids = %s,
-                    youtube_unfollowed_subscription_uuids = %s, followed_topics = %s, favorite_topics = %s,
-                    is_admin = %s, curators = %s
-                WHERE uuid = %s
-                """,
-                *rest, uuid_param,
-            )
+            async with pool.acquire() as conn, conn.transaction():
+                # Only the follow tables of the arrays that change are rewritten
+                previous = await conn.fetchrow(
+                    f"SELECT {', '.join(follows.array for follows in ALL_FOLLOWS)} "  # noqa: S608
+                    "FROM users WHERE uuid = %s FOR UPDATE",
+                    user.uuid,
+                )
+                await conn.execute(
+                    """
+                    UPDATE users SET
+                        first_name = %s, last_name = %s, username = %s, email = %s, avatar_url = %s, locale = %s,
+                        created_at = %s, updated_at = %s, scanned_at = %s, last_login_at = %s,
+                        google_refresh_token = %s, password_hash = %s, password_salt = %s,
+                        subscription_uuids = %s, youtube_subscription_uuids = %s,
+                        youtube_unfollowed_subscription_uuids = %s, followed_topics = %s, favorite_topics = %s,
+                        is_admin = %s, curators = %s
+                    WHERE uuid = %s
+                    """,
+                    *rest, uuid_param,
+                )
+                follow_arrays = _follow_arrays(user)
+                for follows in ALL_FOLLOWS:
+                    if previous is None or set(previous[follows.array]) != follow_arrays[follows.array]:
+                        await follows.sync(conn, [user.uuid])
         except psycopg.errors.UniqueViolation as error:
             if error.diag.constraint_name == "users_email_key":
                 msg = f"Email '{user.email}' is already in use"
@@ -162,6 +318,59 @@ class PostgresUserRepository(UserRepository):
                 raise UsernameAlreadyInUseError(msg) from error
             raise
 
+    async def touch_last_login(self, user_id: UUID, last_login_at: datetime.datetime) -> None:
+        pool = await self._connector.pool()
+        await pool.execute("UPDATE users SET last_login_at = %s WHERE uuid = %s", last_login_at, user_id)
+
+    async def set_scanned_at(self, user_id: UUID, scanned_at: datetime.datetime) -> None:
+        pool = await self._connector.pool()
+        await pool.execute("UPDATE users SET scanned_at = %s WHERE uuid = %s", scanned_at, user_id)
+
+    async def set_youtube_subscriptions(self, user_id: UUID, subscription_ids: set[UUID]) -> None:
+        pool = await self._connector.pool()
+        async with pool.acquire() as conn, conn.transaction():
+            await conn.execute(
+                "UPDATE users SET youtube_subscription_uuids = %s WHERE uuid = %s", list(subscription_ids), user_id,
+            )
+            await YOUTUBE_SUBSCRIPTIONS.sync(conn, [user_id])
+
+    async def follow(self, user_id: UUID, kind: FollowKind, element_id: UUID) -> None:
+        follows, query, _ = FOLLOW_CHANGES[kind]
+        await self._change_follows(user_id, element_id, follows, query)
+
+    async def unfollow(self, user_id: UUID, kind: FollowKind, element_id: UUID) -> None:
+        follows, _, query = FOLLOW_CHANGES[kind]
+        await self._change_follows(user_id, element_id, follows, query)
+
+    async def _change_follows(
+            self, user_id: UUID, element_id: UUID, follows: tuple[_Follows, ...], query: str,
+    ) -> None:
+        """Change the arrays of a user with a query and, only if they changed, the rows mirroring them."""
+        pool = await self._connector.pool()
+        async with pool.acquire() as conn, conn.transaction():
+            result = await conn.execute(query, element_id, user_id)
+            if result == "UPDATE 0":
+                return
+            for changed_follows in follows:
+                await changed_follows.mirror(conn, user_id, element_id)
+
+    async def sync_follow_tables(self, after_user_id: UUID | None, limit: int) -> UUID | None:
+        """
+        Copy the followed subscriptions, topics and curators of the next `limit` users, by UUID, into the follow
+        tables. Returns the last user copied, or None when there are no more users.
+        """
+        pool = await self._connector.pool()
+        async with pool.acquire() as conn, conn.transaction():
+            # The users are locked, so their arrays do not change until their rows are written
+            rows = await conn.fetch(
+                "SELECT uuid FROM users WHERE uuid > %s ORDER BY uuid LIMIT %s FOR UPDATE",
+                after_user_id or UUID(int=0), limit,
+            )
+            user_ids = [row["uuid"] for row in rows]
+            for follows in ALL_FOLLOWS:
+                await follows.sync(conn, user_ids)
+        return user_ids[-1] if user_ids else None
+
     async def find_latest_scan_before(self, timestamp: datetime.datetime) -> list[User]:
         pool = await self._connector.pool()
         rows = await pool.fetch("SELECT * FROM users WHERE scanned_at < %s", timestamp)
@@ -170,11 +379,8 @@ class PostgresUserRepository(UserRepository):
     async def find_users_subscribed_to_subscription(self, subscription_id: UUID) -> list[User]:
         pool = await self._connector.pool()
         rows = await pool.fetch(
-            """
-            SELECT * FROM users
-            WHERE %s = ANY(subscription_uuids) OR %s = ANY(youtube_subscription_uuids)
-            """,
-            subscription_id, subscription_id,
+            f"SELECT * FROM users WHERE uuid IN ({SUBSCRIPTION_FOLLOWERS_QUERY})",  # noqa: S608
+            subscription_id,
         )
         return [_row_to_domain(row) for row in rows]
 
@@ -187,9 +393,8 @@ class PostgresUserRepository(UserRepository):
         logged_after = User.time_since_last_active()
         return await pool.fetchval("SELECT COUNT(*) FROM users WHERE last_login_at > %s", logged_after)
 
-    async def search_by_username(self, username_part: str) -> list[User]:
+    async def search_by_username(self, username_part: str, limit: int, substring: bool = False) -> list[User]:
         pool = await self._connector.pool()
-        rows = await pool.fetch(
-            "SELECT * FROM users WHERE username ILIKE '%%' || %s || '%%'", username_part,
-        )
+        query, params = name_search_query("users", "username", username_part, limit, substring)
+        rows = await pool.fetch(query, *params)
         return [_row_to_domain(row) for row in rows]
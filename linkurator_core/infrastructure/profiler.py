@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+
+DEFAULT_INTERVAL_SECONDS = 0.005
+MAX_PROFILE_SECONDS = 300
+# Seconds profiled when the processor receives SIGUSR1
+SIGNAL_PROFILE_SECONDS = 30
+
+
+class ProfilerAlreadyRunningError(Exception):
+    pass
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of a thread from a background thread, and counts how many times each stack is seen.
+    The profiled code runs unchanged, and nothing runs at all while no profile is being taken.
+    A sample is taken when the profiled thread gives up the GIL, so a loop doing very little work between
+    polls shows up mostly as waiting in the selector.
+    """
+
+    def __init__(self, thread_id: int, interval_seconds: float = DEFAULT_INTERVAL_SECONDS) -> None:
+        self.thread_id = thread_id
+        self.interval_seconds = interval_seconds
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> str:
+        self._stop.set()
+        self._thread.join()
+        return self.collapsed_stacks()
+
+    def collapsed_stacks(self) -> str:
+        """Stacks in the collapsed format of flamegraph.pl and speedscope: the frames joined by ';' and the count."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+
+
+def _collapse(frame: FrameType | None) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+_running = False
+
+
+async def profile_event_loop(seconds: float, interval_seconds: float = DEFAULT_INTERVAL_SECONDS) -> str:
+    """
+    Profile everything the running event loop does for the given seconds, and return the collapsed stacks.
+    Only one profile runs at a time in a process.
+    """
+    global _running  # noqa: PLW0603
+    if _running:
+        msg = "A profile is already being taken in this process"
+        raise ProfilerAlreadyRunningError(msg)
+    _running = True
+    profiler = SamplingProfiler(threading.get_ident(), interval_seconds)
+    profiler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        stacks = profiler.stop()
+        _running = False
+    return stacks
+
+
+_signal_profiles: set[asyncio.Task[None]] = set()
+
+
+def profile_on_signal(seconds: float = SIGNAL_PROFILE_SECONDS) -> None:
+    """
+    Profile the running event loop for `seconds` each time the process receives SIGUSR1, and write the collapsed
+    stacks to a file in the temporary directory. Meant for the processor, which serves no requests.
+    """
+    async def profile_to_file() -> None:
+        try:
+            stacks = await profile_event_loop(seconds)
+        except ProfilerAlreadyRunningError:
+            logging.warning("Ignoring SIGUSR1, a profile is already being taken")
+            return
+        path = Path(tempfile.gettempdir()) / f"linkurator-profile-{os.getpid()}-{int(time.time())}.collapsed"
+        path.write_text(stacks, encoding="utf-8")
+        logging.info("Profile of %s seconds written to %s", seconds, path)
+
+    def start_profile() -> None:
+        task = asyncio.create_task(profile_to_file())
+        _signal_profiles.add(task)
+        task.add_done_callback(_signal_profiles.discard)
+
+    asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, start_profile)
@@ -22,6 +22,7 @@ class RabbitMQEventBus(EventBusService):
         self.connection: aio_pika.abc.AbstractRobustConnection | None = None
         self.queue_name = queue_name
         self._is_running = False
+        self._handler_tasks: set[asyncio.Task[None]] = set()
         self.loop = loop or asyncio.get_event_loop()
         self.url = f"amqp://{self.username}:{self.password}@{self.host}:{self.port}/"
 
@@ -71,7 +72,9 @@ class RabbitMQEventBus(EventBusService):
 
                         if event.__class__ in self.event_handlers:
                             for handler in self.event_handlers[event.__class__]:
-                                self.loop.create_task(handler(event))
+                                task = self.loop.create_task(handler(event))
+                                self._handler_tasks.add(task)
+                                task.add_done_callback(self._handler_tasks.discard)
 
             await channel.close()
 
@@ -86,3 +89,21 @@ class RabbitMQEventBus(EventBusService):
 
     def is_running(self) -> bool:
         return self._is_running
+
+    async def pending_events(self) -> int:
+        """
+        Number of messages waiting in the queue, read from the broker with a passive declare, plus the
+        handlers still running for the consumed ones.
+        """
+        if self.connection is None:
+            self.connection = await aio_pika.connect_robust(self.url, loop=self.loop)
+
+        channel = await self.connection.channel()
+        try:
+            queue = await channel.declare_queue(self.queue_name, passive=True)
+        except aio_pika.exceptions.ChannelNotFoundEntity:
+            # Nobody has consumed from the queue yet, so nothing has been published to it
+            return len(self._handler_tasks)
+        message_count = queue.declaration_result.message_count or 0
+        await channel.close()
+        return message_count + len(self._handler_tasks)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Coroutine, Iterator, ParamSpec, TypeVar
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+@dataclass
+class RequestTiming:
+    """
+    Time spent by a request in each part of the application: queries, repository methods, provider calls,
+    handlers and schemas. The parts running concurrently add up their own time, so the sum can exceed the total.
+    """
+
+    durations_ms: dict[str, float] = field(default_factory=dict)
+    counts: dict[str, int] = field(default_factory=dict)
+
+    def add(self, name: str, duration_ms: float) -> None:
+        self.durations_ms[name] = self.durations_ms.get(name, 0) + duration_ms
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def server_timing(self, total_ms: float) -> str:
+        """Value of the Server-Timing header, with the number of calls of each part as its description."""
+        metrics = [f'{name};dur={duration_ms:.1f};desc="{self.counts[name]}"'
+                   for name, duration_ms in sorted(self.durations_ms.items(), key=lambda part: -part[1])]
+        return ", ".join([f"total;dur={total_ms:.1f}", *metrics])
+
+
+_request_timing: ContextVar[RequestTiming | None] = ContextVar("request_timing", default=None)
+
+
+@contextmanager
+def collect_request_timing() -> Iterator[RequestTiming]:
+    """Collect the timings added by the code run inside the block, including the tasks it starts."""
+    timing = RequestTiming()
+    token = _request_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _request_timing.reset(token)
+
+
+def add_timing(name: str, duration_ms: float) -> None:
+    """Add time spent in a part of the application to the request being served, if any."""
+    timing = _request_timing.get()
+    if timing is not None:
+        timing.add(name, duration_ms)
+
+
+@contextmanager
+def timed_section(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_timing(name, (time.perf_counter() - start) * 1000)
+
+
+def request_timed(name: str) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Coroutine[Any, Any, T]]]:
+    """Add the time spent in each call of a coroutine function to the request being served."""
+    def decorator(function: Callable[P, Awaitable[T]]) -> Callable[P, Coroutine[Any, Any, T]]:
+        @functools.wraps(function)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            with timed_section(name):
+                return await function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -13,6 +13,7 @@ from urllib.parse import urljoin, urlparse
 
 from linkurator_core.domain.common.exceptions import InvalidRssFeedError
 from linkurator_core.infrastructure.asyncio_impl.http_client import AsyncHttpClient
+from linkurator_core.infrastructure.metrics import provider_call
 
 DEFAULT_FEED_ICON = "https://upload.wikimedia.org/wikipedia/en/4/43/Feed-icon.svg"
 
@@ -74,6 +75,7 @@ class RssFeedClient:
     def __init__(self, http_client: AsyncHttpClient = AsyncHttpClient()) -> None:
         self.http_client = http_client
 
+    @provider_call("rss")
     async def get_feed_info(self, feed_url: str) -> RssFeedInfo:
         """Get feed information from an RSS/Atom feed URL."""
         response = await self.http_client.get(feed_url)
@@ -190,6 +192,7 @@ class RssFeedClient:
         msg = f"Unknown feed format: {root.tag}"
         raise InvalidRssFeedError(msg)
 
+    @provider_call("rss")
     async def get_feed_items(self, feed_url: str) -> list[RssFeedItem]:
         """Get items from an RSS/Atom feed URL."""
         response = await self.http_client.get(feed_url)
@@ -201,6 +204,7 @@ class RssFeedClient:
 
         return self.parse_feed_items(response.text)
 
+    @provider_call("rss")
     async def get_feed_items_with_thumbnails(self, items: list[RssFeedItem]) -> list[RssFeedItem]:
         # Find items with default thumbnails and try to get OpenGraph images
         items = copy.deepcopy(items)
@@ -172,14 +172,23 @@ class RssSubscriptionService(SubscriptionService):
             limit=len(item_ids),
         )
 
+        return await self.refresh_items(items)
+
+    async def refresh_items(
+        self,
+        items: list[Item],
+    ) -> set[Item]:
         # Filter for RSS items only
         rss_items = [item for item in items if item.provider == self.provider_name()]
 
         updated_items: set[Item] = set()
+        subscriptions: dict[uuid.UUID, Subscription | None] = {}
 
         for item in rss_items:
-            # Get subscription to find feed_url
-            subscription = await self.subscription_repository.get(item.subscription_uuid)
+            # Get subscription to find feed_url, once per subscription
+            if item.subscription_uuid not in subscriptions:
+                subscriptions[item.subscription_uuid] = await self.subscription_repository.get(item.subscription_uuid)
+            subscription = subscriptions[item.subscription_uuid]
             if subscription is None or subscription.provider != self.provider_name():
                 continue
 
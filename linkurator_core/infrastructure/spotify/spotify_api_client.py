@@ -10,6 +10,8 @@ import aiohttp
 from pydantic import AnyUrl, BaseModel
 from unidecode import unidecode
 
+from linkurator_core.infrastructure.metrics import provider_call
+
 
 class ReleaseDataPrecision(str, Enum):
     DAY = "day"
@@ -74,6 +76,7 @@ class SpotifyApiClient:
         random_index = random.randint(0, len(self.credentials) - 1)
         return self.credentials[random_index]
 
+    @provider_call("spotify")
     async def get_access_token(self) -> str | None:
         auth_url = "https://accounts.spotify.com/api/token"
 
@@ -97,6 +100,7 @@ class SpotifyApiClient:
                 logging.error("Failed to retrieve token: %s -> %s", response.status, await response.text())
                 return None
 
+    @provider_call("spotify")
     async def find_show(self, query: str) -> Show | None:
         token = await self.get_access_token()
         if token is None:
@@ -129,6 +133,7 @@ class SpotifyApiClient:
                 logging.error("Failed to retrieve show: %s -> %s", response.status, await response.text())
                 return None
 
+    @provider_call("spotify")
     async def get_shows(self, show_ids: list[str]) -> list[Show]:
         if len(show_ids) == 0:
             return []
@@ -160,6 +165,7 @@ class SpotifyApiClient:
                 msg = f"Failed to retrieve shows: {response.status} -> {await response.text()}"
                 raise SpotifyApiHttpError(msg)
 
+    @provider_call("spotify")
     async def get_show_episodes(self, show_id: str, offset: int = 0, limit: int = 50) -> GetEpisodesResponse:
         if limit > 50:
             msg = "Cannot retrieve more than 50 episodes at once"
@@ -197,6 +203,7 @@ class SpotifyApiClient:
                 msg = f"Failed to retrieve episodes: {response.status} -> {await response.text()}"
                 raise SpotifyApiHttpError(msg)
 
+    @provider_call("spotify")
     async def get_episodes(self, episode_ids: list[str]) -> list[Episode]:
         if len(episode_ids) == 0:
             return []
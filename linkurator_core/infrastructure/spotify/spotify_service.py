@@ -92,9 +92,16 @@ class SpotifySubscriptionService(SubscriptionService):
             page_number=0,
             limit=len(item_ids))
 
+        return await self.refresh_items(items)
+
+    async def refresh_items(
+            self,
+            items: list[Item],
+    ) -> set[Item]:
         episode_index: dict[str, Item] = {
             episode_id_from_url(item.url): item
             for item in items
+            if item.provider == self.provider_name()
         }
 
         episodes_ids = list(episode_index.keys())
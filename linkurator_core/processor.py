@@ -1,6 +1,7 @@
 import asyncio
 import contextlib
 import logging
+from datetime import timedelta
 from pathlib import Path
 from typing import Any
 
@@ -14,6 +15,8 @@ from linkurator_core.application.common.event_handler import EventHandler
 from linkurator_core.application.items.find_deprecated_items_handler import FindDeprecatedItemsHandler
 from linkurator_core.application.items.find_zero_duration_items import FindZeroDurationItems
 from linkurator_core.application.items.refresh_items_handler import RefreshItemsHandler
+from linkurator_core.application.items.sync_user_timeline_handler import SyncUserTimelineHandler
+from linkurator_core.application.items.user_timeline import UserTimeline
 from linkurator_core.application.subscriptions.find_outdated_subscriptions_handler import (
     FindOutdatedSubscriptionsHandler,
 )
@@ -35,7 +38,9 @@ from linkurator_core.domain.common.event import (
     SubscriptionNeedsSummarizationEvent,
     UserRegisteredEvent,
     UserRegisterRequestSentEvent,
+    UserTimelineBecameOutdatedEvent,
 )
+from linkurator_core.domain.common.event_bus_service import EventBusService
 from linkurator_core.domain.subscriptions.general_subscription_service import GeneralSubscriptionService
 from linkurator_core.domain.subscriptions.subscription_service import SubscriptionService
 from linkurator_core.infrastructure.ai_agents.main_query_agent import MainQueryAgent
@@ -45,24 +50,33 @@ from linkurator_core.infrastructure.asyncio_impl.http_client import AsyncHttpCli
 from linkurator_core.infrastructure.asyncio_impl.scheduler import TaskScheduler
 from linkurator_core.infrastructure.asyncio_impl.utils import run_parallel, run_sequence, wait_until
 from linkurator_core.infrastructure.config.settings import ApplicationSettings
+from linkurator_core.infrastructure.event_bus import create_event_bus
 from linkurator_core.infrastructure.google.account_service import GoogleDomainAccountService
 from linkurator_core.infrastructure.google.gmail_email_sender import GmailEmailSender
 from linkurator_core.infrastructure.google.youtube_api_client import YoutubeApiClient
 from linkurator_core.infrastructure.google.youtube_rss_client import YoutubeRssClient
 from linkurator_core.infrastructure.google.youtube_service import YoutubeService
 from linkurator_core.infrastructure.logger import configure_logging
+from linkurator_core.infrastructure.loop_monitor import monitoring_event_loop
+from linkurator_core.infrastructure.memory_profiler import recording_memory, snapshot_memory_on_signal
+from linkurator_core.infrastructure.metrics import instrument_event_handling, metrics, record_drain_progress
 from linkurator_core.infrastructure.patreon.patreon_api_client import PatreonApiClient
 from linkurator_core.infrastructure.patreon.patreon_service import PatreonSubscriptionService
 from linkurator_core.infrastructure.postgres.chat_repository import PostgresChatRepository
+from linkurator_core.infrastructure.postgres.drain_cursor_repository import PostgresDrainCursorRepository
+from linkurator_core.infrastructure.postgres.item_archiver import PostgresItemArchiver
 from linkurator_core.infrastructure.postgres.item_repository import PostgresItemRepository
+from linkurator_core.infrastructure.postgres.lock_service import PostgresLockService
+from linkurator_core.infrastructure.postgres.query_statistics import query_statistics
 from linkurator_core.infrastructure.postgres.registration_request_repository import (
     PostgresRegistrationRequestRepository,
 )
 from linkurator_core.infrastructure.postgres.rss_data_repository import PostgresRssDataRepository
 from linkurator_core.infrastructure.postgres.subscription_repository import PostgresSubscriptionRepository
+from linkurator_core.infrastructure.postgres.timeline_repository import PostgresTimelineRepository
 from linkurator_core.infrastructure.postgres.topic_repository import PostgresTopicRepository
 from linkurator_core.infrastructure.postgres.user_repository import PostgresUserRepository
-from linkurator_core.infrastructure.rabbitmq_event_bus import RabbitMQEventBus
+from linkurator_core.infrastructure.profiler import profile_on_signal
 from linkurator_core.infrastructure.rss.rss_feed_client import RssFeedClient
 from linkurator_core.infrastructure.rss.rss_service import RssSubscriptionService
 from linkurator_core.infrastructure.spotify.spotify_api_client import SpotifyApiClient, SpotifyCredentials
@@ -85,12 +99,19 @@ class ProcessorReloadHandler(FileSystemEventHandler):
             self.restart_needed = True
 
 
-async def run_processor() -> None:  # pylint: disable=too-many-locals
+async def run_processor(event_bus: EventBusService | None = None) -> None:  # pylint: disable=too-many-locals
+    """
+    Run the event handlers and the scheduled tasks.
+
+    An already created `event_bus` can be given to share it with an API running in the same process.
+    """
     # Read settings
     settings = ApplicationSettings.from_file()
     db_settings = settings.postgres
     spotify_secrets = settings.spotify
-    rabbitmq_settings = settings.rabbitmq
+    query_statistics.configure(
+        db_settings.slow_query_ms, db_settings.slow_query_explain_rate, trace_queries=settings.logging.logfire.enabled)
+    metrics.configure(settings.metrics.directory)
 
     # Repositories
     user_repository = PostgresUserRepository(
@@ -121,6 +142,14 @@ async def run_processor() -> None:  # pylint: disable=too-many-locals
         ip=db_settings.ip_address, port=db_settings.port, db_name=db_settings.database,
         username=db_settings.user, password=db_settings.password,
     )
+    drain_cursor_repository = PostgresDrainCursorRepository(
+        ip=db_settings.ip_address, port=db_settings.port, db_name=db_settings.database,
+        username=db_settings.user, password=db_settings.password,
+    )
+    item_archiver = PostgresItemArchiver(
+        ip=db_settings.ip_address, port=db_settings.port, db_name=db_settings.database,
+        username=db_settings.user, password=db_settings.password,
+    )
 
     # Services
     youtube_client = YoutubeApiClient()
@@ -212,9 +241,27 @@ async def run_processor() -> None:  # pylint: disable=too-many-locals
         model=agent_model,
     )
 
+    # Locks shared with other processor replicas
+    lock_service = PostgresLockService(
+        ip=db_settings.ip_address, port=db_settings.port, db_name=db_settings.database,
+        username=db_settings.user, password=db_settings.password,
+    )
+
     # Event bus
-    event_bus = RabbitMQEventBus(host=str(rabbitmq_settings.ip_address), port=rabbitmq_settings.port,
-                                 username=rabbitmq_settings.user, password=rabbitmq_settings.password)
+    if event_bus is None:
+        event_bus = create_event_bus(settings)
+
+    user_timeline: UserTimeline | None = None
+    if settings.timeline.enabled:
+        user_timeline = UserTimeline(
+            timeline_repository=PostgresTimelineRepository(
+                ip=db_settings.ip_address, port=db_settings.port, db_name=db_settings.database,
+                username=db_settings.user, password=db_settings.password,
+            ),
+            max_subscriptions=settings.timeline.max_subscriptions,
+            max_age=timedelta(days=settings.timeline.max_age_days),
+            event_bus=event_bus,
+        )
 
     # Event handlers
     update_youtube_user_subscriptions = UpdateYoutubeUserSubscriptionsHandler(
@@ -225,11 +272,14 @@ async def run_processor() -> None:  # pylint: disable=too-many-locals
     update_subscriptions_items = UpdateSubscriptionItemsHandler(
         subscription_repository=subscription_repository,
         item_repository=item_repository,
-        subscription_service=general_subscription_service)
+        subscription_service=general_subscription_service,
+        lock_service=lock_service,
+        user_timeline=user_timeline)
     update_subscription = UpdateSubscriptionHandler(
         subscription_repository=subscription_repository,
         subscription_service=general_subscription_service,
         event_bus=event_bus,
+        lock_service=lock_service,
     )
     refresh_items_handler = RefreshItemsHandler(
         item_repository=item_repository,
@@ -247,10 +297,17 @@ async def run_processor() -> None:  # pylint: disable=too-many-locals
         item_repository=item_repository,
         event_bus=event_bus,
         subscription_services=subscription_providers,
+        max_run_seconds=50,
+        drain_cursor_repository=drain_cursor_repository,
     )
     find_zero_duration_items = FindZeroDurationItems(
         item_repository=item_repository,
-        event_bus=event_bus)
+        event_bus=event_bus,
+        max_run_seconds=50,
+        drain_cursor_repository=drain_cursor_repository)
+
+    async def record_drains_progress() -> None:
+        record_drain_progress([*find_deprecated_items.progress(), find_zero_duration_items.progress()])
     send_validate_new_user_email = SendValidateNewUserEmail(
         email_sender=gmail_email_sender,
         registration_request_repository=registration_request_repository,
@@ -273,6 +330,13 @@ async def run_processor() -> None:  # pylint: disable=too-many-locals
         event_bus=event_bus,
     )
 
+    sync_user_timeline_handler = None
+    if user_timeline is not None:
+        sync_user_timeline_handler = SyncUserTimelineHandler(
+            user_repository=user_repository,
+            user_timeline=user_timeline,
+        )
+
     event_handler = EventHandler(
         update_youtube_user_subscriptions_handler=update_youtube_user_subscriptions,
         update_subscription_items_handler=update_subscriptions_items,
@@ -282,31 +346,56 @@ async def run_processor() -> None:  # pylint: disable=too-many-locals
         send_welcome_email=send_welcome_email,
         process_user_query_handler=process_user_query_handler,
         summarize_subscription_handler=summarize_subscription_handler,
+        sync_user_timeline_handler=sync_user_timeline_handler,
     )
 
-    event_bus.subscribe(SubscriptionItemsBecameOutdatedEvent, event_handler.handle)
-    event_bus.subscribe(SubscriptionBecameOutdatedEvent, event_handler.handle)
-    event_bus.subscribe(ItemsBecameOutdatedEvent, event_handler.handle)
-    event_bus.subscribe(UserRegisterRequestSentEvent, event_handler.handle)
-    event_bus.subscribe(UserRegisteredEvent, event_handler.handle)
-    event_bus.subscribe(NewChatQueryEvent, event_handler.handle)
-    event_bus.subscribe(SubscriptionNeedsSummarizationEvent, event_handler.handle)
+    handle_event = instrument_event_handling(event_handler.handle)
+    event_bus.subscribe(SubscriptionItemsBecameOutdatedEvent, handle_event)
+    event_bus.subscribe(SubscriptionBecameOutdatedEvent, handle_event)
+    event_bus.subscribe(ItemsBecameOutdatedEvent, handle_event)
+    event_bus.subscribe(UserRegisterRequestSentEvent, handle_event)
+    event_bus.subscribe(UserRegisteredEvent, handle_event)
+    event_bus.subscribe(NewChatQueryEvent, handle_event)
+    event_bus.subscribe(SubscriptionNeedsSummarizationEvent, handle_event)
+    event_bus.subscribe(UserTimelineBecameOutdatedEvent, handle_event)
 
     # Task scheduler
-    scheduler = TaskScheduler()
-    scheduler.schedule_recurring_task(task=find_subscriptions_with_outdated_items.handle, interval_seconds=60)
-    scheduler.schedule_recurring_task(task=find_outdated_subscriptions.handle, interval_seconds=60 * 5)
-    scheduler.schedule_recurring_task(task=find_deprecated_items.handle, interval_seconds=60 * 5)
-    scheduler.schedule_recurring_task(task=find_zero_duration_items.handle, interval_seconds=60 * 5)
-    scheduler.schedule_recurring_task(task=find_subscriptions_for_summarization.handle, interval_seconds=60 * 60 * 4)
-
-    await run_parallel(
-        event_bus.start(),
-        run_sequence(
-            wait_until(event_bus.is_running),
-            scheduler.start(),
-        ),
-    )
+    # Jobs run independently of each other. The jitter spreads the start of the jobs and the timeout
+    # frees a job that got stuck, as the next run of a job is skipped while the previous one is in progress.
+    # Only the replica holding the leader lock runs the jobs, while every replica consumes events.
+    scheduler = TaskScheduler(lock_service=lock_service)
+    scheduler.schedule_recurring_task(task=find_subscriptions_with_outdated_items.handle, interval_seconds=60,
+                                      jitter_seconds=5, timeout_seconds=60 * 30)
+    scheduler.schedule_recurring_task(task=find_outdated_subscriptions.handle, interval_seconds=60 * 5,
+                                      jitter_seconds=5, timeout_seconds=60 * 30)
+    scheduler.schedule_recurring_task(task=find_deprecated_items.handle, interval_seconds=60,
+                                      jitter_seconds=5, timeout_seconds=60 * 30)
+    scheduler.schedule_recurring_task(task=find_zero_duration_items.handle, interval_seconds=60,
+                                      jitter_seconds=5, timeout_seconds=60 * 30)
+    scheduler.schedule_recurring_task(task=record_drains_progress, interval_seconds=30)
+    scheduler.schedule_recurring_task(task=find_subscriptions_for_summarization.handle, interval_seconds=60 * 60 * 4,
+                                      jitter_seconds=5, timeout_seconds=60 * 60)
+    # The archiver waits a day instead of running on every restart of the processor
+    scheduler.schedule_recurring_task(task=item_archiver.handle, interval_seconds=60 * 60 * 24, skip_first=True,
+                                      jitter_seconds=5, timeout_seconds=60 * 60)
+
+    loop_monitor_settings = settings.event_loop_monitor
+    try:
+        async with contextlib.AsyncExitStack() as stack:
+            await stack.enter_async_context(recording_memory("processor"))
+            if loop_monitor_settings.enabled:
+                await stack.enter_async_context(
+                    monitoring_event_loop("processor", loop_monitor_settings.blocked_ms))
+            await run_parallel(
+                event_bus.start(),
+                run_sequence(
+                    wait_until(event_bus.is_running),
+                    scheduler.start(),
+                ),
+                metrics.flush_periodically(),
+            )
+    finally:
+        await lock_service.close()
 
 
 async def main() -> None:
@@ -314,6 +403,10 @@ async def main() -> None:
     settings = ApplicationSettings.from_file()
 
     configure_logging(settings.logging)
+    # Only here, as the processor runs inside the API workers with the in-memory event bus, and
+    # gunicorn uses SIGUSR1 to reopen the log files of its workers
+    profile_on_signal()
+    snapshot_memory_on_signal()
 
     if settings.api.reload:
         logging.info("Auto-reload enabled. Watching for file changes...")
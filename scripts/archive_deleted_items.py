@@ -0,0 +1,35 @@
+import argparse
+import asyncio
+import logging
+from datetime import timedelta
+
+from linkurator_core.infrastructure.config.settings import ApplicationSettings
+from linkurator_core.infrastructure.postgres.item_archiver import PostgresItemArchiver
+
+logging.basicConfig(format="%(asctime)s - %(levelname)s: %(message)s", level=logging.INFO, datefmt="%Y-%m-%d %H:%M:%S")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Move items deleted longer ago than the retention period to the archive tables")
+    parser.add_argument("--retention-days", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--max-batches", type=int, default=None)
+    parser.add_argument("--pause-seconds", type=float, default=0.5, help="Pause between batches")
+    parser.add_argument("--no-vacuum", action="store_true", help="Do not vacuum the tables after archiving")
+    args = parser.parse_args()
+
+    db_settings = ApplicationSettings.from_file().postgres
+    archiver = PostgresItemArchiver(
+        ip=db_settings.ip_address, port=db_settings.port, db_name=db_settings.database,
+        username=db_settings.user, password=db_settings.password,
+        retention=timedelta(days=args.retention_days),
+        batch_size=args.batch_size,
+        max_batches=args.max_batches,
+        pause_seconds=args.pause_seconds)
+
+    await archiver.archive_deleted_items(vacuum=not args.no_vacuum)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
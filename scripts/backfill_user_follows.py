@@ -0,0 +1,35 @@
+import argparse
+import asyncio
+import logging
+
+from linkurator_core.infrastructure.config.settings import ApplicationSettings
+from linkurator_core.infrastructure.postgres.user_repository import PostgresUserRepository
+
+logging.basicConfig(format="%(asctime)s - %(levelname)s: %(message)s", level=logging.INFO, datefmt="%Y-%m-%d %H:%M:%S")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Copy the followed subscriptions, topics and curators of every user into the follow tables. "
+                    "Run it once every instance writes to the follow tables, to copy the follows written "
+                    "by the previous version during the rollout. It can be run again safely")
+    parser.add_argument("--batch-size", type=int, default=500, help="Users copied in each transaction")
+    args = parser.parse_args()
+
+    db_settings = ApplicationSettings.from_file().postgres
+    user_repository = PostgresUserRepository(
+        ip=db_settings.ip_address, port=db_settings.port, db_name=db_settings.database,
+        username=db_settings.user, password=db_settings.password)
+
+    synced = 0
+    last_user_id = await user_repository.sync_follow_tables(None, args.batch_size)
+    while last_user_id is not None:
+        synced += args.batch_size
+        logging.info("Copied the follows of about %s users", synced)
+        last_user_id = await user_repository.sync_follow_tables(last_user_id, args.batch_size)
+
+    logging.info("Copied the follows of every user")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+import argparse
+import asyncio
+import json
+import logging
+from pathlib import Path
+
+from linkurator_core.benchmarks.api_benchmark import (
+    InMemoryRepositories,
+    benchmark_results,
+    compare_results,
+    in_memory_handlers,
+    load_dataset_in_memory,
+    write_results,
+)
+from linkurator_core.benchmarks.load_test import (
+    default_api_call_mix,
+    load_test_users,
+    run_load_test,
+)
+from linkurator_core.domain.common.synthetic_dataset import SyntheticDataset, SyntheticDatasetShape
+from linkurator_core.infrastructure.fastapi.create_app import create_app_from_handlers
+
+logging.basicConfig(format="%(asctime)s - %(levelname)s: %(message)s", level=logging.INFO, datefmt="%Y-%m-%d %H:%M:%S")
+
+
+async def main(args: argparse.Namespace) -> None:
+    shape = SyntheticDatasetShape(
+        users=args.users, subscriptions=args.subscriptions, items=args.items,
+        subscriptions_per_user=args.subscriptions_per_user, interactions_per_user=args.interactions_per_user,
+        seed=args.seed)
+    dataset = SyntheticDataset(shape)
+    repositories = InMemoryRepositories()
+    tokens = await load_dataset_in_memory(dataset, repositories, args.benchmark_users)
+
+    app = create_app_from_handlers(in_memory_handlers(repositories))
+    users = load_test_users(dataset, tokens)
+    mix = default_api_call_mix(dataset.vocabulary[:200])
+    # A first short run fills the caches and the lazy imports, so they are not part of the measure
+    await run_load_test(app, users, mix, requests=min(args.requests, 200), concurrency=args.concurrency)
+    report = await run_load_test(app, users, mix, requests=args.requests, concurrency=args.concurrency,
+                                 seed=args.seed)
+    logging.info("API benchmark over the in-memory repositories:\n%s", report.as_text())
+
+    results = benchmark_results(report, {"requests": args.requests, "concurrency": args.concurrency, **vars(shape)})
+    write_results(results, Path(args.output))
+    logging.info("Results written to %s", args.output)
+    if args.baseline is not None:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        logging.info("%s", compare_results(results, baseline))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the throughput and latency of the feed, topic, curator and search endpoints, without "
+                    "a database: the handlers run over the in-memory repositories, seeded with a synthetic dataset, "
+                    "and the requests go through the ASGI interface in the same process")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--subscriptions", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--subscriptions-per-user", type=int, default=100)
+    parser.add_argument("--interactions-per-user", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--benchmark-users", type=int, default=50, help="Users making the requests")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--output", type=str, default="api_benchmark.json", help="JSON file of the results")
+    parser.add_argument("--baseline", type=str, default=None,
+                        help="JSON file of the results of a previous run, to compare with")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,79 @@
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from typing import Any
+from uuid import uuid4
+
+from linkurator_core.benchmarks.item_search import generate_search_vocabulary, generate_searchable_items, search_queries
+from linkurator_core.infrastructure.config.settings import ApplicationSettings
+from linkurator_core.infrastructure.postgres.item_repository import PostgresItemRepository
+from linkurator_core.infrastructure.postgres.repositories import run_postgres_migrations
+
+logging.basicConfig(format="%(asctime)s - %(levelname)s: %(message)s", level=logging.INFO, datefmt="%Y-%m-%d %H:%M:%S")
+
+CHUNK_SIZE = 50_000
+
+
+def _plan_summary(plan: dict[str, Any]) -> str:
+    nodes = [plan]
+    summary = []
+    while nodes:
+        node = nodes.pop(0)
+        summary.append(f"{node['Node Type']} {node.get('Index Name', '')}".strip())
+        nodes.extend(node.get("Plans", []))
+    return " > ".join(summary)
+
+
+async def main(args: argparse.Namespace) -> None:
+    db_settings = ApplicationSettings.from_file().postgres
+    repository = PostgresItemRepository(
+        ip=db_settings.ip_address, port=db_settings.port, db_name=args.database,
+        username=db_settings.user, password=db_settings.password)
+    vocabulary = generate_search_vocabulary(args.vocabulary)
+
+    if not args.skip_load:
+        await repository.delete_all_items()
+        subscription_ids = [uuid4() for _ in range(args.subscriptions)]
+        start_time = time.time()
+        for first_item in range(0, args.items, CHUNK_SIZE):
+            items = generate_searchable_items(
+                min(CHUNK_SIZE, args.items - first_item), subscription_ids, vocabulary, first_item=first_item)
+            for i in range(0, len(items), 10_000):
+                await repository.upsert_items(items[i:i + 10_000])
+            logging.info("Loaded %s items", first_item + len(items))
+        await repository.analyze()
+        logging.info("Loaded the catalogue in %.1fs", time.time() - start_time)
+
+    for query in search_queries(vocabulary):
+        plan = await repository.explain_find_items(query.criteria, 0, args.page_size)
+        await repository.find_items(query.criteria, 0, args.page_size)
+        times = []
+        for _ in range(args.runs):
+            start_time = time.perf_counter()
+            await repository.find_items(query.criteria, 0, args.page_size)
+            times.append((time.perf_counter() - start_time) * 1000)
+        times.sort()
+        logging.info("%s: median %.1fms, p95 %.1fms, max %.1fms - %s", query.name, statistics.median(times),
+                     times[int(len(times) * 0.95) - 1], times[-1], _plan_summary(plan))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the latency of searching items by text over a synthetic catalogue. The catalogue is "
+                    "loaded into its own database, in the Postgres server of the configuration")
+    parser.add_argument("--database", type=str, default="search_benchmark")
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--subscriptions", type=int, default=1000)
+    parser.add_argument("--vocabulary", type=int, default=5000, help="Number of distinct words")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--skip-load", action="store_true", help="Search the catalogue loaded by a previous run")
+    arguments = parser.parse_args()
+
+    settings = ApplicationSettings.from_file().postgres
+    if arguments.database == settings.database:
+        parser.error("The benchmark deletes the items of its database, use a different one")
+    run_postgres_migrations(settings.ip_address, settings.port, arguments.database, settings.user, settings.password)
+    asyncio.run(main(arguments))
@@ -0,0 +1,38 @@
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any
+
+from linkurator_core.infrastructure.fastapi.metrics_middleware import MetricsMiddleware
+
+logging.basicConfig(format="%(asctime)s - %(levelname)s: %(message)s", level=logging.INFO, datefmt="%Y-%m-%d %H:%M:%S")
+
+
+async def _empty_app(scope: Any, receive: Any, send: Any) -> None:
+    pass
+
+
+async def _seconds_per_request(app: Any, requests: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/"}
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(scope, None, None)
+    return (time.perf_counter() - start) / requests
+
+
+async def main(args: argparse.Namespace) -> None:
+    bare = await _seconds_per_request(_empty_app, args.requests)
+    instrumented = await _seconds_per_request(MetricsMiddleware(_empty_app), args.requests)
+    overhead_us = (instrumented - bare) * 1e6
+    logging.info("Metrics middleware overhead: %.2f us per request (%.2f us with the middleware, %.2f us without)",
+                 overhead_us, instrumented * 1e6, bare * 1e6)
+    if overhead_us > args.budget_us:
+        logging.error("The overhead is over the budget of %s us per request", args.budget_us)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the time the metrics middleware adds to every request")
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--budget-us", type=float, default=50, help="Overhead per request reported as too high")
+    asyncio.run(main(parser.parse_args()))
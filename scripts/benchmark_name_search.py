@@ -0,0 +1,144 @@
+import argparse
+import asyncio
+import itertools
+import logging
+import random
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from linkurator_core.benchmarks.item_search import generate_search_vocabulary
+from linkurator_core.infrastructure.config.settings import ApplicationSettings
+from linkurator_core.infrastructure.postgres.common import PostgresConnector, PostgresPool
+from linkurator_core.infrastructure.postgres.name_search import name_search_query
+from linkurator_core.infrastructure.postgres.repositories import run_postgres_migrations
+from linkurator_core.infrastructure.postgres.subscription_repository import PostgresSubscriptionRepository
+from linkurator_core.infrastructure.postgres.topic_repository import PostgresTopicRepository
+from linkurator_core.infrastructure.postgres.user_repository import PostgresUserRepository
+
+logging.basicConfig(format="%(asctime)s - %(levelname)s: %(message)s", level=logging.INFO, datefmt="%Y-%m-%d %H:%M:%S")
+
+CHUNK_SIZE = 50_000
+
+INSERT_QUERIES = {
+    "users": """
+        INSERT INTO users (uuid, first_name, last_name, username, email, avatar_url, locale,
+                           created_at, updated_at, scanned_at, last_login_at)
+        SELECT gen_random_uuid(), '', '', name, name || '@example.com', 'https://example.com/avatar.png', 'en',
+               now(), now(), now(), now()
+        FROM unnest(%s::text[]) AS name
+    """,
+    "topics": """
+        INSERT INTO topics (uuid, name, user_id, created_at, updated_at)
+        SELECT gen_random_uuid(), name, gen_random_uuid(), now(), now()
+        FROM unnest(%s::text[]) AS name
+    """,
+    "subscriptions": """
+        INSERT INTO subscriptions (uuid, name, provider, url, thumbnail, created_at, updated_at, scanned_at,
+                                   last_published_at)
+        SELECT gen_random_uuid(), name, 'youtube', 'https://example.com/' || gen_random_uuid(),
+               'https://example.com/thumbnail.png', now(), now(), now(), now()
+        FROM unnest(%s::text[]) AS name
+    """,
+}
+NAME_COLUMNS = {"users": "username", "topics": "name", "subscriptions": "name"}
+
+
+def _generate_names(table: str, count: int, vocabulary: list[str], first_name: int) -> list[str]:
+    """Names made of two or three words of the vocabulary, the first words being the most frequent ones."""
+    rng = random.Random(first_name)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    names = []
+    for i in range(first_name, first_name + count):
+        words = rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(2, 3))
+        if table == "users":
+            # Usernames are unique
+            names.append(f"{'_'.join(words)}{i}")
+        else:
+            names.append(" ".join(word.capitalize() for word in words))
+    return names
+
+
+def _search_texts(vocabulary: list[str]) -> dict[str, str]:
+    return {
+        "One character": vocabulary[0][:1],
+        "Two characters": vocabulary[0][:2],
+        "Part of a common word": vocabulary[0][1:4],
+        "Common word": vocabulary[0],
+        "Rare word": vocabulary[-1],
+        "Two words": f"{vocabulary[1]} {vocabulary[20]}",
+    }
+
+
+def _plan_summary(plan: dict[str, Any]) -> str:
+    nodes = [plan]
+    summary = []
+    while nodes:
+        node = nodes.pop(0)
+        summary.append(f"{node['Node Type']} {node.get('Index Name', '')}".strip())
+        nodes.extend(node.get("Plans", []))
+    return " > ".join(summary)
+
+
+async def _load(pool: PostgresPool, table: str, rows: int, vocabulary: list[str]) -> None:
+    await pool.execute(f"TRUNCATE {table} CASCADE")
+    start_time = time.time()
+    for first_name in range(0, rows, CHUNK_SIZE):
+        names = _generate_names(table, min(CHUNK_SIZE, rows - first_name), vocabulary, first_name)
+        await pool.execute(INSERT_QUERIES[table], names)
+    await pool.execute(f"ANALYZE {table}")
+    logging.info("Loaded %s %s in %.1fs", rows, table, time.time() - start_time)
+
+
+async def main(args: argparse.Namespace) -> None:
+    db_settings = ApplicationSettings.from_file().postgres
+    connection = {"ip": db_settings.ip_address, "port": db_settings.port, "db_name": args.database,
+                  "username": db_settings.user, "password": db_settings.password}
+    pool = await PostgresConnector(**connection).pool()
+    user_repository = PostgresUserRepository(**connection)
+    topic_repository = PostgresTopicRepository(**connection)
+    subscription_repository = PostgresSubscriptionRepository(**connection)
+    searches: dict[str, Callable[[str, int], Awaitable[list[Any]]]] = {
+        "users": user_repository.search_by_username,
+        "topics": topic_repository.search_topics_by_name,
+        "subscriptions": subscription_repository.search_by_name,
+    }
+    vocabulary = generate_search_vocabulary(args.vocabulary)
+
+    for table, search in searches.items():
+        if not args.skip_load:
+            await _load(pool, table, args.rows, vocabulary)
+
+        for name, text in _search_texts(vocabulary).items():
+            query, params = name_search_query(table, NAME_COLUMNS[table], text, args.limit)
+            plan = (await pool.fetchval("EXPLAIN (FORMAT JSON) " + query, *params))[0]["Plan"]
+            await search(text, args.limit)
+            times = []
+            for _ in range(args.runs):
+                start_time = time.perf_counter()
+                await search(text, args.limit)
+                times.append((time.perf_counter() - start_time) * 1000)
+            times.sort()
+            logging.info("%s - %s '%s': median %.1fms, p95 %.1fms, max %.1fms - %s", table, name, text,
+                         statistics.median(times), times[int(len(times) * 0.95) - 1], times[-1],
+                         _plan_summary(plan))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the latency of searching users, topics and subscriptions by name as the user types. "
+                    "The tables are loaded into their own database, in the Postgres server of the configuration")
+    parser.add_argument("--database", type=str, default="name_search_benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows of each table")
+    parser.add_argument("--vocabulary", type=int, default=5000, help="Number of distinct words")
+    parser.add_argument("--limit", type=int, default=10, help="Results of each search")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--skip-load", action="store_true", help="Search the tables loaded by a previous run")
+    arguments = parser.parse_args()
+
+    settings = ApplicationSettings.from_file().postgres
+    if arguments.database == settings.database:
+        parser.error("The benchmark deletes the rows of its database, use a different one")
+    run_postgres_migrations(settings.ip_address, settings.port, arguments.database, settings.user, settings.password)
+    asyncio.run(main(arguments))
@@ -0,0 +1,62 @@
+import argparse
+import asyncio
+import logging
+from typing import Any
+
+from linkurator_core.benchmarks.processor_benchmark import (
+    FakeProviderServer,
+    FakeProviderShape,
+    run_processor_benchmark,
+)
+from linkurator_core.infrastructure.config.settings import ApplicationSettings
+from linkurator_core.infrastructure.postgres.bulk_loader import PostgresBulkLoader
+from linkurator_core.infrastructure.postgres.repositories import run_postgres_migrations
+
+logging.basicConfig(format="%(asctime)s - %(levelname)s: %(message)s", level=logging.WARNING,
+                    datefmt="%Y-%m-%d %H:%M:%S")
+
+
+async def main(args: argparse.Namespace) -> None:
+    db_settings = ApplicationSettings.from_file().postgres
+    connection: dict[str, Any] = {
+        "ip": db_settings.ip_address, "port": db_settings.port, "db_name": args.database,
+        "username": db_settings.user, "password": db_settings.password}
+    await PostgresBulkLoader(**connection).truncate()
+
+    server = FakeProviderServer(FakeProviderShape(
+        items_per_feed=args.items_per_feed, new_items_per_round=args.new_items_per_round,
+        latency_ms=args.latency_ms))
+    async with server.running():
+        youtube_subscriptions = round(args.subscriptions * args.youtube_fraction)
+        subscriptions = [server.youtube_subscription(index) for index in range(youtube_subscriptions)] + [
+            server.rss_subscription(index) for index in range(args.subscriptions - youtube_subscriptions)]
+        report = await run_processor_benchmark(
+            connection, server, subscriptions, rounds=args.rounds, concurrency=args.concurrency,
+            trace_memory=args.trace_memory)
+    logging.warning("Processor benchmark of %s subscriptions:\n%s", len(subscriptions), report.as_text())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the subscription refreshes per minute of the processor, the queries of each refresh "
+                    "and the memory peak. The providers are a local server serving synthetic YouTube and RSS "
+                    "feeds, the events go through an in-process event bus and the data to its own database, in "
+                    "the Postgres server of the configuration")
+    parser.add_argument("--database", type=str, default="processor_benchmark")
+    parser.add_argument("--subscriptions", type=int, default=500)
+    parser.add_argument("--youtube-fraction", type=float, default=0.7, help="Fraction of YouTube subscriptions")
+    parser.add_argument("--items-per-feed", type=int, default=30)
+    parser.add_argument("--new-items-per-round", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=50, help="Latency of every response of the providers")
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="Refreshes of every subscription, the first one imports all the items of the feeds")
+    parser.add_argument("--concurrency", type=int, default=10, help="Events handled at the same time")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Report the peak of the memory allocated by Python, which slows down the processor")
+    arguments = parser.parse_args()
+
+    settings = ApplicationSettings.from_file().postgres
+    if arguments.database == settings.database:
+        parser.error("The benchmark deletes the data of its database, use a different one")
+    run_postgres_migrations(settings.ip_address, settings.port, arguments.database, settings.user, settings.password)
+    asyncio.run(main(arguments))
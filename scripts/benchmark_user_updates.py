@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import logging
+import statistics
+from collections.abc import Awaitable, Callable
+from uuid import UUID, uuid4
+
+from linkurator_core.domain.common.mock_factory import mock_user
+from linkurator_core.domain.common.utils import datetime_now
+from linkurator_core.domain.users.user import User
+from linkurator_core.domain.users.user_repository import FollowKind
+from linkurator_core.infrastructure.config.settings import ApplicationSettings
+from linkurator_core.infrastructure.postgres.common import PostgresConnector, PostgresPool
+from linkurator_core.infrastructure.postgres.repositories import run_postgres_migrations
+from linkurator_core.infrastructure.postgres.user_repository import PostgresUserRepository
+
+logging.basicConfig(format="%(asctime)s - %(levelname)s: %(message)s", level=logging.INFO, datefmt="%Y-%m-%d %H:%M:%S")
+
+
+async def _wal_bytes(pool: PostgresPool, operation: Callable[[], Awaitable[None]]) -> int:
+    start = await pool.fetchval("SELECT pg_current_wal_insert_lsn()")
+    await operation()
+    return int(await pool.fetchval("SELECT pg_wal_lsn_diff(pg_current_wal_insert_lsn(), %s)", start))
+
+
+async def main(args: argparse.Namespace) -> None:
+    db_settings = ApplicationSettings.from_file().postgres
+    connection = {"ip": db_settings.ip_address, "port": db_settings.port, "db_name": args.database,
+                  "username": db_settings.user, "password": db_settings.password}
+    pool = await PostgresConnector(**connection).pool()
+    repository = PostgresUserRepository(**connection)
+
+    await repository.delete_all()
+    user = mock_user(
+        subscribed_to=[uuid4() for _ in range(args.array_size)],
+        topics={uuid4() for _ in range(args.array_size)},
+        curators={uuid4() for _ in range(args.array_size)})
+    user.set_youtube_subscriptions({uuid4() for _ in range(args.array_size)})
+    await repository.add(user)
+
+    async def full_update(change: Callable[[User], None]) -> None:
+        stored_user = await repository.get(user.uuid)
+        assert stored_user is not None
+        change(stored_user)
+        await repository.update(stored_user)
+
+    def touch(stored_user: User) -> None:
+        stored_user.last_login_at = datetime_now()
+
+    def full_update_follow(subscription_id: UUID) -> Callable[[], Awaitable[None]]:
+        return lambda: full_update(lambda stored_user: stored_user.follow_subscription(subscription_id))
+
+    def follow_subscription(subscription_id: UUID) -> Callable[[], Awaitable[None]]:
+        return lambda: repository.follow(user.uuid, FollowKind.SUBSCRIPTION, subscription_id)
+
+    operations: dict[str, list[Callable[[], Awaitable[None]]]] = {
+        "Login, full update": [lambda: full_update(touch) for _ in range(args.runs)],
+        "Login, touch_last_login": [lambda: repository.touch_last_login(user.uuid, datetime_now())
+                                    for _ in range(args.runs)],
+        "Follow, full update": [full_update_follow(uuid4()) for _ in range(args.runs)],
+        "Follow, follow_subscription": [follow_subscription(uuid4()) for _ in range(args.runs)],
+    }
+    for name, calls in operations.items():
+        wal = [await _wal_bytes(pool, call) for call in calls]
+        logging.info("%s: median %s WAL bytes, max %s", name, statistics.median(wal), max(wal))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the WAL written by logins and follows of a user with large arrays of followed "
+                    "subscriptions, topics and curators. The user is created in its own database, in the Postgres "
+                    "server of the configuration")
+    parser.add_argument("--database", type=str, default="user_updates_benchmark")
+    parser.add_argument("--array-size", type=int, default=500, help="UUIDs of each array column of the user")
+    parser.add_argument("--runs", type=int, default=20)
+    arguments = parser.parse_args()
+
+    settings = ApplicationSettings.from_file().postgres
+    if arguments.database == settings.database:
+        parser.error("The benchmark deletes the users of its database, use a different one")
+    run_postgres_migrations(settings.ip_address, settings.port, arguments.database, settings.user, settings.password)
+    asyncio.run(main(arguments))
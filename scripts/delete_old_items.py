@@ -2,7 +2,9 @@ import argparse
 import asyncio
 import logging
 import sys
+import time
 from datetime import datetime, timezone
+from uuid import UUID
 
 from linkurator_core.application.items.delete_subscription_items_handler import DeleteSubscriptionItemsHandler
 from linkurator_core.domain.items.item_repository import ItemFilterCriteria
@@ -17,6 +19,8 @@ logging.basicConfig(format="%(asctime)s - %(levelname)s: %(message)s", level=log
 async def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--admin-email", type=str, required=True)
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Number of subscriptions whose items are deleted at the same time")
     args = parser.parse_args()
 
     db_settings = ApplicationSettings.from_file().postgres
@@ -37,30 +41,41 @@ async def main() -> None:
         subscription_repository=subscription_repository,
         item_repository=item_repository)
 
-    is_there_and_outdated_subscription = True
-
     admin = await user_repository.get_by_email(args.admin_email)
     if admin is None:
         logging.error("Admin user not found")
         sys.exit(1)
+    admin_uuid = admin.uuid
+
+    # The subscriptions are scanned again once their items are deleted, the items fetched again while the script
+    # runs are created after this date and are left alone
+    started_at = datetime.now(tz=timezone.utc)
+    start_time = time.monotonic()
+    deleted_items = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def delete_items(subscription_uuid: UUID) -> None:
+        nonlocal deleted_items
+        async with semaphore:
+            logging.info("Deleting items for subscription with uuid: %s", subscription_uuid)
+            deleted_items += await delete_subscription_items.handle(
+                admin_uuid, subscription_uuid, before=started_at)
 
-    while is_there_and_outdated_subscription:
+    while True:
         items = await item_repository.find_items(
-            criteria=ItemFilterCriteria(created_before=datetime.now(tz=timezone.utc)),
-            page_number=0, limit=1)
+            criteria=ItemFilterCriteria(created_before=started_at),
+            page_number=0, limit=100 * args.concurrency)
 
-        subscriptions_uuids = set()
-        for item in items:
-            subscriptions_uuids.add(item.subscription_uuid)
+        subscriptions_uuids = {item.subscription_uuid for item in items}
+        if len(subscriptions_uuids) == 0:
+            break
 
         logging.info("Found %s subscriptions to delete", len(subscriptions_uuids))
+        await asyncio.gather(*[delete_items(subscription_uuid) for subscription_uuid in subscriptions_uuids])
 
-        for subscription_uuid in subscriptions_uuids:
-            logging.info("Deleting items for subscription with uuid: %s", subscription_uuid)
-            await delete_subscription_items.handle(admin.uuid, subscription_uuid)
-
-        if len(subscriptions_uuids) == 0:
-            is_there_and_outdated_subscription = False
+        elapsed_seconds = time.monotonic() - start_time
+        logging.info("Deleted %s items in %.1f seconds (%.0f rows/sec)",
+                     deleted_items, elapsed_seconds, deleted_items / max(elapsed_seconds, 1e-9))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import logging
+from typing import Any
+from uuid import UUID
+
+from linkurator_core.benchmarks.load_test import (
+    default_api_call_mix,
+    load_test_users,
+    run_load_test,
+)
+from linkurator_core.domain.common.synthetic_dataset import SyntheticDataset, SyntheticDatasetShape
+from linkurator_core.domain.users.session import Session
+from linkurator_core.infrastructure.config.settings import ApplicationSettings
+from linkurator_core.infrastructure.fastapi.app import app_handlers
+from linkurator_core.infrastructure.fastapi.create_app import create_app_from_handlers
+from linkurator_core.infrastructure.in_memory.event_bus import InMemoryEventBus
+from linkurator_core.infrastructure.postgres.bulk_loader import PostgresBulkLoader
+from linkurator_core.infrastructure.postgres.repositories import run_postgres_migrations
+from linkurator_core.infrastructure.postgres.session_repository import PostgresSessionRepository
+
+logging.basicConfig(format="%(asctime)s - %(levelname)s: %(message)s", level=logging.INFO, datefmt="%Y-%m-%d %H:%M:%S")
+
+SESSION_SECONDS = 24 * 60 * 60
+
+
+async def main(args: argparse.Namespace) -> None:
+    settings = ApplicationSettings.from_file()
+    settings.postgres.database = args.database
+    db_settings = settings.postgres
+    connection: dict[str, Any] = {
+        "ip": db_settings.ip_address, "port": db_settings.port, "db_name": args.database,
+        "username": db_settings.user, "password": db_settings.password}
+    dataset = SyntheticDataset(SyntheticDatasetShape(
+        users=args.users, subscriptions=args.subscriptions, items=args.items,
+        subscriptions_per_user=args.subscriptions_per_user, interactions_per_user=args.interactions_per_user,
+        seed=args.seed))
+
+    loader = PostgresBulkLoader(**connection)
+    if not args.skip_load:
+        await loader.truncate()
+        await loader.load(dataset)
+
+    session_repository = PostgresSessionRepository(**connection)
+    tokens: dict[UUID, str] = {}
+    for user_id in dataset.user_ids[:args.load_test_users]:
+        session = Session.new(user_id=user_id, seconds_to_expire=SESSION_SECONDS)
+        await session_repository.add(session)
+        tokens[user_id] = session.token
+
+    # Events are not processed, the mix only reads
+    app = create_app_from_handlers(app_handlers(InMemoryEventBus(), settings))
+    report = await run_load_test(
+        app, load_test_users(dataset, tokens), default_api_call_mix(dataset.vocabulary[:200]),
+        requests=args.requests, concurrency=args.concurrency, seed=args.seed)
+    logging.info("Load test of %s users:\n%s", len(tokens), report.as_text())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replay a mix of API calls of many users against a synthetic dataset, and report the throughput "
+                    "and latency percentiles of each endpoint. The dataset is loaded into its own database, in the "
+                    "Postgres server of the configuration")
+    parser.add_argument("--database", type=str, default="load_test")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--subscriptions", type=int, default=20_000)
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--subscriptions-per-user", type=int, default=300)
+    parser.add_argument("--interactions-per-user", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--load-test-users", type=int, default=100, help="Users making the calls")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--skip-load", action="store_true",
+                        help="Replay the calls over the dataset loaded by a previous run with the same arguments")
+    arguments = parser.parse_args()
+
+    settings = ApplicationSettings.from_file().postgres
+    if arguments.database == settings.database:
+        parser.error("The load test deletes the data of its database, use a different one")
+    run_postgres_migrations(settings.ip_address, settings.port, arguments.database, settings.user, settings.password)
+    asyncio.run(main(arguments))
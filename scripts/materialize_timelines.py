@@ -0,0 +1,45 @@
+import argparse
+import asyncio
+import logging
+from datetime import timedelta
+
+from linkurator_core.application.items.user_timeline import UserTimeline
+from linkurator_core.infrastructure.config.settings import ApplicationSettings
+from linkurator_core.infrastructure.postgres.timeline_repository import PostgresTimelineRepository
+from linkurator_core.infrastructure.postgres.user_repository import PostgresUserRepository
+
+logging.basicConfig(format="%(asctime)s - %(levelname)s: %(message)s", level=logging.INFO, datefmt="%Y-%m-%d %H:%M:%S")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Create or update the materialized timelines of every user")
+    parser.add_argument("--rebuild", action="store_true", help="Drop the existing timelines before creating them")
+    args = parser.parse_args()
+
+    settings = ApplicationSettings.from_file()
+    db_settings = settings.postgres
+    user_repository = PostgresUserRepository(
+        ip=db_settings.ip_address, port=db_settings.port, db_name=db_settings.database,
+        username=db_settings.user, password=db_settings.password)
+    timeline_repository = PostgresTimelineRepository(
+        ip=db_settings.ip_address, port=db_settings.port, db_name=db_settings.database,
+        username=db_settings.user, password=db_settings.password)
+    user_timeline = UserTimeline(
+        timeline_repository=timeline_repository,
+        max_subscriptions=settings.timeline.max_subscriptions,
+        max_age=timedelta(days=settings.timeline.max_age_days))
+
+    users = await user_repository.get_all()
+    materialized = 0
+    for user in users:
+        if args.rebuild:
+            await timeline_repository.delete(user.uuid)
+        if await user_timeline.sync(user) is not None:
+            materialized += 1
+
+    logging.info("Materialized the timelines of %s out of %s users", materialized, len(users))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
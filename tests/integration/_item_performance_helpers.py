@@ -9,18 +9,15 @@ from datetime import datetime, timedelta, timezone
 from typing import Awaitable, Callable
 from uuid import UUID, uuid4
 
+from linkurator_core.benchmarks.item_search import FindItemsQueryCase
 from linkurator_core.domain.common.mock_factory import mock_item
 from linkurator_core.domain.items.interaction import Interaction, InteractionType
 from linkurator_core.domain.items.item import Item
-from linkurator_core.domain.items.item_repository import AnyItemInteraction, ItemFilterCriteria, ItemRepository
-
-
-@dataclass
-class FindItemsQueryCase:
-    name: str
-    criteria: ItemFilterCriteria
-    check_items_result: bool
-    max_baseline_multiplier: float
+from linkurator_core.domain.items.item_repository import (
+    AnyItemInteraction,
+    ItemFilterCriteria,
+    ItemRepository,
+)
 
 
 @dataclass
@@ -171,6 +168,28 @@ async def run_find_items_scenario(
     """
     logging.info(f"=== Testing scenario: {scenario.name} ===")
 
+    await load_scenario_data(repo, scenario, user_uuid)
+
+    if after_insert is not None:
+        start_time = time.time()
+        await after_insert()
+        logging.info(f"Post-insert hook completed in {time.time() - start_time:.3f}s")
+
+    for query in scenario.queries:
+        await measure_find_items_query(
+            repo=repo,
+            query=query,
+            limit=limit,
+            max_expected_time=baseline_time * query.max_baseline_multiplier,
+        )
+
+
+async def load_scenario_data(
+        repo: ItemRepository,
+        scenario: FindItemsPerformanceTestScenario,
+        user_uuid: UUID,
+) -> None:
+    """Replace the items and interactions of the repository with the ones of the scenario."""
     await repo.delete_all_items()
     await repo.delete_all_interactions()
 
@@ -194,19 +213,6 @@ async def run_find_items_scenario(
     await insert_interactions_in_batches(repo, interactions, batch_size=10_000)
     logging.info(f"Interactions inserted in {time.time() - start_time:.3f}s")
 
-    if after_insert is not None:
-        start_time = time.time()
-        await after_insert()
-        logging.info(f"Post-insert hook completed in {time.time() - start_time:.3f}s")
-
-    for query in scenario.queries:
-        await measure_find_items_query(
-            repo=repo,
-            query=query,
-            limit=limit,
-            max_expected_time=baseline_time * query.max_baseline_multiplier,
-        )
-
 
 async def measure_find_items_query(
         repo: ItemRepository,
@@ -269,6 +275,26 @@ async def generate_items(count: int, subscription_ids: list[UUID]) -> list[Item]
     return items
 
 
+async def generate_followed_subscriptions_items(
+        followed_subscriptions: int,
+        items_per_subscription: int = 20,
+        other_items: int = 20_000,
+) -> tuple[list[Item], list[UUID]]:
+    """
+    Generate the items of a feed of many followed subscriptions, and the ids of these subscriptions.
+
+    Besides the items of the followed subscriptions, `other_items` items of 200 other subscriptions
+    are published later, so walking all the items by publication date finds the followed ones last.
+    """
+    followed_subscription_ids = [uuid4() for _ in range(followed_subscriptions)]
+    followed_items = await generate_items(followed_subscriptions * items_per_subscription, followed_subscription_ids)
+    other_items_list = await generate_items(other_items, [uuid4() for _ in range(200)])
+    newest_followed_item_date = max(item.published_at for item in followed_items)
+    for item in other_items_list:
+        item.published_at = newest_followed_item_date + (item.published_at - other_items_list[0].published_at)
+    return [*followed_items, *other_items_list], followed_subscription_ids
+
+
 async def generate_interactions(items: list[Item], user_uuid: UUID, count: int) -> list[Interaction]:
     """Generate test interactions"""
     if not items or count == 0:
@@ -0,0 +1,46 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from linkurator_core.benchmarks.api_benchmark import (
+    InMemoryRepositories,
+    benchmark_results,
+    compare_results,
+    in_memory_handlers,
+    load_dataset_in_memory,
+    write_results,
+)
+from linkurator_core.benchmarks.load_test import default_api_call_mix, load_test_users, run_load_test
+from linkurator_core.domain.common.synthetic_dataset import SyntheticDataset, SyntheticDatasetShape
+from linkurator_core.infrastructure.fastapi.create_app import create_app_from_handlers
+
+SHAPE = SyntheticDatasetShape(
+    users=10, subscriptions=30, items=500, subscriptions_per_user=10, topics_per_user=2, curators=3,
+    curators_per_user=2, interactions_per_user=10)
+
+
+@pytest.mark.asyncio()
+async def test_benchmark_the_api_over_the_in_memory_repositories(tmp_path: Path) -> None:
+    dataset = SyntheticDataset(SHAPE)
+    repositories = InMemoryRepositories()
+    tokens = await load_dataset_in_memory(dataset, repositories, sessions=5)
+    app = create_app_from_handlers(in_memory_handlers(repositories))
+
+    report = await run_load_test(
+        app, load_test_users(dataset, tokens), default_api_call_mix(dataset.vocabulary[:20]), requests=150,
+        concurrency=5)
+
+    assert report.requests == 150
+    assert all(endpoint.errors == 0 for endpoint in report.endpoints.values())
+    results = benchmark_results(report, {"requests": 150, **vars(SHAPE)})
+    path = tmp_path / "api_benchmark.json"
+    write_results(results, path)
+    stored = json.loads(path.read_text(encoding="utf-8"))
+    assert stored["parameters"]["items"] == SHAPE.items
+    assert stored["endpoints"].keys() == report.endpoints.keys()
+    assert {"requests_per_second", "p99_ms"} <= next(iter(stored["endpoints"].values())).keys()
+
+    comparison = compare_results(stored, stored)
+    assert all(endpoint in comparison for endpoint in report.endpoints)
+    assert "+0%" in comparison
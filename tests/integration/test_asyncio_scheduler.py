@@ -1,7 +1,16 @@
+import asyncio
+from unittest.mock import patch
 
 import pytest
 
 from linkurator_core.infrastructure.asyncio_impl.scheduler import TaskScheduler
+from linkurator_core.infrastructure.asyncio_impl.utils import run_parallel, run_sequence
+from linkurator_core.infrastructure.in_memory.lock_service import InMemoryLockService
+from linkurator_core.infrastructure.metrics import (
+    SCHEDULED_TASK_DURATION,
+    SCHEDULED_TASK_LAG,
+    SCHEDULED_TASK_SKIPPED_RUNS,
+)
 
 
 @pytest.mark.asyncio()
@@ -37,3 +46,160 @@ async def test_scheduler() -> None:
 
     assert corroutine_2_seconds_called_times == 3
     assert corroutine_3_seconds_called_times == 2
+
+
+@pytest.mark.asyncio()
+async def test_a_slow_task_does_not_delay_other_tasks() -> None:
+    fast_task_called_times = 0
+
+    async def slow_task() -> None:
+        await asyncio.sleep(10)
+
+    async def fast_task() -> None:
+        nonlocal fast_task_called_times
+        fast_task_called_times += 1
+
+    scheduler = TaskScheduler()
+    scheduler.schedule_recurring_task(task=slow_task, interval_seconds=0.1)
+    scheduler.schedule_recurring_task(task=fast_task, interval_seconds=0.1)
+
+    await run_parallel(
+        scheduler.start(),
+        run_sequence(asyncio.sleep(0.55), scheduler.stop()),
+    )
+
+    # Runs due at 0, 0.1, ..., 0.5: a busy event loop may delay the last one past the stop
+    assert 5 <= fast_task_called_times <= 6
+    slow_task_metrics = scheduler.metrics()[slow_task.__qualname__]
+    assert slow_task_metrics.runs == 1
+    assert slow_task_metrics.skipped_overlapping_runs == fast_task_called_times - 1
+    assert slow_task_metrics.max_lag_seconds < 0.05
+
+
+@pytest.mark.asyncio()
+async def test_failing_and_timed_out_runs_are_counted() -> None:
+    async def failing_task() -> None:
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    async def hanging_task() -> None:
+        await asyncio.Event().wait()
+
+    scheduler = TaskScheduler()
+    scheduler.schedule_recurring_task(task=failing_task, interval_seconds=0.1)
+    scheduler.schedule_recurring_task(task=hanging_task, interval_seconds=0.1, timeout_seconds=0.05)
+
+    await run_parallel(
+        scheduler.start(),
+        run_sequence(asyncio.sleep(0.28), scheduler.stop()),
+    )
+
+    # Runs due at 0, 0.1 and 0.2: a busy event loop may delay the last one, or its timeout, past the stop
+    metrics = scheduler.metrics()
+    failing_task_metrics = metrics[failing_task.__qualname__]
+    assert 2 <= failing_task_metrics.runs <= 3
+    assert failing_task_metrics.failures == failing_task_metrics.runs
+    hanging_task_metrics = metrics[hanging_task.__qualname__]
+    assert 2 <= hanging_task_metrics.runs <= 3
+    assert hanging_task_metrics.runs - 1 <= hanging_task_metrics.timeouts <= hanging_task_metrics.runs
+    assert hanging_task_metrics.skipped_overlapping_runs == 0
+
+
+@pytest.mark.asyncio()
+async def test_jitter_delays_the_start_of_the_runs() -> None:
+    called_times = 0
+
+    async def task() -> None:
+        nonlocal called_times
+        called_times += 1
+
+    scheduler = TaskScheduler()
+    scheduler.schedule_recurring_task(task=task, interval_seconds=1, jitter_seconds=0.2)
+
+    with patch("random.uniform", return_value=0.2):
+        await run_parallel(
+            scheduler.start(),
+            run_sequence(asyncio.sleep(0.1), scheduler.stop()),
+        )
+
+    assert called_times == 0
+
+
+@pytest.mark.asyncio()
+async def test_the_jitter_is_not_counted_as_lag() -> None:
+    async def task() -> None:
+        pass
+
+    scheduler = TaskScheduler()
+    scheduler.schedule_recurring_task(task=task, interval_seconds=1, jitter_seconds=0.2)
+
+    with patch("random.uniform", return_value=0.2):
+        await run_parallel(
+            scheduler.start(),
+            run_sequence(asyncio.sleep(0.3), scheduler.stop()),
+        )
+
+    task_metrics = scheduler.metrics()[task.__qualname__]
+    assert task_metrics.runs == 1
+    assert task_metrics.max_lag_seconds < 0.05
+
+
+@pytest.mark.asyncio()
+async def test_only_the_leader_runs_the_tasks_when_several_schedulers_share_a_lock() -> None:
+    called_times = 0
+
+    async def task() -> None:
+        nonlocal called_times
+        called_times += 1
+
+    lock_service = InMemoryLockService()
+    leader = TaskScheduler(lock_service=lock_service)
+    leader.schedule_recurring_task(task=task, interval_seconds=0.1)
+    follower = TaskScheduler(lock_service=lock_service)
+    follower.schedule_recurring_task(task=task, interval_seconds=0.1)
+
+    await run_parallel(
+        leader.start(),
+        run_sequence(asyncio.sleep(0.05), follower.start()),
+        run_sequence(asyncio.sleep(0.28), leader.stop()),
+        run_sequence(asyncio.sleep(0.53), follower.stop()),
+    )
+
+    # The leader runs at 0, 0.1 and 0.2, and the follower takes over at 0.35 and 0.45
+    assert called_times == 5
+    assert leader.metrics()[task.__qualname__].runs == 3
+    assert follower.metrics()[task.__qualname__].runs == 2
+    assert follower.metrics()[task.__qualname__].skipped_not_leader_runs == 3
+    assert not await lock_service.is_held("task_scheduler_leader")
+
+
+@pytest.mark.asyncio()
+async def test_the_runs_are_recorded_in_the_metrics_registry() -> None:
+    async def hanging_task() -> None:
+        await asyncio.Event().wait()
+
+    async def failing_task() -> None:
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    async def follower_task() -> None:
+        pass
+
+    scheduler = TaskScheduler()
+    scheduler.schedule_recurring_task(task=hanging_task, interval_seconds=1, timeout_seconds=0.05)
+    scheduler.schedule_recurring_task(task=failing_task, interval_seconds=1)
+    lock_service = InMemoryLockService()
+    await lock_service.try_acquire("task_scheduler_leader")
+    follower = TaskScheduler(lock_service=lock_service)
+    follower.schedule_recurring_task(task=follower_task, interval_seconds=1)
+
+    await run_parallel(
+        scheduler.start(),
+        follower.start(),
+        run_sequence(asyncio.sleep(0.3), scheduler.stop(), follower.stop()),
+    )
+
+    assert sum(SCHEDULED_TASK_DURATION.series[(hanging_task.__qualname__, "timeout")][:-1]) == 1
+    assert sum(SCHEDULED_TASK_DURATION.series[(failing_task.__qualname__, "error")][:-1]) == 1
+    assert sum(SCHEDULED_TASK_LAG.series[(failing_task.__qualname__,)][:-1]) == 1
+    assert SCHEDULED_TASK_SKIPPED_RUNS.series[(follower_task.__qualname__, "not_leader")] == [1]
@@ -0,0 +1,90 @@
+from ipaddress import IPv4Address
+from typing import Any
+from uuid import UUID
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+
+from linkurator_core.benchmarks.load_test import ApiCallMix, load_test_users, run_load_test
+from linkurator_core.domain.common.synthetic_dataset import SyntheticDataset, SyntheticDatasetShape
+from linkurator_core.domain.items.item_repository import ItemFilterCriteria
+from linkurator_core.infrastructure.postgres.bulk_loader import PostgresBulkLoader
+from linkurator_core.infrastructure.postgres.common import PostgresConnector
+from linkurator_core.infrastructure.postgres.item_repository import PostgresItemRepository
+from linkurator_core.infrastructure.postgres.repositories import run_postgres_migrations
+from linkurator_core.infrastructure.postgres.topic_repository import PostgresTopicRepository
+from linkurator_core.infrastructure.postgres.user_repository import PostgresUserRepository
+
+SHAPE = SyntheticDatasetShape(
+    users=20, subscriptions=100, items=5000, subscriptions_per_user=30, topics_per_user=2, curators=3,
+    curators_per_user=2, interactions_per_user=20)
+
+
+@pytest.fixture(name="bulk_db_name", scope="module")
+def fixture_bulk_db_name(db_name: str) -> str:
+    # The tables are truncated, so the dataset goes to its own database
+    bulk_db_name = f"{db_name}-bulk"
+    run_postgres_migrations(IPv4Address("127.0.0.1"), 5432, bulk_db_name, "develop", "develop")
+    return bulk_db_name
+
+
+@pytest.mark.asyncio()
+async def test_load_synthetic_dataset(bulk_db_name: str) -> None:
+    connection: dict[str, Any] = {"ip": IPv4Address("127.0.0.1"), "port": 5432, "db_name": bulk_db_name,
+                                  "username": "develop", "password": "develop"}
+    dataset = SyntheticDataset(SHAPE)
+    loader = PostgresBulkLoader(**connection)
+    await loader.truncate()
+
+    await loader.load(dataset, batch_size=1000)
+
+    pool = await PostgresConnector(**connection).pool()
+    assert await pool.fetchval("SELECT count(*) FROM items") == SHAPE.items
+    assert await pool.fetchval("SELECT count(*) FROM interactions") == len(list(dataset.interactions()))
+    indexes = await pool.fetchval("SELECT count(*) FROM pg_indexes WHERE tablename = 'items'")
+    assert indexes > 1
+
+    user = next(dataset.users())
+    stored_user = await PostgresUserRepository(**connection).get(user.uuid)
+    assert stored_user is not None
+    assert stored_user.get_subscriptions() == user.get_subscriptions()
+    assert stored_user.curators == user.curators
+    assert await pool.fetchval(
+        "SELECT count(*) FROM user_subscriptions WHERE user_uuid = %s", user.uuid) == len(user.get_subscriptions())
+
+    topics = await PostgresTopicRepository(**connection).get_by_user_id(user.uuid)
+    assert {topic.uuid for topic in topics} == {dataset.topic_id(0, 0), dataset.topic_id(0, 1)}
+
+    items = await PostgresItemRepository(**connection).find_items(
+        ItemFilterCriteria(subscription_ids=[dataset.subscription_ids[0]]), 0, 10)
+    assert [item.uuid for item in items] == [dataset.item_id(0, position) for position in range(10)]
+
+
+@pytest.mark.asyncio()
+async def test_load_test_reports_each_endpoint() -> None:
+    dataset = SyntheticDataset(SHAPE)
+    tokens = {user_id: f"token-{position}" for position, user_id in enumerate(dataset.user_ids[:5])}
+    app = FastAPI()
+
+    @app.get("/subscriptions/{sub_id}")
+    async def get_subscription(sub_id: UUID, request: Request) -> str:
+        if request.headers.get("Authorization") not in {f"Bearer {token}" for token in tokens.values()}:
+            raise HTTPException(status_code=401)
+        return str(sub_id)
+
+    users = load_test_users(dataset, tokens)
+    mix = [
+        ApiCallMix("GET /subscriptions/{sub_id}", 3, lambda rng, user: (
+            f"/subscriptions/{rng.choice(user.subscription_ids)}")),
+        ApiCallMix("GET /missing", 1, lambda _, user: "/missing"),
+    ]
+
+    report = await run_load_test(app, users, mix, requests=200, concurrency=5)
+
+    assert report.requests == 200
+    assert [user.user_id for user in users] == dataset.user_ids[:5]
+    subscription_report = report.endpoints["GET /subscriptions/{sub_id}"]
+    assert subscription_report.errors == 0
+    assert len(subscription_report.latencies_ms) > 100
+    assert report.endpoints["GET /missing"].errors == len(report.endpoints["GET /missing"].latencies_ms)
+    assert "GET /subscriptions/{sub_id}" in report.as_text()
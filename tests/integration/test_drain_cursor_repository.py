@@ -0,0 +1,38 @@
+from ipaddress import IPv4Address
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from linkurator_core.domain.items.drain_cursor_repository import DrainCursorRepository
+from linkurator_core.infrastructure.in_memory.drain_cursor_repository import InMemoryDrainCursorRepository
+from linkurator_core.infrastructure.postgres.drain_cursor_repository import PostgresDrainCursorRepository
+
+
+@pytest.fixture(name="drain_cursor_repo", scope="session", params=["in_memory", "postgresql"])
+def fixture_drain_cursor_repo(db_name: str, request: Any) -> DrainCursorRepository:
+    if request.param == "postgresql":
+        return PostgresDrainCursorRepository(IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop")
+    return InMemoryDrainCursorRepository()
+
+
+@pytest.mark.asyncio()
+async def test_the_cursor_of_an_unknown_drain_is_none(drain_cursor_repo: DrainCursorRepository) -> None:
+    assert await drain_cursor_repo.get(f"unknown {uuid4()}") is None
+
+
+@pytest.mark.asyncio()
+async def test_save_and_replace_the_cursor_of_a_drain(drain_cursor_repo: DrainCursorRepository) -> None:
+    name = f"drain {uuid4()}"
+    first_cursor = uuid4()
+    second_cursor = uuid4()
+
+    await drain_cursor_repo.save(name, first_cursor)
+    await drain_cursor_repo.save(f"other {name}", second_cursor)
+    assert await drain_cursor_repo.get(name) == first_cursor
+
+    await drain_cursor_repo.save(name, second_cursor)
+    assert await drain_cursor_repo.get(name) == second_cursor
+
+    await drain_cursor_repo.save(name, None)
+    assert await drain_cursor_repo.get(name) is None
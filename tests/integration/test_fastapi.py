@@ -16,6 +16,8 @@ from linkurator_core.application.items.get_subscription_items_handler import (
     GetSubscriptionItemsResponse,
 )
 from linkurator_core.application.items.get_topic_items_handler import GetTopicItemsHandler
+from linkurator_core.application.search.search_by_name_handler import SearchByNameHandler, SearchResults
+from linkurator_core.application.topics.find_topics_by_name_handler import CuratorTopic as FoundCuratorTopic
 from linkurator_core.application.topics.get_curator_topics_as_user_handler import (
     GetCuratorTopicsHandler,
     GetCuratorTopicsResponse,
@@ -28,12 +30,16 @@ from linkurator_core.domain.common.exceptions import (
     SubscriptionNotFoundError,
     TopicNotFoundError,
 )
-from linkurator_core.domain.common.mock_factory import mock_sub, mock_topic, mock_user
+from linkurator_core.domain.common.mock_factory import mock_item, mock_sub, mock_topic, mock_user
 from linkurator_core.domain.items.item import Item
+from linkurator_core.domain.items.item_repository import ItemOrdering
 from linkurator_core.domain.items.item_with_interactions import ItemWithInteractions
+from linkurator_core.domain.items.timeline_repository import TimelineCursor
 from linkurator_core.domain.users.session import Session
 from linkurator_core.domain.users.user import User, Username
 from linkurator_core.infrastructure.fastapi.create_app import Handlers, create_app_from_handlers
+from linkurator_core.infrastructure.fastapi.routers.authentication import check_basic_auth
+from linkurator_core.infrastructure.postgres.query_statistics import query_statistics
 
 USER_UUID = uuid.UUID("8efe1fe3-906d-4aa4-8fbe-b47810c197d8")
 
@@ -104,6 +110,7 @@ def dummy_handlers() -> Handlers:
         get_user_filter_handler=AsyncMock(),
         upsert_user_filter_handler=AsyncMock(),
         delete_user_filter_handler=AsyncMock(),
+        search_by_name_handler=AsyncMock(),
     )
 
 
@@ -202,7 +209,7 @@ def test_get_subscription_items_parses_query_parameters(handlers: Handlers) -> N
     client.get(
         "/subscriptions/3e9232e7-fa87-4e14-a642-9df94d619c1a/items?"
         "page_number=0&page_size=1&search=test&created_before_ts=0&"
-        "max_duration=100&min_duration=10&"
+        "max_duration=100&min_duration=10&order_by=relevance&"
         "include_interactions=without_interactions,recommended,viewed,hidden,discouraged")
     dummy_handler.handle.assert_called_once_with(
         user_id=USER_UUID,
@@ -217,7 +224,8 @@ def test_get_subscription_items_parses_query_parameters(handlers: Handlers) -> N
         include_recommended_items=True,
         include_discouraged_items=True,
         include_viewed_items=True,
-        include_hidden_items=True)
+        include_hidden_items=True,
+        order_by=ItemOrdering.RELEVANCE)
 
 
 def test_get_subscription_items_recommended_and_without_interactions(handlers: Handlers) -> None:
@@ -247,7 +255,8 @@ def test_get_subscription_items_recommended_and_without_interactions(handlers: H
         include_recommended_items=True,
         include_discouraged_items=False,
         include_viewed_items=False,
-        include_hidden_items=False)
+        include_hidden_items=False,
+        order_by=ItemOrdering.PUBLISHED_AT)
 
 
 def test_create_user_topic_returns_201(handlers: Handlers) -> None:
@@ -709,9 +718,35 @@ def test_get_followed_subscriptions_items_parses_query_parameters(handlers: Hand
         include_discouraged_items=True,
         include_viewed_items=True,
         include_hidden_items=True,
+        after=None,
     )
 
 
+def test_get_followed_subscriptions_items_next_page_starts_after_the_last_item(handlers: Handlers) -> None:
+    sub = mock_sub()
+    item1 = mock_item(sub_uuid=sub.uuid)
+    item2 = mock_item(sub_uuid=sub.uuid)
+    dummy_handler = AsyncMock(spec=GetFollowedSubscriptionsItemsHandler)
+    dummy_handler.handle.return_value = GetFollowedSubscriptionsItemsResponse(
+        items=[ItemWithInteractions(item=item, subscription=sub, interactions=[]) for item in [item1, item2]])
+    handlers.get_followed_subscriptions_items_handler = dummy_handler
+    client = TestClient(create_app_from_handlers(handlers), cookies={"token": "token"})
+
+    response = client.get("/subscriptions/items?created_before_ts=999.0&page_number=0&page_size=2")
+    next_page = client.get(response.json()["next_page"])
+
+    assert next_page.status_code == 200
+    assert dummy_handler.handle.call_args.kwargs["page_number"] == 1
+    assert dummy_handler.handle.call_args.kwargs["after"] == TimelineCursor.of(item2)
+
+
+def test_get_followed_subscriptions_items_with_invalid_cursor_returns_400(handlers: Handlers) -> None:
+    client = TestClient(create_app_from_handlers(handlers), cookies={"token": "token"})
+
+    response = client.get("/subscriptions/items?cursor=invalid")
+    assert response.status_code == 400
+
+
 def test_get_curator_topics_without_authentication_returns_200(handlers: Handlers) -> None:
     curator = mock_user()
     topic = mock_topic(user_uuid=curator.uuid)
@@ -729,3 +764,125 @@ def test_get_curator_topics_without_authentication_returns_200(handlers: Handler
     assert topics[0]["uuid"] == str(topic.uuid)
     assert topics[0]["followed"] is False
     assert topics[0]["is_owner"] is False
+
+
+def test_search_by_name_without_authentication_returns_200(handlers: Handlers) -> None:
+    curator = mock_user()
+    topic = mock_topic(user_uuid=curator.uuid)
+    sub = mock_sub()
+
+    dummy_handler = AsyncMock(spec=SearchByNameHandler)
+    dummy_handler.handle.return_value = SearchResults(
+        curators=[curator],
+        topics=[FoundCuratorTopic(topic=topic, curator=curator)],
+        subscriptions=[sub],
+    )
+    handlers.search_by_name_handler = dummy_handler
+
+    client = TestClient(create_app_from_handlers(handlers))
+
+    response = client.get("/search/?text=test&limit=5")
+    assert response.status_code == 200
+    results = response.json()
+    assert [curator_["id"] for curator_ in results["curators"]] == [str(curator.uuid)]
+    assert [topic_["uuid"] for topic_ in results["topics"]] == [str(topic.uuid)]
+    assert [sub_["uuid"] for sub_ in results["subscriptions"]] == [str(sub.uuid)]
+    dummy_handler.handle.assert_called_once_with(text="test", limit=5)
+
+
+def test_search_by_name_with_too_many_results_returns_422(handlers: Handlers) -> None:
+    client = TestClient(create_app_from_handlers(handlers))
+
+    response = client.get("/search/?text=test&limit=1000")
+    assert response.status_code == 422
+
+
+def test_query_statistics_require_authentication(handlers: Handlers) -> None:
+    client = TestClient(create_app_from_handlers(handlers))
+
+    response = client.get("/statistics/queries")
+    assert response.status_code == 401
+
+
+def test_query_statistics_returns_the_slowest_statements_first(handlers: Handlers) -> None:
+    query_statistics.reset()
+    query_statistics.record("SELECT * FROM items", duration_ms=30, rows=10, pool_wait_ms=2)
+    query_statistics.record("SELECT * FROM items", duration_ms=10, rows=20, pool_wait_ms=0)
+    query_statistics.record("SELECT * FROM users", duration_ms=1, rows=1, pool_wait_ms=0)
+    app = create_app_from_handlers(handlers)
+    app.dependency_overrides[check_basic_auth] = lambda: None
+    client = TestClient(app)
+
+    response = client.get("/statistics/queries?limit=1")
+    assert response.status_code == 200
+    statements = response.json()
+    assert len(statements) == 1
+    assert statements[0]["template"] == "SELECT * FROM items"
+    assert statements[0]["calls"] == 2
+    assert statements[0]["mean_ms"] == 20
+    assert statements[0]["max_ms"] == 30
+    assert statements[0]["mean_rows"] == 15
+    assert statements[0]["mean_pool_wait_ms"] == 1
+    assert statements[0]["p50_ms"] == 10
+    assert statements[0]["p99_ms"] == 50
+
+
+def test_metrics_returns_the_route_latencies_in_prometheus_format(handlers: Handlers) -> None:
+    app = create_app_from_handlers(handlers)
+    app.dependency_overrides[check_basic_auth] = lambda: None
+    client = TestClient(app)
+
+    client.get("/health")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
+
+
+def test_server_timing_header_is_sent_when_enabled(handlers: Handlers) -> None:
+    client = TestClient(create_app_from_handlers(handlers, server_timing=True))
+
+    response = client.get("/health")
+
+    assert response.headers["server-timing"].startswith("total;dur=")
+
+
+def test_profiler_returns_collapsed_stacks(handlers: Handlers) -> None:
+    app = create_app_from_handlers(handlers)
+    app.dependency_overrides[check_basic_auth] = lambda: None
+    client = TestClient(app)
+
+    response = client.get("/profiler?seconds=0.2&interval_ms=1")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in response.text.splitlines())
+
+
+def test_profiler_requires_authentication(handlers: Handlers) -> None:
+    client = TestClient(create_app_from_handlers(handlers))
+
+    response = client.get("/profiler?seconds=0.1")
+
+    assert response.status_code == 401
+
+
+def test_memory_snapshots_report_the_worker_memory(handlers: Handlers) -> None:
+    app = create_app_from_handlers(handlers)
+    app.dependency_overrides[check_basic_auth] = lambda: None
+    client = TestClient(app)
+
+    assert client.post("/memory/snapshots").status_code == 409
+    assert client.post("/memory/tracing").status_code == 204
+    try:
+        response = client.post("/memory/snapshots?limit=5")
+    finally:
+        assert client.delete("/memory/tracing").status_code == 204
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["resident_bytes"] > 0
+    assert report["compared_to"] is None
+    assert 0 < len(report["sites"]) <= 5
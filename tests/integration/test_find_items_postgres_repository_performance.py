@@ -1,18 +1,28 @@
 import logging
 import time
 from ipaddress import IPv4Address
+from unittest.mock import patch
 from uuid import uuid4
 
 import pytest
 
+from linkurator_core.benchmarks.item_search import generate_search_vocabulary, generate_searchable_items, search_queries
+from linkurator_core.domain.items.item_repository import ItemFilterCriteria
 from linkurator_core.infrastructure.postgres.item_repository import PostgresItemRepository
 from tests.integration._item_performance_helpers import (
     baseline_function,
     build_duration_filter_scenario,
     build_standard_scenarios,
+    generate_followed_subscriptions_items,
+    insert_items_in_batches,
+    measure_find_items_query,
     run_find_items_scenario,
 )
 
+# Items of the catalogue searched by test_search_items_performance. scripts/benchmark_item_search.py
+# runs the same searches over larger catalogues
+SEARCH_CATALOGUE_ITEMS = 20_000
+
 
 @pytest.fixture(name="postgres_item_repo", scope="session")
 def fixture_postgres_item_repo(db_name: str) -> PostgresItemRepository:
@@ -60,3 +70,56 @@ async def test_find_items_duration_filter_performance(
         postgres_item_repo, scenario, user_uuid, baseline_time,
         after_insert=postgres_item_repo.analyze,
     )
+
+
+@pytest.mark.asyncio()
+async def test_find_items_of_many_subscriptions_performance(
+        postgres_item_repo: PostgresItemRepository, baseline_time: float,
+) -> None:
+    """
+    Compare the two ways of listing the feed of 10, 100 and 1,000 followed subscriptions: filtering all
+    the items by subscription and sorting them, or merging the newest items of each subscription.
+
+    The merged feed is faster for a few subscriptions that publish less than the rest, and slower for
+    hundreds of subscriptions, which sets MERGED_FEED_MAX_SUBSCRIPTIONS.
+    """
+    await postgres_item_repo.delete_all_items()
+    items, subscription_ids = await generate_followed_subscriptions_items(followed_subscriptions=1000)
+    await insert_items_in_batches(postgres_item_repo, items, batch_size=10_000)
+    await postgres_item_repo.analyze()
+
+    for followed_subscriptions in (10, 100, 1000):
+        criteria = ItemFilterCriteria(subscription_ids=subscription_ids[:followed_subscriptions])
+        for strategy, max_subscriptions in [("sorted", 0), ("merged", followed_subscriptions)]:
+            with patch("linkurator_core.infrastructure.postgres.item_repository.MERGED_FEED_MIN_SUBSCRIPTIONS", 1), \
+                    patch("linkurator_core.infrastructure.postgres.item_repository.MERGED_FEED_MAX_SUBSCRIPTIONS",
+                          max_subscriptions):
+                for page_number in (0, 2):
+                    await postgres_item_repo.find_items(criteria, page_number, 50)
+                    start_time = time.time()
+                    for _ in range(3):
+                        found_items = await postgres_item_repo.find_items(criteria, page_number, 50)
+                        assert len(found_items) == 50
+                    average_time = (time.time() - start_time) / 3
+
+                    logging.info(f"{followed_subscriptions} subscriptions, {strategy} feed, page {page_number}: "
+                                 f"{average_time * 1000:.1f}ms")
+                    assert average_time < baseline_time * 3
+
+
+@pytest.mark.asyncio()
+async def test_search_items_performance(postgres_item_repo: PostgresItemRepository, baseline_time: float) -> None:
+    """Measure searching the items by text: whole words, parts of words and ranking the matches."""
+    await postgres_item_repo.delete_all_items()
+    vocabulary = generate_search_vocabulary(5000)
+    items = generate_searchable_items(SEARCH_CATALOGUE_ITEMS, [uuid4() for _ in range(100)], vocabulary)
+    await insert_items_in_batches(postgres_item_repo, items, batch_size=10_000)
+    await postgres_item_repo.analyze()
+
+    for query in search_queries(vocabulary):
+        await measure_find_items_query(
+            repo=postgres_item_repo,
+            query=query,
+            limit=50,
+            max_expected_time=baseline_time * query.max_baseline_multiplier,
+        )
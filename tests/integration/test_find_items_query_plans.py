@@ -0,0 +1,84 @@
+from ipaddress import IPv4Address
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from linkurator_core.benchmarks.item_search import generate_search_vocabulary, generate_searchable_items, search_queries
+from linkurator_core.infrastructure.postgres.item_repository import PostgresItemRepository
+from tests.integration._item_performance_helpers import (
+    FindItemsPerformanceTestScenario,
+    build_duration_filter_scenario,
+    build_standard_scenarios,
+    insert_items_in_batches,
+    load_scenario_data,
+)
+
+LIVE_ITEMS_INDEXES = {"items_live_subscription_published_idx", "items_live_published_idx"}
+# Queries that match few interactions start from them and look the items up by their primary key
+ALLOWED_ITEMS_INDEXES = {*LIVE_ITEMS_INDEXES, "items_pkey"}
+ITEMS_INDEXES_PREFIX = "items_"
+SEARCH_CATALOGUE_ITEMS = 20_000
+USER_UUID = uuid4()
+
+
+def _plan_nodes(plan: dict[str, Any]) -> list[dict[str, Any]]:
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes.extend(_plan_nodes(child))
+    return nodes
+
+
+def _items_index_names(plan: dict[str, Any]) -> set[str]:
+    # Bitmap index scans do not name the table, so the indexes of the items table are told apart by their name
+    return {node["Index Name"] for node in _plan_nodes(plan)
+            if node.get("Index Name", "").startswith(ITEMS_INDEXES_PREFIX)}
+
+
+def _scenarios() -> list[FindItemsPerformanceTestScenario]:
+    return [*build_standard_scenarios(USER_UUID), build_duration_filter_scenario(USER_UUID)]
+
+
+@pytest.fixture(name="postgres_item_repo", scope="session")
+def fixture_postgres_item_repo(db_name: str) -> PostgresItemRepository:
+    return PostgresItemRepository(IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop")
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("scenario", _scenarios(), ids=lambda scenario: scenario.name)
+async def test_find_items_reads_the_live_items_indexes(
+        postgres_item_repo: PostgresItemRepository, scenario: FindItemsPerformanceTestScenario,
+) -> None:
+    """
+    The items of the feed are read from the partial indexes of live items, or by primary key, for every
+    query of the performance scenarios, instead of scanning the table or the indexes that include deleted items.
+    The items of a single subscription are read in the order of the index, without sorting them.
+    """
+    await load_scenario_data(postgres_item_repo, scenario, USER_UUID)
+    await postgres_item_repo.analyze()
+
+    for query in scenario.queries:
+        plan = await postgres_item_repo.explain_find_items(query.criteria, 0, 100)
+        nodes = _plan_nodes(plan)
+
+        index_names = _items_index_names(plan)
+        assert index_names, f"{query.name} does not use an items index: {plan}"
+        assert index_names <= ALLOWED_ITEMS_INDEXES, f"{query.name} uses {index_names}: {plan}"
+        assert not any(node["Node Type"] == "Seq Scan" and node.get("Relation Name") == "items"
+                       for node in nodes), f"{query.name} scans the items table: {plan}"
+        if (query.criteria.subscription_ids is not None and len(query.criteria.subscription_ids) == 1
+                and query.criteria.interactions_from_user is None):
+            assert all(node["Node Type"] != "Sort" for node in nodes), f"{query.name} sorts the items: {plan}"
+
+
+@pytest.mark.asyncio()
+async def test_search_items_does_not_read_every_item(postgres_item_repo: PostgresItemRepository) -> None:
+    await postgres_item_repo.delete_all_items()
+    vocabulary = generate_search_vocabulary(5000)
+    items = generate_searchable_items(SEARCH_CATALOGUE_ITEMS, [uuid4() for _ in range(100)], vocabulary)
+    await insert_items_in_batches(postgres_item_repo, items, batch_size=10_000)
+    await postgres_item_repo.analyze()
+
+    for query in search_queries(vocabulary):
+        plan = await postgres_item_repo.explain_find_items(query.criteria, 0, 50)
+        assert all(node["Node Type"] != "Seq Scan" for node in _plan_nodes(plan)), f"{query.name} reads every item"
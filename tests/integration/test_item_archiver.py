@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+from ipaddress import IPv4Address
+
+import pytest
+
+from linkurator_core.domain.common.mock_factory import mock_interaction, mock_item
+from linkurator_core.infrastructure.postgres.common import PostgresConnector
+from linkurator_core.infrastructure.postgres.item_archiver import PostgresItemArchiver
+from linkurator_core.infrastructure.postgres.item_repository import PostgresItemRepository
+from linkurator_core.infrastructure.postgres.rss_data_repository import PostgresRssDataRepository
+from linkurator_core.infrastructure.rss.rss_data_repository import RawDataRecord
+
+
+@pytest.mark.asyncio()
+async def test_archive_items_deleted_before_the_retention_period(db_name: str) -> None:
+    connection = (IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop")
+    item_repository = PostgresItemRepository(*connection)
+    rss_data_repository = PostgresRssDataRepository(*connection)
+    pool = await PostgresConnector(*connection).pool()
+
+    old_deleted_item = mock_item(url="https://archiver.com/old")
+    recently_deleted_item = mock_item(url="https://archiver.com/recent")
+    live_item = mock_item(url="https://archiver.com/live")
+    await item_repository.upsert_items([old_deleted_item, recently_deleted_item, live_item])
+    await item_repository.delete_items([old_deleted_item.uuid, recently_deleted_item.uuid])
+    await pool.execute("UPDATE items SET deleted_at = %s WHERE uuid = %s",
+                       datetime(2020, 1, 1, tzinfo=timezone.utc), old_deleted_item.uuid)
+
+    old_interaction = mock_interaction(item_id=old_deleted_item.uuid)
+    live_interaction = mock_interaction(item_id=live_item.uuid)
+    await item_repository.add_interaction(old_interaction)
+    await item_repository.add_interaction(live_interaction)
+    await rss_data_repository.set_raw_data([
+        RawDataRecord(rss_url="https://archiver.com/feed", item_url=str(old_deleted_item.url), raw_data="old"),
+        RawDataRecord(rss_url="https://archiver.com/feed", item_url=str(live_item.url), raw_data="live"),
+    ])
+
+    archiver = PostgresItemArchiver(*connection, retention=timedelta(days=30), batch_size=1, pause_seconds=0)
+    result = await archiver.archive_deleted_items()
+
+    assert result.items >= 1
+    assert await item_repository.get_item(old_deleted_item.uuid) is None
+    assert await item_repository.get_interaction(old_interaction.uuid) is None
+    assert await rss_data_repository.get_raw_data("https://archiver.com/feed", str(old_deleted_item.url)) is None
+    assert await pool.fetchval(
+        "SELECT COUNT(*) FROM archived_items WHERE uuid = %s", old_deleted_item.uuid) == 1
+    assert await pool.fetchval(
+        "SELECT COUNT(*) FROM archived_interactions WHERE uuid = %s", old_interaction.uuid) == 1
+    assert await pool.fetchval(
+        "SELECT COUNT(*) FROM archived_rss_data WHERE item_url = %s", str(old_deleted_item.url)) == 1
+
+    assert await pool.fetchval("SELECT COUNT(*) FROM items WHERE uuid = %s", recently_deleted_item.uuid) == 1
+    assert await item_repository.get_item(live_item.uuid) is not None
+    assert await item_repository.get_interaction(live_interaction.uuid) is not None
+    assert await rss_data_repository.get_raw_data("https://archiver.com/feed", str(live_item.url)) is not None
+
+
+@pytest.mark.asyncio()
+async def test_archive_stops_after_the_max_number_of_batches(db_name: str) -> None:
+    connection = (IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop")
+    item_repository = PostgresItemRepository(*connection)
+    pool = await PostgresConnector(*connection).pool()
+
+    items = [mock_item() for _ in range(3)]
+    await item_repository.upsert_items(items)
+    await item_repository.delete_items([item.uuid for item in items])
+    await pool.execute("UPDATE items SET deleted_at = %s WHERE uuid = ANY(%s::uuid[])",
+                       datetime(2020, 1, 1, tzinfo=timezone.utc), [item.uuid for item in items])
+
+    archiver = PostgresItemArchiver(*connection, batch_size=1, max_batches=2, pause_seconds=0)
+    result = await archiver.archive_deleted_items(vacuum=False)
+
+    assert result.batches == 2
+    assert result.items == 2
+
+
+@pytest.mark.asyncio()
+async def test_table_bloat_reports_the_archived_tables(db_name: str) -> None:
+    archiver = PostgresItemArchiver(IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop")
+
+    bloat = await archiver.table_bloat()
+
+    assert [table.table for table in bloat] == ["interactions", "items", "rss_data"]
+    assert all(table.table_bytes >= 0 and table.index_bytes > 0 for table in bloat)
@@ -1,6 +1,8 @@
+from dataclasses import replace
 from datetime import datetime, timedelta, timezone
 from ipaddress import IPv4Address
 from typing import Any
+from unittest.mock import patch
 from uuid import UUID, uuid4
 
 import pytest
@@ -13,6 +15,7 @@ from linkurator_core.domain.items.item_repository import (
     AnyItemInteraction,
     InteractionFilterCriteria,
     ItemFilterCriteria,
+    ItemOrdering,
     ItemRepository,
 )
 from linkurator_core.infrastructure.in_memory.item_repository import InMemoryItemRepository
@@ -69,6 +72,53 @@ async def test_delete_item(item_repo: ItemRepository) -> None:
     assert deleted_item is None
 
 
+@pytest.mark.asyncio()
+async def test_delete_items(item_repo: ItemRepository) -> None:
+    item1 = mock_item()
+    item2 = mock_item()
+    item3 = mock_item()
+    await item_repo.upsert_items([item1, item2, item3])
+
+    await item_repo.delete_items([item1.uuid, item2.uuid])
+    await item_repo.delete_items([])
+
+    assert await item_repo.get_item(item1.uuid) is None
+    assert await item_repo.get_item(item2.uuid) is None
+    assert await item_repo.get_item(item3.uuid) is not None
+
+
+@pytest.mark.asyncio()
+async def test_delete_items_by_subscription(item_repo: ItemRepository) -> None:
+    sub_uuid = uuid4()
+    old_item = mock_item(sub_uuid=sub_uuid, created_at=datetime(2020, 1, 1, tzinfo=timezone.utc))
+    new_item = mock_item(sub_uuid=sub_uuid, created_at=datetime(2024, 1, 1, tzinfo=timezone.utc))
+    other_subscription_item = mock_item(created_at=datetime(2020, 1, 1, tzinfo=timezone.utc))
+    await item_repo.upsert_items([old_item, new_item, other_subscription_item])
+
+    deleted_before = await item_repo.delete_items_by_subscription(
+        sub_uuid, before=datetime(2022, 1, 1, tzinfo=timezone.utc))
+    assert deleted_before == 1
+    assert await item_repo.get_item(old_item.uuid) is None
+    assert await item_repo.get_item(new_item.uuid) is not None
+
+    deleted_rest = await item_repo.delete_items_by_subscription(sub_uuid)
+    assert deleted_rest == 1
+    assert await item_repo.get_item(new_item.uuid) is None
+    assert await item_repo.get_item(other_subscription_item.uuid) is not None
+
+
+@pytest.mark.asyncio()
+async def test_delete_items_by_subscription_in_several_batches(item_repo: ItemRepository) -> None:
+    sub_uuid = uuid4()
+    await item_repo.upsert_items([mock_item(sub_uuid=sub_uuid) for _ in range(5)])
+
+    with patch("linkurator_core.infrastructure.postgres.item_repository.DELETE_BATCH_SIZE", 2):
+        deleted_items = await item_repo.delete_items_by_subscription(sub_uuid)
+
+    assert deleted_items == 5
+    assert await item_repo.find_items(ItemFilterCriteria(subscription_ids=[sub_uuid]), 0, 10) == []
+
+
 @pytest.mark.asyncio()
 async def test_create_and_update_items(item_repo: ItemRepository) -> None:
     item1 = mock_item(item_uuid=UUID("72ab4421-f2b6-499a-bbf1-5105f2ed549b"))
@@ -361,9 +411,10 @@ async def test_find_items_for_a_subscription_with_text_search_criteria(item_repo
         page_number=0,
         limit=4,
     )
-    assert len(found_items) == 2
+    assert len(found_items) == 3
     assert found_items[0].uuid == item4.uuid
-    assert found_items[1].uuid == item2.uuid
+    assert found_items[1].uuid == item3.uuid
+    assert found_items[2].uuid == item2.uuid
 
     found_items = await item_repo.find_items(
         criteria=ItemFilterCriteria(
@@ -395,6 +446,51 @@ async def test_find_items_for_a_subscription_with_text_search_criteria(item_repo
     assert len(found_items) == 0
 
 
+@pytest.mark.asyncio()
+async def test_find_items_with_part_of_a_word(item_repo: ItemRepository) -> None:
+    sub1_uuid = UUID("b76f981e-083f-4cee-9e5c-9f46f010546f")
+    item1 = mock_item(name="Videogames are cool", description="Some games", sub_uuid=sub1_uuid)
+    item2 = mock_item(name="Are videogames culture?", description="Let's find out!", sub_uuid=sub1_uuid)
+    item3 = mock_item(name="Board games", description="Better than videogames", sub_uuid=sub1_uuid)
+
+    await item_repo.delete_all_items()
+    await item_repo.upsert_items([item1, item2, item3])
+
+    async def find_names(text: str) -> set[str]:
+        found_items = await item_repo.find_items(
+            criteria=ItemFilterCriteria(subscription_ids=[sub1_uuid], text=text), page_number=0, limit=3)
+        return {item.name for item in found_items}
+
+    assert await find_names("videog") == {item1.name, item2.name}
+    assert await find_names("vídeo cul") == {item2.name}
+    assert await find_names("games") == {item1.name, item2.name, item3.name}
+    assert await find_names("ga") == set()
+
+
+@pytest.mark.asyncio()
+async def test_find_items_by_relevance(item_repo: ItemRepository) -> None:
+    sub1_uuid = UUID("b76f981e-083f-4cee-9e5c-9f46f010546f")
+    now = datetime.now(tz=timezone.utc)
+    in_description = mock_item(
+        name="Board games", description="Better than football", sub_uuid=sub1_uuid, published_at=now)
+    in_name = mock_item(
+        name="Football tactics", description="Explained", sub_uuid=sub1_uuid, published_at=now - timedelta(days=2))
+    in_both = mock_item(
+        name="Football", description="All about football", sub_uuid=sub1_uuid, published_at=now - timedelta(days=1))
+
+    await item_repo.delete_all_items()
+    await item_repo.upsert_items([in_description, in_name, in_both])
+
+    by_date = await item_repo.find_items(
+        criteria=ItemFilterCriteria(subscription_ids=[sub1_uuid], text="football"), page_number=0, limit=3)
+    by_relevance = await item_repo.find_items(
+        criteria=ItemFilterCriteria(subscription_ids=[sub1_uuid], text="football", order_by=ItemOrdering.RELEVANCE),
+        page_number=0, limit=3)
+
+    assert [item.uuid for item in by_date] == [in_description.uuid, in_both.uuid, in_name.uuid]
+    assert [item.uuid for item in by_relevance] == [in_both.uuid, in_name.uuid, in_description.uuid]
+
+
 @pytest.mark.asyncio()
 async def test_find_items_with_accents(item_repo: ItemRepository) -> None:
     sub1_uuid = UUID("b76f981e-083f-4cee-9e5c-9f46f010546f")
@@ -507,6 +603,29 @@ async def test_find_deprecated_items(item_repo: ItemRepository) -> None:
     assert found_items[0].uuid == item4.uuid
 
 
+@pytest.mark.asyncio()
+async def test_find_item_ids_pages_with_a_cursor_in_id_order(item_repo: ItemRepository) -> None:
+    await item_repo.delete_all_items()
+
+    item1 = mock_item(item_uuid=UUID("0e829ca3-4e4c-42f6-960d-0f79b815587d"), version=1)
+    item2 = mock_item(item_uuid=UUID("656fbb48-7897-4528-ae8b-cc4abc81aec7"), version=1)
+    item3 = mock_item(item_uuid=UUID("6f9f5f02-eb83-4358-8794-ef452dea2f2f"), version=2)
+    item4 = mock_item(item_uuid=UUID("ecb31594-491d-4fa4-b216-e198ab3d5ca2"), version=1)
+    await item_repo.upsert_items([item4, item3, item2, item1])
+    criteria = ItemFilterCriteria(last_version=2, provider="youtube")
+
+    first_page = await item_repo.find_item_ids(criteria=criteria, after_id=None, limit=2)
+    # Deleting an item already returned does not shift the next page
+    await item_repo.delete_item(item1.uuid)
+    second_page = await item_repo.find_item_ids(criteria=criteria, after_id=first_page[-1], limit=2)
+    last_page = await item_repo.find_item_ids(criteria=criteria, after_id=second_page[-1], limit=2)
+
+    assert first_page == [item1.uuid, item2.uuid]
+    assert second_page == [item4.uuid]
+    assert last_page == []
+    assert await item_repo.count_matching_items(criteria) == 2
+
+
 @pytest.mark.asyncio()
 async def test_find_items_with_every_interaction(
         item_repo: ItemRepository,
@@ -1024,6 +1143,93 @@ async def test_filter_with_both_min_and_max_duration_excludes_none_duration_item
     assert {item4} == set(found_items)
 
 
+@pytest.mark.asyncio()
+async def test_find_items_of_many_subscriptions_merges_them_by_publication_date(item_repo: ItemRepository) -> None:
+    subscription_ids = [uuid4() for _ in range(60)]
+    user_uuid = uuid4()
+    base_date = datetime(2019, 1, 1, tzinfo=timezone.utc)
+    items = [
+        mock_item(sub_uuid=subscription_id, published_at=base_date + timedelta(minutes=index * 3 + offset))
+        for index, subscription_id in enumerate(subscription_ids)
+        for offset in range(3)
+    ]
+    await item_repo.upsert_items(items)
+    deleted_item = items[-1]
+    await item_repo.delete_item(deleted_item.uuid)
+    viewed_item = items[-2]
+    await item_repo.add_interaction(Interaction.new(
+        uuid=uuid4(), item_uuid=viewed_item.uuid, user_uuid=user_uuid, interaction_type=InteractionType.VIEWED))
+
+    criteria = ItemFilterCriteria(
+        subscription_ids=subscription_ids,
+        interactions_from_user=user_uuid,
+        interactions=AnyItemInteraction(without_interactions=True))
+    first_page = await item_repo.find_items(criteria=criteria, page_number=0, limit=20)
+    second_page = await item_repo.find_items(criteria=criteria, page_number=1, limit=20)
+
+    expected_items = sorted(
+        [item for item in items if item not in (deleted_item, viewed_item)],
+        key=lambda item: item.published_at, reverse=True)
+    assert [item.uuid for item in first_page] == [item.uuid for item in expected_items[:20]]
+    assert [item.uuid for item in second_page] == [item.uuid for item in expected_items[20:40]]
+
+
+@pytest.mark.asyncio()
+async def test_find_items_after_changing_the_indexed_fields_of_an_item(item_repo: ItemRepository) -> None:
+    old_subscription_id, new_subscription_id = uuid4(), uuid4()
+    base_date = datetime(2018, 1, 1, tzinfo=timezone.utc)
+    items = [mock_item(sub_uuid=old_subscription_id, published_at=base_date + timedelta(days=index), version=1,
+                       provider="spotify")
+             for index in range(5)]
+    await item_repo.upsert_items(items)
+    changed_item = replace(
+        items[0],
+        subscription_uuid=new_subscription_id,
+        published_at=base_date + timedelta(days=10),
+        url=utils.parse_url(f"https://changed-{items[0].uuid}.com"),
+        version=2)
+
+    await item_repo.upsert_items([changed_item])
+
+    old_subscription_items = await item_repo.find_items(
+        ItemFilterCriteria(subscription_ids=[old_subscription_id]), page_number=0, limit=10)
+    assert [item.uuid for item in old_subscription_items] == [item.uuid for item in reversed(items[1:])]
+    both_subscriptions_items = await item_repo.find_items(
+        ItemFilterCriteria(subscription_ids=[old_subscription_id, new_subscription_id],
+                           published_after=base_date + timedelta(days=2)), page_number=0, limit=2)
+    assert [item.uuid for item in both_subscriptions_items] == [changed_item.uuid, items[4].uuid]
+    assert await item_repo.find_items(ItemFilterCriteria(url=items[0].url), page_number=0, limit=10) == []
+    assert await item_repo.find_items(
+        ItemFilterCriteria(url=changed_item.url), page_number=0, limit=10) == [changed_item]
+    outdated_items = await item_repo.find_items(
+        ItemFilterCriteria(subscription_ids=[old_subscription_id, new_subscription_id], provider="spotify",
+                           last_version=2), page_number=0, limit=10)
+    assert changed_item.uuid not in {item.uuid for item in outdated_items}
+    assert len(outdated_items) == 4
+
+
+@pytest.mark.asyncio()
+async def test_find_items_without_interactions_after_deleting_an_interaction(item_repo: ItemRepository) -> None:
+    subscription_id = uuid4()
+    user_uuid = uuid4()
+    items = [mock_item(sub_uuid=subscription_id) for _ in range(3)]
+    await item_repo.upsert_items(items)
+    interaction = Interaction.new(
+        uuid=uuid4(), item_uuid=items[0].uuid, user_uuid=user_uuid, interaction_type=InteractionType.HIDDEN)
+    await item_repo.add_interaction(interaction)
+    criteria = ItemFilterCriteria(
+        subscription_ids=[subscription_id],
+        interactions_from_user=user_uuid,
+        interactions=AnyItemInteraction(without_interactions=True))
+    assert items[0].uuid not in {item.uuid for item in await item_repo.find_items(criteria, 0, 10)}
+
+    await item_repo.delete_interaction(interaction.uuid)
+
+    assert items[0].uuid in {item.uuid for item in await item_repo.find_items(criteria, 0, 10)}
+    interactions = await item_repo.get_user_interactions_by_item_id(user_uuid, [items[0].uuid])
+    assert interactions == {items[0].uuid: []}
+
+
 @pytest.mark.asyncio()
 async def test_find_items_updated_before_a_date(item_repo: ItemRepository) -> None:
     await item_repo.delete_all_items()
@@ -0,0 +1,87 @@
+from ipaddress import IPv4Address
+from typing import Any
+
+import psycopg
+import pytest
+
+from linkurator_core.domain.common.lock_service import LockService
+from linkurator_core.infrastructure.in_memory.lock_service import InMemoryLockService
+from linkurator_core.infrastructure.postgres.lock_service import PostgresLockService
+
+
+@pytest.fixture(name="lock_service", params=["in_memory", "postgresql"])
+def fixture_lock_service(db_name: str, request: Any) -> LockService:
+    if request.param == "postgresql":
+        return PostgresLockService(IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop")
+    return InMemoryLockService()
+
+
+@pytest.mark.asyncio()
+async def test_a_held_lock_cannot_be_acquired_again(lock_service: LockService) -> None:
+    assert await lock_service.try_acquire("lock-a")
+    assert await lock_service.is_held("lock-a")
+    assert not await lock_service.try_acquire("lock-a")
+    assert await lock_service.try_acquire("lock-b")
+
+    await lock_service.release("lock-a")
+    await lock_service.release("lock-b")
+
+
+@pytest.mark.asyncio()
+async def test_a_released_lock_can_be_acquired_again(lock_service: LockService) -> None:
+    assert await lock_service.try_acquire("lock-c")
+    await lock_service.release("lock-c")
+
+    assert not await lock_service.is_held("lock-c")
+    assert await lock_service.try_acquire("lock-c")
+    await lock_service.release("lock-c")
+
+
+@pytest.mark.asyncio()
+async def test_postgres_locks_are_shared_between_processes(db_name: str) -> None:
+    first_process = PostgresLockService(IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop")
+    second_process = PostgresLockService(IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop")
+
+    assert await first_process.try_acquire("shared-lock")
+    assert not await second_process.try_acquire("shared-lock")
+    assert not await second_process.is_held("shared-lock")
+
+    await first_process.close()
+
+    assert await second_process.try_acquire("shared-lock")
+    await second_process.close()
+
+
+@pytest.mark.asyncio()
+async def test_a_postgres_lock_is_lost_with_its_connection(db_name: str) -> None:
+    first_process = PostgresLockService(IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop")
+    second_process = PostgresLockService(IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop")
+    assert await first_process.try_acquire("dropped-lock")
+
+    async with await psycopg.AsyncConnection.connect(
+            host="127.0.0.1", port=5432, dbname=db_name, user="develop", password="develop", autocommit=True,
+    ) as admin:
+        await admin.execute(
+            "SELECT pg_terminate_backend(pid) FROM pg_locks WHERE locktype = 'advisory' AND pid <> pg_backend_pid()")
+
+    assert not await first_process.is_held("dropped-lock")
+    await first_process.release("dropped-lock")
+    assert await second_process.try_acquire("dropped-lock")
+
+    await first_process.close()
+    await second_process.close()
+
+
+@pytest.mark.asyncio()
+async def test_postgres_locks_are_keyed_by_the_64_bits_hash_of_the_name(db_name: str) -> None:
+    lock_service = PostgresLockService(IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop")
+    assert await lock_service.try_acquire("hashed-lock")
+
+    async with await psycopg.AsyncConnection.connect(
+            host="127.0.0.1", port=5432, dbname=db_name, user="develop", password="develop", autocommit=True,
+    ) as other_connection:
+        cursor = await other_connection.execute(
+            "SELECT pg_try_advisory_lock(hashtextextended(%s, 0))", ("hashed-lock",))
+        assert await cursor.fetchone() == (False,)
+
+    await lock_service.close()
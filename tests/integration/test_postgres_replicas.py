@@ -0,0 +1,105 @@
+import time
+from ipaddress import IPv4Address
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from linkurator_core.infrastructure.fastapi.read_your_writes import PRIMARY_READS_COOKIE_NAME, ReadYourWritesMiddleware
+from linkurator_core.infrastructure.postgres.common import (
+    PRIMARY_APPLICATION_NAME,
+    REPLICA_APPLICATION_NAME,
+    PostgresConnector,
+    PostgresReplica,
+    reading_from_primary,
+    reads_from_primary,
+)
+
+# The replicas are connections to the same server, told apart by their application name
+LOCAL_REPLICA = PostgresReplica(IPv4Address("127.0.0.1"), 5432)
+UNREACHABLE_REPLICA = PostgresReplica(IPv4Address("127.0.0.1"), 1)
+APPLICATION_NAME_QUERY = "SELECT current_setting('application_name')"
+
+
+def connector(db_name: str, *replicas: PostgresReplica) -> PostgresConnector:
+    return PostgresConnector(IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop", replicas)
+
+
+@pytest.mark.asyncio()
+async def test_reads_go_to_the_replicas(db_name: str) -> None:
+    pool = await connector(db_name, LOCAL_REPLICA).read_pool()
+
+    assert await pool.fetchval(APPLICATION_NAME_QUERY) == REPLICA_APPLICATION_NAME
+
+
+@pytest.mark.asyncio()
+async def test_reads_go_to_the_primary_without_replicas(db_name: str) -> None:
+    pool = await connector(db_name).read_pool()
+
+    assert await pool.fetchval(APPLICATION_NAME_QUERY) == PRIMARY_APPLICATION_NAME
+
+
+@pytest.mark.asyncio()
+async def test_reads_pinned_to_the_primary_skip_the_replicas(db_name: str) -> None:
+    db_connector = connector(db_name, LOCAL_REPLICA)
+
+    with reads_from_primary():
+        pool = await db_connector.read_pool()
+
+    assert await pool.fetchval(APPLICATION_NAME_QUERY) == PRIMARY_APPLICATION_NAME
+
+
+@pytest.mark.asyncio()
+async def test_reads_go_to_the_primary_when_the_replica_is_unreachable(db_name: str) -> None:
+    db_connector = connector(db_name, UNREACHABLE_REPLICA)
+
+    pool = await db_connector.read_pool()
+    start = time.monotonic()
+    pool = await db_connector.read_pool()
+
+    assert await pool.fetchval(APPLICATION_NAME_QUERY) == PRIMARY_APPLICATION_NAME
+    assert time.monotonic() - start < 0.5
+
+
+@pytest.mark.asyncio()
+async def test_queries_failing_on_a_replica_run_on_the_primary(db_name: str) -> None:
+    db_connector = connector(db_name, LOCAL_REPLICA)
+    replica_pool = await db_connector.read_pool()
+    assert await replica_pool.fetchval(APPLICATION_NAME_QUERY) == REPLICA_APPLICATION_NAME
+
+    primary_pool = await db_connector.pool()
+    await primary_pool.execute(
+        "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+        "WHERE application_name = %s AND datname = current_database()",
+        REPLICA_APPLICATION_NAME,
+    )
+
+    assert await replica_pool.fetchval(APPLICATION_NAME_QUERY) == PRIMARY_APPLICATION_NAME
+    pool = await db_connector.read_pool()
+    assert await pool.fetchval(APPLICATION_NAME_QUERY) == PRIMARY_APPLICATION_NAME
+
+
+def test_reads_go_to_the_primary_for_a_while_after_a_client_writes() -> None:
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, window_seconds=5)
+
+    @app.get("/reads")
+    async def reads() -> bool:
+        return reading_from_primary()
+
+    @app.post("/writes")
+    async def writes() -> bool:
+        return reading_from_primary()
+
+    client = TestClient(app)
+    other_client = TestClient(app)
+
+    assert client.get("/reads").json() is False
+    response = client.post("/writes")
+    assert response.json() is True
+    assert PRIMARY_READS_COOKIE_NAME in response.cookies
+    assert client.get("/reads").json() is True
+    assert other_client.get("/reads").json() is False
+
+    client.cookies.set(PRIMARY_READS_COOKIE_NAME, str(time.time() - 1))
+    assert client.get("/reads").json() is False
@@ -0,0 +1,35 @@
+from ipaddress import IPv4Address
+from typing import Any
+
+import pytest
+
+from linkurator_core.benchmarks.processor_benchmark import (
+    FakeProviderServer,
+    FakeProviderShape,
+    run_processor_benchmark,
+)
+
+
+@pytest.mark.asyncio()
+async def test_processor_benchmark_imports_the_items_of_the_fake_providers(db_name: str) -> None:
+    connection: dict[str, Any] = {"ip": IPv4Address("127.0.0.1"), "port": 5432, "db_name": db_name,
+                                  "username": "develop", "password": "develop"}
+    shape = FakeProviderShape(items_per_feed=60, new_items_per_round=2, latency_ms=1)
+    server = FakeProviderServer(shape)
+
+    async with server.running():
+        subscriptions = [server.youtube_subscription(index) for index in range(3)] + [
+            server.rss_subscription(index) for index in range(2)]
+        report = await run_processor_benchmark(connection, server, subscriptions, rounds=3, trace_memory=True)
+
+    first_round, *next_rounds = report.rounds
+    assert first_round.refreshes == 5
+    assert first_round.items == 5 * shape.items_per_feed
+    assert [round_report.items for round_report in next_rounds] == [5 * shape.new_items_per_round] * 2
+    # The YouTube playlist has more items than a page
+    assert server.requests["youtube_playlist_items"] >= 3 * 2
+    assert all(round_report.queries_per_refresh > 0 for round_report in report.rounds)
+    assert first_round.refreshes_per_minute > 0
+    assert report.peak_traced_bytes is not None
+    assert report.peak_traced_bytes > 0
+    assert "refreshes/min" in report.as_text()
@@ -0,0 +1,98 @@
+import asyncio
+from ipaddress import IPv4Address
+
+import pytest
+
+from linkurator_core.infrastructure.postgres.common import PostgresConnector
+from linkurator_core.infrastructure.postgres.query_statistics import (
+    MAX_STATEMENTS,
+    OTHER_STATEMENTS,
+    QueryStatistics,
+    query_statistics,
+)
+
+
+@pytest.fixture(name="statistics")
+def fixture_statistics() -> QueryStatistics:
+    query_statistics.reset()
+    query_statistics.configure(slow_query_ms=500, explain_rate=0.1, trace_queries=False)
+    return query_statistics
+
+
+@pytest.mark.asyncio()
+async def test_queries_are_recorded_by_statement(db_name: str, statistics: QueryStatistics) -> None:
+    pool = await PostgresConnector(IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop").pool()
+
+    for value in range(3):
+        await pool.fetch("SELECT  generate_series(1, %s)", value + 1)
+
+    statement = next(statement for statement in statistics.statements()
+                     if statement.template == "SELECT generate_series(1, %s)")
+    assert statement.calls == 3
+    assert statement.rows == 6
+    assert statement.total_ms > 0
+    assert statement.pool_wait_ms >= 0
+    assert statement.slow_calls == 0
+    assert statement.plan is None
+    assert 0 < statement.percentile_ms(0.5) <= statement.percentile_ms(0.99)
+
+
+@pytest.mark.asyncio()
+async def test_the_plan_of_slow_reads_is_captured(db_name: str, statistics: QueryStatistics) -> None:
+    statistics.configure(slow_query_ms=0, explain_rate=1, trace_queries=False)
+    pool = await PostgresConnector(IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop").pool()
+
+    await pool.fetchval("SELECT count(*) FROM generate_series(1, %s)", 10)
+
+    for _ in range(50):
+        statement = next(statement for statement in statistics.statements()
+                         if statement.template == "SELECT count(*) FROM generate_series(1, %s)")
+        if statement.plan is not None:
+            break
+        await asyncio.sleep(0.05)
+    assert statement.slow_calls == 1
+    assert statement.plan is not None
+    assert "Function Scan on generate_series" in statement.plan
+    assert "actual time" in statement.plan
+    assert statement.plan_captured_at is not None
+
+
+@pytest.mark.asyncio()
+async def test_writes_are_not_explained(db_name: str, statistics: QueryStatistics) -> None:
+    statistics.configure(slow_query_ms=0, explain_rate=1, trace_queries=False)
+    pool = await PostgresConnector(IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop").pool()
+
+    await pool.execute("CREATE TEMPORARY TABLE explained (id INT)")
+    await asyncio.sleep(0.1)
+
+    statement = next(statement for statement in statistics.statements()
+                     if statement.template == "CREATE TEMPORARY TABLE explained (id INT)")
+    assert statement.slow_calls == 1
+    assert statement.plan is None
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("query", [
+    "SELECT uuid FROM users LIMIT 1 FOR UPDATE",
+    "SELECT uuid FROM users LIMIT 1 FOR NO KEY UPDATE SKIP LOCKED",
+    "SELECT uuid FROM users LIMIT 1 FOR SHARE",
+])
+async def test_locking_reads_are_not_explained(db_name: str, statistics: QueryStatistics, query: str) -> None:
+    statistics.configure(slow_query_ms=0, explain_rate=1, trace_queries=False)
+    pool = await PostgresConnector(IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop").pool()
+
+    await pool.fetch(query)
+    await asyncio.sleep(0.1)
+
+    statement = next(statement for statement in statistics.statements() if statement.template == query)
+    assert statement.slow_calls == 1
+    assert statement.plan is None
+
+
+def test_statements_over_the_limit_are_grouped(statistics: QueryStatistics) -> None:
+    for value in range(MAX_STATEMENTS + 10):
+        statistics.record(f"SELECT {value}", duration_ms=1, rows=1, pool_wait_ms=0)
+
+    statements = statistics.statements()
+    assert len(statements) == MAX_STATEMENTS + 1
+    assert next(statement for statement in statements if statement.template == OTHER_STATEMENTS).calls == 10
@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock
 
+import aio_pika
 import pytest
 
 from linkurator_core.domain.common.event import SubscriptionItemsBecameOutdatedEvent
@@ -31,3 +32,20 @@ async def test_publish_and_subscribe() -> None:
 
     condition_was_met_in_time = results[1][2]
     assert condition_was_met_in_time
+
+
+@pytest.mark.asyncio()
+async def test_pending_events_counts_the_messages_waiting_in_the_queue() -> None:
+    queue_name = f"pending_events_{uuid.uuid4()}"
+    event_bus = RabbitMQEventBus(host="localhost", port=5672, username="develop", password="develop",
+                                 queue_name=queue_name)
+    assert await event_bus.pending_events() == 0
+
+    connection = await aio_pika.connect_robust(event_bus.url)
+    async with connection:
+        channel = await connection.channel()
+        await channel.declare_queue(queue_name, auto_delete=True)
+        for _ in range(2):
+            await event_bus.publish(SubscriptionItemsBecameOutdatedEvent.new(subscription_id=uuid.uuid4()))
+
+        assert await event_bus.pending_events() == 2
@@ -2,20 +2,21 @@ import uuid
 from datetime import datetime, timedelta, timezone
 from ipaddress import IPv4Address
 from math import floor
+from typing import Any
 
 import pytest
 
 from linkurator_core.domain.users.session import Session
-from linkurator_core.domain.users.session_repository import SessionRepository
-from linkurator_core.infrastructure.postgres.session_repository import (
-    PostgresSessionRepository,
-    TokenAlreadyExists,
-)
+from linkurator_core.domain.users.session_repository import SessionRepository, TokenAlreadyExists
+from linkurator_core.infrastructure.in_memory.session_repository import InMemorySessionRepository
+from linkurator_core.infrastructure.postgres.session_repository import PostgresSessionRepository
 
 
-@pytest.fixture(name="session_repo", scope="session")
-def fixture_session_repo(db_name: str) -> SessionRepository:
-    return PostgresSessionRepository(IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop")
+@pytest.fixture(name="session_repo", scope="session", params=["in_memory", "postgresql"])
+def fixture_session_repo(db_name: str, request: Any) -> SessionRepository:
+    if request.param == "postgresql":
+        return PostgresSessionRepository(IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop")
+    return InMemorySessionRepository()
 
 
 @pytest.mark.asyncio()
@@ -266,6 +266,27 @@ async def test_find_subscriptions_by_name(subscription_repo: SubscriptionReposit
     assert len(found_subscriptions) == 0
 
 
+@pytest.mark.asyncio()
+async def test_search_subscriptions_by_name(subscription_repo: SubscriptionRepository) -> None:
+    sub1 = mock_sub(name="Superfútbol")
+    sub2 = mock_sub(name="Futbolistas")
+    sub3 = mock_sub(name="Fútbol y más")
+
+    await subscription_repo.delete_all()
+    await subscription_repo.add(sub1)
+    await subscription_repo.add(sub2)
+    await subscription_repo.add(sub3)
+
+    found_subscriptions = await subscription_repo.search_by_name("futbol", limit=2)
+    assert [sub.uuid for sub in found_subscriptions] == [sub3.uuid, sub2.uuid]
+
+    found_subscriptions = await subscription_repo.search_by_name("fú", limit=10)
+    assert {sub.uuid for sub in found_subscriptions} == {sub2.uuid, sub3.uuid}
+
+    found_subscriptions = await subscription_repo.search_by_name("baloncesto", limit=10)
+    assert found_subscriptions == []
+
+
 @pytest.mark.asyncio()
 async def test_find_subscriptions_by_name_filtered_by_provider(subscription_repo: SubscriptionRepository) -> None:
     sub1 = mock_sub(name="Leyendas y videojuegos", provider="youtube")
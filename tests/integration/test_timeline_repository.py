@@ -0,0 +1,177 @@
+from datetime import datetime, timedelta, timezone
+from ipaddress import IPv4Address
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from linkurator_core.domain.common.mock_factory import mock_interaction, mock_item
+from linkurator_core.domain.items.interaction import InteractionType
+from linkurator_core.domain.items.item_repository import AnyItemInteraction, ItemFilterCriteria, ItemRepository
+from linkurator_core.domain.items.timeline_repository import Timeline, TimelineCursor, TimelineRepository
+from linkurator_core.infrastructure.in_memory.item_repository import InMemoryItemRepository
+from linkurator_core.infrastructure.in_memory.timeline_repository import InMemoryTimelineRepository
+from linkurator_core.infrastructure.postgres.item_repository import PostgresItemRepository
+from linkurator_core.infrastructure.postgres.timeline_repository import PostgresTimelineRepository
+
+
+@pytest.fixture(name="repos", scope="session", params=["in_memory", "postgresql"])
+def fixture_repos(db_name: str, request: Any) -> tuple[ItemRepository, TimelineRepository]:
+    if request.param == "postgresql":
+        return (PostgresItemRepository(IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop"),
+                PostgresTimelineRepository(IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop"))
+    item_repo = InMemoryItemRepository()
+    return item_repo, InMemoryTimelineRepository(item_repo)
+
+
+def days_ago(days: int) -> datetime:
+    return datetime.now(tz=timezone.utc) - timedelta(days=days)
+
+
+@pytest.mark.asyncio()
+async def test_save_and_get_timeline(repos: tuple[ItemRepository, TimelineRepository]) -> None:
+    _, timeline_repo = repos
+    timeline = Timeline(user_id=uuid4(), subscription_ids={uuid4(), uuid4()}, complete_since=days_ago(10))
+
+    await timeline_repo.save(timeline)
+    assert await timeline_repo.get(timeline.user_id) == timeline
+
+    timeline.subscription_ids = {uuid4()}
+    timeline.pending_subscription_ids = {uuid4()}
+    await timeline_repo.save(timeline)
+    assert await timeline_repo.get(timeline.user_id) == timeline
+
+
+@pytest.mark.asyncio()
+async def test_get_timeline_that_does_not_exist(repos: tuple[ItemRepository, TimelineRepository]) -> None:
+    _, timeline_repo = repos
+
+    assert await timeline_repo.get(uuid4()) is None
+
+
+@pytest.mark.asyncio()
+async def test_add_subscription_items_since_the_timeline_is_complete(
+        repos: tuple[ItemRepository, TimelineRepository],
+) -> None:
+    item_repo, timeline_repo = repos
+    sub_id = uuid4()
+    old_item = mock_item(sub_uuid=sub_id, published_at=days_ago(20))
+    item1 = mock_item(sub_uuid=sub_id, published_at=days_ago(5))
+    item2 = mock_item(sub_uuid=sub_id, published_at=days_ago(2))
+    deleted_item = mock_item(sub_uuid=sub_id, published_at=days_ago(3))
+    other_item = mock_item(published_at=days_ago(1))
+    await item_repo.upsert_items([old_item, item1, item2, deleted_item, other_item])
+    await item_repo.delete_item(deleted_item.uuid)
+
+    timeline = Timeline(user_id=uuid4(), subscription_ids={sub_id}, complete_since=days_ago(10))
+    await timeline_repo.save(timeline)
+    await timeline_repo.add_subscription_items(timeline.user_id, {sub_id}, timeline.complete_since)
+
+    items = await timeline_repo.find_items(timeline.user_id, ItemFilterCriteria(), limit=10)
+    assert [item.uuid for item in items] == [item2.uuid, item1.uuid]
+
+
+@pytest.mark.asyncio()
+async def test_remove_subscription_items(repos: tuple[ItemRepository, TimelineRepository]) -> None:
+    item_repo, timeline_repo = repos
+    sub1_id = uuid4()
+    sub2_id = uuid4()
+    item1 = mock_item(sub_uuid=sub1_id, published_at=days_ago(2))
+    item2 = mock_item(sub_uuid=sub2_id, published_at=days_ago(1))
+    await item_repo.upsert_items([item1, item2])
+
+    timeline = Timeline(user_id=uuid4(), subscription_ids={sub1_id, sub2_id}, complete_since=days_ago(10))
+    await timeline_repo.save(timeline)
+    await timeline_repo.add_subscription_items(timeline.user_id, {sub1_id, sub2_id}, timeline.complete_since)
+    await timeline_repo.remove_subscription_items(timeline.user_id, {sub2_id})
+
+    items = await timeline_repo.find_items(timeline.user_id, ItemFilterCriteria(), limit=10)
+    assert [item.uuid for item in items] == [item1.uuid]
+
+
+@pytest.mark.asyncio()
+async def test_add_items_to_the_timelines_following_their_subscription(
+        repos: tuple[ItemRepository, TimelineRepository],
+) -> None:
+    item_repo, timeline_repo = repos
+    sub_id = uuid4()
+    follower = Timeline(user_id=uuid4(), subscription_ids={sub_id, uuid4()}, complete_since=days_ago(10))
+    late_follower = Timeline(user_id=uuid4(), subscription_ids={sub_id}, complete_since=days_ago(1))
+    other_user = Timeline(user_id=uuid4(), subscription_ids={uuid4()}, complete_since=days_ago(10))
+    for timeline in [follower, late_follower, other_user]:
+        await timeline_repo.save(timeline)
+
+    item = mock_item(sub_uuid=sub_id, published_at=days_ago(3))
+    await item_repo.upsert_items([item])
+    await timeline_repo.add_items([item])
+    await timeline_repo.add_items([item])
+
+    follower_items = await timeline_repo.find_items(follower.user_id, ItemFilterCriteria(), limit=10)
+    assert [i.uuid for i in follower_items] == [item.uuid]
+    assert await timeline_repo.find_items(late_follower.user_id, ItemFilterCriteria(), limit=10) == []
+    assert await timeline_repo.find_items(other_user.user_id, ItemFilterCriteria(), limit=10) == []
+
+
+@pytest.mark.asyncio()
+async def test_find_timeline_items_matching_the_criteria(repos: tuple[ItemRepository, TimelineRepository]) -> None:
+    item_repo, timeline_repo = repos
+    sub_id = uuid4()
+    user_id = uuid4()
+    short_item = mock_item(sub_uuid=sub_id, published_at=days_ago(4), duration=10)
+    long_items = [mock_item(sub_uuid=sub_id, published_at=days_ago(3 - i), duration=1000) for i in range(3)]
+    hidden_item = mock_item(sub_uuid=sub_id, published_at=days_ago(1), duration=1000)
+    await item_repo.upsert_items([short_item, *long_items, hidden_item])
+    await item_repo.add_interaction(
+        mock_interaction(item_id=hidden_item.uuid, user_id=user_id, interaction_type=InteractionType.HIDDEN))
+
+    await timeline_repo.save(Timeline(user_id=user_id, subscription_ids={sub_id}, complete_since=days_ago(10)))
+    await timeline_repo.add_subscription_items(user_id, {sub_id}, days_ago(10))
+
+    criteria = ItemFilterCriteria(
+        min_duration=100,
+        interactions_from_user=user_id,
+        interactions=AnyItemInteraction(
+            without_interactions=True, recommended=True, discouraged=True, viewed=True, hidden=False))
+    first_page = await timeline_repo.find_items(user_id, criteria, limit=2)
+    second_page = await timeline_repo.find_items(user_id, criteria, limit=2, after=TimelineCursor.of(first_page[-1]))
+
+    assert [item.uuid for item in first_page] == [long_items[2].uuid, long_items[1].uuid]
+    assert [item.uuid for item in second_page] == [long_items[0].uuid]
+
+
+@pytest.mark.asyncio()
+async def test_find_timeline_items_after_items_published_at_the_same_time(
+        repos: tuple[ItemRepository, TimelineRepository],
+) -> None:
+    item_repo, timeline_repo = repos
+    sub_id = uuid4()
+    user_id = uuid4()
+    published_at = days_ago(1)
+    items = [mock_item(sub_uuid=sub_id, published_at=published_at) for _ in range(5)]
+    await item_repo.upsert_items(items)
+    await timeline_repo.save(Timeline(user_id=user_id, subscription_ids={sub_id}, complete_since=days_ago(10)))
+    await timeline_repo.add_subscription_items(user_id, {sub_id}, days_ago(10))
+
+    pages = [await timeline_repo.find_items(user_id, ItemFilterCriteria(), limit=2)]
+    while len(pages[-1]) == 2:
+        pages.append(await timeline_repo.find_items(
+            user_id, ItemFilterCriteria(), limit=2, after=TimelineCursor.of(pages[-1][-1])))
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [item.uuid for page in pages for item in page] == sorted((item.uuid for item in items), reverse=True)
+
+
+@pytest.mark.asyncio()
+async def test_delete_timeline(repos: tuple[ItemRepository, TimelineRepository]) -> None:
+    item_repo, timeline_repo = repos
+    sub_id = uuid4()
+    item = mock_item(sub_uuid=sub_id, published_at=days_ago(1))
+    await item_repo.upsert_items([item])
+    timeline = Timeline(user_id=uuid4(), subscription_ids={sub_id}, complete_since=days_ago(10))
+    await timeline_repo.save(timeline)
+    await timeline_repo.add_items([item])
+
+    await timeline_repo.delete(timeline.user_id)
+
+    assert await timeline_repo.get(timeline.user_id) is None
+    assert await timeline_repo.find_items(timeline.user_id, ItemFilterCriteria(), limit=10) == []
@@ -182,3 +182,24 @@ async def test_find_topics_by_name(topic_repo: TopicRepository) -> None:
 
     found_topics = await topic_repo.find_topics_by_name("baloncesto")
     assert len(found_topics) == 0
+
+
+@pytest.mark.asyncio()
+async def test_search_topics_by_name(topic_repo: TopicRepository) -> None:
+    topic1 = mock_topic(name="Superfútbol")
+    topic2 = mock_topic(name="Futbolistas")
+    topic3 = mock_topic(name="Fútbol y más")
+
+    await topic_repo.delete_all()
+    await topic_repo.add(topic1)
+    await topic_repo.add(topic2)
+    await topic_repo.add(topic3)
+
+    found_topics = await topic_repo.search_topics_by_name("futbol", limit=2)
+    assert [topic.uuid for topic in found_topics] == [topic3.uuid, topic2.uuid]
+
+    found_topics = await topic_repo.search_topics_by_name("fú", limit=10)
+    assert {topic.uuid for topic in found_topics} == {topic2.uuid, topic3.uuid}
+
+    found_topics = await topic_repo.search_topics_by_name("baloncesto", limit=10)
+    assert found_topics == []
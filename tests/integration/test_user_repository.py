@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 from datetime import datetime, timedelta, timezone
 from ipaddress import IPv4Address
@@ -10,8 +11,9 @@ from linkurator_core.domain.common import utils
 from linkurator_core.domain.common.exceptions import UsernameAlreadyInUseError
 from linkurator_core.domain.common.mock_factory import mock_user
 from linkurator_core.domain.users.user import User, Username
-from linkurator_core.domain.users.user_repository import EmailAlreadyInUse, UserRepository
+from linkurator_core.domain.users.user_repository import EmailAlreadyInUse, FollowKind, UserRepository
 from linkurator_core.infrastructure.in_memory.user_repository import InMemoryUserRepository
+from linkurator_core.infrastructure.postgres.common import PostgresConnector
 from linkurator_core.infrastructure.postgres.user_repository import PostgresUserRepository
 
 
@@ -466,7 +468,7 @@ async def test_search_by_username_partial_match(user_repo: UserRepository) -> No
     await user_repo.add(johnny_walker)
     await user_repo.add(bob_jones)
 
-    result = await user_repo.search_by_username("john")
+    result = await user_repo.search_by_username("john", limit=20)
 
     assert len(result) == 2
     result_uuids = {user.uuid for user in result}
@@ -486,7 +488,7 @@ async def test_search_by_username_case_insensitive(user_repo: UserRepository) ->
     await user_repo.add(john_doe)
     await user_repo.add(jane_smith)
 
-    result = await user_repo.search_by_username("JOHN")
+    result = await user_repo.search_by_username("JOHN", limit=20)
 
     assert len(result) == 1
     result_uuids = {user.uuid for user in result}
@@ -506,7 +508,7 @@ async def test_search_by_username_middle_match(user_repo: UserRepository) -> Non
     await user_repo.add(user2)
     await user_repo.add(user3)
 
-    result = await user_repo.search_by_username("bob")
+    result = await user_repo.search_by_username("bob", limit=20)
 
     assert len(result) == 2
     result_uuids = {user.uuid for user in result}
@@ -525,7 +527,7 @@ async def test_search_by_username_no_matches(user_repo: UserRepository) -> None:
     await user_repo.add(john_doe)
     await user_repo.add(jane_smith)
 
-    result = await user_repo.search_by_username("xyz")
+    result = await user_repo.search_by_username("xyz", limit=20)
 
     assert len(result) == 0
 
@@ -540,7 +542,7 @@ async def test_search_by_username_empty_string(user_repo: UserRepository) -> Non
     await user_repo.add(john_doe)
     await user_repo.add(jane_smith)
 
-    result = await user_repo.search_by_username("")
+    result = await user_repo.search_by_username("", limit=20)
 
     assert len(result) == 2
     result_uuids = {user.uuid for user in result}
@@ -558,7 +560,7 @@ async def test_search_by_username_exact_match(user_repo: UserRepository) -> None
     await user_repo.add(john_doe)
     await user_repo.add(jane_smith)
 
-    result = await user_repo.search_by_username("john_doe")
+    result = await user_repo.search_by_username("john_doe", limit=20)
 
     assert len(result) == 1
     result_uuids = {user.uuid for user in result}
@@ -578,10 +580,258 @@ async def test_search_by_username_special_characters(user_repo: UserRepository)
     await user_repo.add(user2)
     await user_repo.add(user3)
 
-    result = await user_repo.search_by_username("with")
+    result = await user_repo.search_by_username("with", limit=20)
 
     assert len(result) == 2
     result_uuids = {user.uuid for user in result}
     assert user1.uuid in result_uuids
     assert user2.uuid in result_uuids
     assert user3.uuid not in result_uuids
+
+
+@pytest.mark.asyncio()
+async def test_search_by_username_returns_the_most_similar_first(user_repo: UserRepository) -> None:
+    await user_repo.delete_all()
+
+    john_doe = mock_user(username=Username("john_doe"))
+    johnny_walker = mock_user(username=Username("johnny_walker"))
+    big_johnson = mock_user(username=Username("bigjohnson"))
+
+    await user_repo.add(big_johnson)
+    await user_repo.add(johnny_walker)
+    await user_repo.add(john_doe)
+
+    result = await user_repo.search_by_username("john", limit=2)
+
+    assert [user.uuid for user in result] == [john_doe.uuid, johnny_walker.uuid]
+
+
+@pytest.mark.asyncio()
+async def test_search_by_username_with_few_characters_matches_the_beginning(user_repo: UserRepository) -> None:
+    await user_repo.delete_all()
+
+    john_doe = mock_user(username=Username("john_doe"))
+    big_john = mock_user(username=Username("big_john"))
+
+    await user_repo.add(john_doe)
+    await user_repo.add(big_john)
+
+    result = await user_repo.search_by_username("jo", limit=20)
+
+    assert [user.uuid for user in result] == [john_doe.uuid]
+
+
+@pytest.mark.asyncio()
+async def test_search_by_username_substring_with_few_characters_matches_anywhere(user_repo: UserRepository) -> None:
+    await user_repo.delete_all()
+
+    john_doe = mock_user(username=Username("john_doe"))
+    big_john = mock_user(username=Username("big_john"))
+    jane_smith = mock_user(username=Username("jane_smith"))
+
+    await user_repo.add(john_doe)
+    await user_repo.add(big_john)
+    await user_repo.add(jane_smith)
+
+    result = await user_repo.search_by_username("jo", limit=20, substring=True)
+
+    assert {user.uuid for user in result} == {john_doe.uuid, big_john.uuid}
+
+
+@pytest.mark.asyncio()
+async def test_touch_last_login_only_changes_the_last_login(user_repo: UserRepository) -> None:
+    user = mock_user()
+    await user_repo.add(user)
+    edited_user = mock_user(uuid=user.uuid, email=user.email, username=user.username)
+    edited_user.first_name = "edited"
+    await user_repo.update(edited_user)
+
+    last_login_at = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    await user_repo.touch_last_login(user.uuid, last_login_at)
+
+    the_user = await user_repo.get(user.uuid)
+    assert the_user is not None
+    assert the_user.last_login_at == last_login_at
+    assert the_user.first_name == "edited"
+
+
+@pytest.mark.asyncio()
+async def test_set_scanned_at(user_repo: UserRepository) -> None:
+    user = mock_user()
+    await user_repo.add(user)
+
+    scanned_at = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    await user_repo.set_scanned_at(user.uuid, scanned_at)
+
+    the_user = await user_repo.get(user.uuid)
+    assert the_user is not None
+    assert the_user.scanned_at == scanned_at
+
+
+@pytest.mark.asyncio()
+async def test_unfollowed_youtube_subscriptions_are_remembered_until_followed_again(user_repo: UserRepository) -> None:
+    youtube_sub_id = uuid.uuid4()
+    other_sub_id = uuid.uuid4()
+    user = mock_user(subscribed_to=[other_sub_id])
+    await user_repo.add(user)
+
+    await user_repo.set_youtube_subscriptions(user.uuid, {youtube_sub_id})
+    await user_repo.unfollow(user.uuid, FollowKind.SUBSCRIPTION, youtube_sub_id)
+    await user_repo.unfollow(user.uuid, FollowKind.SUBSCRIPTION, other_sub_id)
+
+    the_user = await user_repo.get(user.uuid)
+    assert the_user is not None
+    assert the_user.get_subscriptions() == set()
+    assert the_user.get_youtube_unfollowed_subscriptions() == {youtube_sub_id}
+
+    await user_repo.follow(user.uuid, FollowKind.SUBSCRIPTION, youtube_sub_id)
+    await user_repo.follow(user.uuid, FollowKind.SUBSCRIPTION, youtube_sub_id)
+
+    the_user = await user_repo.get(user.uuid)
+    assert the_user is not None
+    assert the_user.get_subscriptions(include_youtube=False) == {youtube_sub_id}
+    assert the_user.get_youtube_unfollowed_subscriptions() == set()
+
+
+@pytest.mark.asyncio()
+async def test_follow_and_favorite_topics_and_curators(user_repo: UserRepository) -> None:
+    topic_id = uuid.uuid4()
+    curator_id = uuid.uuid4()
+    user = mock_user()
+    await user_repo.add(user)
+
+    await user_repo.follow(user.uuid, FollowKind.TOPIC, topic_id)
+    await user_repo.follow(user.uuid, FollowKind.TOPIC, topic_id)
+    await user_repo.follow(user.uuid, FollowKind.FAVORITE_TOPIC, topic_id)
+    await user_repo.follow(user.uuid, FollowKind.CURATOR, curator_id)
+
+    the_user = await user_repo.get(user.uuid)
+    assert the_user is not None
+    assert the_user.get_followed_topics() == {topic_id}
+    assert the_user.get_favorite_topics() == {topic_id}
+    assert the_user.curators == {curator_id}
+
+    await user_repo.unfollow(user.uuid, FollowKind.TOPIC, topic_id)
+    await user_repo.unfollow(user.uuid, FollowKind.FAVORITE_TOPIC, topic_id)
+    await user_repo.unfollow(user.uuid, FollowKind.CURATOR, curator_id)
+    await user_repo.unfollow(user.uuid, FollowKind.CURATOR, curator_id)
+
+    the_user = await user_repo.get(user.uuid)
+    assert the_user is not None
+    assert the_user.get_followed_topics() == set()
+    assert the_user.get_favorite_topics() == set()
+    assert the_user.curators == set()
+
+
+@pytest.mark.asyncio()
+async def test_concurrent_follows_are_not_lost(user_repo: UserRepository) -> None:
+    user = mock_user()
+    await user_repo.add(user)
+    subscription_ids = {uuid.uuid4() for _ in range(10)}
+
+    await asyncio.gather(*[user_repo.follow(user.uuid, FollowKind.SUBSCRIPTION, sub_id) for sub_id in subscription_ids])
+
+    the_user = await user_repo.get(user.uuid)
+    assert the_user is not None
+    assert the_user.get_subscriptions() == subscription_ids
+
+
+@pytest.mark.asyncio()
+async def test_find_users_subscribed_to_subscription_after_follow_changes(user_repo: UserRepository) -> None:
+    subscription_id = uuid.uuid4()
+    follower = mock_user(subscribed_to=[subscription_id])
+    youtube_follower = mock_user()
+    youtube_follower.set_youtube_subscriptions({subscription_id})
+    unfollower = mock_user()
+    await user_repo.add(follower)
+    await user_repo.add(youtube_follower)
+    await user_repo.add(unfollower)
+    await user_repo.set_youtube_subscriptions(unfollower.uuid, {subscription_id})
+    await user_repo.unfollow(unfollower.uuid, FollowKind.SUBSCRIPTION, subscription_id)
+
+    subscribed_users = await user_repo.find_users_subscribed_to_subscription(subscription_id)
+    assert {user.uuid for user in subscribed_users} == {follower.uuid, youtube_follower.uuid}
+
+    await user_repo.follow(unfollower.uuid, FollowKind.SUBSCRIPTION, subscription_id)
+    edited_follower = mock_user(uuid=follower.uuid, email=follower.email, username=follower.username)
+    await user_repo.update(edited_follower)
+    await user_repo.delete(youtube_follower.uuid)
+
+    subscribed_users = await user_repo.find_users_subscribed_to_subscription(subscription_id)
+    assert {user.uuid for user in subscribed_users} == {unfollower.uuid}
+
+
+@pytest.mark.asyncio()
+async def test_the_follow_tables_mirror_the_topics_and_curators_of_the_users(db_name: str) -> None:
+    connection = (IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop")
+    user_repo = PostgresUserRepository(*connection)
+    pool = await PostgresConnector(*connection).pool()
+    topic_id = uuid.uuid4()
+    curator_id = uuid.uuid4()
+    follower = mock_user(topics={topic_id}, curators={curator_id})
+    other_user = mock_user()
+    await user_repo.add(follower)
+    await user_repo.add(other_user)
+    await user_repo.follow(other_user.uuid, FollowKind.TOPIC, topic_id)
+    await user_repo.follow(other_user.uuid, FollowKind.FAVORITE_TOPIC, topic_id)
+    await user_repo.follow(other_user.uuid, FollowKind.CURATOR, curator_id)
+
+    async def topic_follows() -> list[tuple[uuid.UUID, str]]:
+        rows = await pool.fetch("SELECT user_uuid, kind FROM user_topic_follows WHERE topic_uuid = %s", topic_id)
+        return sorted((row["user_uuid"], row["kind"]) for row in rows)
+
+    async def curator_followers() -> set[uuid.UUID]:
+        rows = await pool.fetch("SELECT user_uuid FROM user_curator_follows WHERE curator_uuid = %s", curator_id)
+        return {row["user_uuid"] for row in rows}
+
+    assert await topic_follows() == sorted(
+        [(follower.uuid, "followed"), (other_user.uuid, "followed"), (other_user.uuid, "favorite")])
+    assert await curator_followers() == {follower.uuid, other_user.uuid}
+
+    await user_repo.update(mock_user(uuid=follower.uuid, email=follower.email, username=follower.username))
+    await user_repo.unfollow(other_user.uuid, FollowKind.FAVORITE_TOPIC, topic_id)
+    await user_repo.delete(other_user.uuid)
+
+    assert await topic_follows() == []
+    assert await curator_followers() == set()
+
+
+@pytest.mark.asyncio()
+async def test_sync_follow_tables_copies_the_follows_written_only_to_the_users_table(db_name: str) -> None:
+    connection = (IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop")
+    user_repo = PostgresUserRepository(*connection)
+    pool = await PostgresConnector(*connection).pool()
+    subscription_id = uuid.uuid4()
+    users = [mock_user(), mock_user(subscribed_to=[subscription_id])]
+    for user in users:
+        await user_repo.add(user)
+    await pool.execute("UPDATE users SET subscription_uuids = %s WHERE uuid = %s", [subscription_id], users[0].uuid)
+    await pool.execute("UPDATE users SET subscription_uuids = '{}' WHERE uuid = %s", users[1].uuid)
+
+    last_user_id = None
+    while (last_user_id := await user_repo.sync_follow_tables(last_user_id, limit=1)) is not None:
+        pass
+
+    subscribed_users = await user_repo.find_users_subscribed_to_subscription(subscription_id)
+    assert [user.uuid for user in subscribed_users] == [users[0].uuid]
+
+
+@pytest.mark.asyncio()
+async def test_update_only_rewrites_the_follow_tables_of_the_changed_arrays(db_name: str) -> None:
+    connection = (IPv4Address("127.0.0.1"), 5432, db_name, "develop", "develop")
+    user_repo = PostgresUserRepository(*connection)
+    pool = await PostgresConnector(*connection).pool()
+    subscription_id = uuid.uuid4()
+    topic_id = uuid.uuid4()
+    user = mock_user(subscribed_to=[subscription_id])
+    await user_repo.add(user)
+    # Only a rewrite of the followed subscriptions would restore the row
+    await pool.execute("DELETE FROM user_subscriptions WHERE user_uuid = %s", user.uuid)
+
+    user.first_name = "edited"
+    user.follow_topic(topic_id)
+    await user_repo.update(user)
+
+    assert await pool.fetchval(
+        "SELECT COUNT(*) FROM user_subscriptions WHERE subscription_uuid = %s", subscription_id) == 0
+    assert await pool.fetchval("SELECT COUNT(*) FROM user_topic_follows WHERE topic_uuid = %s", topic_id) == 1
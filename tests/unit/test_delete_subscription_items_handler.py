@@ -1,5 +1,6 @@
-from unittest.mock import AsyncMock, MagicMock, call
-from uuid import UUID
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID, uuid4
 
 import pytest
 
@@ -9,6 +10,7 @@ from linkurator_core.domain.common.mock_factory import mock_item, mock_sub, mock
 from linkurator_core.domain.items.item_repository import ItemRepository
 from linkurator_core.domain.subscriptions.subscription_repository import SubscriptionRepository
 from linkurator_core.domain.users.user_repository import UserRepository
+from linkurator_core.infrastructure.in_memory.item_repository import InMemoryItemRepository
 
 
 @pytest.mark.asyncio()
@@ -22,32 +24,23 @@ async def test_delete_subscription_items_handler() -> None:
     sub1 = mock_sub(uuid=UUID("0a46b804-a370-480b-b64e-c2079aaaa64b"))
     subscription_repo_mock.get.return_value = sub1
 
-    item_repo_mock = MagicMock(spec=ItemRepository)
-    item1 = mock_item(item_uuid=UUID("1ae708ad-0cf8-4212-9bb7-a7aeb6440546"),
-                      sub_uuid=sub1.uuid)
-    item2 = mock_item(item_uuid=UUID("6e2013d9-d608-4b5b-848a-2b0278e8364b"),
-                      sub_uuid=sub1.uuid)
-
-    # mock find_items to be called twice, one with item1 and another with item2
-    item_repo_mock.find_items.side_effect = [
-        [item1],
-        [item2],
-        [],
-    ]
+    item_repo_mock = AsyncMock(spec=ItemRepository)
+    item_repo_mock.delete_items_by_subscription.return_value = 2
+
     handler = DeleteSubscriptionItemsHandler(
         user_repository=user_repo_mock,
         subscription_repository=subscription_repo_mock,
         item_repository=item_repo_mock)
 
-    await handler.handle(
+    deleted_items = await handler.handle(
         user_id=UUID("1ae708ad-0cf8-4212-9bb7-a7aeb6440546"),
         subscription_id=UUID("0a46b804-a370-480b-b64e-c2079aaaa64b"))
 
+    assert deleted_items == 2
     assert user_repo_mock.get.call_count == 1
     assert subscription_repo_mock.get.call_count == 1
-    assert item_repo_mock.find_items.call_count == 3
-    assert item_repo_mock.delete_item.call_count == 2
-    assert item_repo_mock.delete_item.call_args_list == [call(item1.uuid), call(item2.uuid)]
+    item_repo_mock.delete_items_by_subscription.assert_called_once_with(sub1.uuid, before=None)
+    item_repo_mock.find_items.assert_not_called()
     assert subscription_repo_mock.update.call_count == 1
 
 
@@ -89,3 +82,27 @@ async def test_delete_items_handler_raises_exception_if_subscription_does_not_ex
         await handler.handle(
             user_id=UUID("1ae708ad-0cf8-4212-9bb7-a7aeb6440546"),
             subscription_id=UUID("0a46b804-a370-480b-b64e-c2079aaaa64b"))
+
+
+@pytest.mark.asyncio()
+async def test_items_created_after_the_given_date_are_not_deleted() -> None:
+    user_repo_mock = AsyncMock(spec=UserRepository)
+    user_repo_mock.get.return_value = mock_user(is_admin=True)
+    subscription = mock_sub()
+    subscription_repo_mock = AsyncMock(spec=SubscriptionRepository)
+    subscription_repo_mock.get.return_value = subscription
+    started_at = datetime.now(tz=timezone.utc)
+    old_item = mock_item(sub_uuid=subscription.uuid, created_at=started_at - timedelta(days=1))
+    fetched_again_item = mock_item(sub_uuid=subscription.uuid, created_at=started_at + timedelta(seconds=1))
+    item_repository = InMemoryItemRepository()
+    await item_repository.upsert_items([old_item, fetched_again_item])
+
+    handler = DeleteSubscriptionItemsHandler(
+        user_repository=user_repo_mock,
+        subscription_repository=subscription_repo_mock,
+        item_repository=item_repository)
+    deleted_items = await handler.handle(user_id=uuid4(), subscription_id=subscription.uuid, before=started_at)
+
+    assert deleted_items == 1
+    assert await item_repository.get_item(old_item.uuid) is None
+    assert await item_repository.get_item(fetched_again_item.uuid) == fetched_again_item
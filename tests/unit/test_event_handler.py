@@ -10,6 +10,7 @@ from linkurator_core.domain.common.event import (
     SubscriptionItemsBecameOutdatedEvent,
     UserRegisteredEvent,
     UserRegisterRequestSentEvent,
+    UserTimelineBecameOutdatedEvent,
 )
 
 
@@ -88,3 +89,18 @@ async def test_new_registered_user_event_triggers_send_welcome_email_handler() -
     handle_calls = send_welcome_email.handle.call_args_list
     assert len(handle_calls) == 1
     assert handle_calls[0] == call(uuid.UUID("e3b84e67-11d9-425d-936e-6eb64689f17d"))
+
+
+@pytest.mark.asyncio()
+async def test_user_timeline_became_outdated_event_triggers_sync_user_timeline_handler() -> None:
+    sync_user_timeline_handler = AsyncMock()
+    sync_user_timeline_handler.handle.return_value = None
+    event_handler = dummy_event_handler()
+    event_handler.sync_user_timeline_handler = sync_user_timeline_handler
+
+    await event_handler.handle(UserTimelineBecameOutdatedEvent.new(
+        user_id=uuid.UUID("0c4cc7d8-a5b2-4a5f-9a35-7d8a3ba0f1f4")))
+
+    handle_calls = sync_user_timeline_handler.handle.call_args_list
+    assert len(handle_calls) == 1
+    assert handle_calls[0] == call(uuid.UUID("0c4cc7d8-a5b2-4a5f-9a35-7d8a3ba0f1f4"))
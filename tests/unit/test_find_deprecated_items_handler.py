@@ -1,5 +1,5 @@
 from unittest.mock import AsyncMock, MagicMock
-from uuid import uuid4
+from uuid import UUID
 
 import pytest
 
@@ -7,49 +7,71 @@ from linkurator_core.application.items.find_deprecated_items_handler import Find
 from linkurator_core.domain.common.event import ItemsBecameOutdatedEvent
 from linkurator_core.domain.common.event_bus_service import EventBusService
 from linkurator_core.domain.common.mock_factory import mock_item
-from linkurator_core.domain.items.item_repository import ItemFilterCriteria, ItemRepository
 from linkurator_core.domain.subscriptions.subscription_service import SubscriptionService
+from linkurator_core.infrastructure.in_memory.item_repository import InMemoryItemRepository
 
 
-@pytest.mark.asyncio()
-async def test_find_deprecated_items_publish_an_event_with_all_deprecated_items() -> None:
-    item_repository = AsyncMock(spec=ItemRepository)
-    event_bus = AsyncMock(spec=EventBusService)
+def youtube_service(batch_size: int = 50) -> MagicMock:
     subscription_service = MagicMock(spec=SubscriptionService)
     subscription_service.provider_name.return_value = "youtube"
     subscription_service.provider_version.return_value = 1
+    subscription_service.refresh_batch_size.return_value = batch_size
+    subscription_service.max_refreshed_items_per_minute.return_value = None
+    return subscription_service
+
+
+@pytest.mark.asyncio()
+async def test_find_deprecated_items_publish_an_event_with_all_deprecated_items() -> None:
+    item_repository = InMemoryItemRepository()
+    event_bus = AsyncMock(spec=EventBusService)
+    event_bus.pending_events.return_value = None
     find_deprecated_items_handler = FindDeprecatedItemsHandler(
         item_repository=item_repository,
         event_bus=event_bus,
-        subscription_services=[subscription_service],
+        subscription_services=[youtube_service()],
     )
 
-    items = [mock_item(item_uuid=uuid4(), version=0),
-             mock_item(item_uuid=uuid4(), version=0)]
-
-    item_repository.find_items.return_value = items
+    items = [mock_item(version=0), mock_item(version=0), mock_item(version=1), mock_item(version=0, provider="rss")]
+    await item_repository.upsert_items(items)
 
     await find_deprecated_items_handler.handle()
 
-    item_repository.find_items.assert_called_once_with(
-        criteria=ItemFilterCriteria(provider="youtube", last_version=1),
-        page_number=0,
-        limit=50)
     event_bus.publish.assert_called_once_with(
         ItemsBecameOutdatedEvent.new(item_ids={items[0].uuid, items[1].uuid}))
 
 
 @pytest.mark.asyncio()
-async def test_find_deprecated_items_does_not_publish_an_event_if_there_are_no_deprecated_items() -> None:
-    item_repository = AsyncMock(spec=ItemRepository)
+async def test_find_deprecated_items_publish_batches_of_the_provider_size_until_none_is_left() -> None:
+    item_repository = InMemoryItemRepository()
     event_bus = AsyncMock(spec=EventBusService)
-    subscription_service = MagicMock(spec=SubscriptionService)
+    event_bus.pending_events.return_value = 0
     find_deprecated_items_handler = FindDeprecatedItemsHandler(
         item_repository=item_repository,
         event_bus=event_bus,
-        subscription_services=[subscription_service],
+        subscription_services=[youtube_service(batch_size=2)],
+    )
+
+    item_ids = [UUID(f"00000000-0000-0000-0000-00000000000{i}") for i in range(5)]
+    await item_repository.upsert_items([mock_item(item_uuid=item_id, version=0) for item_id in item_ids])
+
+    await find_deprecated_items_handler.handle()
+
+    published_item_ids = [call.args[0].item_ids for call in event_bus.publish.call_args_list]
+    assert published_item_ids == [set(item_ids[0:2]), set(item_ids[2:4]), set(item_ids[4:5])]
+    progress = find_deprecated_items_handler.progress()[0]
+    assert progress.published_items == 5
+    assert progress.remaining_items == 0
+
+
+@pytest.mark.asyncio()
+async def test_find_deprecated_items_does_not_publish_an_event_if_there_are_no_deprecated_items() -> None:
+    event_bus = AsyncMock(spec=EventBusService)
+    event_bus.pending_events.return_value = None
+    find_deprecated_items_handler = FindDeprecatedItemsHandler(
+        item_repository=InMemoryItemRepository(),
+        event_bus=event_bus,
+        subscription_services=[youtube_service()],
     )
-    item_repository.find_items.return_value = []
 
     await find_deprecated_items_handler.handle()
 
@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from linkurator_core.application.items.find_zero_duration_items import FindZeroDurationItems
+from linkurator_core.domain.common.event import ItemsBecameOutdatedEvent
+from linkurator_core.domain.common.event_bus_service import EventBusService
+from linkurator_core.domain.common.mock_factory import mock_item
+from linkurator_core.infrastructure.in_memory.item_repository import InMemoryItemRepository
+
+
+@pytest.mark.asyncio()
+async def test_find_zero_duration_items_not_updated_in_the_last_day() -> None:
+    item_repository = InMemoryItemRepository()
+    event_bus = AsyncMock(spec=EventBusService)
+    event_bus.pending_events.return_value = None
+    two_days_ago = datetime.now(timezone.utc) - timedelta(days=2)
+    zero_duration_item = mock_item(duration=0, updated_at=two_days_ago)
+    recently_updated_item = mock_item(duration=0)
+    item_with_duration = mock_item(duration=60, updated_at=two_days_ago)
+    await item_repository.upsert_items([zero_duration_item, recently_updated_item, item_with_duration])
+
+    handler = FindZeroDurationItems(item_repository=item_repository, event_bus=event_bus)
+    await handler.handle()
+
+    event_bus.publish.assert_called_once_with(ItemsBecameOutdatedEvent.new(item_ids={zero_duration_item.uuid}))
+    assert handler.progress().remaining_items == 0
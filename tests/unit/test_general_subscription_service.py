@@ -100,6 +100,31 @@ async def test_get_items_unions_sets_from_all_services() -> None:
     assert item3 in result
 
 
+@pytest.mark.asyncio()
+async def test_refresh_items_sends_each_provider_only_its_own_items() -> None:
+    youtube_service = AsyncMock(spec=SubscriptionService)
+    youtube_service.provider_name.return_value = "youtube"
+    spotify_service = AsyncMock(spec=SubscriptionService)
+    spotify_service.provider_name.return_value = "spotify"
+    rss_service = AsyncMock(spec=SubscriptionService)
+    rss_service.provider_name.return_value = "rss"
+
+    youtube_item = mock_item(provider="youtube")
+    spotify_item = mock_item(provider="spotify")
+    youtube_service.refresh_items.return_value = {youtube_item}
+    spotify_service.refresh_items.return_value = {spotify_item}
+
+    general_service = GeneralSubscriptionService(services=[youtube_service, spotify_service, rss_service])
+
+    result = await general_service.refresh_items([youtube_item, spotify_item])
+
+    assert result == {youtube_item, spotify_item}
+    youtube_service.refresh_items.assert_called_once_with([youtube_item])
+    spotify_service.refresh_items.assert_called_once_with([spotify_item])
+    rss_service.refresh_items.assert_not_called()
+    youtube_service.get_items.assert_not_called()
+
+
 @pytest.mark.asyncio()
 async def test_get_items_with_empty_services_list() -> None:
     general_service = GeneralSubscriptionService(services=[])
@@ -84,6 +84,26 @@ async def test_search_curators_by_partial_username_case_insensitive() -> None:
     assert jane_smith not in curators
 
 
+@pytest.mark.asyncio()
+async def test_search_curators_by_a_few_characters_of_the_username() -> None:
+    user_repository = InMemoryUserRepository()
+    john_doe = mock_user(username=Username("john_doe"))
+    big_john = mock_user(username=Username("big_john"))
+    jane_smith = mock_user(username=Username("jane_smith"))
+
+    await user_repository.add(john_doe)
+    await user_repository.add(big_john)
+    await user_repository.add(jane_smith)
+
+    handler = GetCuratorsHandler(user_repository)
+
+    curators = await handler.handle(username="jo")
+
+    assert len(curators) == 2
+    assert john_doe in curators
+    assert big_john in curators
+
+
 @pytest.mark.asyncio()
 async def test_search_curators_by_non_existing_username() -> None:
     user_repository = InMemoryUserRepository()
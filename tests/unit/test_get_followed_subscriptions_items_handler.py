@@ -1,4 +1,4 @@
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
@@ -6,10 +6,13 @@ from linkurator_core.application.items.get_followed_subscriptions_items_handler
     GetFollowedSubscriptionsItemsHandler,
     GetFollowedSubscriptionsItemsResponse,
 )
+from linkurator_core.application.items.user_timeline import UserTimeline
 from linkurator_core.domain.common.mock_factory import mock_interaction, mock_item, mock_sub, mock_user
 from linkurator_core.domain.items.item_with_interactions import ItemWithInteractions
+from linkurator_core.domain.items.timeline_repository import TimelineCursor
 from linkurator_core.infrastructure.in_memory.item_repository import InMemoryItemRepository
 from linkurator_core.infrastructure.in_memory.subscription_repository import InMemorySubscriptionRepository
+from linkurator_core.infrastructure.in_memory.timeline_repository import InMemoryTimelineRepository
 from linkurator_core.infrastructure.in_memory.user_repository import InMemoryUserRepository
 
 
@@ -160,3 +163,38 @@ async def test_get_followed_subscriptions_items_filters_by_followed_subscription
     assert len(result.items) == 1
     assert result.items[0].item == followed_item
     assert result.items[0].subscription == followed_sub
+
+
+@pytest.mark.asyncio()
+async def test_get_followed_subscriptions_items_pulls_the_items_missing_in_the_timeline() -> None:
+    subscription_repo = InMemorySubscriptionRepository()
+    sub = mock_sub()
+    await subscription_repo.add(sub)
+
+    user_repo = InMemoryUserRepository()
+    user = mock_user(subscribed_to=[sub.uuid])
+    await user_repo.add(user)
+
+    item_repo = InMemoryItemRepository()
+    now = datetime.now(tz=timezone.utc)
+    recent_item = mock_item(sub_uuid=sub.uuid, published_at=now - timedelta(days=1))
+    old_item = mock_item(sub_uuid=sub.uuid, published_at=now - timedelta(days=20))
+    await item_repo.upsert_items([recent_item, old_item])
+
+    timeline_repo = InMemoryTimelineRepository(item_repo)
+    user_timeline = UserTimeline(timeline_repo, max_age=timedelta(days=10))
+    await user_timeline.sync(user)
+    handler = GetFollowedSubscriptionsItemsHandler(
+        item_repository=item_repo,
+        subscription_repository=subscription_repo,
+        user_repository=user_repo,
+        user_timeline=user_timeline,
+    )
+
+    first_page = await handler.handle(user_id=user.uuid, created_before=now + timedelta(minutes=1), page_number=0, page_size=1)
+    second_page = await handler.handle(user_id=user.uuid, created_before=now + timedelta(minutes=1), page_number=1, page_size=1,
+                                       after=TimelineCursor.of(first_page.items[-1].item))
+
+    assert set(timeline_repo.timeline_items[user.uuid]) == {recent_item.uuid}
+    assert [item.item.uuid for item in first_page.items] == [recent_item.uuid]
+    assert [item.item.uuid for item in second_page.items] == [old_item.uuid]
@@ -0,0 +1,167 @@
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from linkurator_core.domain.common.event import Event, SubscriptionItemsBecameOutdatedEvent
+from linkurator_core.infrastructure.asyncio_impl.utils import run_parallel, run_sequence, wait_until
+from linkurator_core.infrastructure.in_memory.event_bus import InMemoryEventBus
+
+
+@pytest.mark.asyncio()
+async def test_publish_and_subscribe() -> None:
+    event_bus = InMemoryEventBus()
+    dummy_function = AsyncMock()
+    event_bus.subscribe(SubscriptionItemsBecameOutdatedEvent, dummy_function)
+    event = SubscriptionItemsBecameOutdatedEvent.new(subscription_id=uuid4())
+
+    results = await run_parallel(
+        event_bus.start(),
+        run_sequence(
+            wait_until(event_bus.is_running, check_interval_seconds=0.01),
+            event_bus.publish(event),
+            wait_until(lambda: dummy_function.call_count == 1, check_interval_seconds=0.01),
+            event_bus.stop(),
+        ),
+    )
+
+    condition_was_met_in_time = results[1][2]
+    assert condition_was_met_in_time
+    dummy_function.assert_called_once_with(event)
+    assert not event_bus.is_running()
+
+
+@pytest.mark.asyncio()
+async def test_handlers_never_exceed_the_concurrency_limit() -> None:
+    event_bus = InMemoryEventBus(max_concurrent_handlers=2)
+    running = 0
+    max_running = 0
+
+    async def slow_handler(_: Event) -> None:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    event_bus.subscribe(SubscriptionItemsBecameOutdatedEvent, slow_handler)
+    for _ in range(6):
+        await event_bus.publish(SubscriptionItemsBecameOutdatedEvent.new(subscription_id=uuid4()))
+
+    await run_parallel(
+        event_bus.start(),
+        run_sequence(event_bus.wait_until_idle(), event_bus.stop()),
+    )
+
+    assert max_running == 2
+    assert await event_bus.pending_events() == 0
+
+
+@pytest.mark.asyncio()
+async def test_a_failing_handler_does_not_prevent_other_handlers_from_running() -> None:
+    event_bus = InMemoryEventBus()
+    failing_handler = AsyncMock(side_effect=RuntimeError("boom"))
+    other_handler = AsyncMock()
+    event_bus.subscribe(SubscriptionItemsBecameOutdatedEvent, failing_handler)
+    event_bus.subscribe(SubscriptionItemsBecameOutdatedEvent, other_handler)
+
+    await event_bus.publish(SubscriptionItemsBecameOutdatedEvent.new(subscription_id=uuid4()))
+    await event_bus.publish(SubscriptionItemsBecameOutdatedEvent.new(subscription_id=uuid4()))
+    await run_parallel(
+        event_bus.start(),
+        run_sequence(event_bus.wait_until_idle(), event_bus.stop()),
+    )
+
+    assert failing_handler.call_count == 2
+    assert other_handler.call_count == 2
+
+
+@pytest.mark.asyncio()
+async def test_handlers_can_publish_to_a_full_queue_without_blocking() -> None:
+    event_bus = InMemoryEventBus(max_queue_size=1, max_concurrent_handlers=1)
+    handled: list[Event] = []
+
+    async def fan_out_handler(event: Event) -> None:
+        handled.append(event)
+        if len(handled) == 1:
+            for _ in range(3):
+                await event_bus.publish(SubscriptionItemsBecameOutdatedEvent.new(subscription_id=uuid4()))
+
+    event_bus.subscribe(SubscriptionItemsBecameOutdatedEvent, fan_out_handler)
+    await event_bus.publish(SubscriptionItemsBecameOutdatedEvent.new(subscription_id=uuid4()))
+
+    await asyncio.wait_for(
+        run_parallel(
+            event_bus.start(),
+            run_sequence(event_bus.wait_until_idle(), event_bus.stop()),
+        ),
+        timeout=5,
+    )
+
+    assert len(handled) == 4
+
+
+@pytest.mark.asyncio()
+async def test_events_that_do_not_fit_in_the_queue_are_spilled_to_disk(tmp_path: Path) -> None:
+    spill_path = tmp_path / "events.jsonl"
+    event_bus = InMemoryEventBus(max_queue_size=1, spill_path=spill_path)
+    handler = AsyncMock()
+    event_bus.subscribe(SubscriptionItemsBecameOutdatedEvent, handler)
+
+    events = [SubscriptionItemsBecameOutdatedEvent.new(subscription_id=uuid4()) for _ in range(3)]
+    for event in events:
+        await event_bus.publish(event)
+
+    assert len(spill_path.read_text(encoding="utf-8").splitlines()) == 2
+    assert await event_bus.pending_events() == 3
+
+    await run_parallel(
+        event_bus.start(),
+        run_sequence(event_bus.wait_until_idle(), event_bus.stop()),
+    )
+
+    assert {call.args[0].id for call in handler.call_args_list} == {event.id for event in events}
+    assert not spill_path.exists()
+
+
+@pytest.mark.asyncio()
+async def test_pending_events_are_saved_on_stop_and_handled_on_next_start(tmp_path: Path) -> None:
+    spill_path = tmp_path / "events.jsonl"
+    events = [SubscriptionItemsBecameOutdatedEvent.new(subscription_id=uuid4()) for _ in range(2)]
+
+    first_bus = InMemoryEventBus(max_concurrent_handlers=1, spill_path=spill_path)
+    started_events: list[Event] = []
+
+    async def blocking_handler(event: Event) -> None:
+        started_events.append(event)
+        await asyncio.Event().wait()
+
+    first_bus.subscribe(SubscriptionItemsBecameOutdatedEvent, blocking_handler)
+    for event in events:
+        await first_bus.publish(event)
+    await run_parallel(
+        first_bus.start(),
+        run_sequence(
+            wait_until(lambda: len(started_events) == 1, check_interval_seconds=0.01),
+            first_bus.stop(),
+        ),
+    )
+
+    assert len(spill_path.read_text(encoding="utf-8").splitlines()) == 2
+
+    second_bus = InMemoryEventBus(spill_path=spill_path)
+    handler = AsyncMock()
+    second_bus.subscribe(SubscriptionItemsBecameOutdatedEvent, handler)
+    await run_parallel(
+        second_bus.start(),
+        run_sequence(
+            wait_until(second_bus.is_running, check_interval_seconds=0.01),
+            second_bus.wait_until_idle(),
+            second_bus.stop(),
+        ),
+    )
+
+    assert {call.args[0].id for call in handler.call_args_list} == {event.id for event in events}
+    assert not spill_path.exists()
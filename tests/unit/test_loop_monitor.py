@@ -0,0 +1,50 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from linkurator_core.infrastructure.loop_monitor import EVENT_LOOP_LAG, LAG_BUCKETS_SECONDS, monitoring_event_loop
+
+
+def parse_feed_synchronously() -> None:
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio()
+async def test_blocking_calls_are_logged_with_their_stack(caplog: pytest.LogCaptureFixture) -> None:
+    with caplog.at_level(logging.WARNING):
+        async with monitoring_event_loop("test", blocked_ms=50):
+            await asyncio.sleep(0.15)
+            parse_feed_synchronously()
+            await asyncio.sleep(0.15)
+
+    blocked_logs = [record for record in caplog.records if "event loop of the test has been blocked" in record.message]
+    assert len(blocked_logs) == 1
+    assert "parse_feed_synchronously" in blocked_logs[0].message
+
+
+@pytest.mark.asyncio()
+async def test_lag_is_recorded_as_a_metric() -> None:
+    EVENT_LOOP_LAG.series.clear()
+
+    async with monitoring_event_loop("test", blocked_ms=1000):
+        await asyncio.sleep(0.15)
+        time.sleep(0.2)
+        await asyncio.sleep(0.15)
+
+    series = EVENT_LOOP_LAG.series[("test",)]
+    ticks = sum(series[:-1])
+    assert ticks >= 2
+    over_100ms = sum(series[LAG_BUCKETS_SECONDS.index(0.1) + 1:-1])
+    assert over_100ms == 1
+
+
+@pytest.mark.asyncio()
+async def test_nested_monitoring_of_the_same_loop_is_ignored() -> None:
+    EVENT_LOOP_LAG.series.clear()
+
+    async with monitoring_event_loop("api", blocked_ms=1000), monitoring_event_loop("processor", blocked_ms=1000):
+        await asyncio.sleep(0.25)
+
+    assert ("processor",) not in EVENT_LOOP_LAG.series
@@ -0,0 +1,54 @@
+import os
+from collections.abc import Iterator
+
+import pytest
+
+from linkurator_core.infrastructure.memory_profiler import (
+    RESIDENT_MEMORY,
+    MemoryTracingNotStartedError,
+    memory_tracer,
+    record_memory,
+    resident_memory_bytes,
+)
+
+retained: list[bytes] = []
+
+
+def allocate_feed(size: int) -> None:
+    retained.extend(bytes(1024) for _ in range(size))
+
+
+@pytest.fixture()
+def _tracing() -> Iterator[None]:
+    memory_tracer.start()
+    yield
+    memory_tracer.stop()
+    retained.clear()
+
+
+def test_resident_memory_is_measured() -> None:
+    record_memory("test")
+
+    assert resident_memory_bytes() > 0
+    assert RESIDENT_MEMORY.series[("test", str(os.getpid()))][0] > 0
+
+
+def test_snapshot_requires_tracing() -> None:
+    with pytest.raises(MemoryTracingNotStartedError):
+        memory_tracer.snapshot(limit=10)
+
+
+@pytest.mark.usefixtures("_tracing")
+def test_snapshots_report_the_growth_of_each_module() -> None:
+    first = memory_tracer.snapshot(limit=10)
+    allocate_feed(2000)
+    second = memory_tracer.snapshot(limit=10)
+
+    assert first.compared_to is None
+    assert second.compared_to is not None
+    assert second.traced_peak_bytes >= second.traced_bytes > 2000 * 1024
+    site = second.sites[0]
+    assert site.module == "tests.unit.test_memory_profiler"
+    assert site.size_diff_bytes > 2000 * 1024
+    assert site.count_diff >= 2000
+    assert "tests.unit.test_memory_profiler" in second.as_text()
@@ -0,0 +1,153 @@
+import os
+from pathlib import Path
+from uuid import UUID
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from linkurator_core.application.items.outdated_items_drain import DrainProgress
+from linkurator_core.domain.common.event import UserRegisteredEvent
+from linkurator_core.infrastructure.fastapi.metrics_middleware import MetricsMiddleware
+from linkurator_core.infrastructure.metrics import (
+    EVENT_HANDLING_DURATION,
+    HANDLER_DURATION,
+    HTTP_REQUEST_DURATION,
+    PROVIDER_CALL_DURATION,
+    MetricsRegistry,
+    instrument_event_handling,
+    instrument_handlers,
+    metrics,
+    provider_call,
+    record_drain_progress,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> None:
+    metrics.configure(None)
+    metrics.reset()
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",))
+    histogram.observe(("/items",), 0.003)
+    histogram.observe(("/items",), 0.2)
+    histogram.observe(("/items",), 100)
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{route="/items",le="0.005"} 1' in lines
+    assert 'latency_seconds_bucket{route="/items",le="0.25"} 2' in lines
+    assert 'latency_seconds_bucket{route="/items",le="60"} 2' in lines
+    assert 'latency_seconds_bucket{route="/items",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/items"} 3' in lines
+    assert 'latency_seconds_sum{route="/items"} 100.203' in lines
+
+
+def test_counters_add_up_the_totals_of_other_processes(tmp_path: Path) -> None:
+    other_process = MetricsRegistry()
+    other_process.configure(str(tmp_path))
+    other_process.counter("skipped_total", "Skipped runs.", ("task",)).inc(("refresh",), 2)
+    other_process.flush()
+    (tmp_path / f"{os.getpid()}.json").rename(tmp_path / "1.json")
+
+    registry = MetricsRegistry()
+    registry.configure(str(tmp_path))
+    registry.counter("skipped_total", "Skipped runs.", ("task",)).inc(("refresh",))
+
+    lines = registry.render().splitlines()
+    assert "# TYPE skipped_total counter" in lines
+    assert 'skipped_total{task="refresh"} 3' in lines
+
+
+def test_render_adds_up_the_metrics_of_other_processes(tmp_path: Path) -> None:
+    other_process = MetricsRegistry()
+    other_process.configure(str(tmp_path))
+    other_process.histogram("latency_seconds", "Latency.", ("route",)).observe(("/items",), 0.003)
+    other_process.flush()
+    (tmp_path / f"{os.getpid()}.json").rename(tmp_path / "1.json")
+
+    registry = MetricsRegistry()
+    registry.configure(str(tmp_path))
+    registry.histogram("latency_seconds", "Latency.", ("route",)).observe(("/items",), 0.003)
+    registry.flush()
+
+    assert 'latency_seconds_count{route="/items"} 2' in registry.render().splitlines()
+
+
+def test_requests_are_recorded_by_route_template() -> None:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/topics/{topic_id}/items")
+    async def items(topic_id: str) -> str:
+        return topic_id
+
+    client = TestClient(app)
+    client.get("/topics/1/items")
+    client.get("/topics/2/items")
+    client.get("/unknown/path")
+
+    series = HTTP_REQUEST_DURATION.series
+    assert sum(series[("GET", "/topics/{topic_id}/items", "200")][:-1]) == 2
+    assert sum(series[("GET", "unmatched", "404")][:-1]) == 1
+
+
+@pytest.mark.asyncio()
+async def test_handlers_are_timed_with_their_outcome() -> None:
+    class FailingHandler:
+        async def handle(self) -> None:
+            msg = "failure"
+            raise ValueError(msg)
+
+    class Handlers:
+        def __init__(self) -> None:
+            self.failing = FailingHandler()
+            self.not_a_handler = "value"
+
+    handlers = Handlers()
+    instrument_handlers(handlers)
+
+    with pytest.raises(ValueError, match="failure"):
+        await handlers.failing.handle()
+    assert sum(HANDLER_DURATION.series[("FailingHandler", "error")][:-1]) == 1
+
+
+@pytest.mark.asyncio()
+async def test_provider_calls_are_timed_by_method() -> None:
+    class Client:
+        @provider_call("youtube")
+        async def get_videos(self) -> list[str]:
+            return ["video"]
+
+    assert await Client().get_videos() == ["video"]
+    assert sum(PROVIDER_CALL_DURATION.series[("youtube", "get_videos", "ok")][:-1]) == 1
+
+
+@pytest.mark.asyncio()
+async def test_events_are_timed_by_type() -> None:
+    async def handle(_: object) -> None:
+        pass
+
+    await instrument_event_handling(handle)(UserRegisteredEvent.new(user_id=UUID(int=1)))
+
+    assert sum(EVENT_HANDLING_DURATION.series[("UserRegisteredEvent", "ok")][:-1]) == 1
+
+
+def test_drain_progress_is_recorded_as_gauges() -> None:
+    record_drain_progress([
+        DrainProgress(name="Zero duration items", remaining_items=30, published_items=10, items_per_minute=5,
+                      eta_seconds=360),
+        DrainProgress(name="Deprecated youtube items", remaining_items=8, published_items=0, items_per_minute=0,
+                      eta_seconds=None),
+    ])
+
+    lines = metrics.render().splitlines()
+    assert 'drain_remaining_items{drain="Zero duration items"} 30' in lines
+    assert 'drain_published_items{drain="Zero duration items"} 10' in lines
+    assert 'drain_items_per_minute{drain="Zero duration items"} 5' in lines
+    assert 'drain_eta_seconds{drain="Zero duration items"} 360' in lines
+    assert 'drain_eta_seconds{drain="Deprecated youtube items"} -1' in lines
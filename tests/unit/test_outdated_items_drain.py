@@ -0,0 +1,91 @@
+from unittest.mock import AsyncMock, patch
+from uuid import UUID
+
+import pytest
+
+from linkurator_core.application.items.outdated_items_drain import OutdatedItemsDrain
+from linkurator_core.domain.common.event_bus_service import EventBusService
+from linkurator_core.domain.common.mock_factory import mock_item
+from linkurator_core.domain.items.item_repository import ItemFilterCriteria
+from linkurator_core.infrastructure.in_memory.drain_cursor_repository import InMemoryDrainCursorRepository
+from linkurator_core.infrastructure.in_memory.item_repository import InMemoryItemRepository
+
+ITEM_IDS = [UUID(f"00000000-0000-0000-0000-00000000000{i}") for i in range(6)]
+
+
+async def repository_with_outdated_items() -> InMemoryItemRepository:
+    item_repository = InMemoryItemRepository()
+    await item_repository.upsert_items([mock_item(item_uuid=item_id, version=0) for item_id in ITEM_IDS])
+    return item_repository
+
+
+@pytest.mark.asyncio()
+async def test_drain_pauses_when_too_many_events_are_pending_and_resumes_from_the_cursor() -> None:
+    event_bus = AsyncMock(spec=EventBusService)
+    event_bus.pending_events.side_effect = [0, 10, 0, 0, 0]
+    drain = OutdatedItemsDrain(name="test", item_repository=await repository_with_outdated_items(),
+                               event_bus=event_bus, batch_size=2, max_pending_events=10)
+    criteria = ItemFilterCriteria(last_version=1)
+
+    await drain.drain(criteria)
+
+    assert event_bus.publish.call_count == 1
+    progress = drain.progress()
+    assert progress.published_items == 2
+    assert progress.remaining_items == 4
+    assert progress.eta_seconds is not None
+
+    await drain.drain(criteria)
+
+    published_item_ids = [call.args[0].item_ids for call in event_bus.publish.call_args_list]
+    assert published_item_ids == [set(ITEM_IDS[0:2]), set(ITEM_IDS[2:4]), set(ITEM_IDS[4:6])]
+    assert drain.progress().remaining_items == 0
+
+
+@pytest.mark.asyncio()
+async def test_drain_spaces_the_batches_to_respect_the_rate_limit() -> None:
+    event_bus = AsyncMock(spec=EventBusService)
+    event_bus.pending_events.return_value = None
+    drain = OutdatedItemsDrain(name="test", item_repository=await repository_with_outdated_items(),
+                               event_bus=event_bus, batch_size=3, max_items_per_minute=60)
+
+    with patch("asyncio.sleep") as sleep:
+        await drain.drain(ItemFilterCriteria(last_version=1))
+
+    assert event_bus.publish.call_count == 2
+    assert [call.args[0] for call in sleep.call_args_list] == [3, 3]
+
+
+@pytest.mark.asyncio()
+async def test_drain_stops_when_the_run_takes_too_long() -> None:
+    event_bus = AsyncMock(spec=EventBusService)
+    event_bus.pending_events.return_value = None
+    drain = OutdatedItemsDrain(name="test", item_repository=await repository_with_outdated_items(),
+                               event_bus=event_bus, batch_size=2, max_run_seconds=0)
+
+    await drain.drain(ItemFilterCriteria(last_version=1))
+
+    event_bus.publish.assert_not_called()
+    assert drain.progress().remaining_items == 6
+    assert drain.progress().eta_seconds is None
+
+
+@pytest.mark.asyncio()
+async def test_a_new_drain_resumes_from_the_saved_cursor() -> None:
+    event_bus = AsyncMock(spec=EventBusService)
+    event_bus.pending_events.side_effect = [0, 10, 0, 0, 0]
+    item_repository = await repository_with_outdated_items()
+    cursor_repository = InMemoryDrainCursorRepository()
+    criteria = ItemFilterCriteria(last_version=1)
+
+    await OutdatedItemsDrain(name="test", item_repository=item_repository, event_bus=event_bus, batch_size=2,
+                             max_pending_events=10, cursor_repository=cursor_repository).drain(criteria)
+
+    assert await cursor_repository.get("test") == ITEM_IDS[1]
+
+    await OutdatedItemsDrain(name="test", item_repository=item_repository, event_bus=event_bus, batch_size=2,
+                             max_pending_events=10, cursor_repository=cursor_repository).drain(criteria)
+
+    published_item_ids = [call.args[0].item_ids for call in event_bus.publish.call_args_list]
+    assert published_item_ids == [set(ITEM_IDS[0:2]), set(ITEM_IDS[2:4]), set(ITEM_IDS[4:6])]
+    assert await cursor_repository.get("test") is None
@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+import pytest
+
+from linkurator_core.infrastructure.profiler import ProfilerAlreadyRunningError, profile_event_loop
+
+
+def build_response(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def busy_request(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        build_response(0.02)
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio()
+async def test_profile_samples_the_coroutines_run_by_the_event_loop() -> None:
+    profile = asyncio.create_task(profile_event_loop(0.2, interval_seconds=0.001))
+    await busy_request(0.2)
+    stacks = await profile
+
+    lines = stacks.splitlines()
+    assert len(lines) > 0
+    assert any("busy_request (test_profiler.py:" in line and "build_response" in line for line in lines)
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert ";" in stack
+
+
+@pytest.mark.asyncio()
+async def test_only_one_profile_runs_at_a_time() -> None:
+    profile = asyncio.create_task(profile_event_loop(0.1))
+    await asyncio.sleep(0)
+
+    with pytest.raises(ProfilerAlreadyRunningError):
+        await profile_event_loop(0.1)
+
+    await profile
+    assert isinstance(await profile_event_loop(0.01), str)
@@ -19,12 +19,13 @@ async def test_refresh_items_handler_updates_items_with_latest_info() -> None:
              mock_item(item_uuid=uuid4())]
 
     item_repository.find_items.return_value = items
-    subscription_service.get_items.return_value = items
+    subscription_service.refresh_items.return_value = items
 
     await refresh_items_handler.handle({items[0].uuid, items[1].uuid})
 
     item_repository.upsert_items.assert_called_once_with(items)
-    subscription_service.get_items.assert_called_once_with({items[0].uuid, items[1].uuid})
+    subscription_service.refresh_items.assert_called_once_with(items)
+    item_repository.delete_items.assert_called_once_with([])
 
 
 @pytest.mark.asyncio()
@@ -37,10 +38,11 @@ async def test_refresh_items_handler_deletes_items_that_are_not_returned_by_subs
              mock_item(item_uuid=uuid4())]
 
     item_repository.find_items.return_value = items
-    subscription_service.get_items.return_value = [items[0]]
+    subscription_service.refresh_items.return_value = [items[0]]
 
     await refresh_items_handler.handle({items[0].uuid, items[1].uuid})
 
     item_repository.upsert_items.assert_called_once_with([items[0]])
-    subscription_service.get_items.assert_called_once_with({items[0].uuid, items[1].uuid})
-    item_repository.delete_item.assert_called_once_with(items[1].uuid)
+    subscription_service.refresh_items.assert_called_once_with(items)
+    item_repository.delete_items.assert_called_once_with([items[1].uuid])
+    item_repository.delete_item.assert_not_called()
@@ -0,0 +1,48 @@
+import pytest
+
+from linkurator_core.application.search.search_by_name_handler import SearchByNameHandler
+from linkurator_core.domain.common.mock_factory import mock_sub, mock_topic, mock_user
+from linkurator_core.domain.users.user import Username
+from linkurator_core.infrastructure.in_memory.subscription_repository import InMemorySubscriptionRepository
+from linkurator_core.infrastructure.in_memory.topic_repository import InMemoryTopicRepository
+from linkurator_core.infrastructure.in_memory.user_repository import InMemoryUserRepository
+
+
+@pytest.mark.asyncio()
+async def test_search_curators_topics_and_subscriptions_by_name() -> None:
+    user_repository = InMemoryUserRepository()
+    topic_repository = InMemoryTopicRepository()
+    subscription_repository = InMemorySubscriptionRepository()
+    curator = mock_user(username=Username("cooking_lover"))
+    other_user = mock_user(username=Username("gardener"))
+    topic = mock_topic(name="Cooking recipes", user_uuid=curator.uuid)
+    orphan_topic = mock_topic(name="Cooking without curator")
+    subscription = mock_sub(name="Home cooking")
+    await user_repository.add(curator)
+    await user_repository.add(other_user)
+    await topic_repository.add(topic)
+    await topic_repository.add(orphan_topic)
+    await subscription_repository.add(subscription)
+    await subscription_repository.add(mock_sub(name="Gardening"))
+
+    handler = SearchByNameHandler(user_repository, topic_repository, subscription_repository)
+    results = await handler.handle(" cook ", limit=10)
+
+    assert [user.uuid for user in results.curators] == [curator.uuid]
+    assert [(element.topic.uuid, element.curator.uuid) for element in results.topics] == [(topic.uuid, curator.uuid)]
+    assert [sub.uuid for sub in results.subscriptions] == [subscription.uuid]
+
+
+@pytest.mark.asyncio()
+async def test_search_without_text_finds_nothing() -> None:
+    user_repository = InMemoryUserRepository()
+    subscription_repository = InMemorySubscriptionRepository()
+    await user_repository.add(mock_user())
+    await subscription_repository.add(mock_sub())
+
+    handler = SearchByNameHandler(user_repository, InMemoryTopicRepository(), subscription_repository)
+    results = await handler.handle("  ", limit=10)
+
+    assert results.curators == []
+    assert results.topics == []
+    assert results.subscriptions == []
@@ -0,0 +1,58 @@
+import asyncio
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from linkurator_core.infrastructure.fastapi.server_timing import ServerTimingMiddleware
+from linkurator_core.infrastructure.request_timing import add_timing, request_timed, timed_section
+
+
+@request_timed("items.find_items")
+async def find_items() -> list[str]:
+    add_timing("db", 2)
+    return ["item"]
+
+
+def create_app(send_header: bool, slow_request_ms: int = 1000) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware, send_header=send_header, slow_request_ms=slow_request_ms)
+
+    @app.get("/items")
+    async def items() -> list[str]:
+        results = await asyncio.gather(find_items(), find_items())
+        with timed_section("schema"):
+            return results[0] + results[1]
+
+    return app
+
+
+def test_server_timing_header_has_the_time_of_each_part() -> None:
+    client = TestClient(create_app(send_header=True))
+
+    response = client.get("/items")
+
+    metrics = {metric.split(";")[0]: metric for metric in response.headers["server-timing"].split(", ")}
+    assert set(metrics) == {"total", "items.find_items", "db", "schema"}
+    assert metrics["db"] == 'db;dur=4.0;desc="2"'
+    assert metrics["items.find_items"].endswith('desc="2"')
+
+
+def test_server_timing_header_is_not_sent_when_disabled() -> None:
+    client = TestClient(create_app(send_header=False))
+
+    response = client.get("/items")
+
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+
+
+def test_slow_requests_are_logged_with_their_timing(caplog: pytest.LogCaptureFixture) -> None:
+    client = TestClient(create_app(send_header=False, slow_request_ms=0))
+
+    with caplog.at_level(logging.WARNING):
+        client.get("/items")
+
+    assert "Slow request GET /items" in caplog.text
+    assert 'db;dur=4.0;desc="2"' in caplog.text
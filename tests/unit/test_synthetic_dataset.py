@@ -0,0 +1,61 @@
+import statistics
+
+from linkurator_core.domain.common.synthetic_dataset import SyntheticDataset, SyntheticDatasetShape
+
+SHAPE = SyntheticDatasetShape(
+    users=50, subscriptions=400, items=20_000, subscriptions_per_user=60, topics_per_user=3, curators=5,
+    curators_per_user=3, interactions_per_user=40)
+
+
+def test_same_seed_generates_the_same_entities() -> None:
+    dataset = SyntheticDataset(SHAPE)
+    other_dataset = SyntheticDataset(SHAPE, now=dataset.now)
+
+    assert [user.uuid for user in dataset.users()] == [user.uuid for user in other_dataset.users()]
+    assert [topic.uuid for topic in dataset.topics()] == [topic.uuid for topic in other_dataset.topics()]
+    assert [interaction.uuid for interaction in dataset.interactions()] == [
+        interaction.uuid for interaction in other_dataset.interactions()]
+    assert [item.name for item in dataset.items()][:100] == [item.name for item in other_dataset.items()][:100]
+
+
+def test_items_of_the_subscriptions_follow_a_power_law() -> None:
+    dataset = SyntheticDataset(SHAPE)
+    items = list(dataset.items())
+
+    assert len(items) == SHAPE.items
+    assert len({item.uuid for item in items}) == SHAPE.items
+    sizes = dataset.items_per_subscription
+    assert sizes == sorted(sizes, reverse=True)
+    assert sizes[-1] >= 1
+    # The largest tenth of the subscriptions have about half of the items
+    assert sum(sizes[:SHAPE.subscriptions // 10]) > SHAPE.items * 0.4
+    newest = next(item for item in items if item.subscription_uuid == dataset.subscription_ids[0])
+    assert newest.uuid == dataset.item_id(0, 0)
+    assert newest.published_at == dataset.now
+
+
+def test_users_follow_subscriptions_curators_and_topics() -> None:
+    dataset = SyntheticDataset(SHAPE)
+    users = list(dataset.users())
+    topics = {topic.uuid: topic for topic in dataset.topics()}
+
+    assert len(users) == SHAPE.users
+    assert 30 < statistics.median(len(user.get_subscriptions()) for user in users) < 100
+    assert all(user.curators <= set(dataset.user_ids[:SHAPE.curators]) for user in users)
+    assert all(user.uuid not in user.curators for user in users)
+    assert all(user.get_followed_topics() <= topics.keys() for user in users)
+    subscriptions_of_users = {user.uuid: user.get_subscriptions() for user in users}
+    assert all(set(topic.subscriptions_ids) <= subscriptions_of_users[topic.user_id] for topic in topics.values())
+
+
+def test_interactions_are_with_items_of_the_followed_subscriptions() -> None:
+    dataset = SyntheticDataset(SHAPE)
+    items = {item.uuid: item for item in dataset.items()}
+    subscriptions_of_users = {user.uuid: user.get_subscriptions() for user in dataset.users()}
+    interactions = list(dataset.interactions())
+
+    assert len(interactions) > SHAPE.users * SHAPE.interactions_per_user / 2
+    for interaction in interactions:
+        item = items[interaction.item_uuid]
+        assert item.subscription_uuid in subscriptions_of_users[interaction.user_uuid]
+        assert interaction.created_at > item.published_at
@@ -6,9 +6,11 @@ import pytest
 from linkurator_core.application.subscriptions.update_subscription_handler import UpdateSubscriptionHandler
 from linkurator_core.domain.common.event import SubscriptionNeedsSummarizationEvent
 from linkurator_core.domain.common.event_bus_service import EventBusService
+from linkurator_core.domain.common.lock_service import LockService
 from linkurator_core.domain.common.mock_factory import mock_sub
 from linkurator_core.domain.subscriptions.subscription_repository import SubscriptionRepository
 from linkurator_core.domain.subscriptions.subscription_service import SubscriptionService
+from linkurator_core.infrastructure.in_memory.lock_service import InMemoryLockService
 from linkurator_core.infrastructure.in_memory.subscription_repository import InMemorySubscriptionRepository
 
 
@@ -38,6 +40,7 @@ async def test_update_subscription_handler_successfully_updates_subscription() -
         subscription_repository=subscription_repository,
         subscription_service=subscription_service,
         event_bus=event_bus,
+        lock_service=InMemoryLockService(),
     )
 
     # Act
@@ -82,6 +85,7 @@ async def test_update_subscription_handler_does_not_publish_event_when_descripti
         subscription_repository=subscription_repository,
         subscription_service=subscription_service,
         event_bus=event_bus,
+        lock_service=InMemoryLockService(),
     )
 
     # Act
@@ -106,6 +110,7 @@ async def test_update_subscription_handler_handles_nonexistent_current_subscript
         subscription_repository=subscription_repository,
         subscription_service=subscription_service,
         event_bus=event_bus,
+        lock_service=InMemoryLockService(),
     )
 
     # Act
@@ -134,6 +139,7 @@ async def test_update_subscription_handler_handles_nonexistent_updated_subscript
         subscription_repository=subscription_repository,
         subscription_service=subscription_service,
         event_bus=event_bus,
+        lock_service=InMemoryLockService(),
     )
 
     # Act
@@ -144,3 +150,32 @@ async def test_update_subscription_handler_handles_nonexistent_updated_subscript
     subscription_service.get_subscription.assert_called_once_with(current_subscription.uuid)
     subscription_repository.update.assert_not_called()
     event_bus.publish.assert_not_called()
+
+
+@pytest.mark.asyncio()
+async def test_update_subscription_handler_discards_the_update_when_the_lock_is_lost() -> None:
+    subscription_repository = InMemorySubscriptionRepository()
+    subscription_service = AsyncMock(spec=SubscriptionService)
+    event_bus = AsyncMock(spec=EventBusService)
+    lock_service = AsyncMock(spec=LockService)
+    lock_service.try_acquire.return_value = True
+    lock_service.is_held.return_value = False
+
+    current_subscription = mock_sub(description="Old description")
+    await subscription_repository.add(current_subscription)
+    subscription_service.get_subscription.return_value = mock_sub(
+        uuid=current_subscription.uuid, description="New description")
+
+    handler = UpdateSubscriptionHandler(
+        subscription_repository=subscription_repository,
+        subscription_service=subscription_service,
+        event_bus=event_bus,
+        lock_service=lock_service,
+    )
+    await handler.handle(current_subscription.uuid)
+
+    stored_subscription = await subscription_repository.get(current_subscription.uuid)
+    assert stored_subscription is not None
+    assert stored_subscription.description == "Old description"
+    event_bus.publish.assert_not_called()
+    lock_service.release.assert_called_once()
@@ -7,7 +7,9 @@ from unittest.mock import AsyncMock, MagicMock, call
 
 import pytest
 
+from linkurator_core.application.items.user_timeline import UserTimeline
 from linkurator_core.application.subscriptions.update_subscription_items_handler import UpdateSubscriptionItemsHandler
+from linkurator_core.domain.common.lock_service import LockService
 from linkurator_core.domain.common.mock_factory import mock_sub
 from linkurator_core.domain.common.utils import parse_url
 from linkurator_core.domain.items.item import Item
@@ -15,6 +17,7 @@ from linkurator_core.domain.items.item_repository import ItemFilterCriteria, Ite
 from linkurator_core.domain.subscriptions.subscription_repository import SubscriptionRepository
 from linkurator_core.domain.subscriptions.subscription_service import SubscriptionService
 from linkurator_core.infrastructure.asyncio_impl.utils import run_parallel, run_sequence
+from linkurator_core.infrastructure.in_memory.lock_service import InMemoryLockService
 
 
 @pytest.mark.asyncio()
@@ -42,7 +45,8 @@ async def test_update_subscriptions_items_with_an_item_that_is_not_registered()
 
     handler = UpdateSubscriptionItemsHandler(subscription_service=subscription_service,
                                              subscription_repository=subscription_repository,
-                                             item_repository=item_repository)
+                                             item_repository=item_repository,
+                                             lock_service=InMemoryLockService())
 
     await handler.handle(sub1.uuid)
 
@@ -94,7 +98,8 @@ async def test_update_subscriptions_items_with_items_that_are_already_registered
 
     handler = UpdateSubscriptionItemsHandler(subscription_service=subscription_service,
                                              subscription_repository=subscription_repository,
-                                             item_repository=item_repository)
+                                             item_repository=item_repository,
+                                             lock_service=InMemoryLockService())
 
     await handler.handle(sub1.uuid)
 
@@ -138,7 +143,8 @@ async def test_only_one_concurrent_update_is_allowed_to_run_per_subscription() -
 
     handler = UpdateSubscriptionItemsHandler(subscription_service=subscription_service,
                                              subscription_repository=subscription_repository,
-                                             item_repository=item_repository)
+                                             item_repository=item_repository,
+                                             lock_service=InMemoryLockService())
     await run_parallel(
         handler.handle(sub1.uuid),
         run_sequence(
@@ -148,3 +154,77 @@ async def test_only_one_concurrent_update_is_allowed_to_run_per_subscription() -
     )
 
     assert subscription_repository.update.call_count == 1
+
+
+@pytest.mark.asyncio()
+async def test_update_is_skipped_when_another_process_holds_the_subscription_lock() -> None:
+    sub1 = mock_sub()
+    subscription_service = AsyncMock(spec=SubscriptionService)
+    subscription_repository = MagicMock(spec=SubscriptionRepository)
+    item_repository = MagicMock(spec=ItemRepository)
+    lock_service = AsyncMock(spec=LockService)
+    lock_service.try_acquire.return_value = False
+
+    handler = UpdateSubscriptionItemsHandler(subscription_service=subscription_service,
+                                             subscription_repository=subscription_repository,
+                                             item_repository=item_repository,
+                                             lock_service=lock_service)
+    await handler.handle(sub1.uuid)
+
+    assert subscription_repository.get.call_count == 0
+    assert lock_service.release.call_count == 0
+
+
+@pytest.mark.asyncio()
+async def test_update_is_discarded_when_the_subscription_lock_is_lost() -> None:
+    sub1 = mock_sub()
+    subscription_service = AsyncMock(spec=SubscriptionService)
+    subscription_service.get_subscription_items.return_value = []
+    subscription_repository = MagicMock(spec=SubscriptionRepository)
+    subscription_repository.get.return_value = copy(sub1)
+    item_repository = MagicMock(spec=ItemRepository)
+    lock_service = AsyncMock(spec=LockService)
+    lock_service.try_acquire.return_value = True
+    lock_service.is_held.return_value = False
+
+    handler = UpdateSubscriptionItemsHandler(subscription_service=subscription_service,
+                                             subscription_repository=subscription_repository,
+                                             item_repository=item_repository,
+                                             lock_service=lock_service)
+    await handler.handle(sub1.uuid)
+
+    assert item_repository.upsert_items.call_count == 0
+    assert subscription_repository.update.call_count == 0
+    assert lock_service.release.call_count == 1
+
+
+@pytest.mark.asyncio()
+async def test_update_subscription_items_pushes_the_new_items_to_the_timelines() -> None:
+    sub1 = mock_sub()
+    item1 = Item.new(
+        uuid=uuid.UUID("0b7c2c1e-6f0a-4c53-9a55-4f6cf9d5f8f4"),
+        name="item1",
+        description="",
+        provider="youtube",
+        url=parse_url("http://url.com"),
+        thumbnail=parse_url("http://thumbnail.com"),
+        subscription_uuid=sub1.uuid,
+        published_at=datetime.now(tz=timezone.utc))
+
+    subscription_service = AsyncMock(spec=SubscriptionService)
+    subscription_service.get_subscription_items.return_value = [item1]
+    subscription_repository = MagicMock(spec=SubscriptionRepository)
+    subscription_repository.get.return_value = copy(sub1)
+    item_repository = MagicMock(spec=ItemRepository)
+    item_repository.find_items.return_value = []
+    user_timeline = AsyncMock(spec=UserTimeline)
+
+    handler = UpdateSubscriptionItemsHandler(subscription_service=subscription_service,
+                                             subscription_repository=subscription_repository,
+                                             item_repository=item_repository,
+                                             lock_service=InMemoryLockService(),
+                                             user_timeline=user_timeline)
+
+    await handler.handle(sub1.uuid)
+
+    assert user_timeline.add_items.call_args == call([item1])
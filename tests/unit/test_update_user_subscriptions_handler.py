@@ -10,7 +10,6 @@ from linkurator_core.domain.common.exceptions import InvalidCredentialError
 from linkurator_core.domain.common.mock_factory import mock_sub, mock_user
 from linkurator_core.domain.subscriptions.subscription_repository import SubscriptionRepository
 from linkurator_core.domain.subscriptions.subscription_service import SubscriptionService
-from linkurator_core.domain.users.user import User
 from linkurator_core.domain.users.user_repository import UserRepository
 from linkurator_core.infrastructure.in_memory.subscription_repository import InMemorySubscriptionRepository
 from linkurator_core.infrastructure.in_memory.user_repository import InMemoryUserRepository
@@ -109,8 +108,9 @@ async def test_update_subscriptions_for_user_with_invalid_refresh_token_only_upd
     await handler.handle(user_id=user.uuid, access_token="access_token")
 
     assert subscription_service.get_subscriptions.call_count == 1
-    assert user_repository.update.call_count == 1
-    user_input: User = user_repository.update.call_args[0][0]
-    assert user_input.uuid == user.uuid
-    assert user_input.get_youtube_subscriptions() == user.get_subscriptions()
-    assert user_input.scanned_at > user.scanned_at
+    assert user_repository.update.call_count == 0
+    assert user_repository.set_youtube_subscriptions.call_count == 0
+    assert user_repository.set_scanned_at.call_count == 1
+    user_id, scanned_at = user_repository.set_scanned_at.call_args[0]
+    assert user_id == user.uuid
+    assert scanned_at > user.scanned_at
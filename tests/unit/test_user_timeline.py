@@ -0,0 +1,204 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from linkurator_core.application.items.user_timeline import UserTimeline
+from linkurator_core.domain.common.event import UserTimelineBecameOutdatedEvent
+from linkurator_core.domain.common.event_bus_service import EventBusService
+from linkurator_core.domain.common.mock_factory import mock_item, mock_user
+from linkurator_core.domain.items.item_repository import ItemFilterCriteria
+from linkurator_core.domain.items.timeline_repository import TimelineCursor
+from linkurator_core.infrastructure.in_memory.item_repository import InMemoryItemRepository
+from linkurator_core.infrastructure.in_memory.timeline_repository import InMemoryTimelineRepository
+
+
+def days_ago(days: int) -> datetime:
+    return datetime.now(tz=timezone.utc) - timedelta(days=days)
+
+
+@pytest.mark.asyncio()
+async def test_sync_materializes_the_recent_items_of_the_followed_subscriptions() -> None:
+    item_repo = InMemoryItemRepository()
+    timeline_repo = InMemoryTimelineRepository(item_repo)
+    user_timeline = UserTimeline(timeline_repo, max_age=timedelta(days=10))
+    sub_id = uuid4()
+    recent_item = mock_item(sub_uuid=sub_id, published_at=days_ago(1))
+    old_item = mock_item(sub_uuid=sub_id, published_at=days_ago(20))
+    await item_repo.upsert_items([recent_item, old_item])
+    user = mock_user(subscribed_to=[sub_id])
+
+    timeline = await user_timeline.sync(user)
+
+    assert timeline is not None
+    assert timeline.subscription_ids == {sub_id}
+    assert set(timeline_repo.timeline_items[user.uuid]) == {recent_item.uuid}
+
+
+@pytest.mark.asyncio()
+async def test_sync_adds_and_removes_the_items_of_followed_and_unfollowed_subscriptions() -> None:
+    item_repo = InMemoryItemRepository()
+    timeline_repo = InMemoryTimelineRepository(item_repo)
+    user_timeline = UserTimeline(timeline_repo)
+    sub1_id = uuid4()
+    sub2_id = uuid4()
+    item1 = mock_item(sub_uuid=sub1_id, published_at=days_ago(1))
+    item2 = mock_item(sub_uuid=sub2_id, published_at=days_ago(1))
+    await item_repo.upsert_items([item1, item2])
+    user = mock_user(subscribed_to=[sub1_id])
+    await user_timeline.sync(user)
+
+    user.follow_subscription(sub2_id)
+    user.unfollow_subscription(sub1_id)
+    await user_timeline.sync(user)
+
+    assert set(timeline_repo.timeline_items[user.uuid]) == {item2.uuid}
+
+
+@pytest.mark.asyncio()
+async def test_an_interrupted_sync_is_resumed_by_the_next_one() -> None:
+    item_repo = InMemoryItemRepository()
+    timeline_repo = InMemoryTimelineRepository(item_repo)
+    user_timeline = UserTimeline(timeline_repo)
+    sub_id = uuid4()
+    item = mock_item(sub_uuid=sub_id, published_at=days_ago(1))
+    await item_repo.upsert_items([item])
+    user = mock_user(subscribed_to=[sub_id])
+
+    with (patch.object(timeline_repo, "add_subscription_items", AsyncMock(side_effect=ConnectionError)),
+          pytest.raises(ConnectionError)):
+        await user_timeline.sync(user)
+    interrupted_timeline = await timeline_repo.get(user.uuid)
+    assert interrupted_timeline is not None
+    assert interrupted_timeline.pending_subscription_ids == {sub_id}
+
+    timeline = await user_timeline.sync(user)
+
+    assert timeline is not None
+    assert timeline.pending_subscription_ids == set()
+    assert set(timeline_repo.timeline_items[user.uuid]) == {item.uuid}
+
+
+@pytest.mark.asyncio()
+async def test_users_following_too_many_subscriptions_have_no_timeline() -> None:
+    timeline_repo = InMemoryTimelineRepository(InMemoryItemRepository())
+    user_timeline = UserTimeline(timeline_repo, max_subscriptions=1)
+    user = mock_user(subscribed_to=[uuid4()])
+    await user_timeline.sync(user)
+
+    user.follow_subscription(uuid4())
+
+    assert await user_timeline.sync(user) is None
+    assert await timeline_repo.get(user.uuid) is None
+    assert await user_timeline.find_items(user, ItemFilterCriteria(), page_number=0, limit=10) is None
+
+
+@pytest.mark.asyncio()
+async def test_find_items_only_answers_full_pages() -> None:
+    item_repo = InMemoryItemRepository()
+    user_timeline = UserTimeline(InMemoryTimelineRepository(item_repo))
+    sub_id = uuid4()
+    items = [mock_item(sub_uuid=sub_id, published_at=days_ago(i + 1)) for i in range(3)]
+    await item_repo.upsert_items(items)
+    user = mock_user(subscribed_to=[sub_id])
+    await user_timeline.sync(user)
+
+    first_page = await user_timeline.find_items(user, ItemFilterCriteria(), page_number=0, limit=2)
+    assert first_page is not None
+    second_page = await user_timeline.find_items(
+        user, ItemFilterCriteria(), page_number=1, limit=2, after=TimelineCursor.of(first_page[-1]))
+
+    assert [item.uuid for item in first_page] == [items[0].uuid, items[1].uuid]
+    assert second_page is None
+
+
+@pytest.mark.asyncio()
+async def test_find_items_after_the_cursor_of_the_previous_page() -> None:
+    item_repo = InMemoryItemRepository()
+    user_timeline = UserTimeline(InMemoryTimelineRepository(item_repo))
+    sub_id = uuid4()
+    items = [mock_item(sub_uuid=sub_id, published_at=days_ago(i + 1)) for i in range(4)]
+    await item_repo.upsert_items(items)
+    user = mock_user(subscribed_to=[sub_id])
+    await user_timeline.sync(user)
+
+    second_page = await user_timeline.find_items(
+        user, ItemFilterCriteria(), page_number=1, limit=2, after=TimelineCursor.of(items[1]))
+    page_without_cursor = await user_timeline.find_items(user, ItemFilterCriteria(), page_number=1, limit=2)
+
+    assert second_page is not None
+    assert [item.uuid for item in second_page] == [items[2].uuid, items[3].uuid]
+    assert page_without_cursor is None
+
+
+@pytest.mark.asyncio()
+async def test_reading_an_outdated_timeline_requests_its_sync() -> None:
+    item_repo = InMemoryItemRepository()
+    timeline_repo = InMemoryTimelineRepository(item_repo)
+    event_bus = AsyncMock(spec=EventBusService)
+    user_timeline = UserTimeline(timeline_repo, event_bus=event_bus)
+    sub_id = uuid4()
+    await item_repo.upsert_items([mock_item(sub_uuid=sub_id, published_at=days_ago(1))])
+    user = mock_user(subscribed_to=[sub_id])
+
+    missing_timeline_items = await user_timeline.find_items(user, ItemFilterCriteria(), page_number=0, limit=1)
+    await user_timeline.sync(user)
+    user.follow_subscription(uuid4())
+    outdated_timeline_items = await user_timeline.find_items(user, ItemFilterCriteria(), page_number=0, limit=1)
+
+    assert missing_timeline_items is None
+    assert outdated_timeline_items is None
+    assert timeline_repo.timelines[user.uuid].subscription_ids == {sub_id}
+    published_events = [call_args.args[0] for call_args in event_bus.publish.call_args_list]
+    assert len(published_events) == 2
+    assert all(isinstance(event, UserTimelineBecameOutdatedEvent) for event in published_events)
+    assert all(event.user_id == user.uuid for event in published_events)
+
+
+@pytest.mark.asyncio()
+async def test_reading_an_outdated_timeline_again_does_not_request_another_sync() -> None:
+    item_repo = InMemoryItemRepository()
+    event_bus = AsyncMock(spec=EventBusService)
+    user_timeline = UserTimeline(InMemoryTimelineRepository(item_repo), event_bus=event_bus)
+    no_ttl_user_timeline = UserTimeline(InMemoryTimelineRepository(item_repo), event_bus=event_bus,
+                                        sync_request_ttl=timedelta(0))
+    user = mock_user(subscribed_to=[uuid4()])
+
+    for _ in range(3):
+        await user_timeline.find_items(user, ItemFilterCriteria(), page_number=0, limit=1)
+    assert event_bus.publish.call_count == 1
+
+    for _ in range(3):
+        await no_ttl_user_timeline.find_items(user, ItemFilterCriteria(), page_number=0, limit=1)
+    assert event_bus.publish.call_count == 4
+
+
+@pytest.mark.asyncio()
+async def test_find_items_with_text_are_pulled() -> None:
+    item_repo = InMemoryItemRepository()
+    user_timeline = UserTimeline(InMemoryTimelineRepository(item_repo))
+    sub_id = uuid4()
+    await item_repo.upsert_items([mock_item(sub_uuid=sub_id, name="some name")])
+    user = mock_user(subscribed_to=[sub_id])
+
+    assert await user_timeline.find_items(user, ItemFilterCriteria(text="name"), page_number=0, limit=1) is None
+
+
+@pytest.mark.asyncio()
+async def test_add_items_to_the_timelines_of_the_followers() -> None:
+    item_repo = InMemoryItemRepository()
+    timeline_repo = InMemoryTimelineRepository(item_repo)
+    user_timeline = UserTimeline(timeline_repo)
+    sub_id = uuid4()
+    follower = mock_user(subscribed_to=[sub_id])
+    other_user = mock_user(subscribed_to=[uuid4()])
+    await user_timeline.sync(follower)
+    await user_timeline.sync(other_user)
+
+    new_item = mock_item(sub_uuid=sub_id)
+    await item_repo.upsert_items([new_item])
+    await user_timeline.add_items([new_item])
+
+    assert set(timeline_repo.timeline_items[follower.uuid]) == {new_item.uuid}
+    assert timeline_repo.timeline_items[other_user.uuid] == {}